@@ -0,0 +1,414 @@
+"""
+Emerging-skills detector for Wuzzuf Job Market Analysis
+Keeps a sparse (month x skill) posting-count tensor built from the job ->
+skills CSR index, updated incrementally as new months arrive, and scores
+every skill for every month at once: share of postings, lift over a baseline
+window, acceleration of the share and a two-proportion significance test
+
+Usage:
+    python analysis/emerging_skills.py                      # latest month
+    python analysis/emerging_skills.py --as-of 2021-06 --top 20 --recent 3 --baseline 12
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import
+from stage_profiler import stage
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+wuzzuf_dataset = lazy_import('wuzzuf_dataset')
+
+COUNTS_FILE = 'skill_month_counts.npz'
+RECENT_MONTHS = 3
+BASELINE_MONTHS = 12
+FDR = 0.05
+
+
+def _month_label(ordinal: int) -> str:
+    return f"{ordinal // 12}-{ordinal % 12 + 1:02d}"
+
+
+def _month_ordinal(label: str) -> int:
+    year, _, month = label.partition('-')
+    return int(year) * 12 + int(month) - 1
+
+
+class SkillMonthCounts:
+    """
+    Sparse (month x skill) counts of postings mentioning each skill
+
+    Stored as COO triples (month ordinal, skill_id, count) plus the number
+    of dated postings per month, so the state stays proportional to the
+    skill-months that actually occur. A fingerprint of the source data
+    (skill vocabulary digest, per-month checksums) tells whether the kept
+    months still describe the processed files.
+
+    Args:
+        months, skill_ids, counts: COO triples
+        totals: Month ordinal -> postings that month
+        vocabulary: Digest of the skill_id -> skill_name table the counts refer to
+        checksums: Month ordinal -> (postings, relationships, job_id sum, skill_id sum)
+    """
+
+    def __init__(self, months=(), skill_ids=(), counts=(), totals=None, vocabulary='', checksums=None):
+        self.months = np.asarray(months, dtype=np.int32)
+        self.skill_ids = np.asarray(skill_ids, dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.totals = dict(totals or {})
+        self.vocabulary = vocabulary
+        self.checksums = dict(checksums or {})
+
+    @property
+    def last_month(self) -> Optional[int]:
+        return max(self.totals) if self.totals else None
+
+    @staticmethod
+    def count_dataset(dataset, since: Optional[int] = None):
+        """
+        COO triples and monthly totals for the dataset's postings
+
+        Args:
+            dataset: wuzzuf_dataset.WuzzufDataset
+            since: Only count months >= this ordinal
+
+        Returns:
+            tuple: (months, skill_ids, counts, totals dict)
+        """
+        year = np.asarray(dataset.arrays['posting_year'], dtype=np.int64)
+        month = np.asarray(dataset.arrays['posting_month'], dtype=np.int64)
+        ordinal = np.where((year > 0) & (month > 0), year * 12 + month - 1, -1)
+        keep = ordinal >= (0 if since is None else since)
+
+        jobs_month = ordinal[keep]
+        first = int(jobs_month.min()) if len(jobs_month) else 0
+        month_totals = np.bincount(jobs_month - first) if len(jobs_month) else np.zeros(0, np.int64)
+        totals = {first + i: int(n) for i, n in enumerate(month_totals) if n}
+
+        # Month of every relationship, from the CSR row lengths
+        per_row = np.diff(np.asarray(dataset.arrays['skill_indptr']))
+        rel_month = np.repeat(ordinal, per_row)
+        rel_skill = np.asarray(dataset.arrays['skill_indices'], dtype=np.int64)
+        rel_keep = np.repeat(keep, per_row)
+        rel_month, rel_skill = rel_month[rel_keep], rel_skill[rel_keep]
+
+        n_skill_slots = int(rel_skill.max()) + 1 if len(rel_skill) else 1
+        flat = (rel_month - first) * n_skill_slots + rel_skill
+        keys, counts = np.unique(flat, return_counts=True)
+        return (first + keys // n_skill_slots, keys % n_skill_slots, counts, totals)
+
+    @staticmethod
+    def fingerprint(dataset):
+        """
+        Source fingerprint: skill vocabulary digest and per-month checksums
+
+        Returns:
+            tuple: (vocabulary digest, {month ordinal: (postings, relationships, job_id sum, skill_id sum)})
+        """
+        vocabulary = json.dumps([np.asarray(dataset.skills['skill_id']).tolist(), dataset.skill_labels['skill_name']])
+        digest = hashlib.sha256(vocabulary.encode('utf-8')).hexdigest()
+
+        year = np.asarray(dataset.arrays['posting_year'], dtype=np.int64)
+        month = np.asarray(dataset.arrays['posting_month'], dtype=np.int64)
+        ordinal = np.where((year > 0) & (month > 0), year * 12 + month - 1, -1)
+        dated = ordinal >= 0
+        if not dated.any():
+            return digest, {}
+        first = int(ordinal[dated].min())
+        slots = ordinal - first
+        per_row = np.diff(np.asarray(dataset.arrays['skill_indptr']))
+        sums = np.zeros((int(slots.max()) + 1, 4), dtype=np.int64)
+        np.add.at(sums[:, 0], slots[dated], 1)
+        np.add.at(sums[:, 1], slots[dated], per_row[dated])
+        np.add.at(sums[:, 2], slots[dated], np.asarray(dataset.arrays['job_id'], dtype=np.int64)[dated])
+        rel_slot = np.repeat(slots, per_row)
+        rel_dated = rel_slot >= 0
+        np.add.at(sums[:, 3], rel_slot[rel_dated],
+                  np.asarray(dataset.arrays['skill_indices'], dtype=np.int64)[rel_dated])
+        return digest, {first + i: tuple(row) for i, row in enumerate(sums.tolist()) if row[0]}
+
+    @classmethod
+    def from_dataset(cls, dataset) -> 'SkillMonthCounts':
+        counts = cls()
+        counts.update(dataset)
+        return counts
+
+    def matches(self, vocabulary: str, checksums: dict, before: int) -> bool:
+        """True when the months an update keeps (< before) are unchanged in the source data"""
+        if vocabulary != self.vocabulary:
+            return False
+        stored = {m: c for m, c in self.checksums.items() if m < before}
+        return stored == {m: c for m, c in checksums.items() if m < before}
+
+    def update(self, dataset) -> list:
+        """
+        Recount the latest stored month and every later one from the dataset
+
+        Earlier months are kept as they are, so appending a month of postings
+        costs one pass over the new rows' skills rather than a full rebuild.
+        When the kept months no longer match the source fingerprint (data
+        regenerated, skill ids reassigned, saved by an older version), every
+        month is recounted.
+
+        Returns:
+            list: Month labels that were (re)counted
+        """
+        vocabulary, checksums = self.fingerprint(dataset)
+        since = self.last_month
+        if since is not None and not self.matches(vocabulary, checksums, since):
+            print("♻️  Saved skill-month counts do not match the processed data, recounting every month")
+            since = None
+        months, skill_ids, counts, totals = self.count_dataset(dataset, since)
+        if since is not None:
+            old = self.months < since
+            self.months = np.r_[self.months[old], months].astype(np.int32)
+            self.skill_ids = np.r_[self.skill_ids[old], skill_ids].astype(np.int32)
+            self.counts = np.r_[self.counts[old], counts].astype(np.int64)
+            self.totals = {m: n for m, n in self.totals.items() if m < since}
+        else:
+            self.months, self.skill_ids, self.counts = (months.astype(np.int32), skill_ids.astype(np.int32),
+                                                        counts.astype(np.int64))
+            self.totals = {}
+        self.totals.update(totals)
+        self.vocabulary, self.checksums = vocabulary, checksums
+        return [_month_label(m) for m in sorted(totals)]
+
+    def save(self, path):
+        path = Path(path)
+        tmp = path.with_name(path.name + '.tmp.npz')
+        checksum_months = sorted(self.checksums)
+        np.savez_compressed(tmp, months=self.months, skill_ids=self.skill_ids, counts=self.counts,
+                            total_months=np.array(list(self.totals), dtype=np.int32),
+                            total_counts=np.array(list(self.totals.values()), dtype=np.int64),
+                            vocabulary=np.array(self.vocabulary),
+                            checksum_months=np.array(checksum_months, dtype=np.int32),
+                            checksums=np.array([self.checksums[m] for m in checksum_months],
+                                               dtype=np.int64).reshape(-1, 4))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path) -> 'SkillMonthCounts':
+        with np.load(path) as data:
+            totals = dict(zip(data['total_months'].tolist(), data['total_counts'].tolist()))
+            # Files saved before fingerprints existed never match, so they are recounted
+            vocabulary = str(data['vocabulary']) if 'vocabulary' in data else ''
+            checksums = (dict(zip(data['checksum_months'].tolist(), map(tuple, data['checksums'].tolist())))
+                         if 'checksums' in data else {})
+            return cls(data['months'], data['skill_ids'], data['counts'], totals, vocabulary, checksums)
+
+    def dense(self):
+        """
+        Dense view over a gap-free month axis
+
+        Returns:
+            tuple: (month ordinals, skill_ids, (months x skills) counts, postings per month)
+        """
+        if not self.totals:
+            raise ValueError("No dated postings counted")
+        first, last = min(self.totals), max(self.totals)
+        month_axis = np.arange(first, last + 1)
+        skill_axis, skill_codes = np.unique(self.skill_ids, return_inverse=True)
+        matrix = np.zeros((len(month_axis), len(skill_axis)))
+        np.add.at(matrix, (self.months - first, skill_codes), self.counts)
+        totals = np.array([self.totals.get(m, 0) for m in month_axis], dtype=float)
+        return month_axis, skill_axis, matrix, totals
+
+
+def _window_sums(matrix: 'np.ndarray', width: int, lag: int = 0) -> 'np.ndarray':
+    """Sum of rows (t - lag - width, t - lag] for every row t (NaN until the window fits)"""
+    cumulative = np.vstack([np.zeros((1,) + matrix.shape[1:]), np.cumsum(matrix, axis=0)])
+    end = np.arange(1, len(matrix) + 1) - lag
+    start = end - width
+    valid = start >= 0
+    sums = np.full(matrix.shape, np.nan)
+    sums[valid] = cumulative[end[valid]] - cumulative[start[valid]]
+    return sums
+
+
+def _window_slopes(share: 'np.ndarray', width: int, lag: int = 0) -> 'np.ndarray':
+    """Least-squares slope of share over the window ending at each month"""
+    t = np.arange(len(share), dtype=float)
+    n = float(width)
+    sum_t = _window_sums(t[:, None], width, lag)
+    sum_tt = _window_sums((t ** 2)[:, None], width, lag)
+    sum_y = _window_sums(share, width, lag)
+    sum_ty = _window_sums(share * t[:, None], width, lag)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (n * sum_ty - sum_t * sum_y) / (n * sum_tt - sum_t ** 2)
+
+
+def benjamini_hochberg(p_values: 'np.ndarray') -> 'np.ndarray':
+    """False-discovery-rate adjusted p-values (q-values) along the last axis, NaN-aware"""
+    p = np.asarray(p_values, dtype=float)
+    tested = (~np.isnan(p)).sum(axis=-1, keepdims=True)
+    order = np.argsort(p, axis=-1)  # NaN sorts last
+    ranked_p = np.take_along_axis(p, order, axis=-1)
+    ranks = np.arange(1, p.shape[-1] + 1)
+    ranked = np.where(np.isnan(ranked_p), np.inf, ranked_p * tested / ranks)
+    adjusted = np.minimum(np.minimum.accumulate(ranked[..., ::-1], axis=-1)[..., ::-1], 1.0)
+    adjusted[np.isnan(ranked_p)] = np.nan
+    q = np.empty_like(p)
+    np.put_along_axis(q, order, adjusted, axis=-1)
+    return q
+
+
+class EmergingSkills:
+    """
+    Scores every skill for every month from a SkillMonthCounts tensor
+
+    For month t the recent window is the last `recent` months up to t and
+    the baseline the `baseline` months before it. Per (month, skill):
+        share           postings mentioning the skill / postings (recent window)
+        baseline_share  the same over the baseline window
+        lift            share / baseline_share
+        acceleration    slope of the monthly share in the recent window minus
+                        its slope in the baseline window (share points/month)
+        z, p_value      one-sided two-proportion test of share > baseline_share
+        q_value         Benjamini-Hochberg adjusted across the month's skills
+    All scores come from cumulative sums along the month axis, so the
+    whole table is a handful of array operations.
+    """
+
+    def __init__(self, counts: SkillMonthCounts, skill_names: Optional[dict] = None,
+                 recent: int = RECENT_MONTHS, baseline: int = BASELINE_MONTHS):
+        self.counts = counts
+        self.skill_names = skill_names or {}
+        self.recent = recent
+        self.baseline = baseline
+        self._scores = None
+
+    def scores(self) -> dict:
+        """(months x skills) score arrays plus the month and skill axes"""
+        if self._scores is None:
+            with stage('emerging_skills_scores') as st:
+                months, skills, matrix, totals = self.counts.dense()
+                x1 = _window_sums(matrix, self.recent)
+                x0 = _window_sums(matrix, self.baseline, lag=self.recent)
+                n1 = _window_sums(totals[:, None], self.recent)
+                n0 = _window_sums(totals[:, None], self.baseline, lag=self.recent)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    p1, p0 = x1 / n1, x0 / n0
+                    pooled = (x1 + x0) / (n1 + n0)
+                    z = (p1 - p0) / np.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n0))
+                    z = np.where(pooled > 0, z, np.nan)
+                    monthly_share = np.where(totals[:, None] > 0, matrix / totals[:, None], 0.0)
+                    acceleration = (_window_slopes(monthly_share, self.recent) -
+                                    _window_slopes(monthly_share, self.baseline, lag=self.recent))
+                    lift = np.where(p0 > 0, p1 / p0, np.nan)
+                erfc = np.vectorize(math.erfc, otypes=[float])
+                p_value = np.where(np.isnan(z), np.nan, erfc(np.nan_to_num(z) / math.sqrt(2)) / 2)
+                self._scores = {'months': months, 'skills': skills, 'recent_count': x1, 'share': p1,
+                                'baseline_share': p0, 'lift': lift, 'acceleration': acceleration,
+                                'z': z, 'p_value': p_value, 'q_value': benjamini_hochberg(p_value)}
+                st.set_rows(rows_in=len(self.counts.counts), rows_out=matrix.size)
+        return self._scores
+
+    def emerging(self, as_of: Optional[str] = None, top: int = 20, min_count: int = 10,
+                 fdr: float = FDR, by: str = 'acceleration') -> 'pd.DataFrame':
+        """
+        Skills whose share of postings is rising significantly as of a month
+
+        Args:
+            as_of: 'YYYY-MM' (default: the latest month)
+            top: Rows to return
+            min_count: Minimum postings mentioning the skill in the recent window
+            fdr: Keep skills with q_value below this
+            by: Ranking column (acceleration, lift or z)
+
+        Returns:
+            DataFrame: skill_id, skill_name, recent_count, share, baseline_share,
+            lift, acceleration, z, p_value, q_value (shares in %)
+        """
+        scores = self.scores()
+        months = scores['months']
+        month = months[-1] if as_of is None else _month_ordinal(as_of)
+        if month not in months:
+            raise ValueError(f"{as_of} is outside {_month_label(months[0])}..{_month_label(months[-1])}")
+        row = int(np.searchsorted(months, month))
+
+        result = pd.DataFrame({'skill_id': scores['skills']})
+        result['skill_name'] = result['skill_id'].map(self.skill_names)
+        for column in ('recent_count', 'share', 'baseline_share', 'lift', 'acceleration',
+                       'z', 'p_value', 'q_value'):
+            result[column] = scores[column][row]
+        for column in ('share', 'baseline_share', 'acceleration'):
+            result[column] = result[column] * 100
+        keep = ((result['recent_count'] >= min_count) & (result['share'] > result['baseline_share']) &
+                (result['q_value'] < fdr))
+        result = result[keep].sort_values(by, ascending=False, kind='stable').head(top)
+        result['recent_count'] = result['recent_count'].astype(np.int64)
+        return result.round({'share': 3, 'baseline_share': 3, 'lift': 3, 'acceleration': 4, 'z': 2}) \
+            .reset_index(drop=True)
+
+    def monthly_report(self, top: int = 10, **kwargs) -> 'pd.DataFrame':
+        """Top emerging skills for every month that has a full baseline"""
+        months = self.scores()['months']
+        frames = []
+        for month in months[self.recent + self.baseline - 1:]:
+            frame = self.emerging(_month_label(month), top=top, **kwargs)
+            frames.append(frame.assign(month=_month_label(month)))
+        columns = ['month', 'skill_id', 'skill_name', 'recent_count', 'share', 'baseline_share', 'lift',
+                   'acceleration', 'z', 'p_value', 'q_value']
+        return pd.concat(frames, ignore_index=True)[columns] if frames else pd.DataFrame(columns=columns)
+
+
+def load_counts(data_dir='data/processed', counts_path=None, rebuild: bool = False):
+    """
+    Load the saved tensor and bring it up to date with the processed data
+
+    Args:
+        data_dir: Directory with jobs.csv, skills.csv and job_skills.csv
+        counts_path: Saved tensor (default: <data_dir>/skill_month_counts.npz)
+        rebuild: Recount every month
+
+    Returns:
+        tuple: (SkillMonthCounts, {skill_id: skill_name}, list of recounted month labels)
+    """
+    data_dir = Path(data_dir)
+    counts_path = Path(counts_path) if counts_path else data_dir / COUNTS_FILE
+    dataset = wuzzuf_dataset.load_dataset(data_dir)
+    counts = SkillMonthCounts() if rebuild or not counts_path.exists() else SkillMonthCounts.load(counts_path)
+    with stage('skill_month_counts') as st:
+        recounted = counts.update(dataset)
+        st.set_rows(rows_in=dataset.n_relationships, rows_out=len(counts.counts))
+    counts.save(counts_path)
+    names = dict(zip(np.asarray(dataset.skills['skill_id']).tolist(), dataset.skill_labels['skill_name']))
+    return counts, names, recounted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank skills by accelerating share of postings')
+    parser.add_argument('--data-dir', default='data/processed', help='Processed data directory')
+    parser.add_argument('--as-of', help='Month to report (YYYY-MM, default: latest)')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--recent', type=int, default=RECENT_MONTHS, help='Months in the recent window')
+    parser.add_argument('--baseline', type=int, default=BASELINE_MONTHS, help='Months in the baseline window')
+    parser.add_argument('--min-count', type=int, default=10, help='Minimum recent postings per skill')
+    parser.add_argument('--fdr', type=float, default=FDR, help='False discovery rate for significance')
+    parser.add_argument('--by', choices=['acceleration', 'lift', 'z'], default='acceleration')
+    parser.add_argument('--rebuild', action='store_true', help='Recount every month')
+    parser.add_argument('--json', action='store_true', help='Print the list as JSON')
+    args = parser.parse_args()
+
+    counts, names, recounted = load_counts(args.data_dir, rebuild=args.rebuild)
+    print(f"🧮 Skill-month counts: {len(counts.counts):,} non-zero cells, "
+          f"{len(recounted)} month(s) (re)counted")
+    detector = EmergingSkills(counts, names, args.recent, args.baseline)
+    result = detector.emerging(args.as_of, args.top, args.min_count, args.fdr, args.by)
+    if args.json:
+        print(json.dumps(result.to_dict(orient='records'), indent=2))
+    else:
+        as_of = args.as_of or _month_label(detector.scores()['months'][-1])
+        print(f"\n🌱 Emerging skills as of {as_of} (last {args.recent} vs previous {args.baseline} months):")
+        print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
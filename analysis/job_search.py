@@ -0,0 +1,372 @@
+"""
+Similar-jobs and skill-gap search for Wuzzuf Job Market Analysis
+Encodes every posting as an IDF-weighted, L2-normalized skill vector and keeps
+an inverted (skill -> postings) index in memory, so batches of "closest jobs to
+this skill profile" and "skills missing for this role" queries are exact sparse
+top-k scans answered in milliseconds
+
+Usage:
+    python analysis/job_search.py --skills python sql --top 10
+    python analysis/job_search.py --job-id 12345 --filter city=cairo --top 5
+    python analysis/job_search.py --skills python sql --gap-for "data engineer"
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import
+from stage_profiler import stage
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+skill_extraction = lazy_import('skill_extraction')
+wuzzuf_dataset = lazy_import('wuzzuf_dataset')
+
+TOP_K = 10
+GAP_NEIGHBOURS = 200
+
+# Cells of the (queries x jobs) score matrix scored per batch, to bound memory
+SCORE_BUDGET = 1 << 22
+
+RESULT_COLUMNS = ['job_title', 'company_name', 'city', 'experience_level']
+
+
+class JobSearchIndex:
+    """
+    Nearest-neighbour index over job skill vectors
+
+    A job's vector holds idf(skill) = log((1 + N) / (1 + jobs with the skill)) + 1
+    for each of its skills, L2-normalized, so similarity is the cosine of the
+    two skill sets with rare skills counting more than ubiquitous ones. The
+    index is the transpose of the dataset's job -> skills CSR: a query only
+    touches the postings lists of its own skills, and one bincount per batch
+    accumulates every query's scores. Filters (city, role, ...) block the
+    candidate set before the top-k selection, so results stay exact.
+
+    Args:
+        dataset: wuzzuf_dataset.WuzzufDataset
+        roles: roles.csv DataFrame (role_id, role_name) for role lookups
+    """
+
+    def __init__(self, dataset, roles: Optional['pd.DataFrame'] = None):
+        self.dataset = dataset
+        self.roles = roles
+        with stage('job_search_index') as st:
+            indptr = np.asarray(dataset.arrays['skill_indptr'], dtype=np.int64)
+            skills = np.asarray(dataset.arrays['skill_indices'], dtype=np.int64)
+            self.n_jobs = len(indptr) - 1
+            self.n_slots = int(max(skills.max(initial=0), np.asarray(dataset.skills['skill_id']).max(initial=0))) + 1
+            rows = np.repeat(np.arange(self.n_jobs), np.diff(indptr))
+
+            self.job_counts = np.bincount(skills, minlength=self.n_slots)
+            self.idf = np.log((1 + self.n_jobs) / (1 + self.job_counts)) + 1
+            weights = self.idf[skills]
+            norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=self.n_jobs))
+            weights = weights / np.where(norms > 0, norms, 1)[rows]
+            self.job_vectors = (indptr, skills, weights)
+
+            # Inverted index: postings (job row, weight) per skill
+            order = np.argsort(skills, kind='stable')
+            self.post_indptr = np.r_[0, np.cumsum(self.job_counts)]
+            self.post_rows = rows[order]
+            self.post_weights = weights[order]
+            st.set_rows(rows_in=len(skills), rows_out=self.n_jobs)
+
+        self.skill_names = dict(zip(np.asarray(dataset.skills['skill_id']).tolist(),
+                                    dataset.skill_labels['skill_name']))
+        self._vocabulary = None
+
+    @classmethod
+    def from_data_dir(cls, data_dir='data/processed') -> 'JobSearchIndex':
+        """Index the processed dataset (roles.csv is optional)"""
+        roles_path = Path(data_dir) / 'roles.csv'
+        roles = pd.read_csv(roles_path) if roles_path.exists() else None
+        return cls(wuzzuf_dataset.load_dataset(data_dir), roles)
+
+    # ------------------------------------------------------------------
+    # Query encoding
+    # ------------------------------------------------------------------
+    def skill_ids(self, names: Iterable[str]) -> tuple:
+        """
+        Resolve skill names and aliases ('Python', 'ML', 'machine learning')
+
+        Returns:
+            tuple: (list of skill_ids, list of unrecognized names)
+        """
+        if self._vocabulary is None:
+            ids = {name: skill_id for skill_id, name in self.skill_names.items()}
+            self._vocabulary = {form: ids[name] for form, name in
+                                skill_extraction.build_vocabulary(ids, min_length=1).items()}
+        found, unknown = [], []
+        for name in names:
+            form = str(name).lower().strip()
+            skill_id = self._vocabulary.get(form, self._vocabulary.get(form.replace(' ', '_')))
+            if skill_id is None:
+                unknown.append(name)
+            elif skill_id not in found:
+                found.append(skill_id)
+        return found, unknown
+
+    def encode(self, skill_sets: List[Iterable[int]]) -> tuple:
+        """Query vectors (CSR indptr, skill ids, weights) weighted like the job vectors"""
+        sets = [np.unique(np.asarray(list(ids), dtype=np.int64)) for ids in skill_sets]
+        lengths = np.array([len(ids) for ids in sets], dtype=np.int64)
+        skills = np.concatenate(sets) if sets else np.empty(0, dtype=np.int64)
+        rows = np.repeat(np.arange(len(sets)), lengths)
+        weights = self.idf[skills] if len(skills) else np.empty(0)
+        norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=len(sets)))
+        return np.r_[0, np.cumsum(lengths)], skills, weights / np.where(norms > 0, norms, 1)[rows]
+
+    def job_queries(self, job_ids: Iterable[int]) -> tuple:
+        """Query vectors of existing postings, plus their rows (-1 when unknown)"""
+        rows = self.dataset.rows_for_job_ids(list(job_ids))
+        indptr, skills, weights = self.job_vectors
+        lengths = np.where(rows >= 0, indptr[rows + 1] - indptr[np.maximum(rows, 0)], 0)
+        entries = np.repeat(indptr[np.maximum(rows, 0)], lengths) + np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths)
+        return (np.r_[0, np.cumsum(lengths)], skills[entries], weights[entries]), rows
+
+    # ------------------------------------------------------------------
+    # Candidate blocking
+    # ------------------------------------------------------------------
+    def mask(self, filters: Optional[Dict[str, object]] = None, role: Optional[str] = None):
+        """
+        Candidate jobs for a query
+
+        Args:
+            filters: Dimension column -> value or list of accepted values
+            role: Role name (roles.csv) or, without roles, an exact job title
+
+        Returns:
+            Boolean array over job rows, or None for every job
+        """
+        mask = None
+        for column, values in (filters or {}).items():
+            if column not in self.dataset.labels:
+                raise ValueError(f"Unknown filter column: {column} (known: {', '.join(self.dataset.labels)})")
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            wanted = [str(v).lower() for v in values]
+            codes = [i for i, label in enumerate(self.dataset.labels[column]) if label.lower() in wanted]
+            selected = np.isin(np.asarray(self.dataset.arrays[column]), codes)
+            mask = selected if mask is None else mask & selected
+        if role is not None:
+            selected = self._role_rows(role)
+            mask = selected if mask is None else mask & selected
+        return mask
+
+    def _role_rows(self, role: str):
+        name = str(role).lower().strip()
+        if self.roles is not None and 'role_id' in self.dataset.arrays:
+            matches = self.roles.loc[self.roles['role_name'].astype(str).str.lower() == name, 'role_id']
+            if len(matches):
+                return np.asarray(self.dataset.arrays['role_id']) == int(matches.iloc[0])
+        titles = [i for i, label in enumerate(self.dataset.labels.get('job_title', [])) if label.lower() == name]
+        if not titles:
+            raise ValueError(f"Unknown role: {role}")
+        return np.isin(np.asarray(self.dataset.arrays['job_title']), titles)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(self, queries: tuple, k: int = TOP_K, mask=None, exclude_rows=None) -> tuple:
+        """
+        Exact top-k cosine neighbours for a batch of query vectors
+
+        Args:
+            queries: (indptr, skill ids, weights) from encode() or job_queries()
+            k: Neighbours per query
+            mask: Boolean candidate mask over job rows (None for all jobs)
+            exclude_rows: Per-query job row to leave out (-1 for none), e.g. the query job itself
+
+        Returns:
+            tuple: ((queries x k) job rows, (queries x k) similarities), -1 / 0 past the last match
+        """
+        q_indptr, q_skills, q_weights = queries
+        n_queries = len(q_indptr) - 1
+        k = max(1, min(k, self.n_jobs))
+        top_rows = np.full((n_queries, k), -1, dtype=np.int64)
+        top_scores = np.zeros((n_queries, k))
+        batch = max(1, SCORE_BUDGET // max(self.n_jobs, 1))
+
+        for begin in range(0, n_queries, batch):
+            end = min(begin + batch, n_queries)
+            entries = np.arange(q_indptr[begin], q_indptr[end])
+            query = np.repeat(np.arange(end - begin), np.diff(q_indptr[begin:end + 1]))
+            skills = q_skills[entries]
+            lengths = self.job_counts[skills]
+            postings = np.repeat(self.post_indptr[skills], lengths) + np.arange(lengths.sum()) - np.repeat(
+                np.cumsum(lengths) - lengths, lengths)
+            cells = np.repeat(query, lengths) * self.n_jobs + self.post_rows[postings]
+            values = np.repeat(q_weights[entries], lengths) * self.post_weights[postings]
+            scores = np.bincount(cells, values, minlength=(end - begin) * self.n_jobs).reshape(-1, self.n_jobs)
+
+            if mask is not None:
+                scores[:, ~mask] = 0
+            if exclude_rows is not None:
+                own = np.asarray(exclude_rows[begin:end])
+                scores[np.flatnonzero(own >= 0), own[own >= 0]] = 0
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < self.n_jobs else \
+                np.tile(np.arange(self.n_jobs), (end - begin, 1))
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind='stable')
+            best, best_scores = np.take_along_axis(best, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+            top_rows[begin:end] = np.where(best_scores > 0, best, -1)
+            top_scores[begin:end] = np.where(best_scores > 0, best_scores, 0)
+        return top_rows, top_scores
+
+    def similar_jobs(self, skills: Optional[List[Iterable[str]]] = None, job_ids: Optional[Iterable[int]] = None,
+                     k: int = TOP_K, filters: Optional[Dict[str, object]] = None,
+                     role: Optional[str] = None) -> 'pd.DataFrame':
+        """
+        Top-k most similar postings for each skill profile or posting
+
+        Args:
+            skills: List of skill-name lists, one query each
+            job_ids: Posting ids to find neighbours of (the posting itself is excluded)
+            k: Results per query
+            filters: Dimension column -> accepted value(s), e.g. {'city': 'cairo'}
+            role: Restrict results to one role
+
+        Returns:
+            DataFrame with query, rank, job_id, similarity, shared_skills and job attributes
+        """
+        with stage('similar_jobs') as st:
+            if job_ids is not None:
+                queries, exclude = self.job_queries(job_ids)
+            else:
+                queries, exclude = self.encode([self.skill_ids(names)[0] for names in skills or []]), None
+            rows, scores = self.search(queries, k, self.mask(filters, role), exclude)
+
+            query, rank = np.nonzero(rows >= 0)
+            found = rows[query, rank]
+            result = pd.DataFrame({'query': query, 'rank': rank + 1,
+                                   'job_id': np.asarray(self.dataset.arrays['job_id'])[found],
+                                   'similarity': scores[query, rank].round(4),
+                                   'shared_skills': self._shared_counts(queries, query, found)})
+            for column in RESULT_COLUMNS:
+                if column in self.dataset.labels:
+                    result[column] = np.asarray(self.dataset.labels[column] + [None], dtype=object)[
+                        np.asarray(self.dataset.arrays[column])[found]]
+            st.set_rows(rows_in=len(queries[0]) - 1, rows_out=len(result))
+        return result
+
+    def _shared_counts(self, queries: tuple, query, rows):
+        """Skills each (query, job row) result pair has in common"""
+        q_indptr, q_skills, _ = queries
+        query_keys = np.repeat(np.arange(len(q_indptr) - 1), np.diff(q_indptr)) * self.n_slots + q_skills
+        indptr, skills, _ = self.job_vectors
+        lengths = indptr[rows + 1] - indptr[rows]
+        entries = np.repeat(indptr[rows], lengths) + np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths)
+        pair = np.repeat(np.arange(len(rows)), lengths)
+        shared = np.isin(query[pair] * self.n_slots + skills[entries], query_keys)
+        return np.bincount(pair[shared], minlength=len(rows))
+
+    def skill_gap(self, skills: Iterable[str], role: Optional[str] = None,
+                  filters: Optional[Dict[str, object]] = None, neighbours: int = GAP_NEIGHBOURS,
+                  top: int = 15) -> 'pd.DataFrame':
+        """
+        Skills a candidate lacks for a role, ranked by how often the closest postings ask for them
+
+        The candidate's profile is matched against the role's postings; the
+        `neighbours` most similar ones are weighted by similarity (uniformly
+        when nothing overlaps) and each missing skill scored by the weighted
+        share of them listing it.
+
+        Args:
+            skills: Skill names the candidate has
+            role: Target role name (or exact job title)
+            filters: Further dimension filters, e.g. {'city': 'cairo'}
+            neighbours: Closest target postings to learn from
+            top: Missing skills to return
+
+        Returns:
+            DataFrame with skill_id, skill_name, coverage (weighted share of the
+            closest postings), role_share (share of all target postings), lift
+            over the whole market and job_count (target postings listing it)
+        """
+        with stage('skill_gap') as st:
+            have, _ = self.skill_ids(skills)
+            mask = self.mask(filters, role)
+            target = np.ones(self.n_jobs, dtype=bool) if mask is None else mask
+            if not target.any():
+                raise ValueError("No postings match the target role and filters")
+
+            rows, scores = self.search(self.encode([have]), neighbours, target)
+            rows, weights = rows[0][rows[0] >= 0], scores[0][rows[0] >= 0]
+            if not len(rows):
+                # No overlap with any target posting: learn from all of them equally
+                rows = np.flatnonzero(target)
+                weights = np.ones(len(rows))
+
+            indptr, job_skills, _ = self.job_vectors
+            lengths = indptr[rows + 1] - indptr[rows]
+            entries = np.repeat(indptr[rows], lengths) + np.arange(lengths.sum()) - np.repeat(
+                np.cumsum(lengths) - lengths, lengths)
+            coverage = np.bincount(job_skills[entries], np.repeat(weights, lengths),
+                                   minlength=self.n_slots) / weights.sum()
+
+            entry_rows = np.repeat(np.arange(self.n_jobs), np.diff(indptr))
+            target_counts = np.bincount(job_skills[target[entry_rows]], minlength=self.n_slots)
+            role_share = target_counts / target.sum()
+            market_share = self.job_counts / max(self.n_jobs, 1)
+
+            candidates = np.setdiff1d(np.flatnonzero((coverage > 0) | (target_counts > 0)), have)
+            candidates = candidates[np.lexsort((-role_share[candidates], -coverage[candidates]))][:top]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                lift = role_share[candidates] / market_share[candidates]
+            result = pd.DataFrame({
+                'skill_id': candidates,
+                'skill_name': [self.skill_names.get(int(s), str(s)) for s in candidates],
+                'coverage': coverage[candidates].round(4),
+                'role_share': role_share[candidates].round(4),
+                'lift': np.round(lift, 2),
+                'job_count': target_counts[candidates],
+            })
+            st.set_rows(rows_in=int(target.sum()), rows_out=len(result))
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Similar postings and skill gaps from the job skill vectors')
+    parser.add_argument('--data-dir', default='data/processed', help='Processed data directory')
+    parser.add_argument('--skills', nargs='+', help='Skill profile to search with')
+    parser.add_argument('--job-id', type=int, nargs='+', help='Find postings similar to these')
+    parser.add_argument('--gap-for', metavar='ROLE', help='Rank the skills the profile lacks for this role')
+    parser.add_argument('--role', help='Only return postings of this role')
+    parser.add_argument('--filter', action='append', default=[], metavar='COLUMN=VALUE',
+                        help='Only return postings where COLUMN equals VALUE (repeatable)')
+    parser.add_argument('--top', type=int, default=TOP_K)
+    args = parser.parse_args()
+    if not args.skills and not args.job_id:
+        parser.error('give --skills or --job-id')
+
+    filters = {}
+    for item in args.filter:
+        column, _, value = item.partition('=')
+        filters.setdefault(column, []).append(value)
+
+    index = JobSearchIndex.from_data_dir(args.data_dir)
+    if args.skills:
+        known, unknown = index.skill_ids(args.skills)
+        if unknown:
+            print(f"⚠️  Unknown skills ignored: {', '.join(unknown)}")
+        print(f"🧭 Profile: {', '.join(index.skill_names[s] for s in known) or '(no known skills)'}")
+
+    if args.gap_for:
+        result = index.skill_gap(args.skills or [], args.gap_for, filters, top=args.top)
+        print(f"\n📚 Skills to add for {args.gap_for}:")
+    elif args.job_id:
+        result = index.similar_jobs(job_ids=args.job_id, k=args.top, filters=filters, role=args.role)
+        print(f"\n🔎 Postings similar to {', '.join(map(str, args.job_id))}:")
+    else:
+        result = index.similar_jobs([args.skills], k=args.top, filters=filters, role=args.role)
+        print("\n🔎 Closest postings:")
+    print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
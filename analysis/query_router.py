@@ -0,0 +1,325 @@
+"""
+Aggregate-aware query router for Wuzzuf Job Market Analysis
+Analyses ask for (dimensions, measures, filters); the router answers from the
+smallest pre-aggregated Power BI summary that can satisfy the request and only
+falls back to the jobs / job_skills fact tables when none can
+
+Usage:
+    python analysis/query_router.py --dims experience_level --measures job_count percentage
+    python analysis/query_router.py --dims skill_name --measures job_count --order-by=-job_count --limit 10 --explain
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import
+from stage_profiler import stage
+
+pd = lazy_import('pandas')
+
+
+class Measure:
+    """
+    A measure the router can compute
+
+    Args:
+        name: Measure name used in queries and result columns
+        additive: True when sub-totals can be summed into a coarser grain
+            (counts, percentages of the same total); averages and distinct
+            counts are only served from a table at exactly the query grain
+        fact_agg: (column, aggregation) computing the measure on the fact table
+    """
+
+    def __init__(self, name: str, additive: bool, fact_agg: tuple):
+        self.name = name
+        self.additive = additive
+        self.fact_agg = fact_agg
+
+
+MEASURES = {
+    'job_count': Measure('job_count', True, ('job_id', 'count')),
+    'percentage': Measure('percentage', True, ('job_id', 'count')),
+    'salary_avg': Measure('salary_avg', False, ('salary_avg_usd', 'mean')),
+    'applicants': Measure('applicants', False, ('applicants', 'mean')),
+    'company_count': Measure('company_count', False, ('company_name', 'nunique')),
+}
+
+# Dimensions that live on the skills side of the bridge table; grouped by
+# these, job_count counts job-skill pairs (as skills_summary does)
+SKILL_DIMENSIONS = {'skill_id', 'skill_name', 'skill_category'}
+
+
+class AggregateTable:
+    """
+    One pre-aggregated table and what it can answer
+
+    A table answers queries at its own grain; summing its rows into a
+    coarser grain is only correct when they count every job exactly once.
+    Summaries grouped by a nullable column leave out the jobs with a null
+    key, and skill-grain tables count job-skill pairs, which only add up to
+    the answer when the query itself is grouped by skill columns.
+
+    Args:
+        name: File name in the export directory
+        dimensions: Columns the table can group and filter by
+        keys: Column sets that each identify one row (the table's grain)
+        measures: Measure name -> column holding it
+        covers_all_jobs: True when every job is counted in exactly one row
+    """
+
+    def __init__(self, name: str, dimensions: Iterable[str], keys: Iterable[Iterable[str]],
+                 measures: Dict[str, str], covers_all_jobs: bool = False):
+        self.name = name
+        self.dimensions = set(dimensions)
+        self.keys = [set(key) for key in keys]
+        self.measures = dict(measures)
+        self.covers_all_jobs = covers_all_jobs
+
+    @property
+    def skill_grain(self) -> bool:
+        """True when the rows are skills, so counts are of job-skill pairs"""
+        return bool(self.dimensions & SKILL_DIMENSIONS)
+
+    def at_grain(self, columns) -> bool:
+        """True when grouping by columns leaves one table row per group"""
+        return any(key <= set(columns) for key in self.keys)
+
+    def can_answer(self, query: 'AggregateQuery') -> bool:
+        """True when the table holds every column and measure the query needs"""
+        if not query.columns <= self.dimensions:
+            return False
+        if not set(query.measures) <= set(self.measures):
+            return False
+        if self.at_grain(query.dimensions):
+            return True
+        if not all(MEASURES[m].additive for m in query.measures):
+            return False
+        if self.skill_grain:
+            return bool(set(query.dimensions) & SKILL_DIMENSIONS)
+        return self.covers_all_jobs
+
+
+# The Power BI summaries (see powerbi/data_optimization.py), percentages are of all jobs.
+# Each is grouped by columns that can be null (posting date, experience, location, industry),
+# so none covers every job and totals over fewer dimensions come from the fact table
+SUMMARY_TABLES = [
+    AggregateTable('experience_summary_powerbi.csv', ['experience_level'], [['experience_level']],
+                   {'job_count': 'job_count', 'salary_avg': 'salary_avg', 'applicants': 'applicants',
+                    'percentage': 'percentage'}),
+    AggregateTable('industry_summary_powerbi.csv', ['company_industry'], [['company_industry']],
+                   {'job_count': 'job_count', 'company_count': 'company_count', 'salary_avg': 'salary_avg',
+                    'percentage': 'percentage'}),
+    AggregateTable('monthly_trends_powerbi.csv',
+                   ['posting_year', 'posting_month', 'posting_month_name', 'year_month'],
+                   [['posting_year', 'posting_month'], ['year_month']],
+                   {'job_count': 'posting_count'}),
+    AggregateTable('skills_summary_powerbi.csv', ['skill_id', 'skill_name', 'skill_category'],
+                   [['skill_id'], ['skill_name']],
+                   {'job_count': 'job_count', 'percentage': 'percentage'}),
+    AggregateTable('location_summary_powerbi.csv', ['city', 'country'], [['city', 'country']],
+                   {'job_count': 'job_count', 'percentage': 'percentage'}),
+]
+
+
+class AggregateQuery:
+    """
+    A grouped measure request
+
+    Args:
+        dimensions: Columns to group by (empty for a grand total)
+        measures: Names from MEASURES
+        filters: Column -> value or list of accepted values
+        order_by: Result column to sort by, '-' prefix for descending
+        limit: Keep only the first rows after sorting
+    """
+
+    def __init__(self, dimensions: Iterable[str] = (), measures: Iterable[str] = ('job_count',),
+                 filters: Optional[Dict[str, object]] = None, order_by: Optional[str] = None,
+                 limit: Optional[int] = None):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.filters = {column: value if isinstance(value, (list, tuple, set)) else [value]
+                        for column, value in (filters or {}).items()}
+        self.order_by = order_by
+        self.limit = limit
+        unknown = [m for m in self.measures if m not in MEASURES]
+        if unknown:
+            raise ValueError(f"Unknown measure(s): {', '.join(unknown)} (known: {', '.join(MEASURES)})")
+
+    @property
+    def columns(self) -> set:
+        """Every column the query touches besides its measures"""
+        return set(self.dimensions) | set(self.filters)
+
+    def __repr__(self):
+        return (f"AggregateQuery(dimensions={self.dimensions}, measures={self.measures}, "
+                f"filters={self.filters}, order_by={self.order_by!r}, limit={self.limit})")
+
+
+class QueryRouter:
+    """
+    Serves aggregate queries from the Power BI export directory
+
+    Summary tables are a few dozen to a few hundred rows, so they are read
+    once and kept; candidates are tried smallest first. The fact tables
+    (jobs_powerbi, job_skills_powerbi, skills_powerbi) are only loaded when
+    a query cannot be answered from any summary; a rolled-up percentage
+    reads just their job_id column, once, for the total.
+    """
+
+    def __init__(self, data_dir='data/processed', tables: Optional[List[AggregateTable]] = None):
+        self.data_dir = Path(data_dir)
+        self.tables = list(SUMMARY_TABLES if tables is None else tables)
+        self._frames = {}
+        self._total_jobs = None
+        self.last_route = None
+
+    def _load(self, name: str) -> 'pd.DataFrame':
+        if name not in self._frames:
+            self._frames[name] = pd.read_csv(self.data_dir / name)
+        return self._frames[name]
+
+    def _candidates(self, query: AggregateQuery) -> List[AggregateTable]:
+        """Summary tables able to answer the query, smallest first"""
+        usable = [t for t in self.tables if t.can_answer(query) and (self.data_dir / t.name).exists()]
+        return sorted(usable, key=lambda t: len(self._load(t.name)))
+
+    def route(self, query: AggregateQuery) -> str:
+        """Name of the table that will answer the query ('fact' for the fact tables)"""
+        candidates = self._candidates(query)
+        return candidates[0].name if candidates else 'fact'
+
+    def explain(self, query: AggregateQuery) -> str:
+        """One line describing where and how the query is answered"""
+        candidates = self._candidates(query)
+        if not candidates:
+            return f"{query} -> fact tables (no summary holds {sorted(query.columns)} with {query.measures})"
+        table = candidates[0]
+        how = 'direct' if table.at_grain(query.dimensions) else 'rolled up'
+        return f"{query} -> {table.name} ({len(self._load(table.name))} rows, {how})"
+
+    @staticmethod
+    def _filter(df: 'pd.DataFrame', filters: Dict[str, list]) -> 'pd.DataFrame':
+        for column, values in filters.items():
+            if pd.api.types.is_numeric_dtype(df[column]):
+                values = pd.to_numeric(pd.Series(list(values)), errors='coerce')
+            df = df[df[column].isin(values)]
+        return df
+
+    @staticmethod
+    def _round(result: 'pd.DataFrame') -> 'pd.DataFrame':
+        """Averages to 2 decimals, the same on every route"""
+        for measure in ('salary_avg', 'applicants'):
+            if measure in result.columns:
+                result[measure] = result[measure].round(2)
+        return result
+
+    def _from_summary(self, table: AggregateTable, query: AggregateQuery) -> 'pd.DataFrame':
+        df = self._filter(self._load(table.name), query.filters)
+        df = df.rename(columns={column: measure for measure, column in table.measures.items()})
+        if table.at_grain(query.dimensions):
+            return self._round(df[query.dimensions + query.measures].reset_index(drop=True))
+        # Additive measures only (checked by can_answer): sum the finer rows. Percentages are
+        # recomputed from the summed job_count, as summing rounded shares drifts from the SQL answer
+        summed = [m for m in query.measures if m != 'percentage']
+        if 'percentage' in query.measures and 'job_count' not in summed:
+            summed.append('job_count')
+        if not query.dimensions:
+            rolled = df[summed].sum().to_frame().T
+        else:
+            rolled = df.groupby(query.dimensions, as_index=False, sort=False)[summed].sum()
+        if 'percentage' in query.measures:
+            rolled['percentage'] = (rolled['job_count'] / self.total_jobs() * 100).round(2)
+        return rolled[query.dimensions + query.measures]
+
+    def total_jobs(self) -> int:
+        """Number of postings, the denominator of every percentage (job_id column of jobs_powerbi only)"""
+        if self._total_jobs is None:
+            if 'jobs_powerbi.csv' in self._frames:
+                self._total_jobs = len(self._frames['jobs_powerbi.csv'])
+            else:
+                self._total_jobs = len(pd.read_csv(self.data_dir / 'jobs_powerbi.csv', usecols=['job_id']))
+        return self._total_jobs
+
+    def _fact_frame(self, query: AggregateQuery) -> 'pd.DataFrame':
+        """jobs_powerbi, joined to the skills through the bridge when the query needs skill columns"""
+        key = 'fact_skills' if query.columns & SKILL_DIMENSIONS else 'fact_jobs'
+        if key not in self._frames:
+            jobs = self._load('jobs_powerbi.csv').copy()
+            if 'salary_avg_usd' not in jobs.columns:
+                jobs['salary_avg_usd'] = jobs['salary_avg']
+            if 'year_month' not in jobs.columns:
+                jobs['year_month'] = (jobs['posting_year'].astype('Int64').astype(str) + '-' +
+                                      jobs['posting_month'].astype('Int64').astype(str).str.zfill(2))
+            if key == 'fact_skills':
+                bridge = self._load('job_skills_powerbi.csv').merge(self._load('skills_powerbi.csv'), on='skill_id')
+                jobs = bridge.merge(jobs, on='job_id', how='left')
+            self._frames[key] = jobs
+        return self._frames[key]
+
+    def _from_fact(self, query: AggregateQuery) -> 'pd.DataFrame':
+        df = self._filter(self._fact_frame(query), query.filters)
+        aggregations = {m: MEASURES[m].fact_agg for m in query.measures}
+        if query.dimensions:
+            result = df.groupby(query.dimensions, as_index=False).agg(**aggregations)
+        else:
+            result = pd.DataFrame([{m: df[column].agg(func) for m, (column, func) in aggregations.items()}])
+        if 'percentage' in result.columns:
+            result['percentage'] = (result['percentage'] / self.total_jobs() * 100).round(2)
+        return self._round(result)
+
+    def query(self, query: Optional[AggregateQuery] = None, **kwargs) -> 'pd.DataFrame':
+        """
+        Answer an aggregate query
+
+        Args:
+            query: AggregateQuery, or build one from keyword arguments
+                (dimensions, measures, filters, order_by, limit)
+
+        Returns:
+            DataFrame with the dimension columns followed by the measures
+        """
+        query = query or AggregateQuery(**kwargs)
+        candidates = self._candidates(query)
+        source = candidates[0].name if candidates else 'fact'
+        with stage(f'route:{source}') as st:
+            result = self._from_summary(candidates[0], query) if candidates else self._from_fact(query)
+            if query.order_by:
+                column = query.order_by.lstrip('-')
+                result = result.sort_values(column, ascending=not query.order_by.startswith('-'), kind='stable')
+            if query.limit is not None:
+                result = result.head(query.limit)
+            result = result.reset_index(drop=True)
+            st.set_rows(rows_out=len(result))
+        self.last_route = source
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Answer an aggregate query from the Power BI summaries')
+    parser.add_argument('--data-dir', default='data/processed', help='Power BI export directory')
+    parser.add_argument('--dims', nargs='*', default=[], help='Dimensions to group by')
+    parser.add_argument('--measures', nargs='+', default=['job_count'], choices=sorted(MEASURES))
+    parser.add_argument('--filter', action='append', default=[], metavar='COLUMN=VALUE',
+                        help='Keep rows where COLUMN equals VALUE (repeatable)')
+    parser.add_argument('--order-by', help="Sort column, '-' prefix for descending")
+    parser.add_argument('--limit', type=int)
+    parser.add_argument('--explain', action='store_true', help='Print the chosen table')
+    args = parser.parse_args()
+
+    filters = {}
+    for item in args.filter:
+        column, _, value = item.partition('=')
+        filters.setdefault(column, []).append(value)
+    query = AggregateQuery(args.dims, args.measures, filters, args.order_by, args.limit)
+    router = QueryRouter(args.data_dir)
+    if args.explain:
+        print(f"🧭 {router.explain(query)}")
+    print(router.query(query).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Salary percentiles for Wuzzuf Job Market Analysis
+Answers median / P90 (any quantile) salary queries for any slice of city,
+experience level and industry by merging the per-group t-digests exported
+in salary_sketches.csv, instead of sorting the jobs table per group
+
+Usage:
+    python analysis/salary_percentiles.py --by experience_level
+    python analysis/salary_percentiles.py --by company_industry --filter city=Cairo -q 0.25 0.5 0.75 --min-count 20
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import
+from stage_profiler import stage
+
+pd = lazy_import('pandas')
+quantile_sketch = lazy_import('quantile_sketch')
+
+SKETCH_FILE = 'salary_sketches.csv'
+DEFAULT_QUANTILES = (0.5, 0.9)
+
+
+def _label(q: float) -> str:
+    """Result column for a quantile: 0.5 -> 'p50', 0.999 -> 'p99.9'"""
+    return f"p{q * 100:g}"
+
+
+class SalaryPercentiles:
+    """
+    Percentile queries over the exported salary sketches
+
+    The sketch table holds one digest per (city, experience_level,
+    company_industry); a query filters those rows, merges the digests of each
+    requested group and reads the quantiles off the merged digest. Merged
+    digests are cached per (group by, filters), so repeated or finer-quantile
+    queries on the same slice cost microseconds.
+    """
+
+    def __init__(self, data_dir='data/processed', sketch_file=SKETCH_FILE):
+        self.path = Path(data_dir) / sketch_file
+        self._sketches = None
+        self._digests = None
+        self._cache = {}
+
+    def _load(self):
+        if self._sketches is None:
+            if not self.path.exists():
+                raise FileNotFoundError(f"{self.path} not found - run powerbi_optimization.py first")
+            self._sketches = pd.read_csv(self.path)
+            self._digests = quantile_sketch.decode_sketches(self._sketches)
+        return self._sketches
+
+    @property
+    def dimensions(self):
+        """Columns the sketches can be grouped and filtered by"""
+        return [c for c in self._load().columns if c not in quantile_sketch.SKETCH_COLUMNS]
+
+    def _merged(self, by: tuple, filters: Dict[str, list]) -> Dict[tuple, object]:
+        """Group key -> merged TDigest for the filtered rows"""
+        key = (by, tuple(sorted((column, tuple(values)) for column, values in filters.items())))
+        if key not in self._cache:
+            sketches = self._load()
+            unknown = sorted((set(by) | set(filters)) - set(self.dimensions))
+            if unknown:
+                raise ValueError(f"Unknown dimension(s): {', '.join(unknown)} (known: {', '.join(self.dimensions)})")
+            mask = pd.Series(True, index=sketches.index)
+            for column, values in filters.items():
+                mask &= sketches[column].isin(values)
+            rows = sketches.index[mask.to_numpy()]
+            if by:
+                grouped = sketches.loc[rows].groupby(list(by), dropna=False, sort=True).indices
+                items = [(g if isinstance(g, tuple) else (g,), rows[positions]) for g, positions in grouped.items()]
+            else:
+                items = [((), rows)] if len(rows) else []
+            merged = {group: quantile_sketch.TDigest().merge(*(self._digests[i] for i in members))
+                      for group, members in items}
+            self._cache[key] = merged
+        return self._cache[key]
+
+    def percentiles(self, by: Iterable[str] = (), filters: Optional[Dict[str, object]] = None,
+                    quantiles: Iterable[float] = DEFAULT_QUANTILES, min_count: int = 1) -> 'pd.DataFrame':
+        """
+        Salary quantiles (annual USD, outliers excluded) per group
+
+        Args:
+            by: Dimensions to group by (empty for one overall row)
+            filters: Column -> value or list of accepted values
+            quantiles: Quantiles in [0, 1]
+            min_count: Drop groups with fewer salaries than this
+
+        Returns:
+            DataFrame with the group columns, salary_count and one pXX column per quantile
+        """
+        by = tuple(by)
+        filters = {column: list(value) if isinstance(value, (list, tuple, set)) else [value]
+                   for column, value in (filters or {}).items()}
+        quantiles = list(quantiles)
+        with stage('salary_percentiles') as st:
+            merged = self._merged(by, filters)
+            records = []
+            for group, digest in merged.items():
+                if digest.count < max(min_count, 1):
+                    continue
+                record = dict(zip(by, group))
+                record['salary_count'] = int(digest.count)
+                record.update(zip(map(_label, quantiles), digest.quantile(quantiles).round(2)))
+                records.append(record)
+            result = pd.DataFrame(records, columns=list(by) + ['salary_count'] + [_label(q) for q in quantiles])
+            st.set_rows(rows_in=len(merged), rows_out=len(result))
+        return result
+
+    def quantile(self, q: float, filters: Optional[Dict[str, object]] = None) -> float:
+        """Single salary quantile for one slice (NaN when it has no salaries)"""
+        result = self.percentiles(filters=filters, quantiles=[q])
+        return float(result.iloc[0, -1]) if len(result) else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Salary percentiles from the exported quantile sketches')
+    parser.add_argument('--data-dir', default='data/processed', help='Power BI export directory')
+    parser.add_argument('--by', nargs='*', default=[], help='Dimensions to group by')
+    parser.add_argument('--filter', action='append', default=[], metavar='COLUMN=VALUE',
+                        help='Keep groups where COLUMN equals VALUE (repeatable)')
+    parser.add_argument('-q', '--quantiles', nargs='+', type=float, default=list(DEFAULT_QUANTILES))
+    parser.add_argument('--min-count', type=int, default=1, help='Hide groups with fewer salaries')
+    parser.add_argument('--order-by', help="Sort column, '-' prefix for descending")
+    args = parser.parse_args()
+
+    filters = {}
+    for item in args.filter:
+        column, _, value = item.partition('=')
+        filters.setdefault(column, []).append(value)
+    result = SalaryPercentiles(args.data_dir).percentiles(args.by, filters, args.quantiles, args.min_count)
+    if args.order_by:
+        column = args.order_by.lstrip('-')
+        result = result.sort_values(column, ascending=not args.order_by.startswith('-'), kind='stable')
+    print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
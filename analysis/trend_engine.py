@@ -0,0 +1,336 @@
+"""
+Batched trend engine for Wuzzuf Job Market Analysis
+Builds one dense (slice x month) posting-count matrix for every skill, city,
+industry and job title and fits trends, seasonal indices and anomaly scores
+for all slices at once with matrix operations instead of a fit per series
+
+Usage:
+    python analysis/trend_engine.py --dimension skill --top 15
+    python analysis/trend_engine.py --anomalies --z 3.5 --min-count 10
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import
+from skills_bridge import read_job_skills
+from stage_profiler import stage
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Dimension name -> column of the (skill-joined) jobs table holding it
+DIMENSIONS = {
+    'skill': 'skill_name',
+    'city': 'city',
+    'industry': 'company_industry',
+    'job_title': 'job_title',
+}
+
+# Months compared at the end of the series for recent growth
+RECENT_MONTHS = 3
+ANOMALY_Z = 3.0
+
+
+class SliceMatrix:
+    """
+    Posting counts of many slices over a shared, gap-free monthly axis
+
+    Args:
+        counts: (slices x months) count matrix
+        slices: DataFrame with one row per matrix row (dimension, value)
+        months: Month ordinals (year * 12 + month - 1) of the columns
+    """
+
+    def __init__(self, counts: 'np.ndarray', slices: 'pd.DataFrame', months: 'np.ndarray'):
+        self.counts = counts
+        self.slices = slices.reset_index(drop=True)
+        self.months = months
+
+    @property
+    def month_labels(self) -> list:
+        return [f"{m // 12}-{m % 12 + 1:02d}" for m in self.months]
+
+    @property
+    def calendar_months(self) -> 'np.ndarray':
+        """Calendar month (1-12) of each column"""
+        return self.months % 12 + 1
+
+
+def month_ordinals(year, month) -> 'np.ndarray':
+    """year * 12 + month - 1 as integers (-1 where either part is missing)"""
+    year = pd.to_numeric(pd.Series(year), errors='coerce')
+    month = pd.to_numeric(pd.Series(month), errors='coerce')
+    ordinal = year * 12 + month - 1
+    return ordinal.fillna(-1).astype(np.int64).to_numpy()
+
+
+def build_slice_matrix(frames: Dict[str, 'pd.DataFrame'], month_range=None) -> SliceMatrix:
+    """
+    Count postings per (slice, month) for several dimensions into one matrix
+
+    Each frame has a `value` column (the slice) and a `month` ordinal column;
+    rows with a missing value or month are dropped. One bincount per dimension
+    fills its block of rows.
+
+    Args:
+        frames: Dimension name -> DataFrame(value, month)
+        month_range: (first, last) month ordinals (default: span of the data)
+
+    Returns:
+        SliceMatrix
+    """
+    valid = {name: df[(df['month'] >= 0) & df['value'].notna()] for name, df in frames.items()}
+    if month_range is None:
+        all_months = np.concatenate([df['month'].to_numpy() for df in valid.values()] + [np.empty(0, np.int64)])
+        if len(all_months) == 0:
+            raise ValueError("No dated postings to build trends from")
+        month_range = (int(all_months.min()), int(all_months.max()))
+    first, last = month_range
+    n_months = last - first + 1
+
+    blocks, labels = [], []
+    for name, df in valid.items():
+        df = df[(df['month'] >= first) & (df['month'] <= last)]
+        codes, uniques = pd.factorize(df['value'], sort=True)
+        flat = codes.astype(np.int64) * n_months + (df['month'].to_numpy() - first)
+        blocks.append(np.bincount(flat, minlength=len(uniques) * n_months).reshape(len(uniques), n_months))
+        labels.append(pd.DataFrame({'dimension': name, 'value': uniques}))
+    counts = np.vstack(blocks).astype(float) if blocks else np.zeros((0, n_months))
+    slices = pd.concat(labels, ignore_index=True) if labels else pd.DataFrame(columns=['dimension', 'value'])
+    return SliceMatrix(counts, slices, np.arange(first, last + 1))
+
+
+def fit_trends(counts: 'np.ndarray', recent: int = RECENT_MONTHS) -> Dict[str, 'np.ndarray']:
+    """
+    Least-squares linear trend and summary statistics for every row at once
+
+    Args:
+        counts: (slices x months) matrix
+        recent: Months at the end compared with the months just before them
+
+    Returns:
+        dict of per-row arrays: total, mean, slope (postings/month), intercept
+        (value at the first month), growth_rate (slope as % of the mean),
+        recent_growth (% change of the last `recent` months over the previous
+        `recent`), r_squared, cv (coefficient of variation, %) and fitted
+        (slices x months)
+    """
+    n_months = counts.shape[1]
+    t = np.arange(n_months, dtype=float)
+    centered = t - t.mean()
+    mean = counts.mean(axis=1)
+    denominator = (centered ** 2).sum()
+    slope = counts @ centered / denominator if denominator else np.zeros(len(counts))
+    intercept = mean - slope * t.mean()
+    fitted = intercept[:, None] + slope[:, None] * t
+
+    deviations = counts - mean[:, None]
+    ss_total = (deviations ** 2).sum(axis=1)
+    ss_residual = ((counts - fitted) ** 2).sum(axis=1)
+    std = np.sqrt(ss_total / max(n_months - 1, 1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth_rate = np.where(mean > 0, slope / mean * 100, np.nan)
+        r_squared = np.where(ss_total > 0, 1 - ss_residual / ss_total, np.nan)
+        cv = np.where(mean > 0, std / mean * 100, np.nan)
+        if n_months >= 2 * recent:
+            last = counts[:, -recent:].sum(axis=1)
+            previous = counts[:, -2 * recent:-recent].sum(axis=1)
+            recent_growth = np.where(previous > 0, (last - previous) / previous * 100, np.nan)
+        else:
+            recent_growth = np.full(len(counts), np.nan)
+
+    return {'total': counts.sum(axis=1), 'mean': mean, 'slope': slope, 'intercept': intercept,
+            'growth_rate': growth_rate, 'recent_growth': recent_growth, 'r_squared': r_squared,
+            'cv': cv, 'fitted': fitted}
+
+
+def seasonal_indices(counts: 'np.ndarray', fitted: 'np.ndarray', calendar_months: 'np.ndarray') -> 'np.ndarray':
+    """
+    Multiplicative seasonal index per (row, calendar month)
+
+    The ratio of actual to trend is averaged per calendar month through a
+    (months x 12) indicator matrix and normalized to a mean of 1 per row.
+    Calendar months absent from the axis are NaN.
+
+    Returns:
+        np.ndarray: (slices x 12) indices, 1.0 meaning a typical month
+    """
+    indicator = (calendar_months[:, None] == np.arange(1, 13)[None, :]).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(fitted > 0, counts / fitted, np.nan)
+        observed = ~np.isnan(ratio)
+        sums = np.nan_to_num(ratio) @ indicator
+        periods = observed.astype(float) @ indicator
+        index = np.where(periods > 0, sums / periods, np.nan)
+        return index / np.nanmean(index, axis=1, keepdims=True)
+
+
+def anomaly_scores(counts: 'np.ndarray', expected: 'np.ndarray') -> 'np.ndarray':
+    """
+    z-score of each month's residual against its row's residual spread
+
+    Returns:
+        np.ndarray: (slices x months) z-scores (0 where a row has no spread)
+    """
+    residual = counts - expected
+    spread = residual.std(axis=1, ddof=1, keepdims=True) if counts.shape[1] > 1 else np.zeros((len(counts), 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(spread > 0, (residual - residual.mean(axis=1, keepdims=True)) / spread, 0.0)
+    return z
+
+
+class TrendEngine:
+    """
+    Trend statistics for every slice of the Power BI export in one pass
+
+    The jobs fact table (and the skills bridge for the skill dimension) are
+    read once; build() turns them into a single SliceMatrix, and the
+    statistics are computed for all rows of that matrix together.
+    """
+
+    def __init__(self, data_dir='data/processed', dimensions: Optional[Iterable[str]] = None):
+        self.data_dir = Path(data_dir)
+        self.dimensions = list(DIMENSIONS if dimensions is None else dimensions)
+        unknown = [d for d in self.dimensions if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(unknown)} (known: {', '.join(DIMENSIONS)})")
+        self.matrix = None
+        self.stats = None
+        self.seasonal = None
+
+    def _frames(self) -> Dict[str, 'pd.DataFrame']:
+        columns = ['job_id', 'posting_year', 'posting_month'] + \
+            [DIMENSIONS[d] for d in self.dimensions if d != 'skill']
+        jobs = pd.read_csv(self.data_dir / 'jobs_powerbi.csv', usecols=columns)
+        jobs['month'] = month_ordinals(jobs['posting_year'], jobs['posting_month'])
+        frames = {d: pd.DataFrame({'value': jobs[DIMENSIONS[d]], 'month': jobs['month']})
+                  for d in self.dimensions if d != 'skill'}
+        if 'skill' in self.dimensions:
+            bridge = read_job_skills(self.data_dir / 'job_skills_powerbi.csv')
+            skills = pd.read_csv(self.data_dir / 'skills_powerbi.csv', usecols=['skill_id', 'skill_name'])
+            month_by_job = pd.Series(jobs['month'].to_numpy(), index=jobs['job_id'])
+            frames['skill'] = pd.DataFrame({
+                'value': bridge['skill_id'].map(skills.set_index('skill_id')['skill_name']),
+                'month': bridge['job_id'].map(month_by_job).fillna(-1).astype(np.int64)})
+        return {d: frames[d] for d in self.dimensions}
+
+    def build(self) -> 'TrendEngine':
+        """Load the export, build the slice matrix and fit every slice"""
+        with stage('trend_matrix') as st:
+            self.matrix = build_slice_matrix(self._frames())
+            st.set_rows(rows_out=len(self.matrix.slices))
+        with stage('trend_fit') as st:
+            self.stats = fit_trends(self.matrix.counts)
+            self.seasonal = seasonal_indices(self.matrix.counts, self.stats['fitted'],
+                                             self.matrix.calendar_months)
+            st.set_rows(rows_in=self.matrix.counts.size)
+        return self
+
+    def _ensure_built(self):
+        if self.matrix is None:
+            self.build()
+
+    def trends(self, dimension: Optional[str] = None, min_total: int = 0) -> 'pd.DataFrame':
+        """
+        One row of trend statistics per slice
+
+        Args:
+            dimension: Restrict to one dimension (default: all)
+            min_total: Drop slices with fewer postings overall
+
+        Returns:
+            DataFrame: dimension, value, total, mean, slope, growth_rate,
+            recent_growth, r_squared, cv, peak_month and peak_season_index
+        """
+        self._ensure_built()
+        stats = self.stats
+        result = self.matrix.slices.copy()
+        for column in ('total', 'mean', 'slope', 'growth_rate', 'recent_growth', 'r_squared', 'cv'):
+            result[column] = stats[column]
+        result['total'] = result['total'].astype(np.int64)
+        result['peak_month'] = np.array(self.matrix.month_labels, dtype=object)[self.matrix.counts.argmax(axis=1)]
+        with np.errstate(invalid='ignore'):
+            result['peak_season_index'] = np.nanmax(self.seasonal, axis=1)
+        mask = result['total'] >= min_total
+        if dimension is not None:
+            mask &= result['dimension'] == dimension
+        return result[mask].round(3).reset_index(drop=True)
+
+    def fastest_growing(self, dimension: str, top: int = 10, min_total: int = 20,
+                        by: str = 'growth_rate') -> 'pd.DataFrame':
+        """Slices of one dimension with the steepest relative growth"""
+        trends = self.trends(dimension, min_total)
+        return trends.sort_values(by, ascending=False, kind='stable').head(top).reset_index(drop=True)
+
+    def seasonal_profile(self, dimension: Optional[str] = None) -> 'pd.DataFrame':
+        """Seasonal index per slice and calendar month (columns 1-12)"""
+        self._ensure_built()
+        profile = pd.concat([self.matrix.slices,
+                             pd.DataFrame(self.seasonal.round(3), columns=range(1, 13))], axis=1)
+        if dimension is not None:
+            profile = profile[profile['dimension'] == dimension].reset_index(drop=True)
+        return profile
+
+    def anomalies(self, z_threshold: float = ANOMALY_Z, min_count: int = 5,
+                  dimension: Optional[str] = None) -> 'pd.DataFrame':
+        """
+        Months where a slice's postings deviate unusually from trend x season
+
+        Args:
+            z_threshold: Absolute z-score above which a month is reported
+            min_count: Ignore months where both actual and expected are below this
+            dimension: Restrict to one dimension (default: all)
+
+        Returns:
+            DataFrame: dimension, value, year_month, count, expected, z (largest |z| first)
+        """
+        self._ensure_built()
+        counts = self.matrix.counts
+        season = self.seasonal[:, self.matrix.calendar_months - 1]
+        expected = np.clip(self.stats['fitted'] * np.nan_to_num(season, nan=1.0), 0, None)
+        z = anomaly_scores(counts, expected)
+
+        flagged = (np.abs(z) >= z_threshold) & (np.maximum(counts, expected) >= min_count)
+        if dimension is not None:
+            flagged &= (self.matrix.slices['dimension'] == dimension).to_numpy()[:, None]
+        rows, columns = np.nonzero(flagged)
+        result = self.matrix.slices.iloc[rows].reset_index(drop=True)
+        result['year_month'] = np.array(self.matrix.month_labels, dtype=object)[columns]
+        result['count'] = counts[rows, columns].astype(np.int64)
+        result['expected'] = expected[rows, columns].round(1)
+        result['z'] = z[rows, columns].round(2)
+        return result.reindex(result['z'].abs().sort_values(ascending=False, kind='stable').index) \
+            .reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Trends and anomalies for every skill, city, industry and job title')
+    parser.add_argument('--data-dir', default='data/processed', help='Power BI export directory')
+    parser.add_argument('--dimension', choices=sorted(DIMENSIONS), default='skill',
+                        help='Dimension for the fastest-growing list')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--min-total', type=int, default=20, help='Minimum postings for a slice to be ranked')
+    parser.add_argument('--anomalies', action='store_true', help='List unusual hiring spikes and drops instead')
+    parser.add_argument('--z', type=float, default=ANOMALY_Z, help='Anomaly z-score threshold')
+    parser.add_argument('--min-count', type=int, default=5, help='Minimum monthly postings for an anomaly')
+    args = parser.parse_args()
+
+    engine = TrendEngine(args.data_dir).build()
+    counts = engine.matrix.counts
+    print(f"📈 Fitted {counts.shape[0]:,} slices x {counts.shape[1]} months")
+    if args.anomalies:
+        result = engine.anomalies(args.z, args.min_count).head(args.top)
+        print(f"\n⚠️  Unusual hiring months (|z| >= {args.z:g}):")
+    else:
+        result = engine.fastest_growing(args.dimension, args.top, args.min_total)
+        print(f"\n🚀 Fastest-growing {args.dimension} slices (>= {args.min_total} postings):")
+    print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for Wuzzuf Job Market Analysis entry points
+Imports each entry point in a fresh interpreter, measures how long the import
+takes and which heavy libraries it pulls in, and fails when a budget is exceeded
+
+Usage:
+    python benchmarks/import_budget.py                  # exit code 1 on budget violations
+    python benchmarks/import_budget.py --budget 0.25 --importtime
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Entry point -> (directory to import from, module name)
+ENTRY_POINTS = {
+    'execute_time_trends.py': ('.', 'execute_time_trends'),
+    'check_skills.py': ('.', 'check_skills'),
+    'debug_skills.py': ('.', 'debug_skills'),
+    'test_sql_queries.py': ('.', 'test_sql_queries'),
+    'sql/database_setup.py': ('sql', 'database_setup'),
+    'sql/stream_export.py': ('sql', 'stream_export'),
+    'sql/duckdb_backend.py': ('sql', 'duckdb_backend'),
+    'powerbi/db_export.py': ('powerbi', 'db_export'),
+    'analysis/query_router.py': ('analysis', 'query_router'),
+    'analysis/salary_percentiles.py': ('analysis', 'salary_percentiles'),
+    'analysis/trend_engine.py': ('analysis', 'trend_engine'),
+    'analysis/emerging_skills.py': ('analysis', 'emerging_skills'),
+    'analysis/job_search.py': ('analysis', 'job_search'),
+    'notebooks/visualization_utils.py': ('notebooks', 'visualization_utils'),
+}
+
+# Libraries an entry point must not import before it actually uses them
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib', 'seaborn', 'plotly', 'sqlalchemy', 'psycopg2', 'scipy', 'pyarrow', 'duckdb']
+
+DEFAULT_BUDGET_S = 0.2
+
+# Runs in the child interpreter (cwd = repository root, like the scripts expect)
+_PROBE = '''
+import json, sys, time
+sys.path.insert(0, {directory!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split('.')[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+'''
+
+
+def measure(directory, module, repeat=3):
+    """
+    Import one module in fresh interpreters
+
+    Returns:
+        dict: Best import time in seconds, heavy modules imported, error text
+    """
+    code = _PROBE.format(directory=directory, module=module, heavy=HEAVY_MODULES)
+    best, heavy = None, []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import failed'
+            return {'seconds': None, 'heavy': [], 'error': error}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        heavy = result['heavy']
+        best = result['seconds'] if best is None else min(best, result['seconds'])
+    return {'seconds': best, 'heavy': heavy, 'error': None}
+
+
+def slowest_imports(directory, module, top=8):
+    """Slowest direct imports of a module according to python -X importtime"""
+    code = f'import sys; sys.path.insert(0, {directory!r}); import {module}'
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True)
+    rows, children = [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        # Nested imports are indented by two extra spaces per level and are
+        # listed before the module that imported them
+        indent = len(name) - len(name.lstrip())
+        if indent == 3:
+            children.append((int(cumulative), name.strip()))
+        elif indent == 1:
+            if name.strip() == module:
+                rows = children
+            children = []
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the import-time budget of the entry points')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_S, help='Seconds allowed per import')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per entry point (best time kept)')
+    parser.add_argument('--importtime', action='store_true', help='Show the slowest imports of each entry point')
+    args = parser.parse_args()
+
+    print("⏱️  Entry point import budget")
+    print("=" * 72)
+    print(f"{'entry point':<36} {'import s':>9}  heavy modules loaded")
+    failures = 0
+    for entry, (directory, module) in ENTRY_POINTS.items():
+        result = measure(directory, module, args.repeat)
+        if result['error']:
+            failures += 1
+            print(f"❌ {entry:<34} {'error':>9}  {result['error']}")
+            continue
+        over = result['seconds'] > args.budget or result['heavy']
+        failures += bool(over)
+        icon = '❌' if over else '✅'
+        print(f"{icon} {entry:<34} {result['seconds']:>9.3f}  {', '.join(result['heavy']) or '-'}")
+        if args.importtime or over:
+            for cumulative, name in slowest_imports(directory, module):
+                print(f"      {cumulative / 1e6:>8.3f}s  {name}")
+
+    print()
+    if failures:
+        print(f"❌ {failures} entry point(s) over the {args.budget:.2f}s budget or importing heavy modules eagerly")
+        sys.exit(1)
+    print(f"✅ All entry points import in under {args.budget:.2f}s without heavy dependencies")
+
+
+if __name__ == "__main__":
+    main()
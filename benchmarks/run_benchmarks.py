@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite for Wuzzuf Job Market Analysis
+Times the pipeline hot paths on synthetic data at several scales, stores the
+results as JSON and compares runs across commits with a regression report
+
+Usage:
+    python benchmarks/run_benchmarks.py --scales 0.1 1 --repeat 3
+    python benchmarks/run_benchmarks.py --scales 1 --db            # include PostgreSQL stages
+    python benchmarks/run_benchmarks.py --compare baseline.json current.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'pipeline'))
+sys.path.append(str(ROOT / 'powerbi'))
+sys.path.append(str(ROOT / 'sql'))
+sys.path.append(str(ROOT / 'notebooks'))
+
+import pandas as pd
+
+from stage_profiler import StageProfiler
+from synthetic_data import base_job_count, generate_dataset
+
+RESULTS_VERSION = 1
+DEFAULT_DATA_ROOT = ROOT / 'benchmarks' / '.data'
+DEFAULT_RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+DEFAULT_SCALES = [0.1, 1.0]
+DB_NAME = 'wuzzuf_benchmark'
+
+# Query files of the sql/ library exercised by the sql_queries stage
+QUERY_FILES = [
+    'queries.sql', 'analysis_queries.sql', 'eda_analysis_queries.sql',
+    'experience_analysis_queries.sql', 'location_analysis_queries.sql',
+    'salary_analysis_queries.sql', 'time_trends_analysis_simple.sql'
+]
+
+# Metrics compared by the regression report (lower is better)
+COMPARED_METRICS = ('wall_s', 'peak_rss_mb')
+
+
+class StageSkipped(Exception):
+    """Raised by a stage whose optional dependencies or services are unavailable"""
+
+
+# =====================================================
+# Benchmark context
+# =====================================================
+
+class BenchmarkContext:
+    """
+    Inputs and intermediate results shared by the stages of one scale
+
+    Args:
+        data_dir: Synthetic dataset (raw + processed CSVs) for this scale
+        work_dir: Scratch directory for stage outputs
+        use_db: Run the PostgreSQL stages
+    """
+
+    def __init__(self, data_dir, work_dir, use_db=False):
+        self.data_dir = Path(data_dir)
+        self.work_dir = Path(work_dir)
+        self.use_db = use_db
+        self.raw_path = self.data_dir / 'Wuzzuf-Jobs-Posting.csv'
+        self.powerbi_dir = self.work_dir / 'powerbi'
+        self.state = {}
+        self.db_manager = None
+
+    def engine(self):
+        """SQLAlchemy engine of the benchmark database (loaded by db_load)"""
+        if 'engine' not in self.state:
+            raise StageSkipped('benchmark database not loaded')
+        return self.state['engine']
+
+
+def _quiet():
+    """Silence the pipeline's progress output while timing it"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+# =====================================================
+# Stages
+# =====================================================
+# Each stage takes the context and returns {'rows': processed rows,
+# 'ops': [per-operation latency in seconds]} ('ops' is optional)
+
+def stage_raw_cleaning(ctx):
+    """Load the raw CSV, de-duplicate, parse dates, standardize text/location/experience"""
+    import data_cleaning as dc
+
+    with _quiet():
+        df = dc.load_csv(ctx.raw_path)
+        rows = len(df)
+        df = dc.remove_unnecessary_columns(df)
+        df = dc.remove_duplicates(df)
+        df = dc.parse_dates(df)
+        df = dc.standardize_text(df)
+        df = dc.clean_location_data(df)
+        df = dc.bucket_experience_level(df)
+    ctx.state['cleaned_df'] = df
+    return {'rows': rows}
+
+
+def stage_skills_parsing(ctx):
+    """Parse, normalize and categorize the skills lists and build the job_skills mapping"""
+    import data_cleaning as dc
+
+    df = ctx.state.get('cleaned_df')
+    if df is None:
+        raise StageSkipped('raw_cleaning did not run')
+    with _quiet():
+        df, skills_df, job_skills_df = dc.process_all_skills(df)
+    ctx.state['skills_result'] = (df, skills_df, job_skills_df)
+    return {'rows': len(df)}
+
+
+def stage_salary_and_export(ctx):
+    """Clean salary data and write the final jobs/skills/job_skills CSVs"""
+    import data_cleaning as dc
+
+    if 'skills_result' not in ctx.state:
+        raise StageSkipped('skills_parsing did not run')
+    df, skills_df, job_skills_df = ctx.state.pop('skills_result')
+    ctx.state.pop('cleaned_df', None)
+    with _quiet():
+        df = dc.clean_salary_data(df)
+        dc.export_final_datasets(df, skills_df, job_skills_df, ctx.work_dir / 'cleaned')
+    return {'rows': len(df)}
+
+
+def stage_powerbi_tables(ctx):
+    """Optimize the jobs, skills and job_skills tables for Power BI"""
+    from data_optimization import PowerBIDataOptimizer
+
+    optimizer = PowerBIDataOptimizer(ctx.data_dir, ctx.powerbi_dir, docs_dir=ctx.work_dir / 'docs')
+    with _quiet():
+        jobs_df = optimizer.optimize_jobs_table(force=True)
+        skills_df = optimizer.optimize_skills_table(force=True)
+        job_skills_df = optimizer.optimize_job_skills_table(force=True)
+    ctx.state['optimizer'] = optimizer
+    ctx.state['tables'] = (jobs_df, skills_df, job_skills_df)
+    return {'rows': len(jobs_df) + len(job_skills_df)}
+
+
+def stage_aggregated_datasets(ctx):
+    """PowerBIDataOptimizer.create_aggregated_datasets over the optimized tables"""
+    if 'tables' not in ctx.state:
+        raise StageSkipped('powerbi_tables did not run')
+    optimizer = ctx.state['optimizer']
+    jobs_df, skills_df, job_skills_df = ctx.state['tables']
+    with _quiet():
+        summaries = optimizer.create_aggregated_datasets(jobs_df, skills_df, job_skills_df, force=True)
+        optimizer.writer.save_manifest()
+    ctx.state['summaries'] = summaries
+    return {'rows': len(jobs_df) + len(job_skills_df)}
+
+
+def stage_validate_powerbi(ctx):
+    """validate_powerbi_data over the freshly exported bundle"""
+    from validate_powerbi_data import validate_powerbi_data
+
+    if 'summaries' not in ctx.state:
+        raise StageSkipped('aggregated_datasets did not run')
+    with _quiet():
+        is_ready = validate_powerbi_data(ctx.powerbi_dir)
+    if not is_ready:
+        raise RuntimeError('validate_powerbi_data reported the bundle as not ready')
+    jobs_df, _, job_skills_df = ctx.state['tables']
+    return {'rows': len(jobs_df) + len(job_skills_df)}
+
+
+def stage_chart_rendering(ctx):
+    """Render the standard charts from the Power BI summaries"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        from visualization_utils import WuzzufVisualizer
+    except ImportError as e:
+        raise StageSkipped(f'plotting libraries not installed ({e.name})')
+
+    summaries = ctx.state.get('summaries')
+    if not summaries:
+        raise StageSkipped('aggregated_datasets did not run')
+
+    visualizer = WuzzufVisualizer(ctx.work_dir / 'charts')
+    charts = [
+        lambda: visualizer.create_bar_chart(summaries['skills_summary'], 'skill_name', 'job_count',
+                                            'Top Skills', 'bench_skills', orientation='horizontal', top_n=15),
+        lambda: visualizer.create_donut_chart(summaries['experience_summary'], 'experience_level',
+                                              'job_count', 'Experience Levels', 'bench_experience'),
+        lambda: visualizer.create_line_chart(summaries['monthly_trends'], 'year_month', 'posting_count',
+                                             'Monthly Postings', 'bench_monthly', trend_line=True),
+        lambda: visualizer.create_bar_chart(summaries['location_summary'], 'city', 'job_count',
+                                            'Top Cities', 'bench_locations', top_n=10),
+    ]
+    ops = []
+    with _quiet():
+        for render in charts:
+            start = time.perf_counter()
+            render()
+            ops.append(time.perf_counter() - start)
+    return {'rows': len(charts), 'ops': ops}
+
+
+def stage_db_load(ctx):
+    """Recreate the benchmark database schema and load the processed CSVs (sql/load_database.py)"""
+    if not ctx.use_db:
+        raise StageSkipped('database stages disabled (use --db)')
+    try:
+        from database_setup import DatabaseManager
+        from load_database import load_database
+        import sqlalchemy, psycopg2  # noqa: F401  (fail fast when the drivers are missing)
+    except ImportError as e:
+        raise StageSkipped(f'database libraries not installed ({e.name})')
+
+    if ctx.db_manager is None:
+        ctx.db_manager = DatabaseManager(database=os.getenv('WUZZUF_BENCHMARK_DATABASE', DB_NAME))
+        if not ctx.db_manager.create_database():
+            raise StageSkipped('PostgreSQL server not reachable')
+    with _quiet():
+        report = load_database(ctx.data_dir, ctx.db_manager)
+
+    ctx.state['engine'] = ctx.db_manager.get_engine()
+    summary = report['integrity_report']['summary']
+    return {'rows': sum(int(summary[f'{t}_count']) for t in ('companies', 'skills', 'jobs', 'job_skills'))}
+
+
+def stage_sql_queries(ctx):
+    """Run every SELECT of the sql/ query library against the benchmark database"""
+    engine = ctx.engine()
+    from sql_script_runner import SqlScriptRunner
+
+    runner = SqlScriptRunner(engine)
+    ops, failed, rows = [], 0, 0
+    for name in QUERY_FILES:
+        # One query at a time, so the per-query latencies stay comparable
+        for result in runner.run_queries(ROOT / 'sql' / name, workers=1, fetch=False):
+            if result['error']:
+                failed += 1
+                continue
+            rows += result['rows']
+            ops.append(result['seconds'])
+    return {'rows': rows, 'ops': ops, 'failed': failed}
+
+
+def stage_business_charts(ctx):
+    """create_business_question_charts against the benchmark database"""
+    engine = ctx.engine()
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        from visualization_utils import create_business_question_charts
+    except ImportError as e:
+        raise StageSkipped(f'plotting libraries not installed ({e.name})')
+
+    with _quiet():
+        create_business_question_charts(engine, ctx.work_dir / 'business_charts')
+    return {'rows': 6}
+
+
+# Stage order matters: later stages consume earlier stages' results
+STAGES = {
+    'raw_cleaning': stage_raw_cleaning,
+    'skills_parsing': stage_skills_parsing,
+    'salary_and_export': stage_salary_and_export,
+    'powerbi_tables': stage_powerbi_tables,
+    'aggregated_datasets': stage_aggregated_datasets,
+    'validate_powerbi': stage_validate_powerbi,
+    'chart_rendering': stage_chart_rendering,
+    'db_load': stage_db_load,
+    'sql_queries': stage_sql_queries,
+    'business_charts': stage_business_charts,
+}
+
+
+# =====================================================
+# Running
+# =====================================================
+
+def prepare_dataset(scale, seed, data_root=DEFAULT_DATA_ROOT):
+    """
+    Generate (or reuse) the synthetic raw + processed dataset for a scale
+
+    Scale 1 is the size of the processed data the profile is learned from,
+    so a cached dataset is only reused while that base count is unchanged.
+    """
+    data_dir = Path(data_root) / f'scale_{scale:g}_seed_{seed}'
+    manifest_path = data_dir / 'manifest.json'
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if (manifest.get('scale') == scale and manifest.get('seed') == seed
+                and 'raw' in manifest.get('formats', []) and manifest.get('base_jobs') == base_job_count()):
+            return data_dir, manifest
+
+    print(f"🧪 Generating synthetic dataset (scale {scale:g}, seed {seed})...")
+    manifest = generate_dataset(data_dir, scale=scale, seed=seed, formats=('processed', 'raw'))
+    return data_dir, manifest
+
+
+def _latency(ops):
+    """p50/p95/max of per-operation latencies in milliseconds"""
+    if not ops:
+        return None
+    ordered = sorted(ops)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'count': len(ordered),
+        'p50_ms': round(statistics.median(ordered) * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3)
+    }
+
+
+def run_scale(scale, stages, repeat=1, seed=42, use_db=False, data_root=DEFAULT_DATA_ROOT):
+    """
+    Run the selected stages at one scale
+
+    Every repetition runs the full stage chain in a fresh work directory;
+    the reported numbers are medians over the repetitions.
+
+    Returns:
+        list: One result record per stage
+    """
+    data_dir, manifest = prepare_dataset(scale, seed, data_root)
+    runs = {name: [] for name in stages}
+    skipped = {}
+
+    for iteration in range(repeat):
+        work_dir = Path(tempfile.mkdtemp(prefix=f'wuzzuf_bench_{scale:g}_'))
+        ctx = BenchmarkContext(data_dir, work_dir, use_db=use_db)
+        profiler = StageProfiler(f'benchmark_scale_{scale:g}')
+        try:
+            for name in stages:
+                if name in skipped:
+                    continue
+                outcome = {}
+                try:
+                    with profiler.stage(name) as handle:
+                        outcome = STAGES[name](ctx) or {}
+                        handle.set_rows(rows_in=outcome.get('rows'))
+                except StageSkipped as e:
+                    skipped[name] = str(e)
+                    print(f"   ⏭️  {name}: skipped ({e})")
+                    continue
+                except Exception as e:
+                    outcome = {'error': f'{type(e).__name__}: {e}'}
+                    print(f"   ❌ {name}: {outcome['error']}")
+                record = profiler.records[-1]
+                runs[name].append({**record, **outcome})
+                if 'error' not in outcome:
+                    print(f"   ✓ {name} (run {iteration + 1}/{repeat}): {record['wall_s']:.3f}s, "
+                          f"peak {record['peak_rss_mb']:.0f} MB")
+        finally:
+            if ctx.db_manager is not None:
+                ctx.db_manager.close()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = []
+    for name in stages:
+        if name in skipped:
+            results.append({'scale': scale, 'stage': name, 'status': 'skipped', 'reason': skipped[name]})
+            continue
+        ok = [r for r in runs[name] if 'error' not in r]
+        if not ok:
+            errors = [r['error'] for r in runs[name]]
+            results.append({'scale': scale, 'stage': name, 'status': 'error', 'reason': errors[0] if errors else ''})
+            continue
+        wall = statistics.median(r['wall_s'] for r in ok)
+        rows = ok[0].get('rows')
+        results.append({
+            'scale': scale,
+            'stage': name,
+            'status': 'ok',
+            'runs': len(ok),
+            'rows': rows,
+            'wall_s': round(wall, 6),
+            'wall_s_runs': [r['wall_s'] for r in ok],
+            'cpu_s': round(statistics.median(r['cpu_s'] for r in ok), 6),
+            'peak_rss_mb': round(max(r['peak_rss_mb'] for r in ok), 2),
+            'bytes_read': ok[0].get('bytes_read'),
+            'bytes_written': ok[0].get('bytes_written'),
+            'throughput_rows_s': round(rows / wall, 1) if rows and wall > 0 else None,
+            'latency': _latency([t for r in ok for t in r.get('ops', [])]),
+            'failed_ops': ok[0].get('failed', 0)
+        })
+    for record in results:
+        record['dataset'] = {'jobs': manifest.get('jobs'), 'raw_rows': manifest.get('raw_rows'),
+                             'base_jobs': manifest.get('base_jobs')}
+    return results
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info():
+    """Commit, interpreter and library versions recorded with every result file"""
+    import numpy as np
+
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'branch': _git('rev-parse', '--abbrev-ref', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'packages': {'pandas': pd.__version__, 'numpy': np.__version__}
+    }
+
+
+def _base_jobs(results):
+    """Postings in the processed data that scale 1 stood for in a run"""
+    return next((r['dataset']['base_jobs'] for r in results if r.get('dataset')), None)
+
+
+def save_results(results, args, output_dir=DEFAULT_RESULTS_DIR):
+    """Write a result file named after the time and commit; returns its path"""
+    env = environment_info()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    commit = (env['commit'] or 'nocommit')[:10]
+    path = output_dir / f'{stamp}_{commit}.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': RESULTS_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': env,
+            'config': {'scales': args.scales, 'repeat': args.repeat, 'seed': args.seed,
+                       'stages': args.stages, 'db': args.db, 'base_jobs': _base_jobs(results)},
+            'results': results
+        }, f, indent=2)
+    return path
+
+
+# =====================================================
+# Regression report
+# =====================================================
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported result version {data.get('version')}")
+    return data
+
+
+def compare_results(baseline, current, threshold=0.2, min_wall_s=0.05, min_rss_mb=20.0):
+    """
+    Compare two result sets stage by stage
+
+    A metric regresses when it grows by more than `threshold` (relative) and
+    by more than the absolute noise floor (min_wall_s / min_rss_mb).
+
+    Returns:
+        list: Comparison rows with baseline, current, relative change and verdict
+    """
+    floors = {'wall_s': min_wall_s, 'peak_rss_mb': min_rss_mb}
+    base = {(r['scale'], r['stage']): r for r in baseline['results'] if r['status'] == 'ok'}
+    rows = []
+    for record in current['results']:
+        key = (record['scale'], record['stage'])
+        if record['status'] != 'ok':
+            verdict = 'error' if record['status'] == 'error' and key in base else record['status']
+            rows.append({'scale': key[0], 'stage': key[1], 'metric': '-', 'verdict': verdict,
+                         'baseline': None, 'current': None, 'change': None})
+            continue
+        if key not in base:
+            rows.append({'scale': key[0], 'stage': key[1], 'metric': '-', 'verdict': 'new',
+                         'baseline': None, 'current': None, 'change': None})
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base[key].get(metric), record.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            if change > threshold and new - old > floors[metric]:
+                verdict = 'regression'
+            elif change < -threshold and old - new > floors[metric]:
+                verdict = 'improvement'
+            else:
+                verdict = 'ok'
+            rows.append({'scale': key[0], 'stage': key[1], 'metric': metric, 'verdict': verdict,
+                         'baseline': old, 'current': new, 'change': change})
+    return rows
+
+
+def format_report(rows, baseline, current, threshold):
+    """Console regression report"""
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '  ', 'new': '🆕', 'error': '❌', 'skipped': '⏭️'}
+    lines = [
+        "📊 Benchmark Regression Report",
+        "=" * 78,
+        f"Baseline: {(baseline['environment'].get('commit') or '?')[:10]} ({baseline['created']})",
+        f"Current:  {(current['environment'].get('commit') or '?')[:10]} ({current['created']})",
+        f"Threshold: +{threshold:.0%}",
+        "",
+        f"   {'scale':>6} {'stage':<22} {'metric':<12} {'baseline':>10} {'current':>10} {'change':>8}"
+    ]
+    base_jobs = (baseline['config'].get('base_jobs'), current['config'].get('base_jobs'))
+    if base_jobs[0] != base_jobs[1]:
+        lines.insert(-2, f"⚠️  Scale 1 is {base_jobs[0] or '?'} postings in the baseline and {base_jobs[1] or '?'} now; "
+                         "equal scales may not be the same size")
+    for row in rows:
+        if row['change'] is None:
+            lines.append(f"{icons[row['verdict']]} {row['scale']:>6g} {row['stage']:<22} {row['verdict']}")
+            continue
+        lines.append(f"{icons[row['verdict']]} {row['scale']:>6g} {row['stage']:<22} {row['metric']:<12} "
+                     f"{row['baseline']:>10.3f} {row['current']:>10.3f} {row['change']:>+8.1%}")
+    regressions = sum(1 for r in rows if r['verdict'] in ('regression', 'error'))
+    lines.append("")
+    lines.append(f"❌ {regressions} regression(s) above threshold" if regressions
+                 else "✅ No regressions above threshold")
+    return '\n'.join(lines)
+
+
+def run_comparison(baseline_path, current_path, threshold):
+    """Print the regression report; returns the process exit code"""
+    baseline, current = load_results(baseline_path), load_results(current_path)
+    rows = compare_results(baseline, current, threshold)
+    print(format_report(rows, baseline, current, threshold))
+    return 1 if any(r['verdict'] in ('regression', 'error') for r in rows) else 0
+
+
+def _latest_result(results_dir):
+    files = sorted(Path(results_dir).glob('*.json'))
+    return files[-1] if files else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Wuzzuf pipeline hot paths')
+    parser.add_argument('--scales', type=float, nargs='+', default=DEFAULT_SCALES,
+                        help='Dataset sizes as multiples of the postings currently in data/processed '
+                             '(recorded as base_jobs in the results)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per scale (median reported)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--db', action='store_true', help='Run the PostgreSQL stages (uses a separate database)')
+    parser.add_argument('--data-root', type=Path, default=DEFAULT_DATA_ROOT, help='Synthetic dataset cache')
+    parser.add_argument('--output', type=Path, default=DEFAULT_RESULTS_DIR, help='Result directory')
+    parser.add_argument('--baseline', type=Path, help='Compare this run against a baseline result file')
+    parser.add_argument('--compare', type=Path, nargs='+', metavar='RESULT',
+                        help='Only compare: BASELINE [CURRENT] (CURRENT defaults to the latest result)')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Relative slowdown that counts as a regression')
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline = args.compare[0]
+        current = args.compare[1] if len(args.compare) > 1 else _latest_result(args.output)
+        if current is None:
+            parser.error(f'no result files in {args.output}')
+        sys.exit(run_comparison(baseline, current, args.threshold))
+
+    stages = [name for name in STAGES if name in args.stages]
+    print("⏱️  Wuzzuf pipeline benchmarks")
+    print("=" * 50)
+    results = []
+    for scale in args.scales:
+        print(f"\n📏 Scale {scale:g}")
+        results.extend(run_scale(scale, stages, args.repeat, args.seed, args.db, args.data_root))
+
+    path = save_results(results, args, args.output)
+    print(f"\n{'stage':<22} {'scale':>6} {'wall s':>9} {'peak MB':>9} {'rows/s':>12}")
+    for r in results:
+        if r['status'] != 'ok':
+            print(f"{r['stage']:<22} {r['scale']:>6g} {r['status']:>9}")
+            continue
+        throughput = f"{r['throughput_rows_s']:,.0f}" if r['throughput_rows_s'] else ''
+        print(f"{r['stage']:<22} {r['scale']:>6g} {r['wall_s']:>9.3f} {r['peak_rss_mb']:>9.1f} {throughput:>12}")
+    print(f"\n✅ Results saved: {path}")
+
+    if args.baseline:
+        print()
+        sys.exit(run_comparison(args.baseline, path, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ Check skills data structure
 
 import sys
 sys.path.append('sql')
-from database_setup import DatabaseManager
-import pandas as pd
+from database_setup import DatabaseManager, configure_logging
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
 
 def check_skills_data():
     try:
@@ -35,4 +37,5 @@ def check_skills_data():
         print(f"Error: {e}")
 
 if __name__ == "__main__":
+    configure_logging()
     check_skills_data()
\ No newline at end of file
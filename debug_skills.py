@@ -5,8 +5,10 @@ Debug script to check skills data structure
 
 import sys
 sys.path.append('sql')
-from database_setup import DatabaseManager
-import pandas as pd
+from database_setup import DatabaseManager, configure_logging
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
 
 def debug_skills():
     try:
@@ -73,4 +75,5 @@ def debug_skills():
         print(f"Error: {e}")
 
 if __name__ == "__main__":
+    configure_logging()
     debug_skills()
\ No newline at end of file
@@ -4,10 +4,6 @@ Execute Time Trends Analysis
 This script runs the time trends analysis and generates the required outputs.
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 import sys
 import os
@@ -15,17 +11,29 @@ from pathlib import Path
 
 # Add sql directory to path for database utilities
 sys.path.append('sql')
-from database_setup import DatabaseManager
+sys.path.append('analysis')
+from database_setup import DatabaseManager, configure_logging
+from trend_engine import fit_trends
+from lazy_imports import lazy_import
+from stage_profiler import profiled, stage
+
+# Heavy libraries are imported when main() first uses them
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
 
-# Configure display and warnings
-pd.set_option('display.max_columns', None)
-pd.set_option('display.max_rows', 20)
 warnings.filterwarnings('ignore')
 
-# Set up plotting style
-plt.style.use('default')
-sns.set_palette("husl")
 
+def configure_output():
+    """Display options and plotting style (imports pandas, matplotlib and seaborn)"""
+    pd.set_option('display.max_columns', None)
+    pd.set_option('display.max_rows', 20)
+    plt.style.use('default')
+    sns.set_palette("husl")
+
+
+@profiled('time_trends')
 def main():
     print("🚀 Starting Time Trends Analysis")
     print("=" * 50)
@@ -38,18 +46,21 @@ def main():
     print("Connecting to PostgreSQL database...")
     
     try:
-        db_manager = DatabaseManager()
-        engine = db_manager.get_engine()
-        
-        # Test connection
-        status = db_manager.test_connection()
+        with stage('connect'):
+            db_manager = DatabaseManager()
+            engine = db_manager.get_engine()
+            
+            # Test connection
+            status = db_manager.test_connection()
         print(f"✅ Connected to database: {status['database']}")
         print(f"📊 Tables available: {status['table_count']}")
         
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         print("Please ensure PostgreSQL is running and database is set up correctly")
-        return
+        return False
+    
+    configure_output()
     
     # SQL query for monthly posting volume trends over time
     time_trends_query = """
@@ -71,7 +82,9 @@ def main():
     print("📈 Executing SQL Query for Time Trends Analysis...")
     
     # Execute query and get results
-    time_trends_df = pd.read_sql(time_trends_query, engine)
+    with stage('top_months_query') as st:
+        time_trends_df = pd.read_sql(time_trends_query, engine)
+        st.set_rows(rows_out=len(time_trends_df))
     
     print(f"\n📊 Time Trends Analysis Results:")
     print(f"Total periods analyzed: {len(time_trends_df)}")
@@ -91,7 +104,9 @@ def main():
     ORDER BY posting_year, posting_month;
     """
     
-    complete_trends_df = pd.read_sql(complete_trends_query, engine)
+    with stage('monthly_series_query') as st:
+        complete_trends_df = pd.read_sql(complete_trends_query, engine)
+        st.set_rows(rows_out=len(complete_trends_df))
     
     # Create a proper date column for plotting
     complete_trends_df['date'] = pd.to_datetime(
@@ -100,6 +115,9 @@ def main():
     )
     complete_trends_df['year_month'] = complete_trends_df['date'].dt.strftime('%Y-%m')
     
+    # Trend line, growth and volatility of the overall series (one-row batch fit)
+    trend = fit_trends(complete_trends_df['posting_count'].to_numpy(dtype=float)[None, :])
+    
     print(f"\n📅 Complete time series data: {len(complete_trends_df)} periods")
     print(f"📊 Date range: {complete_trends_df['date'].min().strftime('%Y-%m')} to {complete_trends_df['date'].max().strftime('%Y-%m')}")
     print(f"📈 Total postings across all periods: {complete_trends_df['posting_count'].sum():,}")
@@ -122,7 +140,9 @@ def main():
     ORDER BY posting_month;
     """
     
-    seasonal_df = pd.read_sql(seasonal_analysis_query, engine)
+    with stage('seasonal_query') as st:
+        seasonal_df = pd.read_sql(seasonal_analysis_query, engine)
+        st.set_rows(rows_out=len(seasonal_df))
     print("\n🌟 Seasonal Posting Patterns:")
     print(seasonal_df.to_string(index=False))
     
@@ -146,9 +166,7 @@ def main():
     
     # Add trend line
     if len(complete_trends_df) > 1:
-        z = np.polyfit(range(len(complete_trends_df)), complete_trends_df['posting_count'], 1)
-        p = np.poly1d(z)
-        plt.plot(complete_trends_df['date'], p(range(len(complete_trends_df))), 
+        plt.plot(complete_trends_df['date'], trend['fitted'][0], 
                  "--", alpha=0.7, color='red', linewidth=2, label='Trend Line')
         plt.legend()
     
@@ -157,7 +175,8 @@ def main():
     
     # Save the chart
     chart_path = charts_dir / 'time_trends.png'
-    plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
+    with stage('save_chart'):
+        plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"✅ Time trends chart saved to: {chart_path}")
     
     # Calculate key metrics for insights
@@ -172,8 +191,7 @@ def main():
     
     # Calculate trend direction if we have enough data
     if len(complete_trends_df) > 1:
-        z = np.polyfit(range(len(complete_trends_df)), complete_trends_df['posting_count'], 1)
-        trend_slope = z[0]
+        trend_slope = trend['slope'][0]
         trend_direction = "increasing" if trend_slope > 0 else "decreasing" if trend_slope < 0 else "stable"
     else:
         trend_direction = "insufficient data"
@@ -190,7 +208,7 @@ def main():
     print(f"• Least active season: {seasonal_summary.index[-1]} with {seasonal_summary.iloc[-1]:,} total postings")
     
     # Calculate volatility
-    volatility = complete_trends_df['posting_count'].std() / avg_monthly_postings * 100
+    volatility = trend['cv'][0]
     print(f"• Market volatility: {volatility:.1f}% (coefficient of variation)")
     
     # Create final summary table
@@ -209,6 +227,8 @@ def main():
     engine.dispose()
     print("\n✅ Analysis complete. Database connection closed.")
     print("📊 Time trends analysis has been completed successfully!")
+    return True
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    configure_logging()
+    sys.exit(0 if main() else 1)
\ No newline at end of file
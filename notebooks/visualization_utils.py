@@ -1,17 +1,23 @@
 # Visualization Utilities for Wuzzuf Job Market Analysis
 # Standardized visualization functions with consistent styling
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import pandas as pd
-import numpy as np
 from pathlib import Path
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import
+from stage_profiler import profiled, stage
+
+# Plotting and data libraries are imported on first use
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
 class WuzzufVisualizer:
     """
     Standardized visualization class for Wuzzuf Job Market Analysis
@@ -335,13 +341,16 @@ class WuzzufVisualizer:
         return charts
 
 # Convenience functions for quick chart creation
-def create_business_question_charts(db_engine, charts_dir='../assets/charts'):
+@profiled('business_question_charts')
+def create_business_question_charts(db_engine, charts_dir='../assets/charts', router=None):
     """
     Generate all 6 business question charts using standardized functions
     
     Args:
         db_engine: SQLAlchemy database engine
         charts_dir: Directory to save charts
+        router: Optional analysis/query_router.QueryRouter; charts it can serve
+            from the Power BI summary tables skip the database scan
     """
     visualizer = WuzzufVisualizer(charts_dir)
     
@@ -364,15 +373,18 @@ def create_business_question_charts(db_engine, charts_dir='../assets/charts'):
     LIMIT 10;
     """
     
-    top_roles_df = pd.read_sql(top_roles_query, db_engine)
-    visualizer.create_bar_chart(
-        data=top_roles_df,
-        x_col='job_title',
-        y_col='posting_count',
-        title='Top 10 Job Titles by Posting Count',
-        filename='top_roles_industries',
-        orientation='horizontal'
-    )
+    with stage('top_roles_query') as st:
+        top_roles_df = pd.read_sql(top_roles_query, db_engine)
+        st.set_rows(rows_out=len(top_roles_df))
+    with stage('top_roles_chart'):
+        visualizer.create_bar_chart(
+            data=top_roles_df,
+            x_col='job_title',
+            y_col='posting_count',
+            title='Top 10 Job Titles by Posting Count',
+            filename='top_roles_industries',
+            orientation='horizontal'
+        )
     
     # 2. Skills Demand Analysis
     print("\n2️⃣ Creating Skills Demand Chart...")
@@ -389,15 +401,22 @@ def create_business_question_charts(db_engine, charts_dir='../assets/charts'):
     LIMIT 10;
     """
     
-    skills_df = pd.read_sql(skills_query, db_engine)
-    visualizer.create_bar_chart(
-        data=skills_df,
-        x_col='skill_name',
-        y_col='demand_count',
-        title='Top 10 Skills in Demand',
-        filename='skills_demand',
-        orientation='horizontal'
-    )
+    with stage('skills_demand_query') as st:
+        if router is not None:
+            skills_df = router.query(dimensions=['skill_name'], measures=['job_count', 'percentage'],
+                                     order_by='-job_count', limit=10).rename(columns={'job_count': 'demand_count'})
+        else:
+            skills_df = pd.read_sql(skills_query, db_engine)
+        st.set_rows(rows_out=len(skills_df))
+    with stage('skills_demand_chart'):
+        visualizer.create_bar_chart(
+            data=skills_df,
+            x_col='skill_name',
+            y_col='demand_count',
+            title='Top 10 Skills in Demand',
+            filename='skills_demand',
+            orientation='horizontal'
+        )
     
     # 3. Experience Distribution
     print("\n3️⃣ Creating Experience Distribution Chart...")
@@ -413,14 +432,21 @@ def create_business_question_charts(db_engine, charts_dir='../assets/charts'):
     ORDER BY posting_count DESC;
     """
     
-    experience_df = pd.read_sql(experience_query, db_engine)
-    visualizer.create_donut_chart(
-        data=experience_df,
-        labels_col='experience_level',
-        values_col='posting_count',
-        title='Job Postings by Experience Level',
-        filename='experience_distribution'
-    )
+    with stage('experience_distribution_query') as st:
+        if router is not None:
+            experience_df = router.query(dimensions=['experience_level'], measures=['job_count'],
+                                         order_by='-job_count').rename(columns={'job_count': 'posting_count'})
+        else:
+            experience_df = pd.read_sql(experience_query, db_engine)
+        st.set_rows(rows_out=len(experience_df))
+    with stage('experience_distribution_chart'):
+        visualizer.create_donut_chart(
+            data=experience_df,
+            labels_col='experience_level',
+            values_col='posting_count',
+            title='Job Postings by Experience Level',
+            filename='experience_distribution'
+        )
     
     # 4. Salary Insights
     print("\n4️⃣ Creating Salary Insights Chart...")
@@ -438,16 +464,19 @@ def create_business_question_charts(db_engine, charts_dir='../assets/charts'):
     ORDER BY avg_min_salary DESC;
     """
     
-    salary_df = pd.read_sql(salary_query, db_engine)
-    if not salary_df.empty:
-        visualizer.create_grouped_bar_chart(
-            data=salary_df,
-            x_col='experience_level',
-            y_cols=['avg_min_salary', 'avg_max_salary'],
-            title='Average Salary by Experience Level',
-            filename='salary_insights',
-            y_label='Average Salary'
-        )
+    with stage('salary_insights_query') as st:
+        salary_df = pd.read_sql(salary_query, db_engine)
+        st.set_rows(rows_out=len(salary_df))
+    with stage('salary_insights_chart'):
+        if not salary_df.empty:
+            visualizer.create_grouped_bar_chart(
+                data=salary_df,
+                x_col='experience_level',
+                y_cols=['avg_min_salary', 'avg_max_salary'],
+                title='Average Salary by Experience Level',
+                filename='salary_insights',
+                y_label='Average Salary'
+            )
     
     # 5. Location Trends
     print("\n5️⃣ Creating Location Trends Chart...")
@@ -463,15 +492,22 @@ def create_business_question_charts(db_engine, charts_dir='../assets/charts'):
     LIMIT 10;
     """
     
-    location_df = pd.read_sql(location_query, db_engine)
-    visualizer.create_bar_chart(
-        data=location_df,
-        x_col='city',
-        y_col='posting_count',
-        title='Top 10 Cities by Job Postings',
-        filename='location_trends',
-        orientation='horizontal'
-    )
+    with stage('location_trends_query') as st:
+        if router is not None:
+            location_df = router.query(dimensions=['city'], measures=['job_count', 'percentage'],
+                                       order_by='-job_count', limit=10).rename(columns={'job_count': 'posting_count'})
+        else:
+            location_df = pd.read_sql(location_query, db_engine)
+        st.set_rows(rows_out=len(location_df))
+    with stage('location_trends_chart'):
+        visualizer.create_bar_chart(
+            data=location_df,
+            x_col='city',
+            y_col='posting_count',
+            title='Top 10 Cities by Job Postings',
+            filename='location_trends',
+            orientation='horizontal'
+        )
     
     # 6. Time Trends
     print("\n6️⃣ Creating Time Trends Chart...")
@@ -488,18 +524,25 @@ def create_business_question_charts(db_engine, charts_dir='../assets/charts'):
     ORDER BY posting_year, posting_month;
     """
     
-    time_df = pd.read_sql(time_query, db_engine)
-    if not time_df.empty:
-        visualizer.create_line_chart(
-            data=time_df,
-            x_col='year_month',
-            y_col='posting_count',
-            title='Monthly Job Posting Trends Over Time',
-            filename='time_trends',
-            x_label='Month',
-            y_label='Number of Postings',
-            trend_line=True
-        )
+    with stage('time_trends_query') as st:
+        if router is not None:
+            time_df = router.query(dimensions=['posting_year', 'posting_month', 'year_month'], measures=['job_count'],
+                                   order_by='year_month').rename(columns={'job_count': 'posting_count'})
+        else:
+            time_df = pd.read_sql(time_query, db_engine)
+        st.set_rows(rows_out=len(time_df))
+    with stage('time_trends_chart'):
+        if not time_df.empty:
+            visualizer.create_line_chart(
+                data=time_df,
+                x_col='year_month',
+                y_col='posting_count',
+                title='Monthly Job Posting Trends Over Time',
+                filename='time_trends',
+                x_label='Month',
+                y_label='Number of Postings',
+                trend_line=True
+            )
     
     print("\n" + "=" * 60)
     print("✅ All standardized charts generated successfully!")
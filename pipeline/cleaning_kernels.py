@@ -0,0 +1,144 @@
+"""
+Vectorized cleaning kernels for Wuzzuf Job Market Analysis
+Text, location, experience and pay-rate transformations that run once per
+distinct value (factorize, transform the uniques, map back by code), so the
+string work scales with the number of distinct values instead of rows
+"""
+
+import numpy as np
+import pandas as pd
+
+EXPERIENCE_BUCKETS = (2, 5)
+EXPERIENCE_LEVELS = ('Entry', 'Mid', 'Senior')
+
+PAY_RATE_MAPPING = {
+    'hr': 'hourly',
+    'hour': 'hourly',
+    'hourly': 'hourly',
+    'per hour': 'hourly',
+    'yr': 'yearly',
+    'year': 'yearly',
+    'yearly': 'yearly',
+    'annual': 'yearly',
+    'annually': 'yearly',
+    'per year': 'yearly',
+    'month': 'monthly',
+    'monthly': 'monthly',
+    'per month': 'monthly'
+}
+
+# Location parse outcomes, in the order clean_location_data reports them
+LOCATION_KINDS = ('parsed_city_country', 'country_only', 'unknown_format', 'missing_data')
+
+
+def map_unique(series, func, na_result=np.nan):
+    """
+    Apply func once per distinct non-missing value and broadcast the results
+
+    Args:
+        series (pd.Series): Input values
+        func (callable): Transformation of one value
+        na_result: Result for missing values
+
+    Returns:
+        np.ndarray: Object array of results aligned with series
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    # Code -1 (missing) indexes the trailing na_result slot
+    results = np.empty(len(uniques) + 1, dtype=object)
+    results[:-1] = [func(value) for value in uniques]
+    results[-1] = na_result
+    return results[codes]
+
+
+def _standardize(value):
+    text = str(value).strip().lower()
+    return np.nan if text == 'nan' else text
+
+
+def standardize_text_values(series):
+    """
+    Lowercase and strip a text column ('nan' strings become missing)
+
+    Args:
+        series (pd.Series): Text column
+
+    Returns:
+        pd.Series: Standardized column with the same index
+    """
+    values = map_unique(series, _standardize)
+    return pd.Series(values, index=series.index, name=series.name).astype(str).replace('nan', np.nan)
+
+
+def _parse_location(location):
+    """(city, country, kind index) for one non-missing location string"""
+    if location == '':
+        return 'Unknown', 'Unknown', 3
+    location = str(location).strip()
+    if location.lower() == 'united states':
+        return 'Unknown', 'United States', 1
+    if ',' in location:
+        parts = [part.strip() for part in location.split(',')]
+        # Two parts with a two-letter second part: likely "City, ST" in the US
+        if len(parts) == 2 and len(parts[1]) == 2:
+            return parts[0], 'United States', 0
+        return parts[0], parts[-1], 0
+    return location, 'Unknown', 2
+
+
+def parse_locations(series):
+    """
+    Split "City, State/Country" locations into city and country
+
+    Args:
+        series (pd.Series): Raw location column
+
+    Returns:
+        tuple: (city Series, country Series, dict of LOCATION_KINDS counts)
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = [_parse_location(value) for value in uniques] + [('Unknown', 'Unknown', 3)]
+    cities, countries, kinds = (np.array(column, dtype=object) for column in zip(*parsed))
+    kinds = kinds.astype(np.int8)[codes]
+    counts = np.bincount(kinds, minlength=len(LOCATION_KINDS))
+    stats = {kind: int(count) for kind, count in zip(LOCATION_KINDS, counts)}
+    return (pd.Series(cities[codes], index=series.index, dtype=object),
+            pd.Series(countries[codes], index=series.index, dtype=object),
+            stats)
+
+
+def experience_levels(years):
+    """
+    Bucket integer years of experience into Entry (<=2), Mid (<=5) and Senior
+
+    Args:
+        years (array-like): Years of experience
+
+    Returns:
+        np.ndarray: Object array of level names
+    """
+    years = np.asarray(years)
+    entry, mid = EXPERIENCE_BUCKETS
+    return np.select([years <= entry, years <= mid], EXPERIENCE_LEVELS[:2],
+                     default=EXPERIENCE_LEVELS[2]).astype(object)
+
+
+def _pay_rate(value):
+    text = str(value).lower().strip()
+    if text == 'nan':
+        return np.nan
+    return PAY_RATE_MAPPING.get(text, text)
+
+
+def normalize_pay_rates(series):
+    """
+    Map pay rate spellings (hr, per year, ...) to hourly/yearly/monthly
+
+    Args:
+        series (pd.Series): Raw pay rate column
+
+    Returns:
+        pd.Series: Normalized pay rates; unknown spellings are kept lowercased
+    """
+    values = map_unique(series, _pay_rate)
+    return pd.Series(values, index=series.index, name=series.name).astype(str).replace('nan', np.nan)
@@ -0,0 +1,938 @@
+"""
+Data cleaning pipeline for Wuzzuf Job Market Analysis
+Functions from notebooks/01_data_cleaning.ipynb as an importable module, plus
+run_cleaning_pipeline() which chains them from the raw CSV to the final files
+"""
+
+import ast
+import contextlib
+import io
+import re
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cleaning_kernels import experience_levels, normalize_pay_rates, parse_locations, standardize_text_values
+from duplicate_detection import RAW_FIELDS, mark_near_duplicates
+from salary_normalization import flag_salary_outliers, normalize_currency, normalize_salaries
+from skill_extraction import add_title_skills
+from title_clustering import export_roles, mark_roles
+
+warnings.filterwarnings('ignore')
+
+DEFAULT_RAW_PATH = Path(__file__).resolve().parent.parent / 'data' / 'raw' / 'Wuzzuf-Jobs-Posting.csv'
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent.parent / 'data' / 'processed'
+
+
+# =====================================================
+# Task 2.1: Data Loading and Initial Cleaning
+# =====================================================
+
+def load_csv(file_path):
+    """
+    Load CSV file with proper encoding handling.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        
+    Returns:
+        pd.DataFrame: Loaded dataframe
+    """
+    try:
+        # Try UTF-8 encoding first
+        df = pd.read_csv(file_path, encoding='utf-8')
+        print(f"Successfully loaded {file_path} with UTF-8 encoding")
+    except UnicodeDecodeError:
+        try:
+            # Fallback to latin-1 encoding
+            df = pd.read_csv(file_path, encoding='latin-1')
+            print(f"Successfully loaded {file_path} with latin-1 encoding")
+        except Exception as e:
+            print(f"Error loading file: {e}")
+            return None
+    
+    print(f"Dataset shape: {df.shape}")
+    print(f"Columns: {list(df.columns)}")
+    
+    return df
+
+
+def remove_unnecessary_columns(df):
+    """
+    Remove unnecessary columns like 'Unnamed: 0' and other index columns.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        
+    Returns:
+        pd.DataFrame: Dataframe with unnecessary columns removed
+    """
+    original_cols = len(df.columns)
+    
+    # Remove columns that start with 'Unnamed:' (typically index columns)
+    cols_to_remove = [col for col in df.columns if col.startswith('Unnamed:')]
+    
+    # Also remove the first column if it's just an index (contains only integers)
+    if len(df.columns) > 0:
+        first_col = df.columns[0]
+        if first_col not in cols_to_remove and df[first_col].dtype in ['int64', 'float64']:
+            # Check if it's likely an index column (sequential numbers)
+            if df[first_col].nunique() == len(df) and df[first_col].min() == 0:
+                cols_to_remove.append(first_col)
+    
+    if cols_to_remove:
+        df = df.drop(columns=cols_to_remove)
+        print(f"Removed {len(cols_to_remove)} unnecessary columns: {cols_to_remove}")
+    else:
+        print("No unnecessary columns found to remove")
+    
+    print(f"Columns reduced from {original_cols} to {len(df.columns)}")
+    
+    return df
+
+
+def remove_duplicates(df, id_column='Job Posting ID'):
+    """
+    Remove duplicate records based on Job Posting ID.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        id_column (str): Column name to check for duplicates
+        
+    Returns:
+        pd.DataFrame: Dataframe with duplicates removed
+    """
+    original_rows = len(df)
+    
+    if id_column not in df.columns:
+        print(f"Warning: {id_column} column not found. Available columns: {list(df.columns)}")
+        return df
+    
+    # Check for duplicates
+    duplicates = df.duplicated(subset=[id_column], keep='first')
+    duplicate_count = duplicates.sum()
+    
+    if duplicate_count > 0:
+        df = df[~duplicates].copy()
+        print(f"Removed {duplicate_count} duplicate records based on {id_column}")
+    else:
+        print(f"No duplicates found based on {id_column}")
+    
+    print(f"Rows reduced from {original_rows} to {len(df)}")
+    
+    return df
+
+
+def parse_dates(df, date_column='Job Posting Date'):
+    """
+    Parse Job Posting Date into datetime format and extract year and month columns.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        date_column (str): Column name containing dates
+        
+    Returns:
+        pd.DataFrame: Dataframe with parsed dates and extracted year/month columns
+    """
+    if date_column not in df.columns:
+        print(f"Warning: {date_column} column not found. Available columns: {list(df.columns)}")
+        return df
+    
+    original_nulls = df[date_column].isnull().sum()
+    
+    # Parse dates with error handling
+    df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
+    
+    # Count parsing failures
+    parsing_failures = df[date_column].isnull().sum() - original_nulls
+    successful_parses = len(df) - df[date_column].isnull().sum()
+    
+    # Extract year and month columns
+    df['posting_year'] = df[date_column].dt.year
+    df['posting_month'] = df[date_column].dt.month
+    
+    print(f"Date parsing results:")
+    print(f"  - Successfully parsed: {successful_parses} dates")
+    print(f"  - Parsing failures: {parsing_failures} dates")
+    print(f"  - Success rate: {(successful_parses/len(df)*100):.1f}%")
+    
+    if successful_parses > 0:
+        print(f"  - Date range: {df[date_column].min()} to {df[date_column].max()}")
+        print(f"  - Years covered: {sorted(df['posting_year'].dropna().unique().astype(int))}")
+    
+    return df
+
+
+def generate_data_quality_report(df):
+    """
+    Generate a comprehensive data quality report.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+    """
+    print("=" * 50)
+    print("DATA QUALITY REPORT")
+    print("=" * 50)
+    
+    print(f"\nDataset Overview:")
+    print(f"  - Total rows: {len(df):,}")
+    print(f"  - Total columns: {len(df.columns)}")
+    
+    print(f"\nMissing Data Summary:")
+    missing_data = df.isnull().sum()
+    missing_pct = (missing_data / len(df) * 100).round(2)
+    
+    for col in df.columns:
+        if missing_data[col] > 0:
+            print(f"  - {col}: {missing_data[col]:,} ({missing_pct[col]}%)")
+    
+    if 'Job Posting Date' in df.columns:
+        valid_dates = df['Job Posting Date'].notna().sum()
+        print(f"\nDate Parsing Success:")
+        print(f"  - Valid dates: {valid_dates:,} ({(valid_dates/len(df)*100):.1f}%)")
+    
+    print(f"\nKey Statistics:")
+    if 'Job Posting ID' in df.columns:
+        unique_jobs = df['Job Posting ID'].nunique()
+        print(f"  - Unique job postings: {unique_jobs:,}")
+    
+    if 'Company Name' in df.columns:
+        unique_companies = df['Company Name'].nunique()
+        print(f"  - Unique companies: {unique_companies:,}")
+    
+    if 'Job Title' in df.columns:
+        unique_titles = df['Job Title'].nunique()
+        print(f"  - Unique job titles: {unique_titles:,}")
+
+
+# =====================================================
+# Task 2.2: Text Standardization and Location Processing
+# =====================================================
+
+def standardize_text(df, text_columns=None):
+    """
+    Standardize text fields by converting to lowercase and stripping whitespace.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        text_columns (list): List of column names to standardize. If None, auto-detect text columns.
+        
+    Returns:
+        pd.DataFrame: Dataframe with standardized text columns
+    """
+    df = df.copy()
+    
+    if text_columns is None:
+        # Auto-detect text columns (object dtype columns)
+        text_columns = df.select_dtypes(include=['object']).columns.tolist()
+        # Exclude columns that shouldn't be standardized
+        exclude_cols = ['Job Posting ID', 'Job Skills']  # Skills will be handled separately
+        text_columns = [col for col in text_columns if col not in exclude_cols]
+    
+    print(f"Standardizing text in columns: {text_columns}")
+    
+    for col in text_columns:
+        if col in df.columns:
+            # Strip whitespace and lowercase once per distinct value ('nan' strings become NaN)
+            df[col] = standardize_text_values(df[col])
+    
+    print(f"Text standardization completed for {len(text_columns)} columns")
+    
+    return df
+
+
+def clean_location_data(df, location_column='Job Location'):
+    """
+    Split Job Location into separate city and country columns.
+    Handle various formats: "City, State", "United States", "City, Country"
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        location_column (str): Column name containing location data
+        
+    Returns:
+        pd.DataFrame: Dataframe with separate city and country columns
+    """
+    df = df.copy()
+    
+    if location_column not in df.columns:
+        print(f"Warning: {location_column} column not found.")
+        return df
+    
+    # Parse each distinct location once and map the results back to the rows
+    df['city'], df['country'], location_stats = parse_locations(df[location_column])
+    location_stats['total_locations'] = len(df)
+    
+    # Print parsing statistics
+    print(f"Location parsing results:")
+    print(f"  - Total locations processed: {location_stats['total_locations']:,}")
+    print(f"  - Successfully parsed (City, Country): {location_stats['parsed_city_country']:,}")
+    print(f"  - Country only: {location_stats['country_only']:,}")
+    print(f"  - Unknown format: {location_stats['unknown_format']:,}")
+    print(f"  - Missing data: {location_stats['missing_data']:,}")
+    
+    success_rate = (location_stats['parsed_city_country'] + location_stats['country_only']) / location_stats['total_locations'] * 100
+    print(f"  - Overall parsing success rate: {success_rate:.1f}%")
+    
+    # Show top cities and countries
+    print(f"\nTop 5 cities: {df['city'].value_counts().head().to_dict()}")
+    print(f"Top 5 countries: {df['country'].value_counts().head().to_dict()}")
+    
+    return df
+
+
+def bucket_experience_level(df, experience_column='Years of Experience'):
+    """
+    Convert Years of Experience to integer and bucket into Entry, Mid, and Senior levels.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        experience_column (str): Column name containing years of experience
+        
+    Returns:
+        pd.DataFrame: Dataframe with experience level buckets
+    """
+    df = df.copy()
+    
+    if experience_column not in df.columns:
+        print(f"Warning: {experience_column} column not found.")
+        return df
+    
+    # Convert to numeric, handling any non-numeric values
+    original_dtype = df[experience_column].dtype
+    df[experience_column] = pd.to_numeric(df[experience_column], errors='coerce')
+    
+    # Fill NaN values with 0 (assuming no experience if missing)
+    df[experience_column] = df[experience_column].fillna(0)
+    
+    # Convert to integer
+    df[experience_column] = df[experience_column].astype(int)
+    
+    # Create experience level buckets (Entry <= 2, Mid <= 5, Senior above)
+    df['experience_level'] = experience_levels(df[experience_column].to_numpy())
+    
+    # Generate statistics
+    print(f"Experience level processing results:")
+    print(f"  - Original data type: {original_dtype}")
+    print(f"  - Converted to integer successfully")
+    
+    experience_dist = df['experience_level'].value_counts()
+    experience_pct = df['experience_level'].value_counts(normalize=True) * 100
+    
+    print(f"\nExperience level distribution:")
+    for level in ['Entry', 'Mid', 'Senior']:
+        count = experience_dist.get(level, 0)
+        pct = experience_pct.get(level, 0)
+        print(f"  - {level}: {count:,} ({pct:.1f}%)")
+    
+    print(f"\nExperience years statistics:")
+    print(f"  - Min: {df[experience_column].min()} years")
+    print(f"  - Max: {df[experience_column].max()} years")
+    print(f"  - Mean: {df[experience_column].mean():.1f} years")
+    print(f"  - Median: {df[experience_column].median():.1f} years")
+    
+    return df
+
+
+# =====================================================
+# Task 2.3: Skills Processing and Normalization
+# =====================================================
+
+def parse_skills_list(skills_string):
+    """
+    Parse complex skill string formats (handle brackets, quotes, commas).
+    
+    Args:
+        skills_string (str): String representation of skills list
+        
+    Returns:
+        list: List of individual skills
+    """
+    if pd.isna(skills_string) or skills_string == '':
+        return []
+    
+    try:
+        # Try to parse as Python literal (list)
+        skills_list = ast.literal_eval(skills_string)
+        if isinstance(skills_list, list):
+            return [str(skill).strip() for skill in skills_list if skill]
+    except (ValueError, SyntaxError):
+        pass
+    
+    # Fallback: manual parsing
+    # Remove brackets and quotes
+    cleaned = re.sub(r'[\[\]"\']', '', str(skills_string))
+    # Split by comma and clean
+    skills_list = [skill.strip() for skill in cleaned.split(',') if skill.strip()]
+    
+    return skills_list
+
+
+def create_skills_mapping():
+    """
+    Create comprehensive synonym dictionary for skill standardization.
+    
+    Returns:
+        dict: Mapping of skill variations to standardized names
+    """
+    skills_mapping = {
+        # Programming Languages
+        'javascript': 'javascript',
+        'js': 'javascript',
+        'node.js': 'nodejs',
+        'node': 'nodejs',
+        'python': 'python',
+        'java': 'java',
+        'c++': 'cpp',
+        'c#': 'csharp',
+        'c': 'c',
+        'r': 'r',
+        'scala': 'scala',
+        'go': 'go',
+        'swift': 'swift',
+        'php': 'php',
+        'ruby': 'ruby',
+        
+        # Databases
+        'sql': 'sql',
+        't-sql': 'tsql',
+        'pl/sql': 'plsql',
+        'mysql': 'mysql',
+        'postgresql': 'postgresql',
+        'postgres': 'postgresql',
+        'oracle': 'oracle',
+        'mongodb': 'mongodb',
+        'mongo': 'mongodb',
+        'redis': 'redis',
+        'nosql': 'nosql',
+        'database': 'database',
+        
+        # Cloud & DevOps
+        'aws': 'aws',
+        'azure': 'azure',
+        'gcp': 'gcp',
+        'google cloud': 'gcp',
+        'cloud': 'cloud',
+        'docker': 'docker',
+        'kubernetes': 'kubernetes',
+        'devops': 'devops',
+        'ci/cd': 'cicd',
+        'jenkins': 'jenkins',
+        'git': 'git',
+        'github': 'github',
+        
+        # Data & Analytics
+        'data_lake': 'data_lake',
+        'data_lakes': 'data_lake',
+        'data lake': 'data_lake',
+        'etl': 'etl',
+        'spark': 'spark',
+        'pyspark': 'pyspark',
+        'hadoop': 'hadoop',
+        'tableau': 'tableau',
+        'power bi': 'powerbi',
+        'powerbi': 'powerbi',
+        'excel': 'excel',
+        'machine_learning': 'machine_learning',
+        'machine learning': 'machine_learning',
+        'ml': 'machine_learning',
+        'ai': 'artificial_intelligence',
+        'artificial intelligence': 'artificial_intelligence',
+        
+        # Web Technologies
+        'html': 'html',
+        'css': 'css',
+        'react': 'react',
+        'angular': 'angular',
+        'vue': 'vue',
+        'jquery': 'jquery',
+        'json': 'json',
+        'xml': 'xml',
+        'rest': 'rest_api',
+        'api': 'api',
+        
+        # Frameworks & Libraries
+        'asp.net': 'aspnet',
+        '.net': 'dotnet',
+        'spring': 'spring',
+        'django': 'django',
+        'flask': 'flask',
+        
+        # Systems & Infrastructure
+        'linux': 'linux',
+        'unix': 'unix',
+        'windows': 'windows',
+        'server': 'server',
+        'apache': 'apache',
+        'nginx': 'nginx',
+        
+        # Methodologies
+        'agile': 'agile',
+        'scrum': 'scrum',
+        'kanban': 'kanban',
+        'waterfall': 'waterfall',
+        
+        # General Skills
+        'programming': 'programming',
+        'coding': 'programming',
+        'development': 'development',
+        'testing': 'testing',
+        'debugging': 'debugging',
+        'troubleshooting': 'troubleshooting',
+        
+        # Business Intelligence
+        'bi': 'business_intelligence',
+        'business intelligence': 'business_intelligence',
+        'data analysis': 'data_analysis',
+        'data analytics': 'data_analysis',
+        'analytics': 'analytics',
+        
+        # Mobile
+        'ios': 'ios',
+        'android': 'android',
+        'mobile': 'mobile',
+        
+        # Other Technologies
+        'microsoft': 'microsoft',
+        'ibm': 'ibm',
+        'sap': 'sap',
+        'salesforce': 'salesforce',
+        'powershell': 'powershell',
+        'bash': 'bash',
+        'shell': 'shell',
+        'iot': 'iot',
+        'blockchain': 'blockchain',
+        'cybersecurity': 'cybersecurity',
+        'security': 'security',
+        'back-end': 'backend',
+        'backend': 'backend',
+        'front-end': 'frontend',
+        'frontend': 'frontend',
+        'full-stack': 'fullstack',
+        'fullstack': 'fullstack',
+        'warehousing': 'data_warehousing',
+        'data warehousing': 'data_warehousing',
+        'redshift': 'redshift',
+        'snowflake': 'snowflake',
+        'aurora': 'aurora'
+    }
+    
+    return skills_mapping
+
+
+def normalize_skills(skills_list, skills_mapping):
+    """
+    Normalize skills using the mapping dictionary.
+    
+    Args:
+        skills_list (list): List of raw skills
+        skills_mapping (dict): Mapping dictionary for normalization
+        
+    Returns:
+        list: List of normalized skills
+    """
+    normalized_skills = []
+    
+    for skill in skills_list:
+        if not skill:
+            continue
+            
+        # Clean the skill: lowercase, strip, remove special chars
+        cleaned_skill = str(skill).lower().strip()
+        cleaned_skill = re.sub(r'[^a-zA-Z0-9\s\-\+\./]', '', cleaned_skill)
+        cleaned_skill = re.sub(r'\s+', ' ', cleaned_skill).strip()
+        
+        if not cleaned_skill:
+            continue
+        
+        # Apply mapping if exists, otherwise use cleaned skill
+        normalized_skill = skills_mapping.get(cleaned_skill, cleaned_skill)
+        
+        if normalized_skill and normalized_skill not in normalized_skills:
+            normalized_skills.append(normalized_skill)
+    
+    return normalized_skills
+
+
+def categorize_skills(skill_name):
+    """
+    Categorize skills as technical or soft skills.
+    
+    Args:
+        skill_name (str): Normalized skill name
+        
+    Returns:
+        str: 'technical' or 'soft'
+    """
+    technical_skills = {
+        'javascript', 'nodejs', 'python', 'java', 'cpp', 'csharp', 'c', 'r', 'scala', 'go', 'swift', 'php', 'ruby',
+        'sql', 'tsql', 'plsql', 'mysql', 'postgresql', 'oracle', 'mongodb', 'redis', 'nosql', 'database',
+        'aws', 'azure', 'gcp', 'cloud', 'docker', 'kubernetes', 'devops', 'cicd', 'jenkins', 'git', 'github',
+        'data_lake', 'etl', 'spark', 'pyspark', 'hadoop', 'tableau', 'powerbi', 'machine_learning', 'artificial_intelligence',
+        'html', 'css', 'react', 'angular', 'vue', 'jquery', 'json', 'xml', 'rest_api', 'api',
+        'aspnet', 'dotnet', 'spring', 'django', 'flask',
+        'linux', 'unix', 'windows', 'server', 'apache', 'nginx',
+        'programming', 'development', 'testing', 'debugging', 'troubleshooting',
+        'business_intelligence', 'data_analysis', 'analytics',
+        'ios', 'android', 'mobile',
+        'microsoft', 'ibm', 'sap', 'salesforce', 'powershell', 'bash', 'shell',
+        'iot', 'blockchain', 'cybersecurity', 'security', 'backend', 'frontend', 'fullstack',
+        'data_warehousing', 'redshift', 'snowflake', 'aurora'
+    }
+    
+    soft_skills = {
+        'agile', 'scrum', 'kanban', 'waterfall', 'excel', 'communication', 'leadership', 'teamwork',
+        'project management', 'problem solving', 'critical thinking', 'time management'
+    }
+    
+    if skill_name.lower() in technical_skills:
+        return 'technical'
+    elif skill_name.lower() in soft_skills:
+        return 'soft'
+    else:
+        # Default to technical for unknown skills
+        return 'technical'
+
+
+def process_all_skills(df, skills_column='Job Skills'):
+    """
+    Process all skills in the dataset and create skills mapping tables.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        skills_column (str): Column name containing skills data
+        
+    Returns:
+        tuple: (processed_df, skills_df, job_skills_df)
+    """
+    print(f"Processing skills from {skills_column} column...")
+    
+    # Create skills mapping
+    skills_mapping = create_skills_mapping()
+    print(f"Created skills mapping with {len(skills_mapping)} entries")
+    
+    # Process each job's skills
+    all_skills = set()
+    job_skills_data = []
+    parsing_stats = {'total_jobs': 0, 'jobs_with_skills': 0, 'total_skills_parsed': 0, 'parsing_errors': 0}
+    
+    for idx, skills_string in df[skills_column].items():
+        parsing_stats['total_jobs'] += 1
+        
+        try:
+            # Parse skills list
+            raw_skills = parse_skills_list(skills_string)
+            
+            if raw_skills:
+                parsing_stats['jobs_with_skills'] += 1
+                
+                # Normalize skills
+                normalized_skills = normalize_skills(raw_skills, skills_mapping)
+                parsing_stats['total_skills_parsed'] += len(normalized_skills)
+                
+                # Add to all skills set
+                all_skills.update(normalized_skills)
+                
+                # Create job-skills mapping entries
+                job_id = df.at[idx, 'Job Posting ID']
+                for skill in normalized_skills:
+                    job_skills_data.append({'job_id': job_id, 'skill_name': skill})
+        
+        except Exception as e:
+            parsing_stats['parsing_errors'] += 1
+            if parsing_stats['parsing_errors'] <= 5:  # Show first 5 errors
+                print(f"Error parsing skills for job {idx}: {e}")
+    
+    # Create skills DataFrame with IDs and categories
+    skills_data = []
+    for skill_id, skill_name in enumerate(sorted(all_skills), 1):
+        category = categorize_skills(skill_name)
+        skills_data.append({
+            'skill_id': skill_id,
+            'skill_name': skill_name,
+            'skill_category': category
+        })
+    
+    skills_df = pd.DataFrame(skills_data)
+    
+    # Create job-skills mapping DataFrame with skill IDs
+    skill_name_to_id = dict(zip(skills_df['skill_name'], skills_df['skill_id']))
+    
+    for entry in job_skills_data:
+        entry['skill_id'] = skill_name_to_id[entry['skill_name']]
+    
+    job_skills_df = pd.DataFrame(job_skills_data)[['job_id', 'skill_id']]
+    
+    # Print processing statistics
+    print(f"\nSkills processing results:")
+    print(f"  - Total jobs processed: {parsing_stats['total_jobs']:,}")
+    print(f"  - Jobs with skills: {parsing_stats['jobs_with_skills']:,} ({parsing_stats['jobs_with_skills']/parsing_stats['total_jobs']*100:.1f}%)")
+    print(f"  - Total skills parsed: {parsing_stats['total_skills_parsed']:,}")
+    print(f"  - Unique skills identified: {len(all_skills):,}")
+    print(f"  - Parsing errors: {parsing_stats['parsing_errors']:,}")
+    
+    # Show skill categories
+    category_counts = skills_df['skill_category'].value_counts()
+    print(f"\nSkill categories:")
+    for category, count in category_counts.items():
+        print(f"  - {category.title()}: {count:,} skills")
+    
+    # Show top skills
+    skill_frequency = job_skills_df['skill_id'].value_counts()
+    top_skills = skills_df[skills_df['skill_id'].isin(skill_frequency.head(10).index)]
+    top_skills = top_skills.merge(skill_frequency.reset_index(), left_on='skill_id', right_on='skill_id')
+    top_skills = top_skills.sort_values('count', ascending=False)
+    
+    print(f"\nTop 10 most common skills:")
+    for _, row in top_skills.head(10).iterrows():
+        print(f"  - {row['skill_name']}: {row['count']:,} jobs ({row['skill_category']})")
+    
+    return df, skills_df, job_skills_df
+
+
+# =====================================================
+# Task 2.4: Salary Data Cleaning and File Export
+# =====================================================
+
+def clean_salary_data(df, min_pay_col='Minimum Pay', max_pay_col='Maximum Pay', pay_rate_col='Pay Rate',
+                      currency_col='Currency'):
+    """
+    Handle various salary formats and currencies, implement numeric conversion with error handling.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        min_pay_col (str): Column name for minimum pay
+        max_pay_col (str): Column name for maximum pay
+        pay_rate_col (str): Column name for pay rate
+        currency_col (str): Column name for the posted currency (optional)
+        
+    Returns:
+        pd.DataFrame: Dataframe with cleaned salary data
+    """
+    df = df.copy()
+    
+    print(f"Cleaning salary data...")
+    
+    # Check initial salary data availability
+    initial_min_pay_count = df[min_pay_col].notna().sum()
+    initial_max_pay_count = df[max_pay_col].notna().sum()
+    initial_pay_rate_count = df[pay_rate_col].notna().sum()
+    
+    print(f"Initial salary data availability:")
+    print(f"  - {min_pay_col}: {initial_min_pay_count:,} records ({initial_min_pay_count/len(df)*100:.1f}%)")
+    print(f"  - {max_pay_col}: {initial_max_pay_count:,} records ({initial_max_pay_count/len(df)*100:.1f}%)")
+    print(f"  - {pay_rate_col}: {initial_pay_rate_count:,} records ({initial_pay_rate_count/len(df)*100:.1f}%)")
+    
+    # Clean and standardize pay rate
+    if pay_rate_col in df.columns:
+        # Lowercase and map common pay rate formats (cleaning_kernels.PAY_RATE_MAPPING), once per distinct value
+        df[pay_rate_col] = normalize_pay_rates(df[pay_rate_col])
+    
+    # Ensure salary columns are numeric
+    for col in [min_pay_col, max_pay_col]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Create standardized salary columns (convert all to yearly)
+    df['salary_min'] = df[min_pay_col].copy()
+    df['salary_max'] = df[max_pay_col].copy()
+    
+    # Convert hourly to yearly (assuming 40 hours/week, 52 weeks/year)
+    hourly_mask = df[pay_rate_col] == 'hourly'
+    if hourly_mask.any():
+        df.loc[hourly_mask, 'salary_min'] = df.loc[hourly_mask, 'salary_min'] * 40 * 52
+        df.loc[hourly_mask, 'salary_max'] = df.loc[hourly_mask, 'salary_max'] * 40 * 52
+        print(f"Converted {hourly_mask.sum():,} hourly salaries to yearly")
+    
+    # Convert monthly to yearly
+    monthly_mask = df[pay_rate_col] == 'monthly'
+    if monthly_mask.any():
+        df.loc[monthly_mask, 'salary_min'] = df.loc[monthly_mask, 'salary_min'] * 12
+        df.loc[monthly_mask, 'salary_max'] = df.loc[monthly_mask, 'salary_max'] * 12
+        print(f"Converted {monthly_mask.sum():,} monthly salaries to yearly")
+    
+    # Keep the posted currency as an ISO code so normalize_salaries converts it;
+    # postings without one (the Wuzzuf export has no currency column) are USD
+    if currency_col in df.columns:
+        df['currency'] = normalize_currency(df[currency_col])
+    else:
+        df['currency'] = normalize_currency(pd.Series(pd.NA, index=df.index, dtype='object'))
+    if (df['currency'] != 'USD').any():
+        print(f"Posted currencies: {', '.join(f'{c} ({n:,})' for c, n in df['currency'].value_counts().items())}")
+    
+    # Generate salary statistics
+    valid_salary_mask = df['salary_min'].notna() & df['salary_max'].notna()
+    valid_salary_count = valid_salary_mask.sum()
+    
+    print(f"\nSalary cleaning results:")
+    print(f"  - Records with valid salary data: {valid_salary_count:,} ({valid_salary_count/len(df)*100:.1f}%)")
+    
+    if valid_salary_count > 0:
+        print(f"  - Salary range (min): ${df['salary_min'].min():,.0f} - ${df['salary_min'].max():,.0f}")
+        print(f"  - Salary range (max): ${df['salary_max'].min():,.0f} - ${df['salary_max'].max():,.0f}")
+        print(f"  - Average minimum salary: ${df['salary_min'].mean():,.0f}")
+        print(f"  - Average maximum salary: ${df['salary_max'].mean():,.0f}")
+        
+        # Pay rate distribution
+        if pay_rate_col in df.columns:
+            pay_rate_dist = df[df['salary_min'].notna()][pay_rate_col].value_counts()
+            print(f"\nPay rate distribution (for records with salary):")
+            for rate, count in pay_rate_dist.items():
+                print(f"  - {rate}: {count:,} records")
+    
+    return df
+
+
+def export_final_datasets(df, skills_df, job_skills_df, output_dir='../data/processed'):
+    """
+    Create data export pipeline with proper CSV formatting and generate validation report.
+    
+    Args:
+        df (pd.DataFrame): Main jobs dataframe
+        skills_df (pd.DataFrame): Skills dataframe
+        job_skills_df (pd.DataFrame): Job-skills mapping dataframe
+        output_dir (str): Directory the final CSV files are written to
+    """
+    print(f"Exporting final datasets...")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Prepare the main jobs dataset
+    jobs_df = df.copy()
+    
+    # Select and rename columns for final jobs dataset
+    jobs_columns = {
+        'Job Posting ID': 'job_id',
+        'Job Posting Date': 'posting_date',
+        'Job Title': 'job_title',
+        'Job Title Full': 'job_title_full',
+        'Job Title Additional Info': 'job_title_additional',
+        'Job Position Type': 'position_type',
+        'Job Position Level': 'position_level',
+        'Years of Experience': 'years_experience',
+        'experience_level': 'experience_level',
+        'city': 'city',
+        'country': 'country',
+        'salary_min': 'salary_min',
+        'salary_max': 'salary_max',
+        'salary_min_usd': 'salary_min_usd',
+        'salary_max_usd': 'salary_max_usd',
+        'salary_outlier': 'salary_outlier',
+        'Pay Rate': 'pay_rate',
+        'currency': 'currency',
+        'Number of Applicants': 'applicants',
+        'Company Name': 'company_name',
+        'Company Industry': 'company_industry',
+        'Company Size': 'company_size',
+        'posting_year': 'posting_year',
+        'posting_month': 'posting_month',
+        'canonical_job_id': 'canonical_job_id',
+        'role_id': 'role_id'
+    }
+    
+    # Select available columns and rename
+    available_columns = {k: v for k, v in jobs_columns.items() if k in jobs_df.columns}
+    jobs_final = jobs_df[list(available_columns.keys())].rename(columns=available_columns)
+    
+    # Export datasets
+    print(f"\nExporting datasets:")
+    
+    # 1. Main jobs dataset
+    jobs_final.to_csv(output_dir / 'jobs.csv', index=False)
+    print(f"  - jobs.csv: {jobs_final.shape[0]:,} rows, {jobs_final.shape[1]} columns")
+    
+    # 2. Skills dataset (already created in Task 2.3)
+    skills_df.to_csv(output_dir / 'skills.csv', index=False)
+    print(f"  - skills.csv: {skills_df.shape[0]:,} rows, {skills_df.shape[1]} columns")
+    
+    # 3. Job-skills mapping (already created in Task 2.3)
+    job_skills_df.to_csv(output_dir / 'job_skills.csv', index=False)
+    print(f"  - job_skills.csv: {job_skills_df.shape[0]:,} rows, {job_skills_df.shape[1]} columns")
+    
+    # Generate data export validation report
+    print(f"\n" + "="*50)
+    print("DATA EXPORT VALIDATION REPORT")
+    print("="*50)
+    
+    print(f"\n1. JOBS DATASET (jobs.csv)")
+    print(f"   - Total records: {jobs_final.shape[0]:,}")
+    print(f"   - Total columns: {jobs_final.shape[1]}")
+    print(f"   - Unique job IDs: {jobs_final['job_id'].nunique():,}")
+    print(f"   - Date range: {jobs_final['posting_date'].min()} to {jobs_final['posting_date'].max()}")
+    print(f"   - Records with salary data: {jobs_final['salary_min'].notna().sum():,} ({jobs_final['salary_min'].notna().sum()/len(jobs_final)*100:.1f}%)")
+    print(f"   - Unique companies: {jobs_final['company_name'].nunique():,}")
+    print(f"   - Unique job titles: {jobs_final['job_title'].nunique():,}")
+    
+    print(f"\n2. SKILLS DATASET (skills.csv)")
+    print(f"   - Total skills: {skills_df.shape[0]:,}")
+    print(f"   - Technical skills: {(skills_df['skill_category'] == 'technical').sum():,}")
+    print(f"   - Soft skills: {(skills_df['skill_category'] == 'soft').sum():,}")
+    
+    print(f"\n3. JOB-SKILLS MAPPING (job_skills.csv)")
+    print(f"   - Total mappings: {job_skills_df.shape[0]:,}")
+    print(f"   - Unique jobs with skills: {job_skills_df['job_id'].nunique():,}")
+    print(f"   - Average skills per job: {job_skills_df.shape[0] / job_skills_df['job_id'].nunique():.1f}")
+    
+    print(f"\n4. DATA QUALITY SUMMARY")
+    print(f"   - Data completeness: High (minimal missing critical data)")
+    print(f"   - Data consistency: Standardized text, normalized skills, consistent formats")
+    print(f"   - Data relationships: Proper foreign key relationships maintained")
+    print(f"   - Ready for database import: Yes")
+    print(f"   - Ready for analysis: Yes")
+    
+    return jobs_final, skills_df, job_skills_df
+
+
+# =====================================================
+# Complete pipeline
+# =====================================================
+
+def run_cleaning_pipeline(raw_path=DEFAULT_RAW_PATH, output_dir=DEFAULT_OUTPUT_DIR, quiet=False, title_skills=True):
+    """
+    Run the full cleaning pipeline from the raw Wuzzuf CSV to jobs/skills/job_skills.csv
+    (plus the roles.csv dimension from title_clustering)
+
+    Same steps, in the same order, as notebooks/01_data_cleaning.ipynb, without
+    the intermediate task_2_x_cleaned.csv round trips.
+
+    Args:
+        raw_path (str): Path to the raw Wuzzuf CSV
+        output_dir (str): Directory for the final CSV files
+        quiet (bool): Suppress the per-step progress output
+        title_skills (bool): Add skills mentioned in the job titles to job_skills (skill_extraction)
+
+    Returns:
+        tuple: (jobs_df, skills_df, job_skills_df)
+    """
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with output:
+        df = load_csv(raw_path)
+        if df is None:
+            raise ValueError(f"Could not load raw data from {raw_path}")
+        df = remove_unnecessary_columns(df)
+        df = remove_duplicates(df)
+        df = parse_dates(df)
+        df = standardize_text(df)
+        df = clean_location_data(df)
+        df = bucket_experience_level(df)
+        df, skills_df, job_skills_df = process_all_skills(df)
+        df = clean_salary_data(df)
+        df = flag_salary_outliers(normalize_salaries(df, pay_rate_col='Pay Rate'))
+        df = mark_near_duplicates(df, job_skills_df, fields=RAW_FIELDS)
+        df, roles_df = mark_roles(df, title_column='Job Title')
+        if title_skills:
+            job_skills_df = add_title_skills(df, skills_df, job_skills_df)
+        result = export_final_datasets(df, skills_df, job_skills_df, output_dir)
+        export_roles(roles_df, output_dir)
+        return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Clean the raw Wuzzuf CSV into jobs/skills/job_skills/roles.csv')
+    parser.add_argument('--no-title-skills', dest='title_skills', action='store_false',
+                        help='Keep only the tagged Job Skills (skip skills mentioned in job titles)')
+    run_cleaning_pipeline(title_skills=parser.parse_args().title_skills)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate posting detection for Wuzzuf Job Market Analysis
+MinHash signatures over (normalized title, company, city, skill set), banded
+locality-sensitive hashing and a posting-date window find jobs reposted under
+a new id in near-linear time; each cluster gets one canonical posting id
+
+Usage:
+    python pipeline/duplicate_detection.py data/processed            # add canonical_job_id to jobs.csv
+    python pipeline/duplicate_detection.py data/processed --threshold 0.8 --window-days 14 --dry-run
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Column roles in the cleaned jobs.csv layout
+DEFAULT_FIELDS = {
+    'id': 'job_id',
+    'title': 'job_title',
+    'company': 'company_name',
+    'city': 'city',
+    'date': 'posting_date',
+}
+
+# The same roles in the raw-named frame inside run_cleaning_pipeline
+RAW_FIELDS = {
+    'id': 'Job Posting ID',
+    'title': 'Job Title',
+    'company': 'Company Name',
+    'city': 'city',
+    'date': 'Job Posting Date',
+}
+
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.7
+WINDOW_DAYS = 30
+
+# Later bucket members (by posting date) each job is compared with, per band;
+# bounds the work on a degenerate bucket while components still connect it
+MAX_BUCKET_NEIGHBOURS = 100
+
+_EMPTY = np.uint64(0xFFFFFFFFFFFFFFFF)
+_TOKEN = re.compile(r'[a-z0-9+#]+')
+
+
+def _feature_tokens(df, fields, job_skills_df=None):
+    """
+    Feature set of every job as CSR arrays
+
+    Title words plus tagged company, city and skill tokens, so two postings
+    only look alike when they share most of all four.
+
+    Returns:
+        tuple: (indptr, uint64 token hashes)
+    """
+    ids = df[fields['id']].to_numpy()
+    # Title words, tokenized once per distinct title
+    codes, titles = pd.factorize(df[fields['title']].fillna('').astype(str).str.lower())
+    words = [[f"t:{w}" for w in sorted(set(_TOKEN.findall(title)))] for title in titles]
+    lengths = np.array([len(w) for w in words], dtype=np.int64)
+    flat = np.array([w for ws in words for w in ws], dtype=object)
+    starts = np.r_[0, np.cumsum(lengths)][codes]
+    per_row = lengths[codes]
+    offsets = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+    parts = [pd.DataFrame({'row': np.repeat(np.arange(len(df)), per_row),
+                           'token': flat[np.repeat(starts, per_row) + offsets]})]
+    for role, prefix in (('company', 'co'), ('city', 'ci')):
+        values = df[fields[role]].fillna('').astype(str).str.lower().str.strip()
+        parts.append(pd.DataFrame({'row': np.arange(len(df)), 'token': prefix + ':' + values}))
+    if job_skills_df is not None and len(job_skills_df):
+        rows = pd.Series(np.arange(len(df)), index=ids)
+        bridge = job_skills_df[job_skills_df['job_id'].isin(rows.index)]
+        parts.append(pd.DataFrame({'row': rows.loc[bridge['job_id']].to_numpy(),
+                                   'token': 'sk:' + bridge['skill_id'].astype(str).to_numpy()}))
+
+    tokens = pd.concat(parts, ignore_index=True)
+    tokens = tokens.sort_values('row', kind='stable')
+    hashes = pd.util.hash_array(tokens['token'].to_numpy(dtype=object))
+    counts = np.bincount(tokens['row'].to_numpy(), minlength=len(df))
+    indptr = np.r_[0, np.cumsum(counts)]
+    return indptr, hashes
+
+
+def _mix64(x):
+    """splitmix64 finalizer: a bijective, well-mixed 64-bit hash (uint64 arithmetic wraps)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def minhash_signatures(indptr, hashes, num_perm=NUM_PERM, seed=42):
+    """
+    MinHash signature per CSR row: for each of num_perm independently seeded
+    64-bit hash functions (token hash XOR a random seed, then mixed), the
+    minimum over the row's tokens
+
+    Returns:
+        np.ndarray: (rows x num_perm) uint64 signatures
+    """
+    rng = np.random.default_rng(seed)
+    seeds = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    starts = indptr[:-1]
+    empty = indptr[1:] == starts
+    signatures = np.empty((len(starts), num_perm), dtype=np.uint64)
+    for i in range(num_perm):
+        permuted = _mix64(hashes ^ seeds[i])
+        signatures[:, i] = np.minimum.reduceat(np.r_[permuted, _EMPTY], np.minimum(starts, len(permuted)))
+    signatures[empty] = _EMPTY
+    return signatures
+
+
+def candidate_pairs(signatures, dates, bands=BANDS, window_days=WINDOW_DAYS,
+                    max_neighbours=MAX_BUCKET_NEIGHBOURS):
+    """
+    Candidate duplicate pairs from banded LSH
+
+    Rows whose signatures agree on every row of at least one band share a
+    bucket. Within a bucket, members are ordered by posting date and every
+    pair inside the date window is a candidate (up to max_neighbours later
+    members per job), so each pair's similarity is checked directly.
+
+    Returns:
+        np.ndarray: (pairs x 2) row positions
+    """
+    n, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    day = dates.astype('datetime64[D]').astype(np.int64)
+    pairs = []
+    for band in range(bands):
+        block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        keys = pd.util.hash_pandas_object(pd.DataFrame(block), index=False).to_numpy()
+        order = np.lexsort((day, keys))
+        sorted_keys, sorted_days = keys[order], day[order]
+        # Members k places apart: while one pair of a job leaves its bucket or window, later ones do too
+        active = np.arange(n - 1)
+        for k in range(1, max_neighbours + 1):
+            active = active[active + k < n]
+            linked = ((sorted_keys[active + k] == sorted_keys[active]) &
+                      (sorted_days[active + k] - sorted_days[active] <= window_days))
+            active = active[linked]
+            if not len(active):
+                break
+            pairs.append(np.column_stack([order[active], order[active + k]]))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.vstack(pairs), axis=1).astype(np.int64)
+    # Deduplicate pairs found in several bands through a single int64 key
+    keys = np.unique(pairs[:, 0] * n + pairs[:, 1])
+    return np.column_stack([keys // n, keys % n])
+
+
+def estimated_similarity(signatures, left, right):
+    """Estimated Jaccard similarity (share of equal signature entries) of row pairs"""
+    if not len(left):
+        return np.empty(0)
+    return (signatures[left] == signatures[right]).mean(axis=1)
+
+
+def connected_components(n, pairs):
+    """Component label (smallest member) per node, by min-label propagation with pointer jumping"""
+    labels = np.arange(n)
+    if len(pairs) == 0:
+        return labels
+    u, v = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[u], labels[v])
+        before = labels.copy()
+        np.minimum.at(labels, labels[u], low)
+        np.minimum.at(labels, labels[v], low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, before):
+            return labels
+
+
+def star_clusters(labels, day, ids, signatures, threshold=THRESHOLD, window_days=WINDOW_DAYS):
+    """
+    Split components into clusters around their earliest posting
+
+    Components of similar pairs can chain far apart postings (A ~ B ~ C with
+    A and C unrelated, or reposts drifting past the date window). Within each
+    component, the earliest unassigned posting (lowest id on ties) becomes a
+    center and takes every unassigned member that is similar to it and posted
+    within window_days of it; the rest start the next round.
+
+    Returns:
+        np.ndarray: Row of each job's cluster center (itself for singletons)
+    """
+    center = np.arange(len(labels))
+    multi = np.bincount(labels, minlength=len(labels))[labels] > 1
+    order = np.flatnonzero(multi)
+    unassigned = order[np.lexsort((ids[order], day[order], labels[order]))]
+    while len(unassigned):
+        component = labels[unassigned]
+        first = np.r_[True, component[1:] != component[:-1]]
+        starts = np.flatnonzero(first)
+        head = np.repeat(unassigned[starts], np.diff(np.r_[starts, len(unassigned)]))
+        joins = ((estimated_similarity(signatures, unassigned, head) >= threshold) &
+                 (day[unassigned] - day[head] <= window_days)) | first
+        center[unassigned[joins]] = head[joins]
+        unassigned = unassigned[~joins]
+    return center
+
+
+def find_near_duplicates(df, job_skills_df=None, fields=None, threshold=THRESHOLD,
+                         window_days=WINDOW_DAYS, num_perm=NUM_PERM, bands=BANDS):
+    """
+    Canonical posting id for every job
+
+    Candidate pairs from LSH are kept when their estimated Jaccard similarity
+    (share of equal signature entries) reaches the threshold. The connected
+    components of the kept pairs are then split by star_clusters, so every
+    posting in a cluster is similar to, and within the date window of, the
+    cluster's earliest posting (lowest id on ties), which is its canonical id.
+
+    Args:
+        df (pd.DataFrame): Jobs
+        job_skills_df (pd.DataFrame): job_id / skill_id bridge (optional)
+        fields (dict): Column per role (default: DEFAULT_FIELDS)
+        threshold (float): Minimum estimated Jaccard similarity
+        window_days (int): Maximum days between a repost and its canonical posting
+        num_perm (int): MinHash functions (a multiple of bands)
+        bands (int): LSH bands
+
+    Returns:
+        tuple: (pd.Series of canonical ids aligned with df, stats dict)
+    """
+    fields = {**DEFAULT_FIELDS, **(fields or {})}
+    ids = df[fields['id']].to_numpy()
+    dates = pd.to_datetime(df[fields['date']], errors='coerce')
+    dates = dates.fillna(dates.min() if dates.notna().any() else pd.Timestamp(0)).to_numpy()
+    day = dates.astype('datetime64[D]').astype(np.int64)
+
+    indptr, hashes = _feature_tokens(df, fields, job_skills_df)
+    signatures = minhash_signatures(indptr, hashes, num_perm)
+    pairs = candidate_pairs(signatures, dates, bands, window_days)
+    similarity = estimated_similarity(signatures, pairs[:, 0], pairs[:, 1])
+    kept = pairs[similarity >= threshold]
+    labels = connected_components(len(df), kept)
+    center = star_clusters(labels, day, ids, signatures, threshold, window_days)
+    canonical = pd.Series(ids[center], index=df.index, name='canonical_job_id')
+
+    reposts = center != np.arange(len(df))
+    stats = {'candidate_pairs': int(len(pairs)), 'duplicate_pairs': int(len(kept)),
+             'duplicates': int(reposts.sum()), 'clusters': int(len(np.unique(center[reposts])))}
+    return canonical, stats
+
+
+def mark_near_duplicates(df, job_skills_df=None, fields=None, **kwargs):
+    """
+    Add a canonical_job_id column (equal to the job's own id unless it is a repost)
+
+    Args:
+        df (pd.DataFrame): Jobs
+        job_skills_df (pd.DataFrame): job_id / skill_id bridge (optional)
+        fields (dict): Column per role (default: DEFAULT_FIELDS)
+        **kwargs: threshold, window_days, num_perm, bands
+
+    Returns:
+        pd.DataFrame: Copy of df with canonical_job_id
+    """
+    df = df.copy()
+    df['canonical_job_id'], stats = find_near_duplicates(df, job_skills_df, fields, **kwargs)
+    print(f"Near-duplicate postings: {stats['duplicates']:,} reposts in {stats['clusters']:,} clusters "
+          f"({stats['candidate_pairs']:,} LSH candidate pairs checked)")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find reposted jobs and add canonical_job_id to jobs.csv')
+    parser.add_argument('data_dir', nargs='?', default='data/processed',
+                        help='Directory with jobs.csv and job_skills.csv')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='Minimum estimated Jaccard similarity')
+    parser.add_argument('--window-days', type=int, default=WINDOW_DAYS, help='Maximum days between reposts')
+    parser.add_argument('--dry-run', action='store_true', help='Report without writing')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    jobs = pd.read_csv(data_dir / 'jobs.csv')
+    job_skills = pd.read_csv(data_dir / 'job_skills.csv')
+    jobs = mark_near_duplicates(jobs.drop(columns=['canonical_job_id'], errors='ignore'), job_skills,
+                                threshold=args.threshold, window_days=args.window_days)
+    if args.dry_run:
+        return 0
+    tmp = data_dir / 'jobs.csv.tmp'
+    jobs.to_csv(tmp, index=False)
+    tmp.replace(data_dir / 'jobs.csv')
+    print(f"✅ Updated {data_dir / 'jobs.csv'}: {jobs['canonical_job_id'].nunique():,} distinct postings "
+          f"of {len(jobs):,} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Lazy module imports for Wuzzuf Job Market Analysis entry points
+Heavy libraries (pandas, matplotlib, SQLAlchemy, psycopg2, ...) are imported on
+first attribute access, so scripts only pay for what a run actually uses
+"""
+
+import importlib
+import sys
+from typing import Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported the first time one of its
+    attributes is used
+
+    Example:
+        pd = lazy_import('pandas')
+        ...
+        df = pd.read_csv(path)   # pandas is imported here
+    """
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name: str):
+    """
+    Module `name` if it is already imported, otherwise a LazyModule for it
+
+    Missing packages raise ImportError at first use rather than at import time.
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def is_loaded(module) -> bool:
+    """True when a lazy_import() result has been imported"""
+    return not isinstance(module, LazyModule) or module.__dict__['_module'] is not None
+
+
+def require(module, feature: str, package: Optional[str] = None):
+    """
+    Import a lazy_import() result now, turning a missing package into an
+    ImportError that says what needs it and how to install it
+
+    Args:
+        module: lazy_import() result
+        feature: What needs the package (e.g. 'Parquet export')
+        package: pip package name (default: the module's top-level name)
+
+    Returns:
+        The imported module
+    """
+    if not isinstance(module, LazyModule):
+        return module
+    name = module.__dict__['_name']
+    try:
+        return module._load()
+    except ImportError as e:
+        package = package or name.split('.')[0]
+        raise ImportError(f"{feature} needs the '{package}' package, which is not installed. "
+                          f"Install it with: pip install {package} (or pip install -r requirements.txt)") from e
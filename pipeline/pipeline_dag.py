@@ -0,0 +1,423 @@
+"""
+Cached, resumable pipeline DAG for Wuzzuf Job Market Analysis
+Stages declare their input and output files; a stage only re-runs when the
+content hashes of its inputs (including its own code) or of its upstream
+stages changed, and independent stages can run in parallel
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from skills_bridge import file_sha256
+
+ROOT = Path(__file__).resolve().parent.parent
+STATE_DIR = ROOT / '.wuzzuf'
+STATE_FILE = 'pipeline_state.json'
+LOG_DIRNAME = 'logs'
+
+PROCESSED = 'data/processed'
+CLEANED_FILES = [f'{PROCESSED}/jobs.csv', f'{PROCESSED}/skills.csv', f'{PROCESSED}/job_skills.csv',
+                 f'{PROCESSED}/roles.csv']
+POWERBI_TABLES = [
+    f'{PROCESSED}/jobs_powerbi.csv', f'{PROCESSED}/skills_powerbi.csv', f'{PROCESSED}/job_skills_powerbi.csv',
+    f'{PROCESSED}/skills_summary_powerbi.csv', f'{PROCESSED}/monthly_trends_powerbi.csv',
+    f'{PROCESSED}/experience_summary_powerbi.csv', f'{PROCESSED}/location_summary_powerbi.csv',
+    f'{PROCESSED}/industry_summary_powerbi.csv'
+]
+
+
+class Stage:
+    """
+    One pipeline step run as a subprocess from the repository root
+
+    Args:
+        name: Stage name used on the command line
+        command: Arguments after the Python interpreter (script path and options)
+        inputs: Files the stage reads, including its code (repo-relative)
+        outputs: Files the stage writes (repo-relative)
+        after: Stages that must run first without a file between them
+               (e.g. everything that reads the database depends on its load)
+        description: One-line description for `wuzzuf list`
+    """
+
+    def __init__(self, name: str, command: List[str], inputs: Iterable[str] = (),
+                 outputs: Iterable[str] = (), after: Iterable[str] = (), description: str = ''):
+        self.name = name
+        self.command = list(command)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.description = description
+        self.deps: List[str] = []
+
+    def argv(self) -> List[str]:
+        return [sys.executable] + self.command
+
+
+def default_stages() -> List[Stage]:
+    """The project's pipeline, in the order the notebooks and scripts were run by hand"""
+    return [
+        Stage('clean',
+              ['pipeline/data_cleaning.py'],
+              inputs=['data/raw/Wuzzuf-Jobs-Posting.csv', 'pipeline/data_cleaning.py',
+                      'pipeline/cleaning_kernels.py', 'pipeline/salary_normalization.py',
+                      'pipeline/duplicate_detection.py', 'pipeline/title_clustering.py',
+                      'pipeline/skill_extraction.py', 'data/reference/currency_rates.csv'],
+              outputs=CLEANED_FILES,
+              description='Raw Wuzzuf CSV -> jobs/skills/job_skills/roles.csv (01_data_cleaning)'),
+        Stage('load_database',
+              ['sql/load_database.py'],
+              inputs=CLEANED_FILES + ['sql/load_database.py', 'sql/database_setup.py', 'sql/schema.sql'],
+              description='Recreate the schema and load PostgreSQL (02_database_insertion)'),
+        Stage('powerbi_export',
+              ['powerbi_optimization.py'],
+              inputs=CLEANED_FILES + ['powerbi_optimization.py', 'powerbi/data_optimization.py',
+                                      'powerbi/export_writer.py', 'powerbi/partitioned_export.py',
+                                      'powerbi/db_export.py', 'pipeline/quantile_sketch.py'],
+              outputs=POWERBI_TABLES + [f'{PROCESSED}/salary_sketches.csv', f'{PROCESSED}/role_summary_powerbi.csv',
+                                        f'{PROCESSED}/powerbi_partitions/partitions.json',
+                                        'powerbi/data_model_documentation.md',
+                                        'powerbi/import_validation_checklist.md'],
+              description='Power BI tables, summaries, partitions and docs'),
+        Stage('validate_powerbi',
+              ['powerbi/validate_powerbi_data.py'],
+              inputs=POWERBI_TABLES + ['powerbi/validate_powerbi_data.py'],
+              outputs=['powerbi/import_summary.md'],
+              description='Validate the Power BI bundle and write the import summary'),
+        Stage('time_trends',
+              ['execute_time_trends.py'],
+              inputs=['execute_time_trends.py', 'analysis/trend_engine.py'],
+              outputs=['assets/charts/time_trends.png'],
+              after=['load_database'],
+              description='Time trends analysis and chart from the database'),
+    ]
+
+
+class PipelineDAG:
+    """
+    Dependency graph, cache state and scheduler for a list of stages
+
+    The state file records, per stage, the fingerprint it last succeeded with
+    and the hashes of its outputs. A stage is current when its fingerprint
+    (command + input hashes + upstream fingerprints) is unchanged and its
+    outputs still hash to the recorded values. Failed stages are recorded as
+    failed, so the next run resumes from them.
+    """
+
+    def __init__(self, stages: Optional[List[Stage]] = None, root=ROOT, state_dir=None):
+        self.root = Path(root)
+        self.state_dir = Path(state_dir) if state_dir else self.root / STATE_DIR.name
+        self.state_path = self.state_dir / STATE_FILE
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages if stages is not None else default_stages():
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        self._link()
+        self.state = self._load_state()
+
+    # ------------------------------------------------------------------
+    # Graph
+    # ------------------------------------------------------------------
+    def _link(self):
+        producers = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f"{output} is produced by both {producers[output]} and {stage.name}")
+                producers[output] = stage.name
+        for stage in self.stages.values():
+            deps = [producers[i] for i in stage.inputs if i in producers and producers[i] != stage.name]
+            for name in stage.after:
+                if name not in self.stages:
+                    raise ValueError(f"{stage.name} runs after unknown stage {name}")
+                deps.append(name)
+            stage.deps = list(dict.fromkeys(deps))
+        self.order = self._toposort()
+
+    def _toposort(self) -> List[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage {name}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def select(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """Targets plus everything upstream of them, in run order (default: all stages)"""
+        if not targets:
+            return list(self.order)
+        unknown = [t for t in targets if t not in self.stages]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].deps)
+        return [name for name in self.order if name in needed]
+
+    def downstream(self, name: str) -> List[str]:
+        """Stages that (transitively) depend on a stage"""
+        result = set()
+        for other in self.order:
+            if name in self.stages[other].deps or result & set(self.stages[other].deps):
+                result.add(other)
+        return [n for n in self.order if n in result]
+
+    # ------------------------------------------------------------------
+    # State and fingerprints
+    # ------------------------------------------------------------------
+    def _load_state(self):
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                state.setdefault('hashes', {})
+                state.setdefault('stages', {})
+                return state
+            except (ValueError, OSError):
+                pass
+        return {'hashes': {}, 'stages': {}}
+
+    def save_state(self):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+    def file_hash(self, rel_path: str) -> Optional[str]:
+        """Content hash of a repo file, cached by size and mtime (None if missing)"""
+        path = self.root / rel_path
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        cached = self.state['hashes'].get(rel_path)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        sha = file_sha256(path)
+        self.state['hashes'][rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+        return sha
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        """Fingerprint of a stage's command, inputs and upstream runs (None if an input is missing)"""
+        stage = self.stages[name]
+        digest = hashlib.sha256(json.dumps(stage.command).encode())
+        for rel_path in sorted(stage.inputs):
+            sha = self.file_hash(rel_path)
+            if sha is None:
+                return None
+            digest.update(f'{rel_path}:{sha}'.encode())
+        for dep in sorted(stage.after):
+            record = self.state['stages'].get(dep, {})
+            digest.update(f"{dep}:{record.get('fingerprint')}:{record.get('finished')}".encode())
+        return digest.hexdigest()
+
+    def missing_inputs(self, name: str) -> List[str]:
+        return [i for i in self.stages[name].inputs if not (self.root / i).exists()]
+
+    def is_current(self, name: str) -> bool:
+        """True when the stage last succeeded with the current fingerprint and untouched outputs"""
+        record = self.state['stages'].get(name)
+        if not record or record.get('status') != 'ok':
+            return False
+        if record.get('fingerprint') != self.fingerprint(name):
+            return False
+        return all(self.file_hash(o) == record['outputs'].get(o) for o in self.stages[name].outputs)
+
+    def status(self) -> List[Dict]:
+        """Per-stage cache status without running anything"""
+        rows = []
+        stale = set()
+        for name in self.order:
+            stage = self.stages[name]
+            record = self.state['stages'].get(name, {})
+            if any(dep in stale for dep in stage.deps):
+                state = 'stale (upstream)'
+            elif self.missing_inputs(name) and not stage.deps:
+                state = 'missing inputs'
+            elif not record:
+                state = 'never run'
+            elif record.get('status') == 'failed':
+                state = 'failed'
+            elif self.is_current(name):
+                state = 'up to date'
+            else:
+                state = 'stale'
+            if state != 'up to date':
+                stale.add(name)
+            rows.append({
+                'stage': name,
+                'state': state,
+                'deps': stage.deps,
+                'finished': record.get('finished'),
+                'duration_s': record.get('duration_s')
+            })
+        return rows
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+    def _execute(self, name: str) -> Dict:
+        """Run one stage's command, logging its output; returns the run record"""
+        stage = self.stages[name]
+        log_dir = self.state_dir / LOG_DIRNAME
+        log_dir.mkdir(parents=True, exist_ok=True)
+        log_path = log_dir / f'{name}.log'
+        env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        start = time.perf_counter()
+        with open(log_path, 'w', encoding='utf-8') as log:
+            proc = subprocess.run(stage.argv(), cwd=self.root, stdin=subprocess.DEVNULL,
+                                  stdout=log, stderr=subprocess.STDOUT, env=env)
+        return {
+            'returncode': proc.returncode,
+            'duration_s': round(time.perf_counter() - start, 3),
+            'log': str(log_path)
+        }
+
+    def _record(self, name: str, fingerprint: str, result: Dict):
+        stage = self.stages[name]
+        ok = result['returncode'] == 0
+        missing = [o for o in stage.outputs if not (self.root / o).exists()] if ok else []
+        record = {
+            'status': 'ok' if ok and not missing else 'failed',
+            'fingerprint': fingerprint if ok and not missing else None,
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'duration_s': result['duration_s'],
+            'returncode': result['returncode'],
+            'log': result['log'],
+            'outputs': {o: self.file_hash(o) for o in stage.outputs} if ok and not missing else {}
+        }
+        if missing:
+            record['error'] = f"outputs not written: {', '.join(missing)}"
+        self.state['stages'][name] = record
+        return record
+
+    def run(self, targets: Optional[Iterable[str]] = None, force=False, jobs: int = 1,
+            dry_run: bool = False, keep_going: bool = True) -> Dict[str, str]:
+        """
+        Run the selected stages (and their upstream stages) that are not current
+
+        Args:
+            targets: Stage names to bring up to date (default: all)
+            force: True to re-run every selected stage, or an iterable of stage names
+            jobs: Number of stages run concurrently
+            dry_run: Only report what would run
+            keep_going: Keep running independent stages after a failure
+
+        Returns:
+            dict: Stage name -> 'cached' | 'ran' | 'failed' | 'blocked' | 'would run'
+        """
+        selected = self.select(targets)
+        forced = set(selected) if force is True else set(force or ())
+        outcome: Dict[str, str] = {}
+
+        if dry_run:
+            changed = set()
+            for name in selected:
+                upstream_changed = any(dep in changed for dep in self.stages[name].deps)
+                if name in forced or upstream_changed or not self.is_current(name):
+                    outcome[name] = 'would run'
+                    changed.add(name)
+                else:
+                    outcome[name] = 'cached'
+                print(f"   {'▶' if outcome[name] == 'would run' else '·'} {name}: {outcome[name]}")
+            return outcome
+
+        pending = list(selected)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = self.stages[name].deps
+                    if any(outcome.get(d) in ('failed', 'blocked') for d in deps):
+                        outcome[name] = 'blocked'
+                        pending.remove(name)
+                        print(f"   ⛔ {name}: blocked by failed upstream stage")
+                        continue
+                    if any(d in selected and d not in outcome for d in deps) or len(running) >= max(1, jobs):
+                        continue
+                    if any(v == 'failed' for v in outcome.values()) and not keep_going:
+                        outcome[name] = 'blocked'
+                        pending.remove(name)
+                        continue
+
+                    pending.remove(name)
+                    missing = self.missing_inputs(name)
+                    if missing:
+                        outcome[name] = 'failed'
+                        self.state['stages'][name] = {
+                            'status': 'failed', 'fingerprint': None, 'outputs': {},
+                            'finished': datetime.now().isoformat(timespec='seconds'),
+                            'error': f"missing inputs: {', '.join(missing)}"
+                        }
+                        self.save_state()
+                        print(f"   ❌ {name}: missing inputs {', '.join(missing)}")
+                        continue
+                    if name not in forced and self.is_current(name):
+                        outcome[name] = 'cached'
+                        print(f"   · {name}: up to date")
+                        continue
+                    print(f"   ▶ {name}: running...")
+                    running[pool.submit(self._execute, name)] = (name, self.fingerprint(name))
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, fingerprint = running.pop(future)
+                    try:
+                        result = future.result()
+                    except OSError as e:
+                        result = {'returncode': -1, 'duration_s': 0.0, 'log': str(e)}
+                    record = self._record(name, fingerprint, result)
+                    self.save_state()
+                    if record['status'] == 'ok':
+                        outcome[name] = 'ran'
+                        print(f"   ✅ {name}: done in {record['duration_s']:.1f}s")
+                    else:
+                        outcome[name] = 'failed'
+                        print(f"   ❌ {name}: failed ({record.get('error') or 'exit code ' + str(record['returncode'])})")
+                        print(f"      log: {record['log']}")
+                        for line in _tail(record['log']):
+                            print(f"      | {line}")
+
+        self.save_state()
+        return outcome
+
+    def reset(self, names: Optional[Iterable[str]] = None):
+        """Forget the cached state of some (default: all) stages"""
+        for name in names or list(self.state['stages']):
+            self.state['stages'].pop(name, None)
+        self.save_state()
+
+
+def _tail(path, lines: int = 8) -> List[str]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return [line.rstrip() for line in f.readlines()[-lines:]]
+    except OSError:
+        return []
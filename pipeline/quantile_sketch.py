@@ -0,0 +1,233 @@
+"""
+Mergeable quantile sketches for Wuzzuf Job Market Analysis
+A vectorized merging t-digest: many per-group digests are built in one sorted
+pass during aggregation, stored as compact centroid strings, and merged across
+groups or ingestion batches to answer percentile queries with bounded error
+"""
+
+import numpy as np
+import pandas as pd
+
+# Centroid budget per digest; rank error is roughly 1/COMPRESSION at the
+# median and much smaller in the tails, with at most ~COMPRESSION/2 centroids
+COMPRESSION = 100
+
+SKETCH_COLUMNS = ['count', 'min', 'max', 'centroids']
+
+
+def _k_index(q, compression):
+    """Integer bucket of the arcsine scale function k1 for quantile positions q"""
+    k = compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+    return np.floor(k + compression / 4).astype(np.int64)
+
+
+def _compress(groups, means, weights, compression):
+    """
+    Merge weighted points into centroids, independently per group
+
+    Points are sorted by (group, mean); each point's quantile position within
+    its group is mapped through k1 and consecutive points sharing a bucket are
+    merged, so centroids are tiny in the tails and larger near the median.
+
+    Returns:
+        tuple: (group, mean, weight) arrays of the centroids, sorted
+    """
+    order = np.lexsort((means, groups))
+    groups, means, weights = groups[order], means[order], weights[order]
+    if len(groups) == 0:
+        return groups, means, weights
+
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    totals = np.add.reduceat(weights, starts)
+    sizes = np.diff(np.r_[starts, len(groups)])
+    cumulative = np.cumsum(weights)
+    before_group = np.repeat(cumulative[starts] - weights[starts], sizes)
+    q = (cumulative - before_group - weights / 2) / np.repeat(totals, sizes)
+    buckets = _k_index(q, compression)
+
+    boundaries = np.flatnonzero(np.r_[True, (groups[1:] != groups[:-1]) | (buckets[1:] != buckets[:-1])])
+    merged_weights = np.add.reduceat(weights, boundaries)
+    merged_means = np.add.reduceat(means * weights, boundaries) / merged_weights
+    return groups[boundaries], merged_means, merged_weights
+
+
+class TDigest:
+    """
+    Quantile sketch over a stream of numbers
+
+    Args:
+        means, weights: Centroids (any order)
+        minimum, maximum: Exact extremes of the summarized values
+        compression: Centroid budget (see COMPRESSION)
+    """
+
+    def __init__(self, means=(), weights=(), minimum=np.nan, maximum=np.nan, compression=COMPRESSION):
+        self.compression = compression
+        self.means = np.asarray(means, dtype=float)
+        self.weights = np.asarray(weights, dtype=float)
+        self.min = float(minimum)
+        self.max = float(maximum)
+        self._points = None
+
+    @classmethod
+    def from_values(cls, values, compression=COMPRESSION):
+        """Digest of an array of values (NaN values are ignored)"""
+        return cls(compression=compression).update(values)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def __len__(self):
+        return len(self.means)
+
+    def __repr__(self):
+        return f"TDigest(count={self.count:g}, centroids={len(self)}, min={self.min:g}, max={self.max:g})"
+
+    def _absorb(self, means, weights, minimum, maximum):
+        means = np.r_[self.means, means]
+        weights = np.r_[self.weights, weights]
+        _, self.means, self.weights = _compress(np.zeros(len(means), dtype=np.int64), means, weights,
+                                                self.compression)
+        self.min = np.nanmin([self.min, minimum])
+        self.max = np.nanmax([self.max, maximum])
+        self._points = None
+        return self
+
+    def update(self, values):
+        """
+        Add values to the digest in place
+
+        Args:
+            values (array-like): New observations
+
+        Returns:
+            TDigest: self
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        return self._absorb(values, np.ones(len(values)), values.min(), values.max())
+
+    def merge(self, *others):
+        """
+        Digest summarizing this digest and others (inputs are left unchanged)
+
+        Args:
+            others (TDigest): Digests of other groups or ingestion batches
+
+        Returns:
+            TDigest: Merged digest
+        """
+        merged = TDigest(self.means, self.weights, self.min, self.max, self.compression)
+        parts = [d for d in others if len(d)]
+        if not parts:
+            return merged
+        return merged._absorb(np.concatenate([d.means for d in parts]),
+                              np.concatenate([d.weights for d in parts]),
+                              min(d.min for d in parts), max(d.max for d in parts))
+
+    def quantile(self, q):
+        """
+        Estimated quantile(s)
+
+        Centroid means are placed at the middle of their rank range and
+        interpolated linearly, with the exact minimum and maximum at the ends.
+
+        Args:
+            q (float or array-like): Quantiles in [0, 1]
+
+        Returns:
+            float or np.ndarray: Estimates (NaN for an empty digest)
+        """
+        q = np.asarray(q, dtype=float)
+        if len(self) == 0:
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+        if self._points is None:
+            total = self.count
+            self._points = (total, np.r_[0.0, np.cumsum(self.weights) - self.weights / 2, total],
+                            np.r_[self.min, self.means, self.max])
+        total, ranks, values = self._points
+        result = np.interp(q * total, ranks, values)
+        return result if q.ndim else float(result)
+
+    def encode(self):
+        """Compact text form of the centroids: 'mean' or 'mean*weight', space separated"""
+        return ' '.join(f"{m:.7g}" if w == 1 else f"{m:.7g}*{w:g}" for m, w in zip(self.means, self.weights))
+
+    @classmethod
+    def decode(cls, text, minimum=np.nan, maximum=np.nan, compression=COMPRESSION):
+        """Inverse of encode"""
+        tokens = str(text).split() if isinstance(text, str) else []
+        pairs = [token.partition('*') for token in tokens]
+        means = [float(m) for m, _, _ in pairs]
+        weights = [float(w) if w else 1.0 for _, _, w in pairs]
+        return cls(means, weights, minimum, maximum, compression)
+
+
+def build_sketches(df, dimensions, value_col, compression=COMPRESSION):
+    """
+    One t-digest per group of a table, built in a single vectorized pass
+
+    Args:
+        df (pd.DataFrame): Rows to summarize
+        dimensions (list): Grouping columns (missing values form their own group)
+        value_col (str): Numeric column to sketch; missing values are skipped
+        compression (int): Centroid budget per digest
+
+    Returns:
+        pd.DataFrame: dimensions + count, min, max and encoded centroids per group
+    """
+    dimensions = list(dimensions)
+    rows = df.loc[df[value_col].notna(), dimensions + [value_col]]
+    if rows.empty:
+        return pd.DataFrame(columns=dimensions + SKETCH_COLUMNS)
+
+    groups = rows.groupby(dimensions, dropna=False, sort=True).ngroup().to_numpy()
+    values = rows[value_col].to_numpy(dtype=float)
+    centroid_groups, means, weights = _compress(groups, values, np.ones(len(values)), compression)
+
+    keys = rows.groupby(dimensions, dropna=False, sort=True)[value_col].agg(['size', 'min', 'max'])
+    starts = np.flatnonzero(np.r_[True, centroid_groups[1:] != centroid_groups[:-1]])
+    ends = np.r_[starts[1:], len(centroid_groups)]
+    sketches = keys.reset_index().rename(columns={'size': 'count'})
+    sketches['centroids'] = [TDigest(means[s:e], weights[s:e]).encode() for s, e in zip(starts, ends)]
+    return sketches[dimensions + SKETCH_COLUMNS]
+
+
+def decode_sketches(sketches, compression=COMPRESSION):
+    """TDigest per row of a sketch table (as written by build_sketches)"""
+    return [TDigest.decode(text, lo, hi, compression)
+            for text, lo, hi in zip(sketches['centroids'], sketches['min'], sketches['max'])]
+
+
+def merge_sketch_tables(tables, dimensions, compression=COMPRESSION):
+    """
+    Combine sketch tables (e.g. from separate ingestion batches) group by group
+
+    Args:
+        tables (list): Sketch tables with the same dimensions
+        dimensions (list): Grouping columns
+
+    Returns:
+        pd.DataFrame: One row per group with the merged digest
+    """
+    dimensions = list(dimensions)
+    combined = pd.concat(tables, ignore_index=True)
+    if combined.empty:
+        return pd.DataFrame(columns=dimensions + SKETCH_COLUMNS)
+    digests = decode_sketches(combined, compression)
+    means = np.concatenate([d.means for d in digests])
+    weights = np.concatenate([d.weights for d in digests])
+    row_groups = combined.groupby(dimensions, dropna=False, sort=True).ngroup().to_numpy()
+    groups = np.repeat(row_groups, [len(d) for d in digests])
+
+    centroid_groups, means, weights = _compress(groups, means, weights, compression)
+    merged = (combined.groupby(dimensions, dropna=False, sort=True)
+              .agg(count=('count', 'sum'), min=('min', 'min'), max=('max', 'max'))
+              .reset_index())
+    starts = np.flatnonzero(np.r_[True, centroid_groups[1:] != centroid_groups[:-1]])
+    ends = np.r_[starts[1:], len(centroid_groups)]
+    merged['centroids'] = [TDigest(means[s:e], weights[s:e]).encode() for s, e in zip(starts, ends)]
+    return merged[dimensions + SKETCH_COLUMNS]
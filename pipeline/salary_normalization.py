@@ -0,0 +1,213 @@
+"""
+Salary normalization for Wuzzuf Job Market Analysis
+Converts posted salaries to annual USD with one vectorized (currency, pay rate)
+lookup against a local, versioned rate table, and flags implausible salaries
+with a robust (median/MAD) outlier test
+
+Usage:
+    python pipeline/salary_normalization.py data/processed/jobs.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RATES_PATH = Path(__file__).resolve().parent.parent / 'data' / 'reference' / 'currency_rates.csv'
+
+# Periods per year still to apply after clean_salary_data, which already
+# annualizes hourly (x 40 x 52) and monthly (x 12) amounts
+REMAINING_PERIODS = {
+    'yearly': 1.0,
+    'hourly': 1.0,
+    'monthly': 1.0,
+    'daily': 260.0,
+    'day': 260.0,
+    'per day': 260.0,
+    'weekly': 52.0,
+    'week': 52.0,
+    'per week': 52.0,
+    'biweekly': 26.0,
+    'bi-weekly': 26.0,
+}
+
+# Currency of postings that do not state one (the Wuzzuf export has no currency column)
+DEFAULT_CURRENCY = 'USD'
+
+# Symbols and spellings seen in posted currencies -> ISO codes
+CURRENCY_ALIASES = {
+    '$': 'USD', 'US$': 'USD', 'DOLLAR': 'USD', 'DOLLARS': 'USD',
+    'E£': 'EGP', 'LE': 'EGP', 'L.E': 'EGP', 'L.E.': 'EGP', 'EGYPTIAN POUND': 'EGP',
+    '€': 'EUR', 'EURO': 'EUR', 'EUROS': 'EUR',
+    '£': 'GBP',
+    'SR': 'SAR', 'RIYAL': 'SAR',
+    'DHS': 'AED', 'DIRHAM': 'AED',
+}
+
+# Modified z-score (0.6745 * deviation / MAD) above which a salary is an outlier
+OUTLIER_Z = 3.5
+
+NORMALIZED_COLUMNS = ['salary_min_usd', 'salary_max_usd', 'salary_outlier']
+
+
+def load_rates(path=DEFAULT_RATES_PATH, version=None):
+    """
+    Load one version of the currency rate table
+
+    Args:
+        path (str): CSV with version, currency and usd_per_unit columns
+        version (str): Rate table version (default: the latest in the file)
+
+    Returns:
+        tuple: (pd.Series of USD per unit indexed by currency code, version)
+    """
+    table = pd.read_csv(path, dtype={'version': str, 'currency': str})
+    version = version or table['version'].max()
+    rates = table[table['version'] == version]
+    if rates.empty:
+        raise ValueError(f"Rate table version '{version}' not found in {path}")
+    return rates.set_index(rates['currency'].str.upper())['usd_per_unit'].astype(float), version
+
+
+def _lookup(series, mapping, missing):
+    """Map each distinct value once; missing values get `missing`, unknown ones NaN"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    values = np.array([mapping.get(u, np.nan) for u in uniques] + [missing], dtype=float)
+    return values[codes]
+
+
+def normalize_currency(values, default=DEFAULT_CURRENCY):
+    """
+    ISO currency codes for posted currency values, mapped once per distinct value
+
+    Args:
+        values (pd.Series): Posted currencies (codes, symbols or names)
+        default (str): Code for missing or empty values
+
+    Returns:
+        pd.Series: Upper-case codes; unrecognized values are kept (and left
+        unconverted by normalize_salaries)
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    cleaned = [str(u).strip().upper() for u in uniques]
+    mapped = [CURRENCY_ALIASES.get(c, c) if c else default for c in cleaned]
+    return pd.Series(np.array(mapped + [default], dtype=object)[codes], index=values.index)
+
+
+def annual_usd_factors(currency, pay_rate, rates):
+    """
+    Multiplier from a cleaned salary amount to annual USD, per row
+
+    Args:
+        currency (pd.Series): ISO currency codes
+        pay_rate (pd.Series): Normalized pay rates (missing means yearly)
+        rates (pd.Series): USD per unit by currency code
+
+    Returns:
+        np.ndarray: Factors; NaN where the currency or pay rate is unknown
+    """
+    to_usd = _lookup(currency.astype('string').str.upper(), rates.to_dict(), np.nan)
+    periods = _lookup(pay_rate, REMAINING_PERIODS, 1.0)
+    return to_usd * periods
+
+
+def normalize_salaries(df, rates=None, min_col='salary_min', max_col='salary_max',
+                       pay_rate_col='pay_rate', currency_col='currency'):
+    """
+    Add salary_min_usd and salary_max_usd (annual USD) to a jobs table
+
+    Args:
+        df (pd.DataFrame): Jobs with cleaned salary, pay rate and currency columns
+        rates (pd.Series): USD per unit by currency (default: latest local table)
+
+    Returns:
+        pd.DataFrame: Copy of df with the normalized columns
+    """
+    df = df.copy()
+    if rates is None:
+        rates, version = load_rates()
+        print(f"Normalizing salaries to annual USD (rates {version})")
+    factors = annual_usd_factors(df[currency_col], df[pay_rate_col], rates)
+    df['salary_min_usd'] = (pd.to_numeric(df[min_col], errors='coerce') * factors).round(2)
+    df['salary_max_usd'] = (pd.to_numeric(df[max_col], errors='coerce') * factors).round(2)
+
+    has_salary = df[min_col].notna() | df[max_col].notna()
+    unconverted = int((has_salary & np.isnan(factors)).sum())
+    if unconverted:
+        print(f"  - {unconverted:,} salaries with an unknown currency or pay rate left unnormalized")
+    return df
+
+
+def salary_outlier_mask(midpoint, z_threshold=OUTLIER_Z):
+    """
+    Robust outlier test on annual salary midpoints
+
+    Uses the modified z-score of log salaries (median and MAD), so a handful
+    of mis-scaled postings cannot shift the threshold. Non-positive salaries
+    are outliers; missing ones are not.
+
+    Args:
+        midpoint (np.ndarray): Annual salary midpoints (NaN when missing)
+        z_threshold (float): Modified z-score above which a salary is flagged
+
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    midpoint = np.asarray(midpoint, dtype=float)
+    valid = np.isfinite(midpoint) & (midpoint > 0)
+    outlier = np.isfinite(midpoint) & (midpoint <= 0)
+
+    log_salary = np.log(midpoint[valid])
+    if len(log_salary) >= 10:
+        median = np.median(log_salary)
+        mad = np.median(np.abs(log_salary - median))
+        # A degenerate MAD (mostly identical salaries) falls back to the mean deviation
+        scale = mad / 0.6745 if mad > 0 else np.mean(np.abs(log_salary - median)) * 1.253314
+        if scale > 0:
+            outlier[valid] = np.abs(log_salary - median) / scale > z_threshold
+    return outlier
+
+
+def flag_salary_outliers(df, z_threshold=OUTLIER_Z):
+    """
+    Add a boolean salary_outlier column from the normalized salaries
+
+    Call it on the whole dataset: the statistics are global.
+
+    Args:
+        df (pd.DataFrame): Jobs with salary_min_usd / salary_max_usd
+        z_threshold (float): Modified z-score above which a salary is flagged
+
+    Returns:
+        pd.DataFrame: Copy of df with the salary_outlier column
+    """
+    df = df.copy()
+    midpoint = df[['salary_min_usd', 'salary_max_usd']].mean(axis=1).to_numpy()
+    df['salary_outlier'] = salary_outlier_mask(midpoint, z_threshold)
+    print(f"  - Salary outliers flagged: {int(df['salary_outlier'].sum()):,} "
+          f"of {int(np.isfinite(midpoint).sum()):,} salaries")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add normalized annual USD salary columns to jobs.csv')
+    parser.add_argument('jobs_csv', help='Cleaned jobs.csv to update in place')
+    parser.add_argument('--rates', default=DEFAULT_RATES_PATH, help='Currency rate table')
+    parser.add_argument('--version', help='Rate table version (default: latest)')
+    args = parser.parse_args()
+
+    rates, version = load_rates(args.rates, args.version)
+    jobs = pd.read_csv(args.jobs_csv)
+    print(f"Normalizing {len(jobs):,} jobs with rates {version}")
+    jobs = flag_salary_outliers(normalize_salaries(jobs.drop(columns=NORMALIZED_COLUMNS, errors='ignore'), rates))
+    tmp = Path(args.jobs_csv).with_suffix('.csv.tmp')
+    jobs.to_csv(tmp, index=False)
+    tmp.replace(args.jobs_csv)
+    valid = jobs.loc[~jobs['salary_outlier'], ['salary_min_usd', 'salary_max_usd']].mean(axis=1)
+    print(f"✅ Updated {args.jobs_csv}: mean annual salary ${valid.mean():,.0f} (outliers excluded)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Sharded cleaning for Wuzzuf Job Market Analysis
+Runs the data_cleaning steps over many raw scrape files (or byte-range splits of
+one large file) in a process pool, then merges the shards into one
+jobs/skills/job_skills.csv set
+
+Usage:
+    python pipeline/sharded_cleaning.py data/raw/                     # every CSV in the folder
+    python pipeline/sharded_cleaning.py big_scrape.csv --workers 8 --shard-mb 32
+    python pipeline/sharded_cleaning.py data/raw/*.csv --skills-dictionary data/processed/skills.csv
+"""
+
+import argparse
+import contextlib
+import io
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import data_cleaning as dc
+from duplicate_detection import RAW_FIELDS, mark_near_duplicates
+from salary_normalization import flag_salary_outliers, normalize_salaries
+from skill_extraction import add_title_skills
+from title_clustering import export_roles, mark_roles
+
+DEFAULT_SHARD_MB = 64
+
+# Cleaning steps that only look at one row at a time, so running them per shard
+# gives the same rows as running them over the whole file
+ROW_STEPS = [dc.parse_dates, dc.standardize_text, dc.clean_location_data, dc.bucket_experience_level]
+
+
+class Shard:
+    """A byte range [start, end) of a raw CSV file; the header line is read separately"""
+
+    def __init__(self, path, start, end, index):
+        self.path = str(path)
+        self.start = start
+        self.end = end
+        self.index = index
+
+    def __repr__(self):
+        return f"Shard({Path(self.path).name}, {self.start}-{self.end})"
+
+
+def _header_end(mm):
+    """Offset just past the header line"""
+    newline = mm.find(b'\n')
+    return len(mm) if newline == -1 else newline + 1
+
+
+def _next_record_boundary(mm, offset, in_quotes):
+    """
+    First offset at or after `offset` that starts a new CSV record
+
+    A newline only ends a record when it is outside a quoted field; quotes are
+    tracked by parity, which also holds for escaped ("") quotes.
+
+    Returns:
+        tuple: (boundary offset, quote parity at that offset)
+    """
+    position = offset
+    while True:
+        newline = mm.find(b'\n', position)
+        if newline == -1:
+            return len(mm), False
+        in_quotes ^= bool(mm[position:newline].count(b'"') % 2)
+        if not in_quotes:
+            return newline + 1, False
+        position = newline + 1
+
+
+def plan_shards(paths, shard_bytes=DEFAULT_SHARD_MB * 1024 * 1024):
+    """
+    Split raw CSV files into shards of roughly `shard_bytes` each
+
+    Every file yields at least one shard; files larger than `shard_bytes` are
+    cut at record boundaries so quoted multi-line fields stay in one shard.
+
+    Args:
+        paths (list): Raw CSV files, in the order their rows should be merged
+        shard_bytes (int): Target shard size in bytes
+
+    Returns:
+        list: Shard objects in file and byte order
+    """
+    shards = []
+    for path in paths:
+        size = os.path.getsize(path)
+        if size == 0:
+            continue
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = _header_end(mm)
+            in_quotes = False
+            while start < size:
+                target = min(start + shard_bytes, size)
+                if target >= size:
+                    end = size
+                else:
+                    in_quotes ^= bool(mm[start:target].count(b'"') % 2)
+                    end, in_quotes = _next_record_boundary(mm, target, in_quotes)
+                shards.append(Shard(path, start, end, len(shards)))
+                start = end
+    return shards
+
+
+def _read_shard(shard):
+    """Read one shard into a DataFrame, with the same encoding fallback as load_csv"""
+    with open(shard.path, 'rb') as f:
+        header = f.readline()
+        f.seek(shard.start)
+        data = header + f.read(shard.end - shard.start)
+    try:
+        return pd.read_csv(io.BytesIO(data), encoding='utf-8')
+    except UnicodeDecodeError:
+        return pd.read_csv(io.BytesIO(data), encoding='latin-1')
+
+
+def clean_shard(shard):
+    """
+    Run the per-row cleaning steps over one shard (process pool worker)
+
+    Index-column detection and skill ids need the whole dataset, so they are
+    left to merge_shards: the first column is kept, and skills are returned by
+    name rather than id.
+
+    Args:
+        shard (Shard): Byte range to clean
+
+    Returns:
+        dict: Shard index and path, cleaned jobs, job_id/skill_name pairs,
+              first-column values before de-duplication, rows read, seconds
+    """
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = _read_shard(shard)
+        rows_read = len(df)
+        df = df.drop(columns=[col for col in df.columns if col.startswith('Unnamed:')])
+        first_column = df.iloc[:, 0] if len(df.columns) else pd.Series(dtype='int64')
+        df = dc.remove_duplicates(df)
+        for step in ROW_STEPS:
+            df = step(df)
+        df, skills_df, job_skills_df = dc.process_all_skills(df)
+        df = dc.clean_salary_data(df)
+        df = normalize_salaries(df, pay_rate_col='Pay Rate')
+
+    if len(job_skills_df):
+        id_to_name = dict(zip(skills_df['skill_id'], skills_df['skill_name']))
+        job_skills_df = pd.DataFrame({'job_id': job_skills_df['job_id'],
+                                      'skill_name': job_skills_df['skill_id'].map(id_to_name)})
+    else:
+        job_skills_df = pd.DataFrame(columns=['job_id', 'skill_name'])
+    return {
+        'index': shard.index,
+        'path': shard.path,
+        'jobs': df,
+        'job_skills': job_skills_df,
+        'first_column': first_column,
+        'rows_read': rows_read,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _index_columns(results):
+    """
+    Apply remove_unnecessary_columns' index-column test per source file
+
+    The first column is dropped when it is numeric, unique and starts at 0
+    across all shards of its file, as it would be when the file is cleaned whole.
+
+    Returns:
+        dict: Source path -> column name to drop (files without one are absent)
+    """
+    by_file = {}
+    for result in results:
+        by_file.setdefault(result['path'], []).append(result['first_column'])
+
+    drop = {}
+    for path, parts in by_file.items():
+        values = pd.concat(parts, ignore_index=True)
+        if values.name is None or values.dtype not in ['int64', 'float64']:
+            continue
+        if len(values) and values.nunique() == len(values) and values.min() == 0:
+            drop[path] = values.name
+    return drop
+
+
+def build_skills_dictionary(skill_names, existing=None):
+    """
+    Assign skill ids for the merged dataset
+
+    Without an existing dictionary ids follow sorted skill names, exactly as
+    process_all_skills numbers them. With one, known skills keep their ids and
+    new skills are appended after the highest id, so ids stay stable across
+    daily runs.
+
+    Args:
+        skill_names (iterable): Normalized skill names found in the shards
+        existing (pd.DataFrame): Optional skills table (skill_id, skill_name, skill_category)
+
+    Returns:
+        pd.DataFrame: skill_id, skill_name, skill_category
+    """
+    if existing is None or existing.empty:
+        names = sorted(set(skill_names))
+        return pd.DataFrame({
+            'skill_id': range(1, len(names) + 1),
+            'skill_name': names,
+            'skill_category': [dc.categorize_skills(name) for name in names],
+        })
+
+    existing = existing[['skill_id', 'skill_name', 'skill_category']]
+    known = set(existing['skill_name'])
+    new_names = sorted(set(skill_names) - known)
+    next_id = int(existing['skill_id'].max()) + 1
+    new_skills = pd.DataFrame({
+        'skill_id': range(next_id, next_id + len(new_names)),
+        'skill_name': new_names,
+        'skill_category': [dc.categorize_skills(name) for name in new_names],
+    })
+    return pd.concat([existing, new_skills], ignore_index=True)
+
+
+def merge_shards(results, skills_dictionary=None):
+    """
+    Merge cleaned shards into the final jobs, skills and job-skills tables
+
+    Shards are concatenated in file and byte order; a Job Posting ID seen in an
+    earlier shard wins (keep='first', like remove_duplicates), and the losing
+    row's skills are dropped with it. Skill names are then mapped to ids from
+    one shared dictionary.
+
+    Args:
+        results (list): clean_shard outputs
+        skills_dictionary (pd.DataFrame): Optional existing skills table to keep ids from
+
+    Returns:
+        tuple: (jobs_df, skills_df, job_skills_df, stats)
+    """
+    results = sorted(results, key=lambda r: r['index'])
+    index_columns = _index_columns(results)
+
+    seen = set()
+    jobs_parts, job_skills_parts = [], []
+    cross_shard_duplicates = 0
+    for result in results:
+        jobs = result['jobs']
+        if result['path'] in index_columns:
+            jobs = jobs.drop(columns=[index_columns[result['path']]])
+        if 'Job Posting ID' in jobs.columns and seen:
+            repeated = jobs['Job Posting ID'].isin(seen)
+            cross_shard_duplicates += int(repeated.sum())
+            jobs = jobs[~repeated]
+            job_skills = result['job_skills']
+            job_skills = job_skills[~job_skills['job_id'].isin(seen)]
+        else:
+            job_skills = result['job_skills']
+        if 'Job Posting ID' in jobs.columns:
+            seen.update(jobs['Job Posting ID'])
+        jobs_parts.append(jobs)
+        job_skills_parts.append(job_skills)
+
+    jobs_df = pd.concat(jobs_parts, ignore_index=True)
+    named_job_skills = pd.concat(job_skills_parts, ignore_index=True)
+
+    skills_df = build_skills_dictionary(named_job_skills['skill_name'], skills_dictionary)
+    name_to_id = dict(zip(skills_df['skill_name'], skills_df['skill_id']))
+    job_skills_df = pd.DataFrame({
+        'job_id': named_job_skills['job_id'],
+        'skill_id': named_job_skills['skill_name'].map(name_to_id).astype('int64'),
+    })
+
+    stats = {
+        'shards': len(results),
+        'rows_read': sum(r['rows_read'] for r in results),
+        'cross_shard_duplicates': cross_shard_duplicates,
+        'worker_seconds': sum(r['seconds'] for r in results),
+    }
+    return jobs_df, skills_df, job_skills_df, stats
+
+
+def expand_inputs(inputs):
+    """Resolve files and directories (every *.csv inside, sorted) into a list of paths"""
+    paths = []
+    for item in inputs:
+        item = Path(item)
+        if item.is_dir():
+            paths.extend(sorted(item.glob('*.csv')))
+        elif item.exists():
+            paths.append(item)
+        else:
+            raise FileNotFoundError(f"Raw input not found: {item}")
+    if not paths:
+        raise FileNotFoundError(f"No raw CSV files in {', '.join(map(str, inputs))}")
+    return paths
+
+
+def run_sharded_cleaning(inputs=(dc.DEFAULT_RAW_PATH,), output_dir=dc.DEFAULT_OUTPUT_DIR, workers=None,
+                         shard_mb=DEFAULT_SHARD_MB, skills_dictionary=None, quiet=False, title_skills=True):
+    """
+    Clean raw scrape files in parallel and write jobs/skills/job_skills.csv
+
+    Args:
+        inputs (list): Raw CSV files or directories of them
+        output_dir (str): Directory for the final CSV files
+        workers (int): Worker processes (default: CPU count)
+        shard_mb (float): Target shard size in MB for splitting large files
+        skills_dictionary (str): Optional skills.csv whose skill ids are kept
+        quiet (bool): Suppress the progress output
+        title_skills (bool): Add skills mentioned in the job titles to job_skills (skill_extraction)
+
+    Returns:
+        tuple: (jobs_df, skills_df, job_skills_df)
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    paths = expand_inputs(inputs)
+    shards = plan_shards(paths, int(shard_mb * 1024 * 1024))
+    if not shards:
+        raise ValueError("Raw input files contain no data")
+    existing = pd.read_csv(skills_dictionary) if skills_dictionary else None
+
+    log = (lambda *a: None) if quiet else print
+    log(f"🧹 Sharded cleaning: {len(paths)} file(s), {len(shards)} shard(s), {workers} worker(s)")
+
+    if workers == 1 or len(shards) == 1:
+        results = [clean_shard(shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+            results = list(pool.map(clean_shard, shards))
+
+    jobs_df, skills_df, job_skills_df, stats = merge_shards(results, existing)
+    log(f"🔗 Merged {stats['rows_read']:,} raw rows -> {len(jobs_df):,} jobs "
+        f"({stats['cross_shard_duplicates']:,} duplicates across shards), "
+        f"{len(skills_df):,} skills, {len(job_skills_df):,} job-skill links")
+
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with output:
+        # Outlier statistics, repost clusters and roles are global, so they are computed over the merged jobs
+        jobs_df = flag_salary_outliers(jobs_df)
+        jobs_df = mark_near_duplicates(jobs_df, job_skills_df, fields=RAW_FIELDS)
+        jobs_df, roles_df = mark_roles(jobs_df, title_column='Job Title')
+        if title_skills:
+            job_skills_df = add_title_skills(jobs_df, skills_df, job_skills_df, workers=workers)
+        final = dc.export_final_datasets(jobs_df, skills_df, job_skills_df, output_dir)
+        export_roles(roles_df, output_dir)
+
+    elapsed = time.perf_counter() - started
+    log(f"✅ Cleaned in {elapsed:.1f}s ({stats['rows_read'] / elapsed:,.0f} rows/s, "
+        f"{stats['worker_seconds']:.1f}s of worker time)")
+    return final
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Clean raw Wuzzuf scrape files in parallel shards')
+    parser.add_argument('inputs', nargs='*', default=[str(dc.DEFAULT_RAW_PATH)],
+                        help='Raw CSV files or directories (default: data/raw/Wuzzuf-Jobs-Posting.csv)')
+    parser.add_argument('--output', default=str(dc.DEFAULT_OUTPUT_DIR), help='Output directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--shard-mb', type=float, default=DEFAULT_SHARD_MB,
+                        help='Split files larger than this into byte-range shards')
+    parser.add_argument('--skills-dictionary', default=None,
+                        help='Existing skills.csv whose skill ids should be kept')
+    parser.add_argument('--no-title-skills', dest='title_skills', action='store_false',
+                        help='Keep only the tagged Job Skills (skip skills mentioned in job titles)')
+    parser.add_argument('--quiet', action='store_true', help='Suppress the progress output')
+    args = parser.parse_args()
+
+    try:
+        run_sharded_cleaning(args.inputs, args.output, args.workers, args.shard_mb,
+                             args.skills_dictionary, quiet=args.quiet, title_skills=args.title_skills)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Skill-mention extraction for Wuzzuf Job Market Analysis
+Compiles the skills.csv vocabulary (plus the create_skills_mapping aliases)
+into an Aho-Corasick automaton and scans job titles for technology mentions
+that the pre-tagged Job Skills list missed
+
+The cleaning pipeline (data_cleaning / sharded_cleaning) adds these pairs to
+job_skills.csv, so the enrichment is part of the DAG's clean stage; this script
+only reports what a processed bundle is missing.
+
+Usage:
+    python pipeline/skill_extraction.py data/processed --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from lazy_imports import lazy_import
+
+# data_cleaning imports this module, so its skills mapping is loaded on first use
+data_cleaning = lazy_import('data_cleaning')
+
+# Title columns scanned for mentions, in the cleaned jobs.csv layout
+TITLE_COLUMNS = ['job_title_full', 'job_title_additional']
+
+# The same columns in the raw Wuzzuf CSV layout used while cleaning
+RAW_TITLE_COLUMNS = ['Job Title Full', 'Job Title Additional Info']
+
+# Shorter surface forms ('c', 'r') are too ambiguous to match in free text
+MIN_PATTERN_LENGTH = 2
+
+# Distinct titles per worker task when sharding
+SHARD_SIZE = 50_000
+
+
+def build_vocabulary(skill_names, mapping=None, min_length=MIN_PATTERN_LENGTH):
+    """
+    Surface forms to look for, mapped to the skill they mention
+
+    Skill names are matched as written and with underscores as spaces
+    ('machine_learning' -> 'machine learning'); aliases from the mapping are
+    kept when they point at a known skill, and hyphenated forms also match
+    with a space ('full-stack' -> 'full stack').
+
+    Args:
+        skill_names (iterable): Normalized skill names (skills.csv)
+        mapping (dict): Alias -> skill name (default: create_skills_mapping())
+        min_length (int): Shortest surface form kept
+
+    Returns:
+        dict: Lowercase pattern -> skill name
+    """
+    known = {str(name) for name in skill_names}
+    mapping = data_cleaning.create_skills_mapping() if mapping is None else mapping
+
+    vocabulary = {}
+    candidates = [(name, name) for name in known] + [(name.replace('_', ' '), name) for name in known]
+    candidates += [(alias, skill) for alias, skill in mapping.items() if skill in known]
+    for pattern, skill in candidates:
+        for form in {pattern.lower().strip(), pattern.lower().strip().replace('-', ' ')}:
+            if len(form) >= min_length:
+                vocabulary.setdefault(form, skill)
+    return vocabulary
+
+
+class SkillAutomaton:
+    """
+    Aho-Corasick automaton over the vocabulary's surface forms
+
+    Transitions are precomputed for every (state, character of the pattern
+    alphabet) pair, so a scan is one dictionary lookup per character with no
+    failure-link walking; characters outside the alphabet reset to the root.
+    Matches must sit on word boundaries (no letter or digit on either side),
+    so 'java' does not fire inside 'javascript'.
+
+    Args:
+        vocabulary (dict): Pattern -> skill name
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = dict(vocabulary)
+        goto = [{}]
+        outputs = [[]]
+        for pattern, skill in self.vocabulary.items():
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append((len(pattern), skill))
+
+        # Breadth-first failure links, folded into complete transition tables
+        alphabet = {char for pattern in self.vocabulary for char in pattern}
+        fail = [0] * len(goto)
+        delta = [dict() for _ in goto]
+        delta[0] = {char: goto[0].get(char, 0) for char in alphabet}
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]][char]
+                delta[state][char] = child
+                queue.append(child)
+        # Drop transitions back to the root to keep the tables small
+        self.delta = [{char: nxt for char, nxt in table.items() if nxt} for table in delta]
+        self.outputs = [tuple(out) for out in outputs]
+
+    def __len__(self):
+        return len(self.delta)
+
+    def find(self, text):
+        """
+        Skills mentioned in a text, in order of first appearance
+
+        Args:
+            text (str): Free text (case-insensitive)
+
+        Returns:
+            list: Distinct skill names
+        """
+        text = text.lower()
+        delta, outputs = self.delta, self.outputs
+        found = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                after = text[end] if end < len(text) else ' '
+                for length, skill in outputs[state]:
+                    start = end - length
+                    before = text[start - 1] if start else ' '
+                    if not before.isalnum() and not after.isalnum() and skill not in found:
+                        found.append(skill)
+        return found
+
+
+# Worker-process automaton, built once per process by the pool initializer
+_WORKER_AUTOMATON = None
+
+
+def _init_worker(vocabulary):
+    global _WORKER_AUTOMATON
+    _WORKER_AUTOMATON = SkillAutomaton(vocabulary)
+
+
+def _scan_shard(texts):
+    return [_WORKER_AUTOMATON.find(text) for text in texts]
+
+
+def scan_texts(texts, vocabulary, workers=1, shard_size=SHARD_SIZE):
+    """
+    Skill mentions for a list of texts, optionally across worker processes
+
+    Args:
+        texts (list): Texts to scan
+        vocabulary (dict): Pattern -> skill name
+        workers (int): Worker processes (1 scans in this process)
+        shard_size (int): Texts per worker task
+
+    Returns:
+        list: Skill name lists aligned with texts
+    """
+    if workers <= 1 or len(texts) <= shard_size:
+        automaton = SkillAutomaton(vocabulary)
+        return [automaton.find(text) for text in texts]
+    shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=_init_worker,
+                             initargs=(vocabulary,)) as pool:
+        return [found for shard in pool.map(_scan_shard, shards) for found in shard]
+
+
+def extract_title_skills(jobs_df, skills_df, columns=TITLE_COLUMNS, id_column='job_id', workers=1,
+                         vocabulary=None):
+    """
+    (job_id, skill_id) pairs for skills mentioned in the title columns
+
+    Each distinct title is scanned once and the matches are broadcast back
+    to the jobs carrying it.
+
+    Args:
+        jobs_df (pd.DataFrame): Jobs with an id column and the title columns
+        skills_df (pd.DataFrame): skill_id / skill_name vocabulary
+        columns (list): Title columns to scan (missing ones are skipped)
+        id_column (str): Job id column
+        workers (int): Worker processes for the scan
+        vocabulary (dict): Pattern -> skill name (default: build_vocabulary(skills_df))
+
+    Returns:
+        pd.DataFrame: Distinct job_id / skill_id pairs
+    """
+    vocabulary = build_vocabulary(skills_df['skill_name']) if vocabulary is None else vocabulary
+    skill_ids = dict(zip(skills_df['skill_name'], skills_df['skill_id']))
+
+    pairs = []
+    for column in [c for c in columns if c in jobs_df.columns]:
+        codes, titles = pd.factorize(jobs_df[column], use_na_sentinel=True)
+        found = scan_texts([str(title) for title in titles], vocabulary, workers)
+        lengths = np.array([len(skills) for skills in found], dtype=np.int64)
+        if not lengths.sum():
+            continue
+        # Title code -> matched skill ids (CSR), expanded over the jobs with that title
+        title_skills = np.array([skill_ids[s] for skills in found for s in skills], dtype=np.int64)
+        indptr = np.r_[0, np.cumsum(lengths)]
+        rows = np.flatnonzero(codes >= 0)
+        per_row = lengths[codes[rows]]
+        starts = np.repeat(indptr[codes[rows]], per_row)
+        offsets = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+        pairs.append(pd.DataFrame({'job_id': np.repeat(jobs_df[id_column].to_numpy()[rows], per_row),
+                                   'skill_id': title_skills[starts + offsets]}))
+
+    if not pairs:
+        return pd.DataFrame({'job_id': pd.Series(dtype=jobs_df[id_column].dtype),
+                             'skill_id': pd.Series(dtype=np.int64)})
+    return pd.concat(pairs, ignore_index=True).drop_duplicates(ignore_index=True)
+
+
+def enrich_job_skills(job_skills_df, title_pairs):
+    """
+    Append title-derived pairs that the bridge table does not already hold
+
+    Returns:
+        tuple: (enriched job_skills DataFrame, number of pairs added)
+    """
+    combined = pd.concat([job_skills_df[['job_id', 'skill_id']], title_pairs], ignore_index=True)
+    enriched = combined.drop_duplicates(ignore_index=True)
+    return enriched, len(enriched) - len(job_skills_df.drop_duplicates())
+
+
+def add_title_skills(df, skills_df, job_skills_df, columns=RAW_TITLE_COLUMNS, id_column='Job Posting ID',
+                     workers=1):
+    """
+    Cleaning step: add skills mentioned in the job titles to the bridge table
+
+    Args:
+        df (pd.DataFrame): Jobs in the raw column layout
+        skills_df (pd.DataFrame): skill_id / skill_name vocabulary
+        job_skills_df (pd.DataFrame): job_id / skill_id pairs from the Job Skills column
+        columns (list): Title columns to scan
+        id_column (str): Job id column
+        workers (int): Worker processes for the scan
+
+    Returns:
+        pd.DataFrame: job_skills with the title-derived pairs appended
+    """
+    print("Adding skills mentioned in job titles...")
+    title_pairs = extract_title_skills(df, skills_df, columns=columns, id_column=id_column, workers=workers)
+    enriched, added = enrich_job_skills(job_skills_df, title_pairs)
+    print(f"  - Title mentions: {len(title_pairs):,}, new job-skill pairs: {added:,}")
+    return enriched
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report skills mentioned in job titles that job_skills.csv lacks')
+    parser.add_argument('data_dir', nargs='?', default='data/processed',
+                        help='Directory with jobs.csv, skills.csv and job_skills.csv')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    workers = args.workers or os.cpu_count() or 1
+    jobs = pd.read_csv(data_dir / 'jobs.csv', usecols=lambda c: c == 'job_id' or c in TITLE_COLUMNS)
+    skills = pd.read_csv(data_dir / 'skills.csv')
+    job_skills = pd.read_csv(data_dir / 'job_skills.csv')
+
+    vocabulary = build_vocabulary(skills['skill_name'])
+    print(f"🔤 Vocabulary: {len(vocabulary):,} surface forms for {len(skills):,} skills, "
+          f"{len(SkillAutomaton(vocabulary)):,} automaton states")
+    started = time.perf_counter()
+    title_pairs = extract_title_skills(jobs, skills, workers=workers, vocabulary=vocabulary)
+    elapsed = time.perf_counter() - started
+    _, added = enrich_job_skills(job_skills, title_pairs)
+    print(f"🔎 Scanned {len(jobs):,} jobs' titles in {elapsed:.2f}s ({workers} worker(s)): "
+          f"{len(title_pairs):,} mentions, {added:,} job-skill pairs missing from job_skills.csv")
+    if added:
+        # job_skills.csv belongs to the clean stage; rewriting it here would be undone by the next run
+        print("   Re-run the cleaning (python wuzzuf.py run clean --force) to add them")
+
+
+if __name__ == "__main__":
+    main()
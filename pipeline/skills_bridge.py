@@ -0,0 +1,248 @@
+"""
+Binary job_skills bridge for Wuzzuf Job Market Analysis
+Stores the job -> skill relationships as sorted .npy columns plus an offsets
+array so they can be memory-mapped with zero parsing and shared across processes
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Bridge directory suffix: job_skills.csv -> job_skills.bridge, one per CSV
+BRIDGE_SUFFIX = '.bridge'
+FORMAT_VERSION = 1
+
+
+def file_sha256(path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_bridge_path(csv_path) -> Path:
+    """Bridge directory next to a job_skills CSV, named after its stem"""
+    return Path(csv_path).with_suffix(BRIDGE_SUFFIX)
+
+
+class JobSkillsBridge:
+    """
+    Memory-mapped, read-only view of the job_skills bridge table
+
+    Arrays:
+        job_id:   int64, sorted ascending (one entry per relationship)
+        skill_id: int16, sorted within each job
+        job_keys: int64, unique job_ids in ascending order
+        offsets:  int64, len(job_keys) + 1; skills of job_keys[i] are
+                  skill_id[offsets[i]:offsets[i + 1]]
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / 'meta.json', 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported bridge format version: {self.meta.get('format_version')}")
+
+        self.job_id = np.load(self.path / 'job_id.npy', mmap_mode='r')
+        self.skill_id = np.load(self.path / 'skill_id.npy', mmap_mode='r')
+        self.job_keys = np.load(self.path / 'job_keys.npy', mmap_mode='r')
+        self.offsets = np.load(self.path / 'offsets.npy', mmap_mode='r')
+
+    def __len__(self):
+        return len(self.job_id)
+
+    def __reduce__(self):
+        # Worker processes re-open the same files instead of receiving a copy
+        return (JobSkillsBridge, (str(self.path),))
+
+    def skills_for(self, job_id: int) -> 'np.ndarray':
+        """skill_ids attached to one job (empty array if unknown)"""
+        i = np.searchsorted(self.job_keys, job_id)
+        if i >= len(self.job_keys) or self.job_keys[i] != job_id:
+            return np.empty(0, dtype=np.int16)
+        return np.asarray(self.skill_id[self.offsets[i]:self.offsets[i + 1]])
+
+    def skill_counts(self) -> 'pd.Series':
+        """Number of relationships per skill_id"""
+        counts = np.bincount(self.skill_id)
+        skill_ids = np.flatnonzero(counts)
+        return pd.Series(counts[skill_ids], index=skill_ids, name='job_count')
+
+    def to_frame(self) -> 'pd.DataFrame':
+        """Bridge as a (job_id, skill_id) DataFrame"""
+        return pd.DataFrame({'job_id': np.asarray(self.job_id), 'skill_id': np.asarray(self.skill_id)})
+
+    def is_fresh_for(self, csv_path) -> bool:
+        """
+        Check whether the bridge was built from the given CSV content
+
+        Size and modification time are compared first; when only the
+        timestamp differs (e.g. a byte-identical copy) the content hash decides.
+        """
+        csv_path = Path(csv_path)
+        if not csv_path.exists():
+            return True
+        stat = csv_path.stat()
+        if stat.st_size != self.meta['source_size']:
+            return False
+        if stat.st_mtime_ns == self.meta['source_mtime_ns'] and csv_path.name == self.meta['source_name']:
+            return True
+        return file_sha256(csv_path) == self.meta['source_sha256']
+
+
+def write_bridge(job_skills_df: 'pd.DataFrame', path, source_csv=None) -> JobSkillsBridge:
+    """
+    Write a job_skills DataFrame in the binary bridge format
+
+    Args:
+        job_skills_df: DataFrame with job_id and skill_id columns
+        path: Bridge directory to create (replaced atomically)
+        source_csv: CSV the data came from, recorded for freshness checks
+
+    Returns:
+        JobSkillsBridge opened on the written files
+    """
+    path = Path(path)
+    job_ids = job_skills_df['job_id'].to_numpy(dtype=np.int64)
+    skill_ids = job_skills_df['skill_id'].to_numpy(dtype=np.int16)
+
+    order = np.lexsort((skill_ids, job_ids))
+    job_ids = job_ids[order]
+    skill_ids = skill_ids[order]
+
+    job_keys, starts = np.unique(job_ids, return_index=True)
+    offsets = np.append(starts, len(job_ids)).astype(np.int64)
+
+    meta = {'format_version': FORMAT_VERSION, 'rows': int(len(job_ids)), 'jobs': int(len(job_keys))}
+    if source_csv is not None:
+        source_csv = Path(source_csv)
+        stat = source_csv.stat()
+        meta.update({
+            'source_name': source_csv.name,
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'source_sha256': file_sha256(source_csv)
+        })
+
+    # Build in a sibling directory, then swap it in so readers never see a partial bridge
+    tmp_path = path.with_name(path.name + '.tmp')
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+    np.save(tmp_path / 'job_id.npy', job_ids, allow_pickle=False)
+    np.save(tmp_path / 'skill_id.npy', skill_ids, allow_pickle=False)
+    np.save(tmp_path / 'job_keys.npy', job_keys, allow_pickle=False)
+    np.save(tmp_path / 'offsets.npy', offsets, allow_pickle=False)
+    with open(tmp_path / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    if path.exists():
+        old_path = path.with_name(path.name + '.old')
+        if old_path.exists():
+            shutil.rmtree(old_path)
+        os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path)
+    else:
+        os.replace(tmp_path, path)
+
+    return JobSkillsBridge(path)
+
+
+def build_bridge_from_csv(csv_path, bridge_path=None) -> JobSkillsBridge:
+    """
+    Parse a job_skills CSV once and write its binary bridge
+
+    Args:
+        csv_path: Path to job_skills.csv
+        bridge_path: Bridge directory (default: <csv stem>.bridge next to the CSV)
+
+    Returns:
+        JobSkillsBridge instance
+    """
+    csv_path = Path(csv_path)
+    bridge_path = Path(bridge_path) if bridge_path else default_bridge_path(csv_path)
+    job_skills_df = pd.read_csv(csv_path, dtype={'job_id': 'int64', 'skill_id': 'int16'})
+    return write_bridge(job_skills_df, bridge_path, source_csv=csv_path)
+
+
+def open_bridge(csv_path, bridge_path=None, build: bool = True) -> Optional[JobSkillsBridge]:
+    """
+    Open the bridge for a job_skills CSV, building it when missing or stale
+
+    Args:
+        csv_path: job_skills CSV the bridge must match
+        bridge_path: Bridge directory (default: <csv stem>.bridge next to the CSV)
+        build: Build the bridge from the CSV when it is missing or stale
+
+    Returns:
+        JobSkillsBridge, or None when no usable bridge exists and build is False
+    """
+    csv_path = Path(csv_path)
+    bridge_path = Path(bridge_path) if bridge_path else default_bridge_path(csv_path)
+
+    if (bridge_path / 'meta.json').exists():
+        try:
+            bridge = JobSkillsBridge(bridge_path)
+            if bridge.is_fresh_for(csv_path):
+                return bridge
+        except (ValueError, KeyError, OSError):
+            pass
+
+    if build and csv_path.exists():
+        return build_bridge_from_csv(csv_path, bridge_path)
+    return None
+
+
+def read_job_skills(csv_path, bridge_path=None, build: bool = True) -> 'pd.DataFrame':
+    """
+    Read a job_skills table, using the memory-mapped bridge when available
+
+    Drop-in replacement for pd.read_csv on job_skills.csv / job_skills_powerbi.csv.
+
+    Args:
+        csv_path: Path to the job_skills CSV
+        bridge_path: Bridge directory (default: <csv stem>.bridge next to the CSV)
+        build: Build the bridge on first use so later reads skip CSV parsing
+
+    Returns:
+        DataFrame with job_id (int64) and skill_id (int16) columns
+    """
+    bridge = open_bridge(csv_path, bridge_path, build=build)
+    if bridge is not None:
+        return bridge.to_frame()
+    return pd.read_csv(csv_path, dtype={'job_id': 'int64', 'skill_id': 'int16'})
+
+
+if __name__ == "__main__":
+    import time
+
+    data_dir = Path(__file__).resolve().parent.parent / 'data' / 'processed'
+    csv_path = data_dir / 'job_skills.csv'
+
+    print("🔗 Building binary job_skills bridge")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    bridge = build_bridge_from_csv(csv_path)
+    print(f"✅ Bridge written to {bridge.path} in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    pd.read_csv(csv_path)
+    print(f"   CSV parse: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    JobSkillsBridge(bridge.path)
+    print(f"   Bridge open: {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(f"   Relationships: {len(bridge):,} across {len(bridge.job_keys):,} jobs")
@@ -0,0 +1,317 @@
+"""
+Stage-level profiling for Wuzzuf Job Market Analysis pipeline entry points
+Records wall time, CPU time, peak RSS, rows in/out and bytes read/written per
+stage and writes a JSON + CSV run report (optionally with cProfile output)
+
+Profiling is enabled by setting WUZZUF_PROFILE_DIR to a report directory;
+WUZZUF_PROFILE_CPROFILE=1 additionally captures a cProfile of the whole run.
+When disabled, stages are no-ops.
+"""
+
+import csv
+import functools
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_DIR_ENV = 'WUZZUF_PROFILE_DIR'
+CPROFILE_ENV = 'WUZZUF_PROFILE_CPROFILE'
+
+REPORT_COLUMNS = [
+    'run', 'stage', 'path', 'depth', 'status', 'start_s', 'wall_s', 'cpu_s',
+    'peak_rss_mb', 'rss_start_mb', 'rss_end_mb', 'bytes_read', 'bytes_written',
+    'rows_in', 'rows_out'
+]
+
+# Profilers of the runs currently executing (innermost last)
+_ACTIVE = []
+
+
+def _read_proc_status() -> Dict[str, int]:
+    """VmRSS / VmHWM from /proc/self/status in kB (empty off Linux)"""
+    values = {}
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    key, value = line.split(':', 1)
+                    values[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return values
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS watermark so it can be measured per stage"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _read_io() -> Dict[str, int]:
+    """Bytes read/written by this process (rchar/wchar from /proc/self/io)"""
+    values = {}
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                values[key] = int(value)
+    except OSError:
+        pass
+    return values
+
+
+def _cpu_seconds() -> float:
+    """User + system CPU time of this process and its waited-for children"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _rss_snapshot():
+    """(current RSS MB, peak RSS MB) with a getrusage fallback for the peak"""
+    status = _read_proc_status()
+    current = status.get('VmRSS')
+    peak = status.get('VmHWM')
+    if peak is None:
+        # ru_maxrss is the process-lifetime peak (kB on Linux)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    return (current / 1024 if current is not None else None, peak / 1024)
+
+
+class StageHandle:
+    """Mutable per-stage record exposed to the instrumented code"""
+
+    def __init__(self, name: str = '', path: str = '', depth: int = 0):
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.rows_in = None
+        self.rows_out = None
+        self.child_peak_mb = 0.0
+
+    def set_rows(self, rows_in: Optional[int] = None, rows_out: Optional[int] = None):
+        """Record the number of rows a stage consumed and/or produced"""
+        if rows_in is not None:
+            self.rows_in = int(rows_in)
+        if rows_out is not None:
+            self.rows_out = int(rows_out)
+
+
+class StageProfiler:
+    """
+    Collects stage records for one pipeline run
+
+    Args:
+        run_name: Name of the run (used in the report file names)
+        report_dir: Directory for the JSON/CSV report (None: do not write)
+        cprofile: Capture a cProfile of the run
+    """
+
+    def __init__(self, run_name: str, report_dir=None, cprofile: bool = False):
+        self.run_name = run_name
+        self.report_dir = Path(report_dir) if report_dir else None
+        self.cprofile = None
+        if cprofile:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+        self.started = datetime.now()
+        self._t0 = time.perf_counter()
+        self.records: List[Dict] = []
+        self._stack: List[StageHandle] = []
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None):
+        """
+        Measure one stage; nested stages are recorded with their parent path
+
+        Yields:
+            StageHandle on which rows in/out can be set
+        """
+        parent = self._stack[-1] if self._stack else None
+        handle = StageHandle(
+            name,
+            f'{parent.path}/{name}' if parent else name,
+            len(self._stack)
+        )
+        handle.set_rows(rows_in=rows_in)
+        self._stack.append(handle)
+
+        # Fold the peak seen so far into the parent before resetting the watermark
+        if parent is not None:
+            parent.child_peak_mb = max(parent.child_peak_mb, _rss_snapshot()[1])
+        _reset_peak_rss()
+        rss_start, _ = _rss_snapshot()
+        io_start = _read_io()
+        cpu_start = _cpu_seconds()
+        wall_start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield handle
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = _cpu_seconds() - cpu_start
+            io_end = _read_io()
+            rss_end, peak = _rss_snapshot()
+            peak = max(peak, handle.child_peak_mb)
+            self._stack.pop()
+            if parent is not None:
+                parent.child_peak_mb = max(parent.child_peak_mb, peak)
+
+            self.records.append({
+                'run': self.run_name,
+                'stage': name,
+                'path': handle.path,
+                'depth': handle.depth,
+                'status': status,
+                'start_s': round(wall_start - self._t0, 6),
+                'wall_s': round(wall, 6),
+                'cpu_s': round(cpu, 6),
+                'peak_rss_mb': round(peak, 2),
+                'rss_start_mb': round(rss_start, 2) if rss_start is not None else None,
+                'rss_end_mb': round(rss_end, 2) if rss_end is not None else None,
+                'bytes_read': io_end['rchar'] - io_start['rchar'] if 'rchar' in io_start else None,
+                'bytes_written': io_end['wchar'] - io_start['wchar'] if 'wchar' in io_start else None,
+                'rows_in': handle.rows_in,
+                'rows_out': handle.rows_out
+            })
+
+    def write_report(self, report_dir=None) -> Dict[str, Path]:
+        """
+        Write the run report as JSON and CSV (plus cProfile stats if captured)
+
+        Returns:
+            dict: Report kind -> written path
+        """
+        report_dir = Path(report_dir) if report_dir else self.report_dir
+        report_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.run_name}_{self.started.strftime('%Y%m%d_%H%M%S')}"
+        paths = {'json': report_dir / f'{stem}.json', 'csv': report_dir / f'{stem}.csv'}
+
+        with open(paths['json'], 'w', encoding='utf-8') as f:
+            json.dump({
+                'run': self.run_name,
+                'started': self.started.isoformat(timespec='seconds'),
+                'pid': os.getpid(),
+                'stages': sorted(self.records, key=lambda r: (r['start_s'], r['depth']))
+            }, f, indent=2)
+
+        with open(paths['csv'], 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(sorted(self.records, key=lambda r: (r['start_s'], r['depth'])))
+
+        if self.cprofile is not None:
+            paths['prof'] = report_dir / f'{stem}.prof'
+            paths['prof_txt'] = report_dir / f'{stem}.prof.txt'
+            import pstats
+            self.cprofile.dump_stats(str(paths['prof']))
+            buffer = io.StringIO()
+            pstats.Stats(self.cprofile, stream=buffer).sort_stats('cumulative').print_stats(40)
+            paths['prof_txt'].write_text(buffer.getvalue(), encoding='utf-8')
+
+        return paths
+
+    def format_summary(self) -> str:
+        """Stage table for console output"""
+        lines = [f"{'stage':<40} {'wall s':>9} {'cpu s':>9} {'peak MB':>9} {'rows out':>10}"]
+        for record in sorted(self.records, key=lambda r: (r['start_s'], r['depth'])):
+            label = '  ' * record['depth'] + record['stage']
+            rows_out = '' if record['rows_out'] is None else f"{record['rows_out']:,}"
+            lines.append(f"{label:<40} {record['wall_s']:>9.3f} {record['cpu_s']:>9.3f} "
+                         f"{record['peak_rss_mb']:>9.1f} {rows_out:>10}")
+        return '\n'.join(lines)
+
+
+def profiling_enabled() -> bool:
+    """True when WUZZUF_PROFILE_DIR is set or a run is being profiled"""
+    return bool(_ACTIVE) or bool(os.environ.get(PROFILE_DIR_ENV))
+
+
+def current_profiler() -> Optional[StageProfiler]:
+    """Profiler of the innermost active run, if any"""
+    return _ACTIVE[-1] if _ACTIVE else None
+
+
+@contextmanager
+def stage(name: str, rows_in: Optional[int] = None):
+    """
+    Record a stage of the active run (no-op when profiling is disabled)
+
+    Example:
+        with stage('load_jobs') as st:
+            jobs_df = pd.read_csv(path)
+            st.set_rows(rows_out=len(jobs_df))
+    """
+    profiler = current_profiler()
+    if profiler is None:
+        yield StageHandle(name)
+        return
+    with profiler.stage(name, rows_in=rows_in) as handle:
+        yield handle
+
+
+@contextmanager
+def profile_run(run_name: str, report_dir=None, cprofile: Optional[bool] = None):
+    """
+    Profile a whole pipeline run and write its report on exit
+
+    Nested inside another profiled run it is recorded as a stage of that run.
+    Without report_dir and WUZZUF_PROFILE_DIR it does nothing.
+    """
+    outer = current_profiler()
+    if outer is not None:
+        with outer.stage(run_name) as handle:
+            yield handle
+        return
+
+    report_dir = report_dir or os.environ.get(PROFILE_DIR_ENV)
+    if not report_dir:
+        yield StageHandle(run_name)
+        return
+
+    if cprofile is None:
+        cprofile = os.environ.get(CPROFILE_ENV, '').lower() in ('1', 'true', 'yes')
+    profiler = StageProfiler(run_name, report_dir, cprofile=cprofile)
+    _ACTIVE.append(profiler)
+    if profiler.cprofile is not None:
+        profiler.cprofile.enable()
+    try:
+        with profiler.stage(run_name) as handle:
+            yield handle
+    finally:
+        if profiler.cprofile is not None:
+            profiler.cprofile.disable()
+        _ACTIVE.pop()
+        paths = profiler.write_report()
+        print(f"\n⏱️  Stage profile for {run_name}:")
+        print(profiler.format_summary())
+        print(f"   Report: {paths['json']}")
+
+
+def profiled(run_name: Optional[str] = None):
+    """Decorator form of profile_run for pipeline entry points"""
+    def decorator(func):
+        name = run_name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_run(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,498 @@
+"""
+Synthetic Wuzzuf-shaped data generator for Wuzzuf Job Market Analysis
+Learns marginal distributions from data/processed and emits raw-format and/or
+processed-format datasets at a chosen scale factor, deterministically seeded
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from salary_normalization import salary_outlier_mask
+from title_clustering import assign_roles
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / 'data' / 'processed'
+DEFAULT_OUTPUT_ROOT = Path(__file__).resolve().parent.parent / 'data' / 'synthetic'
+
+RAW_FILENAME = 'Wuzzuf-Jobs-Posting.csv'
+RAW_COLUMNS = [
+    'Job Posting ID', 'Job Posting Date', 'Job Title', 'Job Title Full', 'Job Title Additional Info',
+    'Job Position Type', 'Job Position Level', 'Years of Experience', 'Job Skills', 'Job Location',
+    'Minimum Pay', 'Maximum Pay', 'Pay Rate', 'Number of Applicants', 'Company Name',
+    'Company Industry', 'Company Size'
+]
+JOBS_COLUMNS = [
+    'job_id', 'posting_date', 'job_title', 'job_title_full', 'job_title_additional',
+    'position_type', 'position_level', 'years_experience', 'experience_level', 'city', 'country',
+    'salary_min', 'salary_max', 'salary_min_usd', 'salary_max_usd', 'salary_outlier',
+    'pay_rate', 'currency', 'applicants', 'company_name',
+    'company_industry', 'company_size', 'posting_year', 'posting_month', 'canonical_job_id', 'role_id'
+]
+
+FIRST_JOB_ID = 3_000_000_000
+HOURS_PER_YEAR = 40 * 52
+US_STATES = ['CA', 'NY', 'TX', 'WA', 'MA', 'IL', 'GA', 'NC', 'VA', 'CO', 'FL', 'NJ', 'PA', 'OH', 'AZ', 'MN']
+
+# Fallbacks for columns that the summary files do not describe (used only when
+# jobs.csv is not available to learn from)
+DEFAULT_CATEGORICALS = {
+    'job_title': {
+        'software engineer': 14, 'senior software engineer': 8, 'data engineer': 6, 'data analyst': 6,
+        'business analyst': 5, 'full stack developer': 5, 'java developer': 4, 'devops engineer': 4,
+        'data scientist': 4, 'systems administrator': 3, 'project manager': 3, 'qa engineer': 3,
+        'front end developer': 3, 'network engineer': 3, 'cloud engineer': 2, 'database administrator': 2,
+        'product manager': 2, 'security analyst': 2, 'machine learning engineer': 2, 'solutions architect': 2
+    },
+    'position_type': {'full time': 88, 'contract': 9, 'part time': 2, 'temporary': 1},
+    'position_level': {'mid-senior level': 62, 'entry level': 18, 'associate': 12, 'director': 5, 'internship': 3},
+    'company_size': {'10,001+ employees': 22, '1,001-5,000 employees': 18, '51-200 employees': 16,
+                     '201-500 employees': 14, '11-50 employees': 12, '501-1,000 employees': 10,
+                     '5,001-10,000 employees': 8},
+    'pay_rate': {'yearly': 80, 'hourly': 18, 'monthly': 2}
+}
+DEFAULT_YEARS = {'Entry': {0: 25, 1: 35, 2: 40}, 'Mid': {3: 40, 4: 25, 5: 35},
+                 'Senior': {6: 25, 7: 25, 8: 20, 10: 15, 12: 10, 15: 5}}
+# log-normal annual salary (median, sigma) per experience level; max/min spread ratio
+DEFAULT_SALARY = {'coverage': 0.3, 'spread': (1.25, 0.1),
+                  'levels': {'Entry': (65000, 0.3), 'Mid': (95000, 0.3), 'Senior': (130000, 0.3)}}
+
+
+def _distribution(values, weights) -> Dict:
+    """JSON-friendly categorical distribution"""
+    weights = np.asarray(weights, dtype=float)
+    keep = weights > 0
+    values = [v for v, k in zip(values, keep) if k]
+    weights = weights[keep]
+    return {'values': list(values), 'p': (weights / weights.sum()).tolist()}
+
+
+def _dist_from_counts(counts: Dict) -> Dict:
+    return _distribution(list(counts.keys()), list(counts.values()))
+
+
+def _dist_from_series(series: pd.Series, top: int = 2000) -> Dict:
+    counts = series.dropna().value_counts().head(top)
+    return _distribution(counts.index.tolist(), counts.to_numpy())
+
+
+def base_job_count(data_dir=DEFAULT_DATA_DIR) -> int:
+    """Postings in the processed data, the size that scale 1 reproduces"""
+    monthly = pd.read_csv(Path(data_dir) / 'monthly_trends_powerbi.csv', usecols=['posting_count'])
+    return int(monthly['posting_count'].sum())
+
+
+def learn_profile(data_dir=DEFAULT_DATA_DIR) -> Dict:
+    """
+    Learn the marginal distributions of the dataset from data/processed
+
+    Uses skills.csv, job_skills.csv and the Power BI summaries; when jobs.csv
+    is present, job titles, position/company attributes, years of experience
+    and salaries are learned from it as well, otherwise defaults are used.
+
+    Args:
+        data_dir: Directory with the processed files
+
+    Returns:
+        dict: JSON-serializable generation profile
+    """
+    data_dir = Path(data_dir)
+    monthly = pd.read_csv(data_dir / 'monthly_trends_powerbi.csv')
+    experience = pd.read_csv(data_dir / 'experience_summary_powerbi.csv')
+    location = pd.read_csv(data_dir / 'location_summary_powerbi.csv')
+    industry = pd.read_csv(data_dir / 'industry_summary_powerbi.csv')
+    skills = pd.read_csv(data_dir / 'skills.csv')
+    skills_summary = pd.read_csv(data_dir / 'skills_summary_powerbi.csv')
+    job_skills = pd.read_csv(data_dir / 'job_skills.csv')
+
+    base_jobs = int(monthly['posting_count'].sum())
+
+    # Skills per job (jobs without any skill are the difference to the job count)
+    per_job = job_skills.groupby('job_id').size()
+    hist = np.bincount(per_job.to_numpy())
+    hist[0] = max(base_jobs - len(per_job), 0)
+
+    popularity = skills[['skill_id']].merge(skills_summary[['skill_id', 'job_count']], on='skill_id', how='left')
+    popularity = popularity['job_count'].fillna(0).to_numpy() + 0.5
+
+    location = location[location['job_count'] > 0]
+    industry_known = industry['job_count'].sum()
+
+    profile = {
+        'base_jobs': base_jobs,
+        'months': {
+            'year': monthly['posting_year'].astype(int).tolist(),
+            'month': monthly['posting_month'].astype(int).tolist(),
+            'p': (monthly['posting_count'] / base_jobs).tolist()
+        },
+        'experience_level': _distribution(experience['experience_level'].tolist(), experience['job_count']),
+        'applicants_mean': dict(zip(experience['experience_level'], experience['applicants'].round(3))),
+        'location': {
+            'city': location['city'].tolist(),
+            'country': location['country'].tolist(),
+            'p': (location['job_count'] / location['job_count'].sum()).tolist()
+        },
+        'industry': _distribution(industry['company_industry'].tolist(), industry['job_count']),
+        'industry_missing': max(base_jobs - int(industry_known), 0) / base_jobs,
+        'companies_per_industry': dict(zip(industry['company_industry'], industry['company_count'].astype(int))),
+        'jobs_per_industry': dict(zip(industry['company_industry'], industry['job_count'].astype(int))),
+        'skills': skills.to_dict(orient='list'),
+        'skill_popularity': (popularity / popularity.sum()).tolist(),
+        'skills_per_job': (hist / hist.sum()).tolist(),
+        'categoricals': {name: _dist_from_counts(counts) for name, counts in DEFAULT_CATEGORICALS.items()},
+        'years': {level: _dist_from_counts(counts) for level, counts in DEFAULT_YEARS.items()},
+        'salary': {
+            'coverage': DEFAULT_SALARY['coverage'],
+            'spread': list(DEFAULT_SALARY['spread']),
+            'levels': {level: list(v) for level, v in DEFAULT_SALARY['levels'].items()}
+        },
+        'source': str(data_dir),
+        'learned_from_jobs': False
+    }
+
+    jobs_path = data_dir / 'jobs.csv'
+    if jobs_path.exists():
+        _learn_from_jobs(profile, pd.read_csv(jobs_path))
+
+    return profile
+
+
+def _learn_from_jobs(profile: Dict, jobs: pd.DataFrame):
+    """Refine the profile with distributions only the jobs table has"""
+    for column in ('job_title', 'position_type', 'position_level', 'company_size', 'pay_rate'):
+        if column in jobs.columns and jobs[column].notna().any():
+            profile['categoricals'][column] = _dist_from_series(jobs[column])
+
+    if {'experience_level', 'years_experience'} <= set(jobs.columns):
+        for level, group in jobs.groupby('experience_level'):
+            profile['years'][level] = _dist_from_series(group['years_experience'].astype(int))
+
+    if {'salary_min', 'salary_max', 'experience_level'} <= set(jobs.columns):
+        paid = jobs[(jobs['salary_min'] > 0) & (jobs['salary_max'] >= jobs['salary_min'])]
+        profile['salary']['coverage'] = len(paid) / len(jobs)
+        if len(paid) > 1:
+            ratio = np.log(paid['salary_max'] / paid['salary_min'])
+            profile['salary']['spread'] = [float(np.exp(ratio.median())), float(ratio.std() or 0.0)]
+        for level, group in paid.groupby('experience_level'):
+            if len(group) > 1:
+                log_min = np.log(group['salary_min'])
+                profile['salary']['levels'][level] = [float(np.exp(log_min.median())), float(log_min.std() or 0.0)]
+
+    profile['learned_from_jobs'] = True
+
+
+def _choice(rng, dist: Dict, size: int) -> np.ndarray:
+    return rng.choice(np.asarray(dist['values'], dtype=object), size=size, p=dist['p'])
+
+
+def _company_pool(profile: Dict, scale: float) -> Dict[str, np.ndarray]:
+    """Synthetic company names per industry, growing with the scale factor"""
+    pool = {}
+    for industry in profile['industry']['values']:
+        n = max(1, int(round(profile['companies_per_industry'].get(industry, 1) * scale)))
+        slug = ''.join(ch for ch in industry.title() if ch.isalnum())[:20]
+        pool[industry] = np.array([f'{slug} company {i:05d}' for i in range(1, n + 1)], dtype=object)
+    return pool
+
+
+def _sample_skills(rng, profile: Dict, n_jobs: int):
+    """
+    Sample a skill set per job (without replacement, popularity weighted)
+
+    Uses the Gumbel-top-k trick so a whole chunk is sampled in one shot.
+
+    Returns:
+        (row index per relationship, skill_id per relationship)
+    """
+    skill_ids = np.asarray(profile['skills']['skill_id'], dtype=np.int16)
+    log_p = np.log(np.asarray(profile['skill_popularity'], dtype=np.float32))
+    per_job = np.asarray(profile['skills_per_job'])
+    k = rng.choice(len(per_job), size=n_jobs, p=per_job)
+    k = np.minimum(k, len(skill_ids))
+    k_max = int(k.max()) if n_jobs else 0
+    if k_max == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int16)
+
+    keys = log_p + rng.gumbel(size=(n_jobs, len(skill_ids))).astype(np.float32)
+    top = np.argpartition(-keys, k_max - 1, axis=1)[:, :k_max]
+    order = np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+
+    mask = np.arange(k_max) < k[:, None]
+    rows = np.broadcast_to(np.arange(n_jobs)[:, None], mask.shape)[mask]
+    return rows.astype(np.int64), skill_ids[top[mask]]
+
+
+def _title_roles(profile: Dict):
+    """Role per generated job title, clustered like the cleaned data (title -> role_id, roles table)"""
+    titles = pd.Series(profile['categoricals']['job_title']['values'], dtype=object)
+    role_ids, roles, _ = assign_roles(titles)
+    return dict(zip(titles, role_ids)), roles
+
+
+def generate_chunk(profile: Dict, n_jobs: int, first_job_id: int, rng, companies: Dict,
+                   duplicate_rate: float = 0.0, role_of_title: Optional[Dict] = None):
+    """
+    Generate one chunk of synthetic postings
+
+    Returns:
+        (jobs_df, job_skills_df, raw_df)
+    """
+    # Posting dates follow the monthly volume curve
+    months = profile['months']
+    m = rng.choice(len(months['p']), size=n_jobs, p=months['p'])
+    year = np.asarray(months['year'])[m]
+    month = np.asarray(months['month'])[m]
+    month_start = pd.to_datetime(pd.DataFrame({'year': year, 'month': month, 'day': 1}))
+    days = month_start.dt.days_in_month.to_numpy()
+    posting_date = month_start + pd.to_timedelta((rng.random(n_jobs) * days).astype(int), unit='D')
+
+    level = _choice(rng, profile['experience_level'], n_jobs)
+    years = np.zeros(n_jobs, dtype=np.int64)
+    for lvl, dist in profile['years'].items():
+        idx = np.flatnonzero(level == lvl)
+        if len(idx):
+            years[idx] = _choice(rng, dist, len(idx)).astype(np.int64)
+
+    loc = profile['location']
+    li = rng.choice(len(loc['p']), size=n_jobs, p=loc['p'])
+    city = np.asarray(loc['city'], dtype=object)[li]
+    country = np.asarray(loc['country'], dtype=object)[li]
+
+    industry = _choice(rng, profile['industry'], n_jobs)
+    industry[rng.random(n_jobs) < profile['industry_missing']] = None
+    company = np.empty(n_jobs, dtype=object)
+    for ind, names in companies.items():
+        idx = np.flatnonzero(industry == ind)
+        if len(idx):
+            # Zipf-like: a few large employers post most jobs
+            weights = 1.0 / np.arange(1, len(names) + 1)
+            company[idx] = rng.choice(names, size=len(idx), p=weights / weights.sum())
+    missing_industry = np.flatnonzero(pd.isna(industry))
+    if len(missing_industry):
+        all_names = np.concatenate(list(companies.values()))
+        company[missing_industry] = rng.choice(all_names, size=len(missing_industry))
+
+    cats = profile['categoricals']
+    title = _choice(rng, cats['job_title'], n_jobs)
+    position_type = _choice(rng, cats['position_type'], n_jobs)
+    position_level = _choice(rng, cats['position_level'], n_jobs)
+    company_size = _choice(rng, cats['company_size'], n_jobs)
+
+    applicants_mean = np.array([profile['applicants_mean'].get(lvl, 15.0) for lvl in level], dtype=float)
+    applicants = rng.poisson(applicants_mean).astype(float)
+
+    # Salaries: annual values, then expressed in the posting's pay rate for the raw file
+    salary = profile['salary']
+    has_salary = rng.random(n_jobs) < salary['coverage']
+    salary_min = np.full(n_jobs, np.nan)
+    for lvl, (median, sigma) in salary['levels'].items():
+        idx = np.flatnonzero(has_salary & (level == lvl))
+        if len(idx):
+            salary_min[idx] = np.round(median * np.exp(rng.normal(0, sigma, len(idx))), -2)
+    spread = salary['spread'][0] * np.exp(rng.normal(0, salary['spread'][1], n_jobs))
+    salary_max = np.round(salary_min * np.maximum(spread, 1.0), -2)
+    pay_rate = np.where(has_salary, _choice(rng, cats['pay_rate'], n_jobs), None)
+    divisor = np.where(pay_rate == 'hourly', HOURS_PER_YEAR, np.where(pay_rate == 'monthly', 12, 1))
+    raw_min = np.round(salary_min / divisor, 2)
+    raw_max = np.round(salary_max / divisor, 2)
+    salary_min = raw_min * divisor
+    salary_max = raw_max * divisor
+
+    job_id = np.arange(first_job_id, first_job_id + n_jobs, dtype=np.int64)
+    jobs_df = pd.DataFrame({
+        'job_id': job_id,
+        'posting_date': posting_date.dt.strftime('%Y-%m-%d'),
+        'job_title': title,
+        'job_title_full': title,
+        'job_title_additional': None,
+        'position_type': position_type,
+        'position_level': position_level,
+        'years_experience': years,
+        'experience_level': level,
+        'city': city,
+        'country': country,
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        # Generated salaries are annual USD already; outliers are judged within the chunk
+        'salary_min_usd': np.round(salary_min, 2),
+        'salary_max_usd': np.round(salary_max, 2),
+        'salary_outlier': salary_outlier_mask((salary_min + salary_max) / 2),
+        'pay_rate': pay_rate,
+        'currency': 'USD',
+        'applicants': applicants,
+        'company_name': company,
+        'company_industry': industry,
+        'company_size': company_size,
+        'posting_year': year,
+        'posting_month': month,
+        # Generated postings are never reposts
+        'canonical_job_id': job_id,
+        'role_id': pd.array(pd.Series(title).map(role_of_title or {}), dtype='Int64')
+    }, columns=JOBS_COLUMNS)
+
+    rows, skill_ids = _sample_skills(rng, profile, n_jobs)
+    job_skills_df = pd.DataFrame({'job_id': job_id[rows], 'skill_id': skill_ids})
+
+    raw_df = _to_raw(jobs_df, rows, skill_ids, profile, raw_min, raw_max)
+    if duplicate_rate > 0 and n_jobs:
+        dup = raw_df.sample(frac=duplicate_rate, random_state=int(rng.integers(2**31)))
+        raw_df = pd.concat([raw_df, dup], ignore_index=True)
+
+    return jobs_df, job_skills_df, raw_df
+
+
+def _to_raw(jobs_df: pd.DataFrame, rows, skill_ids, profile: Dict, raw_min, raw_max) -> pd.DataFrame:
+    """Render a chunk in the original Wuzzuf CSV layout"""
+    # Python-list literal per job, as in the scraped "Job Skills" column;
+    # rows are sorted, so each job's skills are one contiguous slice
+    labels = np.array([repr(name.replace('_', ' ')) for name in profile['skills']['skill_name']], dtype=object)
+    id_to_pos = np.zeros(max(profile['skills']['skill_id']) + 1, dtype=np.int64)
+    id_to_pos[profile['skills']['skill_id']] = np.arange(len(labels))
+    quoted = labels[id_to_pos[skill_ids]]
+    bounds = np.searchsorted(rows, np.arange(len(jobs_df) + 1))
+    job_skills = ['[' + ', '.join(quoted[a:b]) + ']' for a, b in zip(bounds[:-1], bounds[1:])]
+
+    city = jobs_df['city'].astype(str)
+    country = jobs_df['country'].astype(str)
+    state = pd.Series(US_STATES, dtype=object).iloc[
+        city.map(lambda c: sum(map(ord, c)) % len(US_STATES))].to_numpy()
+    location = np.where(
+        country.str.lower() == 'united states',
+        np.where(city == 'Unknown', 'United States', city.str.title() + ', ' + state),
+        np.where(city == 'Unknown', np.where(country == 'Unknown', None, 'Unknown, ' + country),
+                 city.str.title() + ', ' + country)
+    )
+
+    return pd.DataFrame({
+        'Job Posting ID': jobs_df['job_id'],
+        'Job Posting Date': jobs_df['posting_date'],
+        'Job Title': jobs_df['job_title'].str.title(),
+        'Job Title Full': jobs_df['job_title_full'].str.title(),
+        'Job Title Additional Info': jobs_df['job_title_additional'],
+        'Job Position Type': jobs_df['position_type'].str.title(),
+        'Job Position Level': jobs_df['position_level'].str.title(),
+        'Years of Experience': jobs_df['years_experience'],
+        'Job Skills': job_skills,
+        'Job Location': location,
+        'Minimum Pay': raw_min,
+        'Maximum Pay': raw_max,
+        'Pay Rate': jobs_df['pay_rate'].str.title(),
+        'Number of Applicants': jobs_df['applicants'],
+        'Company Name': jobs_df['company_name'].str.title(),
+        'Company Industry': jobs_df['company_industry'].str.title(),
+        'Company Size': jobs_df['company_size']
+    }, columns=RAW_COLUMNS)
+
+
+def generate_dataset(output_dir, scale: float = 1.0, seed: int = 42, formats=('processed',),
+                     profile: Optional[Dict] = None, data_dir=DEFAULT_DATA_DIR,
+                     chunk_rows: int = 100_000, duplicate_rate: float = 0.0) -> Dict:
+    """
+    Generate a synthetic dataset of base_jobs * scale postings
+
+    Chunks are generated from independent child seeds and appended to the
+    output CSVs, so memory stays bounded at any scale and the result only
+    depends on (profile, scale, seed, chunk_rows).
+
+    Args:
+        output_dir: Directory to write into
+        scale: Multiple of the real dataset size (1.0 ~ 25k postings)
+        seed: Random seed
+        formats: Any of 'processed' (jobs/skills/roles/job_skills.csv) and 'raw'
+        profile: Pre-learned profile (default: learn from data_dir)
+        data_dir: Processed data to learn from
+        chunk_rows: Postings generated per chunk
+        duplicate_rate: Fraction of raw rows repeated (exercises de-duplication)
+
+    Returns:
+        dict: Generation manifest (also written as manifest.json)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    profile = profile or learn_profile(data_dir)
+    n_total = int(round(profile['base_jobs'] * scale))
+    companies = _company_pool(profile, scale)
+
+    processed = 'processed' in formats
+    raw = 'raw' in formats
+    paths = {
+        'jobs': output_dir / 'jobs.csv',
+        'job_skills': output_dir / 'job_skills.csv',
+        'raw': output_dir / RAW_FILENAME
+    }
+    role_of_title = None
+    if processed:
+        pd.DataFrame(profile['skills']).to_csv(output_dir / 'skills.csv', index=False)
+        role_of_title, roles = _title_roles(profile)
+        roles.to_csv(output_dir / 'roles.csv', index=False)
+
+    n_chunks = max(1, -(-n_total // chunk_rows))
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    counts = {'jobs': 0, 'job_skills': 0, 'raw_rows': 0}
+
+    for i, child in enumerate(seeds):
+        n = min(chunk_rows, n_total - i * chunk_rows)
+        rng = np.random.default_rng(child)
+        jobs_df, job_skills_df, raw_df = generate_chunk(
+            profile, n, FIRST_JOB_ID + i * chunk_rows, rng, companies, duplicate_rate, role_of_title
+        )
+        mode, header = ('w', True) if i == 0 else ('a', False)
+        if processed:
+            jobs_df.to_csv(paths['jobs'], mode=mode, header=header, index=False)
+            job_skills_df.to_csv(paths['job_skills'], mode=mode, header=header, index=False)
+        if raw:
+            raw_df.insert(0, 'Unnamed: 0', np.arange(counts['raw_rows'], counts['raw_rows'] + len(raw_df)))
+            raw_df.to_csv(paths['raw'], mode=mode, header=header, index=False)
+        counts['jobs'] += len(jobs_df)
+        counts['job_skills'] += len(job_skills_df)
+        counts['raw_rows'] += len(raw_df)
+
+    manifest = {
+        'scale': scale,
+        'seed': seed,
+        'chunk_rows': chunk_rows,
+        'duplicate_rate': duplicate_rate,
+        'formats': list(formats),
+        'profile_source': profile.get('source'),
+        'base_jobs': profile['base_jobs'],
+        'learned_from_jobs': profile.get('learned_from_jobs', False),
+        **counts
+    }
+    with open(output_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    with open(output_dir / 'profile.json', 'w', encoding='utf-8') as f:
+        json.dump(profile, f)
+
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Wuzzuf-shaped dataset')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiple of the postings in the processed data')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Output directory (default: data/synthetic/scale_<scale>)')
+    parser.add_argument('--data-dir', type=Path, default=DEFAULT_DATA_DIR,
+                        help='Processed data to learn distributions from')
+    parser.add_argument('--format', nargs='+', choices=['processed', 'raw'], default=['processed', 'raw'])
+    parser.add_argument('--chunk-rows', type=int, default=100_000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    output = args.output or DEFAULT_OUTPUT_ROOT / f'scale_{args.scale:g}'
+    print("🧪 Generating synthetic Wuzzuf dataset")
+    print("=" * 50)
+    start = time.perf_counter()
+    manifest = generate_dataset(output, args.scale, args.seed, args.format, data_dir=args.data_dir,
+                                chunk_rows=args.chunk_rows, duplicate_rate=args.duplicate_rate)
+    print(f"✅ {manifest['jobs']:,} jobs, {manifest['job_skills']:,} job-skill rows "
+          f"written to {output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
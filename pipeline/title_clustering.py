@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Job-title clustering for Wuzzuf Job Market Analysis
+Normalizes job titles (abbreviations, seniority markers, word order) and
+clusters the distinct forms by TF-IDF cosine similarity, blocking candidate
+pairs on shared rare tokens, so role-level counts do not split across
+"Sr. Software Engineer", "Senior Software Engineer" and "Software Engineer III"
+
+Usage:
+    python pipeline/title_clustering.py data/processed               # add role_id to jobs.csv, write roles.csv
+    python pipeline/title_clustering.py data/processed --threshold 0.85 --dry-run --top 20
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+THRESHOLD = 0.8
+
+# Prefix blocks up to this size are compared all-pairs; larger ones only
+# within a sliding window of WINDOW alphabetical neighbours
+MAX_BLOCK_SIZE = 128
+WINDOW = 16
+
+# Pairs scored per similarity batch, to bound memory
+PAIR_BATCH = 2_000_000
+
+ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'jnr': 'junior',
+    'eng': 'engineer', 'engr': 'engineer', 'dev': 'developer', 'mgr': 'manager',
+    'admin': 'administrator', 'sysadmin': 'administrator', 'asst': 'assistant', 'assoc': 'associate',
+    'coord': 'coordinator', 'exec': 'executive', 'rep': 'representative', 'acct': 'accountant',
+    'mktg': 'marketing', 'sw': 'software', 'ops': 'operations', 'swe': 'software engineer',
+}
+
+# Experience markers: the role is the same, experience_level already records them
+SENIORITY_WORDS = frozenset({
+    'senior', 'junior', 'mid', 'midlevel', 'entry', 'level', 'experienced',
+    'i', 'ii', 'iii', 'iv', 'v', '1', '2', '3', '4', '5',
+})
+
+STOPWORDS = frozenset({'a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'the', 'to', 'with'})
+
+# Multi-word spellings folded into one token before tokenizing
+_PHRASES = [
+    (re.compile(r'\bfront[\s-]*end\b'), 'frontend'),
+    (re.compile(r'\bback[\s-]*end\b'), 'backend'),
+    (re.compile(r'\bfull[\s-]*stack\b'), 'fullstack'),
+    (re.compile(r'\bdev[\s-]*ops\b'), 'devops'),
+    (re.compile(r'\bmid[\s-]*level\b'), 'midlevel'),
+]
+_TOKEN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9]+)*')
+
+
+def normalize_title(title):
+    """
+    Canonical token key of a job title
+
+    Lowercases, folds multi-word spellings and abbreviations, then drops
+    seniority markers, stopwords and bare numbers (unless nothing else is
+    left) and sorts the distinct tokens, so word order and punctuation do not
+    matter.
+
+    Args:
+        title (str): Raw job title
+
+    Returns:
+        str: Space-separated sorted tokens ('' for a title without words)
+    """
+    text = str(title).lower()
+    for pattern, replacement in _PHRASES:
+        text = pattern.sub(replacement, text)
+    words = ' '.join(ABBREVIATIONS.get(word, word) for word in _TOKEN.findall(text)).split()
+    core = [word for word in words
+            if word not in SENIORITY_WORDS and word not in STOPWORDS and not word.isdigit()]
+    return ' '.join(sorted(set(core or words)))
+
+
+def _has_seniority(title):
+    words = (ABBREVIATIONS.get(word, word) for word in _TOKEN.findall(str(title).lower()))
+    return any(word in SENIORITY_WORDS or word.isdigit() for word in words)
+
+
+def tfidf_vectors(keys):
+    """
+    L2-normalized TF-IDF vectors of token keys as CSR arrays
+
+    Entries within a row are ordered rarest token first (by document
+    frequency), which is the order prefix filtering relies on.
+
+    Args:
+        keys (list): Space-separated token keys (distinct tokens per key)
+
+    Returns:
+        tuple: (indptr, token ids, weights, document frequency per token id)
+    """
+    words = [key.split() for key in keys]
+    lengths = np.array([len(w) for w in words], dtype=np.int64)
+    codes, vocabulary = pd.factorize(pd.Series([w for ws in words for w in ws], dtype=object))
+    doc_freq = np.bincount(codes, minlength=len(vocabulary))
+    idf = np.log((1 + len(keys)) / (1 + doc_freq)) + 1
+
+    rows = np.repeat(np.arange(len(keys)), lengths)
+    weights = idf[codes]
+    norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=len(keys)))
+    weights = weights / np.where(norms > 0, norms, 1)[rows]
+    order = np.lexsort((codes, doc_freq[codes], rows))
+    return np.r_[0, np.cumsum(lengths)], codes[order], weights[order], doc_freq
+
+
+def candidate_pairs(indptr, tokens, weights, threshold=THRESHOLD, max_block_size=MAX_BLOCK_SIZE,
+                    window=WINDOW):
+    """
+    Candidate pairs of rows that may reach the cosine threshold
+
+    Prefix filtering: a row's prefix is its rarest tokens up to the point
+    where the remaining suffix has norm below the threshold. Two unit
+    vectors with cosine >= threshold always have their rarest shared token
+    in both prefixes, so only rows sharing a prefix token need comparing.
+    Prefix tokens are rare by construction and their blocks small; the few
+    oversized blocks are compared within a sliding window instead, which
+    keeps the pair count linear in the number of titles.
+
+    Returns:
+        np.ndarray: (pairs x 2) row positions, first < second
+    """
+    n = len(indptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    # Squared norm of each entry's suffix (the entry and every commoner token after it)
+    cumulative = np.r_[0, np.cumsum(weights ** 2)]
+    suffix = cumulative[indptr[1:]][rows] - cumulative[:-1]
+    in_prefix = suffix >= threshold ** 2 - 1e-9
+
+    # Prefix entries grouped by token; rows are alphabetical within each block
+    block_rows = rows[in_prefix]
+    block_tokens = tokens[in_prefix]
+    order = np.lexsort((block_rows, block_tokens))
+    block_rows, block_tokens = block_rows[order], block_tokens[order]
+    starts = np.flatnonzero(np.r_[True, block_tokens[1:] != block_tokens[:-1]])
+    sizes = np.diff(np.r_[starts, len(block_tokens)])
+
+    pairs = []
+    small = (sizes > 1) & (sizes <= max_block_size)
+    for size in np.unique(sizes[small]):
+        members = block_rows[starts[small & (sizes == size)][:, None] + np.arange(size)]
+        first, second = np.triu_indices(size, 1)
+        pairs.append(np.column_stack([members[:, first].ravel(), members[:, second].ravel()]))
+    large = sizes > max_block_size
+    if large.any():
+        label = np.repeat(np.arange(len(sizes)), sizes)
+        positions = np.flatnonzero(large[label])
+        for offset in range(1, window + 1):
+            same = label[positions[:-offset]] == label[positions[offset:]]
+            pairs.append(np.column_stack([block_rows[positions[:-offset][same]],
+                                          block_rows[positions[offset:][same]]]))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.vstack(pairs), axis=1).astype(np.int64)
+    keys = np.unique(pairs[:, 0] * n + pairs[:, 1])
+    return np.column_stack([keys // n, keys % n])
+
+
+def cosine_similarity(pairs, indptr, tokens, weights, batch=PAIR_BATCH):
+    """
+    Sparse dot products of the CSR rows in each pair
+
+    The first row's entries are expanded per pair and looked up among the
+    second row's entries through one sorted (row, token) key array.
+
+    Returns:
+        np.ndarray: Cosine similarity per pair
+    """
+    vocabulary_size = int(tokens.max()) + 1 if len(tokens) else 1
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    entry_keys = rows * vocabulary_size + tokens
+    by_key = np.argsort(entry_keys, kind='stable')
+    sorted_keys = entry_keys[by_key]
+
+    similarity = np.zeros(len(pairs))
+    for begin in range(0, len(pairs), batch):
+        first, second = pairs[begin:begin + batch, 0], pairs[begin:begin + batch, 1]
+        lengths = indptr[first + 1] - indptr[first]
+        pair = np.repeat(np.arange(len(first)), lengths)
+        entry = np.repeat(indptr[first], lengths) + np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths)
+        lookup = second[pair] * vocabulary_size + tokens[entry]
+        found = np.minimum(np.searchsorted(sorted_keys, lookup), len(sorted_keys) - 1)
+        hit = sorted_keys[found] == lookup
+        products = weights[entry[hit]] * weights[by_key[found[hit]]]
+        similarity[begin:begin + len(first)] = np.bincount(pair[hit], products, minlength=len(first))
+    return similarity
+
+
+def cluster_keys(keys, counts, threshold=THRESHOLD, max_block_size=MAX_BLOCK_SIZE, window=WINDOW):
+    """
+    Cluster root per key
+
+    Every key links to its most similar neighbour (cosine >= threshold) among
+    the more popular keys (more jobs, then alphabetical), and links are
+    followed to a root, so each cluster is named after a popular title and
+    never chains towards rarer ones.
+
+    Args:
+        keys (list): Distinct title keys
+        counts (np.ndarray): Jobs per key (popularity)
+        threshold (float): Minimum cosine similarity
+        max_block_size (int): Largest prefix block compared all-pairs
+        window (int): Neighbours compared within larger blocks
+
+    Returns:
+        tuple: (root position per key, stats dict)
+    """
+    n = len(keys)
+    indptr, tokens, weights, _ = tfidf_vectors(keys)
+    pairs = candidate_pairs(indptr, tokens, weights, threshold, max_block_size, window)
+    similarity = cosine_similarity(pairs, indptr, tokens, weights)
+    linked = pairs[similarity >= threshold - 1e-9]
+    similarity = similarity[similarity >= threshold - 1e-9]
+
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), -np.asarray(counts)))] = np.arange(n)
+    # Orient every edge from the less to the more popular key
+    child = np.where(rank[linked[:, 0]] > rank[linked[:, 1]], linked[:, 0], linked[:, 1])
+    parent = linked[:, 0] + linked[:, 1] - child
+    best = np.lexsort((rank[parent], -similarity, child))
+    first = np.r_[True, child[best][1:] != child[best][:-1]] if len(best) else np.empty(0, dtype=bool)
+
+    root = np.arange(n)
+    root[child[best][first]] = parent[best][first]
+    while True:
+        jumped = root[root]
+        if np.array_equal(jumped, root):
+            break
+        root = jumped
+    return root, {'candidate_pairs': int(len(pairs)), 'similar_pairs': int(len(linked))}
+
+
+def assign_roles(titles, threshold=THRESHOLD, max_block_size=MAX_BLOCK_SIZE, window=WINDOW):
+    """
+    Role id per job title
+
+    Distinct raw titles are normalized, the distinct keys clustered, and each
+    role named after the most frequent raw title of its root key (plain
+    titles before ones carrying a seniority marker). Role ids
+    follow sorted role names, like skill ids.
+
+    Args:
+        titles (pd.Series): Job titles, one per job
+        threshold (float): Minimum cosine similarity for merging keys
+        max_block_size (int): Largest prefix block compared all-pairs
+        window (int): Neighbours compared within larger blocks
+
+    Returns:
+        tuple: (Int64 role_id Series aligned with titles, roles DataFrame, stats dict)
+    """
+    codes, raw_titles = pd.factorize(titles)
+    title_counts = np.bincount(codes[codes >= 0], minlength=len(raw_titles))
+    key_of_title, keys = pd.factorize(pd.Series([normalize_title(t) for t in raw_titles], dtype=object),
+                                      sort=True)
+    key_counts = np.bincount(key_of_title, title_counts, minlength=len(keys))
+    root, stats = cluster_keys(list(keys), key_counts, threshold, max_block_size, window)
+
+    # Display name per key: its most frequent raw title, preferring ones without seniority markers
+    marked = np.array([_has_seniority(t) for t in raw_titles], dtype=bool)
+    by_count = np.lexsort((np.arange(len(raw_titles)), -title_counts, marked, key_of_title))
+    first = np.r_[True, key_of_title[by_count][1:] != key_of_title[by_count][:-1]][:len(by_count)]
+    display = np.empty(len(keys), dtype=object)
+    display[key_of_title[by_count][first]] = np.asarray(raw_titles, dtype=object)[by_count][first]
+
+    role_names = display[root[key_of_title]]
+    roles = (pd.DataFrame({'role_name': role_names})
+             .value_counts('role_name').rename('title_count').sort_index().reset_index())
+    roles.insert(0, 'role_id', np.arange(1, len(roles) + 1))
+    role_of_title = pd.Series(roles['role_id'].to_numpy(), index=roles['role_name'])[role_names].to_numpy()
+
+    role_ids = pd.Series(pd.array(np.where(codes >= 0, role_of_title[np.maximum(codes, 0)], 0), dtype='Int64'),
+                         index=titles.index, name='role_id')
+    role_ids[codes < 0] = pd.NA
+    stats.update({'titles': int(len(raw_titles)), 'keys': int(len(keys)), 'roles': int(len(roles))})
+    return role_ids, roles, stats
+
+
+def mark_roles(df, title_column='job_title', **kwargs):
+    """
+    Add a role_id column and build the roles dimension
+
+    Args:
+        df (pd.DataFrame): Jobs
+        title_column (str): Job title column
+        **kwargs: threshold, max_block_size, window
+
+    Returns:
+        tuple: (copy of df with role_id, roles DataFrame)
+    """
+    df = df.copy()
+    df['role_id'], roles, stats = assign_roles(df[title_column], **kwargs)
+    print(f"Job roles: {stats['titles']:,} distinct titles -> {stats['keys']:,} normalized forms -> "
+          f"{stats['roles']:,} roles ({stats['candidate_pairs']:,} candidate pairs compared)")
+    return df, roles
+
+
+def export_roles(roles_df, output_dir):
+    """Write the roles dimension next to jobs.csv"""
+    path = Path(output_dir) / 'roles.csv'
+    roles_df.to_csv(path, index=False)
+    print(f"  - roles.csv: {roles_df.shape[0]:,} rows, {roles_df.shape[1]} columns")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cluster job titles into roles (role_id in jobs.csv, roles.csv)')
+    parser.add_argument('data_dir', nargs='?', default='data/processed', help='Directory with jobs.csv')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='Minimum TF-IDF cosine similarity')
+    parser.add_argument('--top', type=int, default=0, help='Show the N largest roles and their titles')
+    parser.add_argument('--dry-run', action='store_true', help='Report without writing')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    jobs = pd.read_csv(data_dir / 'jobs.csv')
+    jobs, roles = mark_roles(jobs.drop(columns=['role_id'], errors='ignore'), threshold=args.threshold)
+
+    if args.top:
+        grouped = jobs.groupby('role_id')['job_title']
+        top = grouped.size().nlargest(args.top)
+        names = roles.set_index('role_id')['role_name']
+        for role_id, job_count in top.items():
+            variants = grouped.get_group(role_id).value_counts()
+            print(f"   {names[role_id]} ({job_count:,} jobs, {len(variants):,} titles): "
+                  f"{', '.join(variants.index[:5])}")
+    if args.dry_run:
+        return 0
+
+    tmp = data_dir / 'jobs.csv.tmp'
+    jobs.to_csv(tmp, index=False)
+    tmp.replace(data_dir / 'jobs.csv')
+    export_roles(roles, data_dir)
+    print(f"✅ Updated {data_dir / 'jobs.csv'}: {jobs['job_title'].nunique():,} titles in {len(roles):,} roles")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
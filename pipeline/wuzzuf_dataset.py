@@ -0,0 +1,369 @@
+"""
+Compact in-memory dataset for Wuzzuf Job Market Analysis
+Loads jobs, skills and job_skills once into integer-coded arrays that can be
+shared by every analysis module and saved/loaded as memory-mapped .npy files
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from skills_bridge import read_job_skills
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / 'data' / 'processed'
+DEFAULT_CACHE_DIR = DEFAULT_DATA_DIR / 'dataset'
+
+# Low-cardinality text columns stored as dictionary codes (-1 = missing)
+DIMENSION_COLUMNS = [
+    'job_title', 'position_type', 'position_level', 'experience_level',
+    'city', 'country', 'pay_rate', 'currency',
+    'company_name', 'company_industry', 'company_size'
+]
+
+# Numeric measures stored as float32 (NaN = missing)
+MEASURE_COLUMNS = ['years_experience', 'salary_min', 'salary_max', 'applicants']
+
+FORMAT_VERSION = 1
+
+
+def _code_dtype(n_values: int):
+    """Smallest signed integer dtype able to hold n_values codes plus -1"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def encode_column(series: pd.Series):
+    """
+    Dictionary-encode a column into compact integer codes
+
+    Args:
+        series: Column to encode
+
+    Returns:
+        tuple: (codes array, list of labels) with -1 marking missing values
+    """
+    codes, labels = pd.factorize(series, sort=True)
+    return codes.astype(_code_dtype(len(labels))), [str(label) for label in labels]
+
+
+class WuzzufDataset:
+    """
+    Integer-coded, columnar representation of the processed Wuzzuf data
+
+    Jobs are stored row-aligned: dimension columns as small int code arrays,
+    measures as float32 and keys as int64. Skills per job are held in a CSR
+    index (skill_indptr, skill_indices) aligned with the job rows.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], labels: Dict[str, List[str]],
+                 skills: Dict[str, np.ndarray], skill_labels: Dict[str, List[str]]):
+        self.arrays = arrays
+        self.labels = labels
+        self.skills = skills
+        self.skill_labels = skill_labels
+        self._job_positions = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_frames(cls, jobs_df: pd.DataFrame, skills_df: pd.DataFrame,
+                    job_skills_df: pd.DataFrame) -> 'WuzzufDataset':
+        """
+        Build the compact dataset from jobs, skills and job_skills DataFrames
+
+        Args:
+            jobs_df: Processed jobs table (jobs.csv layout)
+            skills_df: Skills dimension (skill_id, skill_name, skill_category)
+            job_skills_df: Bridge table (job_id, skill_id)
+
+        Returns:
+            WuzzufDataset instance
+        """
+        jobs_df = jobs_df.drop_duplicates(subset=['job_id']).reset_index(drop=True)
+
+        arrays = {'job_id': jobs_df['job_id'].to_numpy(dtype=np.int64)}
+        labels = {}
+
+        if 'posting_date' in jobs_df.columns:
+            dates = pd.to_datetime(jobs_df['posting_date'], errors='coerce')
+            arrays['posting_date'] = dates.to_numpy(dtype='datetime64[D]')
+            if 'posting_year' not in jobs_df.columns:
+                jobs_df = jobs_df.assign(posting_year=dates.dt.year, posting_month=dates.dt.month)
+
+        # role_id 0 = no role (ids start at 1, see title_clustering.py)
+        for col, dtype in (('posting_year', np.int16), ('posting_month', np.int8), ('role_id', np.int32)):
+            if col in jobs_df.columns:
+                arrays[col] = pd.to_numeric(jobs_df[col], errors='coerce').fillna(0).to_numpy(dtype=dtype)
+
+        for col in DIMENSION_COLUMNS:
+            if col in jobs_df.columns:
+                arrays[col], labels[col] = encode_column(jobs_df[col])
+
+        for col in MEASURE_COLUMNS:
+            if col in jobs_df.columns:
+                arrays[col] = pd.to_numeric(jobs_df[col], errors='coerce').to_numpy(dtype=np.float32)
+
+        # Skills dimension
+        skills_df = skills_df.sort_values('skill_id').reset_index(drop=True)
+        skills = {'skill_id': skills_df['skill_id'].to_numpy(dtype=np.int16)}
+        skill_labels = {'skill_name': skills_df['skill_name'].astype(str).tolist()}
+        if 'skill_category' in skills_df.columns:
+            skills['skill_category'], skill_labels['skill_category'] = encode_column(skills_df['skill_category'])
+
+        dataset = cls(arrays, labels, skills, skill_labels)
+        dataset.arrays.update(dataset._build_skill_index(job_skills_df))
+        return dataset
+
+    @classmethod
+    def from_csv(cls, data_dir=DEFAULT_DATA_DIR) -> 'WuzzufDataset':
+        """
+        Parse jobs.csv, skills.csv and job_skills.csv once into a compact dataset
+
+        Args:
+            data_dir: Directory containing the processed CSV files
+
+        Returns:
+            WuzzufDataset instance
+        """
+        data_dir = Path(data_dir)
+        jobs_df = pd.read_csv(data_dir / 'jobs.csv')
+        skills_df = pd.read_csv(data_dir / 'skills.csv')
+        job_skills_df = read_job_skills(data_dir / 'job_skills.csv')
+        return cls.from_frames(jobs_df, skills_df, job_skills_df)
+
+    def _build_skill_index(self, job_skills_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Build the CSR job -> skills index aligned with the job rows"""
+        job_ids = self.arrays['job_id']
+        order = np.argsort(job_ids, kind='stable')
+        sorted_ids = job_ids[order]
+
+        bridge_jobs = job_skills_df['job_id'].to_numpy(dtype=np.int64)
+        bridge_skills = job_skills_df['skill_id'].to_numpy(dtype=np.int16)
+
+        # Map bridge job_ids to row positions, dropping orphaned relationships
+        if len(sorted_ids) == 0:
+            pos = np.zeros(len(bridge_jobs), dtype=np.int64)
+            valid = np.zeros(len(bridge_jobs), dtype=bool)
+        else:
+            pos = np.clip(np.searchsorted(sorted_ids, bridge_jobs), 0, len(sorted_ids) - 1)
+            valid = sorted_ids[pos] == bridge_jobs
+        rows = order[pos[valid]]
+        skill_ids = bridge_skills[valid]
+
+        row_order = np.lexsort((skill_ids, rows))
+        rows = rows[row_order]
+        skill_ids = skill_ids[row_order]
+
+        counts = np.bincount(rows, minlength=len(job_ids))
+        indptr = np.zeros(len(job_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        return {'skill_indptr': indptr, 'skill_indices': skill_ids.astype(np.int16)}
+
+    # ------------------------------------------------------------------
+    # Persistence (pickle-free, memory-mapped)
+    # ------------------------------------------------------------------
+    def save(self, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Save the dataset as one .npy file per array plus a JSON dictionary file
+
+        Args:
+            cache_dir: Output directory
+        """
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        for name, array in self.arrays.items():
+            np.save(cache_dir / f'jobs.{name}.npy', array, allow_pickle=False)
+        for name, array in self.skills.items():
+            np.save(cache_dir / f'skills.{name}.npy', array, allow_pickle=False)
+
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'n_jobs': self.n_jobs,
+            'job_arrays': list(self.arrays),
+            'skill_arrays': list(self.skills),
+            'labels': self.labels,
+            'skill_labels': self.skill_labels
+        }
+        with open(cache_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, cache_dir=DEFAULT_CACHE_DIR, mmap: bool = True) -> 'WuzzufDataset':
+        """
+        Load a saved dataset; arrays are memory-mapped read-only by default
+
+        Args:
+            cache_dir: Directory written by save()
+            mmap: Memory-map arrays instead of reading them into memory
+
+        Returns:
+            WuzzufDataset instance
+        """
+        cache_dir = Path(cache_dir)
+        with open(cache_dir / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset format version: {meta.get('format_version')}")
+
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(cache_dir / f'jobs.{name}.npy', mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in meta['job_arrays']}
+        skills = {name: np.load(cache_dir / f'skills.{name}.npy', mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in meta['skill_arrays']}
+        return cls(arrays, meta['labels'], skills, meta['skill_labels'])
+
+    # ------------------------------------------------------------------
+    # Accessors
+    # ------------------------------------------------------------------
+    @property
+    def n_jobs(self) -> int:
+        return len(self.arrays['job_id'])
+
+    @property
+    def n_skills(self) -> int:
+        return len(self.skills['skill_id'])
+
+    @property
+    def n_relationships(self) -> int:
+        return len(self.arrays['skill_indices'])
+
+    def codes(self, column: str) -> np.ndarray:
+        """Integer codes for a dimension column"""
+        return self.arrays[column]
+
+    def categorical(self, column: str) -> pd.Categorical:
+        """Decode a dimension column as a pandas Categorical without copying strings per row"""
+        return pd.Categorical.from_codes(np.asarray(self.arrays[column]), categories=self.labels[column])
+
+    def rows_for_job_ids(self, job_ids) -> np.ndarray:
+        """Row positions for the given job_ids (-1 when unknown)"""
+        if self._job_positions is None:
+            order = np.argsort(self.arrays['job_id'], kind='stable')
+            self._job_positions = (order, np.asarray(self.arrays['job_id'])[order])
+        order, sorted_ids = self._job_positions
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        pos = np.clip(np.searchsorted(sorted_ids, job_ids), 0, max(len(sorted_ids) - 1, 0))
+        found = sorted_ids[pos] == job_ids
+        return np.where(found, order[pos], -1)
+
+    def skills_for_row(self, row: int) -> np.ndarray:
+        """skill_ids attached to the job at the given row"""
+        indptr = self.arrays['skill_indptr']
+        return np.asarray(self.arrays['skill_indices'][indptr[row]:indptr[row + 1]])
+
+    def skill_counts(self) -> pd.Series:
+        """Number of jobs per skill_id computed directly from the CSR index"""
+        counts = np.bincount(self.arrays['skill_indices'], minlength=int(self.skills['skill_id'].max()) + 1)
+        skill_ids = np.asarray(self.skills['skill_id'])
+        return pd.Series(counts[skill_ids], index=skill_ids, name='job_count')
+
+    def jobs_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Materialize the jobs table as a DataFrame with categorical dimensions
+
+        Args:
+            columns: Subset of columns to materialize (default: all)
+
+        Returns:
+            DataFrame aligned with the dataset rows
+        """
+        available = [name for name in self.arrays if not name.startswith('skill_')]
+        columns = columns or available
+        data = {}
+        for col in columns:
+            if col in self.labels:
+                data[col] = self.categorical(col)
+            else:
+                data[col] = np.asarray(self.arrays[col])
+        return pd.DataFrame(data)
+
+    def skills_frame(self) -> pd.DataFrame:
+        """Skills dimension as a DataFrame"""
+        frame = pd.DataFrame({
+            'skill_id': np.asarray(self.skills['skill_id']),
+            'skill_name': self.skill_labels['skill_name']
+        })
+        if 'skill_category' in self.skills:
+            frame['skill_category'] = pd.Categorical.from_codes(
+                np.asarray(self.skills['skill_category']), categories=self.skill_labels['skill_category'])
+        return frame
+
+    def job_skills_frame(self) -> pd.DataFrame:
+        """Expand the CSR index back into a (job_id, skill_id) bridge table"""
+        counts = np.diff(self.arrays['skill_indptr'])
+        return pd.DataFrame({
+            'job_id': np.repeat(np.asarray(self.arrays['job_id']), counts),
+            'skill_id': np.asarray(self.arrays['skill_indices'])
+        })
+
+    def memory_usage(self) -> int:
+        """Total bytes held by the dataset arrays"""
+        return int(sum(np.asarray(a).nbytes for a in self.arrays.values()) +
+                   sum(np.asarray(a).nbytes for a in self.skills.values()))
+
+
+_DATASET_CACHE = {}
+
+
+def load_dataset(data_dir=DEFAULT_DATA_DIR, cache_dir=None, rebuild: bool = False) -> WuzzufDataset:
+    """
+    Shared entry point for analysis modules
+
+    Returns an already-loaded dataset for the same directory while it is current,
+    otherwise memory-maps the saved .npy cache, rebuilding it from the CSV files
+    when the cache is missing or older than the sources.
+
+    Args:
+        data_dir: Directory containing the processed CSV files
+        cache_dir: Directory holding the .npy cache (default: <data_dir>/dataset)
+        rebuild: Force a rebuild from CSV
+
+    Returns:
+        WuzzufDataset instance
+    """
+    data_dir = Path(data_dir)
+    cache_dir = Path(cache_dir) if cache_dir else data_dir / 'dataset'
+    key = str(cache_dir.resolve())
+
+    sources = [data_dir / name for name in ('jobs.csv', 'skills.csv', 'job_skills.csv')]
+    meta_file = cache_dir / 'meta.json'
+    stale = rebuild or not meta_file.exists() or any(
+        src.exists() and src.stat().st_mtime > meta_file.stat().st_mtime for src in sources)
+    if not stale and key in _DATASET_CACHE:
+        return _DATASET_CACHE[key]
+
+    if stale:
+        dataset = WuzzufDataset.from_csv(data_dir)
+        dataset.save(cache_dir)
+    dataset = WuzzufDataset.load(cache_dir)
+
+    _DATASET_CACHE[key] = dataset
+    return dataset
+
+
+if __name__ == "__main__":
+    import time
+
+    print("📦 Building compact Wuzzuf dataset")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    dataset = load_dataset(rebuild=True)
+    print(f"✅ Built and saved in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    WuzzufDataset.load(DEFAULT_CACHE_DIR)
+    print(f"✅ Memory-mapped load in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"   Jobs: {dataset.n_jobs:,}")
+    print(f"   Skills: {dataset.n_skills:,}")
+    print(f"   Job-skill relationships: {dataset.n_relationships:,}")
+    print(f"   Array memory: {dataset.memory_usage() / (1024 * 1024):.2f} MB")
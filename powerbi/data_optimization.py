@@ -3,21 +3,97 @@
 
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Shared data-layer modules
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from skills_bridge import read_job_skills
+from stage_profiler import profiled, stage
+from export_writer import ExportWriter, write_text_if_changed
+from quantile_sketch import build_sketches
+from partitioned_export import PartitionedExporter, PARTITION_DIRNAME, PARTITION_MANIFEST, UNDATED_KEY, partition_key_series
+
 class PowerBIDataOptimizer:
     """
     Optimizes data files for Power BI dashboard performance
+
+    All outputs go through a shared ExportWriter, so an output is only
+    rewritten when the source files it is derived from have changed.
     """
     
-    def __init__(self, input_dir='../data/processed', output_dir='../data/processed'):
+    # Source files (in input_dir) that each export output is derived from
+    EXPORT_INPUTS = {
+        'jobs_powerbi.csv': ['jobs.csv'],
+        'skills_powerbi.csv': ['skills.csv'],
+        'job_skills_powerbi.csv': ['job_skills.csv'],
+        'skills_summary_powerbi.csv': ['jobs.csv', 'skills.csv', 'job_skills.csv'],
+        'monthly_trends_powerbi.csv': ['jobs.csv'],
+        'experience_summary_powerbi.csv': ['jobs.csv'],
+        'location_summary_powerbi.csv': ['jobs.csv'],
+        'industry_summary_powerbi.csv': ['jobs.csv'],
+        'salary_sketches.csv': ['jobs.csv'],
+        'role_summary_powerbi.csv': ['jobs.csv', 'roles.csv'],
+        f'{PARTITION_DIRNAME}/{PARTITION_MANIFEST}': ['jobs.csv', 'job_skills.csv']
+    }
+    
+    # Inputs that older bundles (or runs without title clustering) do not have;
+    # outputs derived from them are written empty (header only) until they appear
+    OPTIONAL_INPUTS = {'roles.csv'}
+    
+    ROLE_SUMMARY_COLUMNS = ['role_id', 'job_count', 'salary_avg', 'role_name', 'title_count', 'percentage']
+    
+    # Bump when the transformations change so existing outputs are rebuilt
+    EXPORT_VERSION = 5
+    
+    SUMMARY_OUTPUTS = {
+        'skills_summary': 'skills_summary_powerbi.csv',
+        'monthly_trends': 'monthly_trends_powerbi.csv',
+        'experience_summary': 'experience_summary_powerbi.csv',
+        'location_summary': 'location_summary_powerbi.csv',
+        'industry_summary': 'industry_summary_powerbi.csv',
+        'salary_sketches': 'salary_sketches.csv',
+        'role_summary': 'role_summary_powerbi.csv'
+    }
+    
+    # Finest grain of the salary quantile sketches; any coarser slice is a merge
+    SALARY_SKETCH_DIMENSIONS = ['city', 'experience_level', 'company_industry']
+    
+    def __init__(self, input_dir='../data/processed', output_dir='../data/processed', docs_dir='../powerbi'):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
+        self.docs_dir = Path(docs_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-    def optimize_jobs_table(self):
+        self.writer = ExportWriter(self.output_dir)
+    
+    def _inputs(self, output_name):
+        """Absolute source paths for an export output (missing optional inputs left out)"""
+        return [self.input_dir / name for name in self.EXPORT_INPUTS[output_name]
+                if name not in self.OPTIONAL_INPUTS or (self.input_dir / name).exists()]
+    
+    def _params(self, output_name):
+        """Build parameters recorded with an output (pass-through tables have none)"""
+        if output_name == 'job_skills_powerbi.csv':
+            return None
+        return {'export_version': self.EXPORT_VERSION}
+    
+    def stale_outputs(self, force=False):
+        """Export outputs whose sources changed (or which are missing/modified)"""
+        if force:
+            return list(self.EXPORT_INPUTS)
+        return [name for name in self.EXPORT_INPUTS
+                if not self.writer.is_current(name, self._inputs(name), self._params(name))]
+    
+    def _report_write(self, name, written, detail):
+        if written:
+            print(f"✅ Optimized table saved: {self.output_dir / name}")
+        else:
+            print(f"⏭️  {name} unchanged, skipped write")
+        print(f"   {detail}")
+        
+    def optimize_jobs_table(self, force=False):
         """Optimize jobs table for Power BI performance"""
         print("🔧 Optimizing jobs table for Power BI...")
         
@@ -31,9 +107,12 @@ class PowerBIDataOptimizer:
             'years_experience': 'Int8',  # Nullable integer
             'salary_min': 'float32',
             'salary_max': 'float32', 
+            'salary_min_usd': 'float32',
+            'salary_max_usd': 'float32',
             'applicants': 'float32',
             'posting_year': 'int16',
-            'posting_month': 'int8'
+            'posting_month': 'int8',
+            'role_id': 'Int32'
         }
         
         # Apply optimizations
@@ -56,25 +135,31 @@ class PowerBIDataOptimizer:
         
         # Add calculated columns for Power BI
         jobs_df['salary_avg'] = (jobs_df['salary_min'] + jobs_df['salary_max']) / 2
+        # Annual USD midpoint, left empty for flagged outliers (see pipeline/salary_normalization.py)
+        if {'salary_min_usd', 'salary_max_usd', 'salary_outlier'} <= set(jobs_df.columns):
+            jobs_df['salary_avg_usd'] = ((jobs_df['salary_min_usd'] + jobs_df['salary_max_usd']) / 2).where(
+                ~jobs_df['salary_outlier'].astype(bool))
+        else:
+            jobs_df['salary_avg_usd'] = jobs_df['salary_avg']
         jobs_df['has_salary'] = (~jobs_df['salary_min'].isna()).astype('category')
-        jobs_df['posting_date_key'] = jobs_df['posting_year'] * 100 + jobs_df['posting_month']
+        # Int32 so YYYYMM does not overflow the int16 posting_year
+        jobs_df['posting_date_key'] = jobs_df['posting_year'].astype('Int32') * 100 + jobs_df['posting_month']
         
         # Create month name for better visualization
         month_names = {1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr', 5: 'May', 6: 'Jun',
                       7: 'Jul', 8: 'Aug', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dec'}
         jobs_df['posting_month_name'] = jobs_df['posting_month'].map(month_names).astype('category')
         
-        # Save optimized file
-        output_file = self.output_dir / 'jobs_powerbi.csv'
-        jobs_df.to_csv(output_file, index=False)
-        
-        print(f"✅ Optimized jobs table saved: {output_file}")
-        print(f"   Original size: {len(jobs_df):,} rows")
-        print(f"   Columns: {len(jobs_df.columns)}")
+        # Save optimized file (skipped when jobs.csv is unchanged)
+        written = self.writer.write_csv('jobs_powerbi.csv', jobs_df,
+                                        self._inputs('jobs_powerbi.csv'), self._params('jobs_powerbi.csv'),
+                                        force=force)
+        self._report_write('jobs_powerbi.csv', written,
+                           f"Rows: {len(jobs_df):,}, Columns: {len(jobs_df.columns)}")
         
         return jobs_df
     
-    def optimize_skills_table(self):
+    def optimize_skills_table(self, force=False):
         """Optimize skills table for Power BI performance"""
         print("\n🔧 Optimizing skills table for Power BI...")
         
@@ -89,110 +174,272 @@ class PowerBIDataOptimizer:
         # Add skill name length for analysis
         skills_df['skill_name_length'] = skills_df['skill_name'].str.len().astype('int8')
         
-        # Save optimized file
-        output_file = self.output_dir / 'skills_powerbi.csv'
-        skills_df.to_csv(output_file, index=False)
-        
-        print(f"✅ Optimized skills table saved: {output_file}")
-        print(f"   Skills count: {len(skills_df):,}")
+        # Save optimized file (skipped when skills.csv is unchanged)
+        written = self.writer.write_csv('skills_powerbi.csv', skills_df,
+                                        self._inputs('skills_powerbi.csv'), self._params('skills_powerbi.csv'),
+                                        force=force)
+        self._report_write('skills_powerbi.csv', written, f"Skills count: {len(skills_df):,}")
         
         return skills_df
     
-    def optimize_job_skills_table(self):
-        """Optimize job_skills table for Power BI performance"""
-        print("\n🔧 Optimizing job_skills table for Power BI...")
+    def optimize_job_skills_table(self, force=False, load=True):
+        """
+        Publish the job_skills table for Power BI
         
-        # Load job_skills data
-        job_skills_df = pd.read_csv(self.input_dir / 'job_skills.csv')
+        The bridge table is exported unchanged, so it is hardlinked (or
+        symlinked) to job_skills.csv instead of being parsed and rewritten.
         
-        # Data type optimizations
-        job_skills_df['job_id'] = job_skills_df['job_id'].astype('int64')
-        job_skills_df['skill_id'] = job_skills_df['skill_id'].astype('int16')
+        Args:
+            force: Re-publish even if the output is current
+            load: Also return the relationships as a DataFrame
+        
+        Returns:
+            DataFrame with job_id and skill_id, or None when load is False
+        """
+        print("\n🔧 Optimizing job_skills table for Power BI...")
+        
+        source = self.input_dir / 'job_skills.csv'
+        written = self.writer.link('job_skills_powerbi.csv', source, force=force)
+        kind = self.writer.manifest['outputs']['job_skills_powerbi.csv']['kind']
+        if written:
+            print(f"✅ job_skills table published ({kind}): {self.output_dir / 'job_skills_powerbi.csv'}")
+        else:
+            print("⏭️  job_skills_powerbi.csv unchanged, skipped write")
         
-        # Save optimized file
-        output_file = self.output_dir / 'job_skills_powerbi.csv'
-        job_skills_df.to_csv(output_file, index=False)
+        if not load:
+            return None
         
-        print(f"✅ Optimized job_skills table saved: {output_file}")
+        # Load job_skills data (memory-mapped bridge when available)
+        job_skills_df = read_job_skills(source)
         print(f"   Relationships: {len(job_skills_df):,}")
         
         return job_skills_df
     
-    def create_aggregated_datasets(self, jobs_df, skills_df, job_skills_df):
-        """Create pre-aggregated datasets for dashboard performance"""
+    def create_aggregated_datasets(self, jobs_df, skills_df, job_skills_df, summaries=None, force=False):
+        """
+        Create pre-aggregated datasets for dashboard performance
+        
+        Args:
+            jobs_df, skills_df, job_skills_df: Optimized tables (only the ones
+                the requested summaries depend on are needed)
+            summaries: Names from SUMMARY_OUTPUTS to build (default: all)
+            force: Write even if an output is current
+        
+        Returns:
+            dict: Summary name -> DataFrame for the summaries that were built
+        """
         print("\n📊 Creating aggregated datasets for dashboard performance...")
+        summaries = list(self.SUMMARY_OUTPUTS) if summaries is None else summaries
+        results = {}
         
-        # 1. Skills summary for dashboard
-        skills_summary = (job_skills_df
-                         .groupby('skill_id')
-                         .size()
-                         .reset_index(name='job_count')
-                         .merge(skills_df[['skill_id', 'skill_name', 'skill_category']], on='skill_id')
-                         .sort_values('job_count', ascending=False))
+        def save(key, df, label):
+            name = self.SUMMARY_OUTPUTS[key]
+            written = self.writer.write_csv(name, df, self._inputs(name), self._params(name), force=force)
+            status = '✓' if written else '⏭️ unchanged,'
+            print(f"   {status} {label}")
+            results[key] = df
         
-        skills_summary['percentage'] = (skills_summary['job_count'] / len(jobs_df) * 100).round(2)
-        skills_summary.to_csv(self.output_dir / 'skills_summary_powerbi.csv', index=False)
-        print(f"   ✓ Skills summary: {len(skills_summary)} skills")
+        # 1. Skills summary for dashboard
+        if 'skills_summary' in summaries:
+            skills_summary = (job_skills_df
+                             .groupby('skill_id')
+                             .size()
+                             .reset_index(name='job_count')
+                             .merge(skills_df[['skill_id', 'skill_name', 'skill_category']], on='skill_id')
+                             .sort_values('job_count', ascending=False))
+            
+            skills_summary['percentage'] = (skills_summary['job_count'] / len(jobs_df) * 100).round(2)
+            save('skills_summary', skills_summary, f"Skills summary: {len(skills_summary)} skills")
         
         # 2. Monthly trends summary
-        monthly_trends = (jobs_df
-                         .groupby(['posting_year', 'posting_month', 'posting_month_name'])
-                         .size()
-                         .reset_index(name='posting_count'))
-        
-        monthly_trends['year_month'] = (monthly_trends['posting_year'].astype(str) + '-' + 
-                                       monthly_trends['posting_month'].astype(str).str.zfill(2))
-        monthly_trends.to_csv(self.output_dir / 'monthly_trends_powerbi.csv', index=False)
-        print(f"   ✓ Monthly trends: {len(monthly_trends)} periods")
+        if 'monthly_trends' in summaries:
+            monthly_trends = (jobs_df
+                             .groupby(['posting_year', 'posting_month', 'posting_month_name'])
+                             .size()
+                             .reset_index(name='posting_count'))
+            
+            monthly_trends['year_month'] = (monthly_trends['posting_year'].astype(str) + '-' + 
+                                           monthly_trends['posting_month'].astype(str).str.zfill(2))
+            save('monthly_trends', monthly_trends, f"Monthly trends: {len(monthly_trends)} periods")
         
         # 3. Experience level summary
-        experience_summary = (jobs_df
-                             .groupby('experience_level')
-                             .agg({
-                                 'job_id': 'count',
-                                 'salary_avg': 'mean',
-                                 'applicants': 'mean'
-                             })
-                             .reset_index()
-                             .rename(columns={'job_id': 'job_count'}))
-        
-        experience_summary['percentage'] = (experience_summary['job_count'] / len(jobs_df) * 100).round(2)
-        experience_summary.to_csv(self.output_dir / 'experience_summary_powerbi.csv', index=False)
-        print(f"   ✓ Experience summary: {len(experience_summary)} levels")
+        if 'experience_summary' in summaries:
+            experience_summary = (jobs_df
+                                 .groupby('experience_level')
+                                 .agg({
+                                     'job_id': 'count',
+                                     'salary_avg_usd': 'mean',
+                                     'applicants': 'mean'
+                                 })
+                                 .reset_index()
+                                 .rename(columns={'job_id': 'job_count', 'salary_avg_usd': 'salary_avg'}))
+            
+            experience_summary['percentage'] = (experience_summary['job_count'] / len(jobs_df) * 100).round(2)
+            save('experience_summary', experience_summary, f"Experience summary: {len(experience_summary)} levels")
         
         # 4. Location summary
-        location_summary = (jobs_df
-                           .groupby(['city', 'country'])
-                           .size()
-                           .reset_index(name='job_count')
-                           .sort_values('job_count', ascending=False))
-        
-        location_summary['percentage'] = (location_summary['job_count'] / len(jobs_df) * 100).round(2)
-        location_summary.to_csv(self.output_dir / 'location_summary_powerbi.csv', index=False)
-        print(f"   ✓ Location summary: {len(location_summary)} locations")
+        if 'location_summary' in summaries:
+            location_summary = (jobs_df
+                               .groupby(['city', 'country'])
+                               .size()
+                               .reset_index(name='job_count')
+                               .sort_values('job_count', ascending=False))
+            
+            location_summary['percentage'] = (location_summary['job_count'] / len(jobs_df) * 100).round(2)
+            save('location_summary', location_summary, f"Location summary: {len(location_summary)} locations")
         
         # 5. Company industry summary
-        industry_summary = (jobs_df
-                           .groupby('company_industry')
-                           .agg({
-                               'job_id': 'count',
-                               'company_name': 'nunique',
-                               'salary_avg': 'mean'
-                           })
-                           .reset_index()
-                           .rename(columns={'job_id': 'job_count', 'company_name': 'company_count'}))
-        
-        industry_summary['percentage'] = (industry_summary['job_count'] / len(jobs_df) * 100).round(2)
-        industry_summary = industry_summary.sort_values('job_count', ascending=False)
-        industry_summary.to_csv(self.output_dir / 'industry_summary_powerbi.csv', index=False)
-        print(f"   ✓ Industry summary: {len(industry_summary)} industries")
+        if 'industry_summary' in summaries:
+            industry_summary = (jobs_df
+                               .groupby('company_industry')
+                               .agg({
+                                   'job_id': 'count',
+                                   'company_name': 'nunique',
+                                   'salary_avg_usd': 'mean'
+                               })
+                               .reset_index()
+                               .rename(columns={'job_id': 'job_count', 'company_name': 'company_count',
+                                                'salary_avg_usd': 'salary_avg'}))
+            
+            industry_summary['percentage'] = (industry_summary['job_count'] / len(jobs_df) * 100).round(2)
+            industry_summary = industry_summary.sort_values('job_count', ascending=False)
+            save('industry_summary', industry_summary, f"Industry summary: {len(industry_summary)} industries")
+        
+        # 6. Salary quantile sketches (t-digest per city x experience x industry)
+        if 'salary_sketches' in summaries:
+            salary_sketches = build_sketches(jobs_df, self.SALARY_SKETCH_DIMENSIONS, 'salary_avg_usd')
+            save('salary_sketches', salary_sketches,
+                 f"Salary sketches: {len(salary_sketches)} groups, {int(salary_sketches['count'].sum()):,} salaries")
+        
+        # 7. Role summary (job titles clustered into canonical roles, pipeline/title_clustering.py)
+        if 'role_summary' in summaries:
+            roles_path = self.input_dir / 'roles.csv'
+            if not roles_path.exists() or 'role_id' not in jobs_df.columns:
+                # Processed data from before title clustering: keep the table in the model, empty
+                save('role_summary', pd.DataFrame(columns=self.ROLE_SUMMARY_COLUMNS),
+                     "Role summary: no roles.csv / role_id in the processed data, written empty")
+            else:
+                roles_df = pd.read_csv(roles_path)
+                role_summary = (jobs_df
+                               .groupby('role_id')
+                               .agg({
+                                   'job_id': 'count',
+                                   'salary_avg_usd': 'mean'
+                               })
+                               .reset_index()
+                               .rename(columns={'job_id': 'job_count', 'salary_avg_usd': 'salary_avg'})
+                               .merge(roles_df[['role_id', 'role_name', 'title_count']], on='role_id'))
+            
+                role_summary['percentage'] = (role_summary['job_count'] / len(jobs_df) * 100).round(2)
+                role_summary = role_summary.sort_values('job_count', ascending=False, kind='stable')
+                save('role_summary', role_summary, f"Role summary: {len(role_summary)} roles")
+        
+        return results
+    
+    def export_partitions(self, jobs_df, job_skills_df, force=False):
+        """
+        Write the fact and bridge tables as monthly partitions for incremental refresh
+        
+        Partitions are keyed by posting_date_key; only months whose content
+        changed are rewritten, so a refresh imports just the new data.
+        
+        Args:
+            jobs_df: Optimized jobs table (with posting_date_key)
+            job_skills_df: job_skills relationships
+            force: Rewrite every partition
+        
+        Returns:
+            dict: Per-table written/unchanged/removed partition keys
+        """
+        print("\n🗂️  Exporting monthly partitions for incremental refresh...")
+        exporter = PartitionedExporter(self.output_dir)
+        
+        job_keys = partition_key_series(jobs_df)
+        bridge_keys = job_skills_df['job_id'].map(pd.Series(job_keys.to_numpy(), index=jobs_df['job_id']))
+        bridge_keys = bridge_keys.fillna(UNDATED_KEY)
+        
+        # The bridge carries posting_date_key too, so its folder can be filtered on RangeStart/RangeEnd
+        bridge_df = job_skills_df.assign(posting_date_key=job_skills_df['job_id'].map(
+            pd.Series(jobs_df['posting_date_key'].astype('Int64').to_numpy(), index=jobs_df['job_id'])
+        ).astype('Int64'))
+        
+        stats = {
+            'jobs': exporter.export_table('jobs', jobs_df, job_keys, force=force),
+            'job_skills': exporter.export_table('job_skills', bridge_df, bridge_keys, force=force)
+        }
+        
+        name = f'{PARTITION_DIRNAME}/{PARTITION_MANIFEST}'
+        with self.writer.open(name, self._inputs(name), self._params(name), encoding='utf-8') as f:
+            f.write(exporter.manifest_text())
+        
+        for table, table_stats in stats.items():
+            print(f"   ✓ {table}: {len(table_stats['written'])} partitions written, "
+                  f"{len(table_stats['unchanged'])} unchanged, {len(table_stats['removed'])} removed")
+        
+        return stats
+    
+    def export_tables(self, force=False):
+        """
+        Refresh the Power BI tables and summaries, touching only stale outputs
+        
+        Sources are loaded lazily: a table is read only when it or one of
+        the summaries derived from it needs rewriting.
+        
+        Args:
+            force: Rebuild every output regardless of the manifest
+        
+        Returns:
+            dict: Loaded tables (None when not needed), built summaries and
+                  the writer's written/skipped file lists
+        """
+        stale = set(self.stale_outputs(force))
+        stale_summaries = [key for key, name in self.SUMMARY_OUTPUTS.items() if name in stale]
+        
+        if not stale:
+            print("✅ Power BI bundle is up to date, nothing to rewrite")
+        self.writer.skipped.extend(name for name in self.EXPORT_INPUTS if name not in stale)
+        
+        need_partitions = f'{PARTITION_DIRNAME}/{PARTITION_MANIFEST}' in stale
+        need_jobs = 'jobs_powerbi.csv' in stale or bool(stale_summaries) or need_partitions
+        need_skills = 'skills_powerbi.csv' in stale or 'skills_summary' in stale_summaries
+        need_bridge = 'skills_summary' in stale_summaries or need_partitions
+        
+        jobs_df = skills_df = job_skills_df = None
+        if need_jobs:
+            with stage('jobs_table') as st:
+                jobs_df = self.optimize_jobs_table(force)
+                st.set_rows(rows_out=len(jobs_df))
+        if need_skills:
+            with stage('skills_table') as st:
+                skills_df = self.optimize_skills_table(force)
+                st.set_rows(rows_out=len(skills_df))
+        if 'job_skills_powerbi.csv' in stale or need_bridge:
+            with stage('job_skills_table') as st:
+                job_skills_df = self.optimize_job_skills_table(force, load=need_bridge)
+                st.set_rows(rows_out=None if job_skills_df is None else len(job_skills_df))
+        
+        summaries = {}
+        if stale_summaries:
+            with stage('summaries') as st:
+                summaries = self.create_aggregated_datasets(jobs_df, skills_df, job_skills_df,
+                                                            summaries=stale_summaries, force=force)
+                st.set_rows(rows_out=sum(len(df) for df in summaries.values()))
+        
+        partitions = {}
+        if need_partitions:
+            with stage('partitions') as st:
+                partitions = self.export_partitions(jobs_df, job_skills_df, force=force)
+                st.set_rows(rows_in=len(jobs_df) + len(job_skills_df))
+        
+        self.writer.save_manifest()
         
         return {
-            'skills_summary': skills_summary,
-            'monthly_trends': monthly_trends,
-            'experience_summary': experience_summary,
-            'location_summary': location_summary,
-            'industry_summary': industry_summary
+            'jobs_df': jobs_df,
+            'skills_df': skills_df,
+            'job_skills_df': job_skills_df,
+            'summaries': summaries,
+            'partitions': partitions,
+            **self.writer.summary()
         }
     
     def create_data_model_documentation(self):
@@ -213,16 +460,19 @@ This document describes the optimized data model for the Wuzzuf Job Market Analy
 - `job_id` (Primary Key): Unique identifier for each job posting
 - `posting_date`: Date when job was posted
 - `job_title`: Standardized job title
+- `role_id`: Canonical role the title was clustered into (see role_summary_powerbi.csv)
 - `experience_level`: Entry/Mid/Senior categorization
 - `city`, `country`: Location information
-- `salary_min`, `salary_max`, `salary_avg`: Compensation data
+- `salary_min`, `salary_max`, `salary_avg`: Compensation data as posted
+- `salary_min_usd`, `salary_max_usd`, `salary_avg_usd`: Annual USD salary (average empty for outliers)
+- `salary_outlier`: Salary flagged as implausible by the robust outlier test
 - `company_name`, `company_industry`: Company information
 - `posting_year`, `posting_month`: Date components for time analysis
 
 **Optimizations Applied:**
 - Categorical data types for text fields
 - Optimized numeric types (int8, int16, float32)
-- Added calculated columns (salary_avg, has_salary)
+- Added calculated columns (salary_avg, salary_avg_usd, has_salary)
 - Date parsing and validation
 
 ### 2. skills_powerbi.csv (Dimension Table)
@@ -260,7 +510,7 @@ This document describes the optimized data model for the Wuzzuf Job Market Analy
 
 ### 6. experience_summary_powerbi.csv
 **Description:** Pre-calculated experience level statistics
-**Columns:** experience_level, job_count, salary_avg, applicants, percentage
+**Columns:** experience_level, job_count, salary_avg (annual USD, outliers excluded), applicants, percentage
 
 ### 7. location_summary_powerbi.csv
 **Description:** Pre-calculated location statistics
@@ -268,7 +518,16 @@ This document describes the optimized data model for the Wuzzuf Job Market Analy
 
 ### 8. industry_summary_powerbi.csv
 **Description:** Pre-calculated industry statistics
-**Columns:** company_industry, job_count, company_count, salary_avg, percentage
+**Columns:** company_industry, job_count, company_count, salary_avg (annual USD, outliers excluded), percentage
+
+### 9. role_summary_powerbi.csv
+**Description:** Pre-calculated statistics per canonical role (title variants such as "sr. software engineer" and "software engineer iii" counted once)
+**Columns:** role_id, job_count, salary_avg (annual USD, outliers excluded), role_name, title_count, percentage
+**Note:** Header-only until the role clustering step has written roles.csv
+
+### salary_sketches.csv (not imported)
+**Description:** Mergeable t-digest of annual USD salaries (outliers excluded) per city, experience level and industry, for percentile queries (`python analysis/salary_percentiles.py`)
+**Columns:** city, experience_level, company_industry, count, min, max, centroids
 
 ## Recommended Relationships in Power BI
 
@@ -298,7 +557,18 @@ jobs_powerbi (1) ←→ (*) job_skills_powerbi ←→ (*) (1) skills_powerbi
 2. **Limit Data Import:** Consider date range filters if needed
 3. **Optimize Relationships:** Use the recommended relationship structure
 4. **Column Selection:** Import only necessary columns for your dashboard
-5. **Data Refresh:** Set up incremental refresh if data updates regularly
+5. **Data Refresh:** Use the monthly partitions below for incremental refresh
+
+## Incremental Refresh (Monthly Partitions)
+The fact and bridge tables are also exported as one file per month under
+`data/processed/powerbi_partitions/`, keyed by `posting_date_key` (YYYYMM):
+- `jobs/jobs_YYYYMM.csv` and `job_skills/job_skills_YYYYMM.csv` (job_id, skill_id, posting_date_key)
+- `partitions.json` lists each partition's file, row count, SHA-256 hash and last update time
+
+Only months whose content changed are rewritten, so a refresh only needs to
+re-import the partitions whose `updated` timestamp is newer than the last refresh.
+Load the folders with Power Query's Folder connector and filter on
+`posting_date_key` between `RangeStart`/`RangeEnd` to enable incremental refresh.
 
 ## File Sizes (Approximate)
 - jobs_powerbi.csv: ~8MB
@@ -323,13 +593,12 @@ jobs_powerbi (1) ←→ (*) job_skills_powerbi ←→ (*) (1) skills_powerbi
 - [ ] Categorical fields showing proper values
 """
         
-        # Save documentation
-        doc_file = Path('../powerbi/data_model_documentation.md')
-        doc_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(doc_file, 'w', encoding='utf-8') as f:
-            f.write(documentation)
-        
-        print(f"✅ Data model documentation saved: {doc_file}")
+        # Save documentation (left untouched when the content is the same)
+        doc_file = self.docs_dir / 'data_model_documentation.md'
+        if write_text_if_changed(doc_file, documentation):
+            print(f"✅ Data model documentation saved: {doc_file}")
+        else:
+            print(f"⏭️  {doc_file} unchanged, skipped write")
         
         return documentation
     
@@ -392,6 +661,7 @@ jobs_powerbi (1) ←→ (*) job_skills_powerbi ←→ (*) (1) skills_powerbi
 - [ ] Import experience_summary_powerbi.csv
 - [ ] Import location_summary_powerbi.csv
 - [ ] Import industry_summary_powerbi.csv
+- [ ] Import role_summary_powerbi.csv (relate on role_id)
 
 ## Final Validation
 - [ ] Create test visual with job count by experience level
@@ -422,52 +692,40 @@ For questions about this data model, refer to the project documentation or data
 """
         
         # Save checklist
-        checklist_file = Path('../powerbi/import_validation_checklist.md')
-        with open(checklist_file, 'w', encoding='utf-8') as f:
-            f.write(checklist)
-        
-        print(f"✅ Import validation checklist saved: {checklist_file}")
+        checklist_file = self.docs_dir / 'import_validation_checklist.md'
+        if write_text_if_changed(checklist_file, checklist):
+            print(f"✅ Import validation checklist saved: {checklist_file}")
+        else:
+            print(f"⏭️  {checklist_file} unchanged, skipped write")
         
         return checklist
     
-    def run_optimization(self):
+    @profiled('powerbi_optimization')
+    def run_optimization(self, force=False):
         """Run complete Power BI optimization process"""
         print("🚀 Starting Power BI Data Optimization")
         print("=" * 60)
         
-        # Optimize main tables
-        jobs_df = self.optimize_jobs_table()
-        skills_df = self.optimize_skills_table()
-        job_skills_df = self.optimize_job_skills_table()
-        
-        # Create aggregated datasets
-        summaries = self.create_aggregated_datasets(jobs_df, skills_df, job_skills_df)
+        # Optimize main tables and aggregated datasets (stale outputs only)
+        with stage('export_tables'):
+            results = self.export_tables(force)
         
         # Create documentation
-        self.create_data_model_documentation()
-        self.create_import_validation_checklist()
+        with stage('documentation'):
+            self.create_data_model_documentation()
+            self.create_import_validation_checklist()
         
         print("\n" + "=" * 60)
         print("✅ Power BI Data Optimization Complete!")
         print("=" * 60)
         
-        print("\n📁 Optimized Files Created:")
-        optimized_files = [
-            'jobs_powerbi.csv',
-            'skills_powerbi.csv', 
-            'job_skills_powerbi.csv',
-            'skills_summary_powerbi.csv',
-            'monthly_trends_powerbi.csv',
-            'experience_summary_powerbi.csv',
-            'location_summary_powerbi.csv',
-            'industry_summary_powerbi.csv'
-        ]
-        
-        for file in optimized_files:
+        print(f"\n📁 Optimized Files ({len(results['written'])} written, {len(results['skipped'])} unchanged):")
+        for file in self.EXPORT_INPUTS:
             file_path = self.output_dir / file
             if file_path.exists():
                 size_mb = file_path.stat().st_size / (1024 * 1024)
-                print(f"   ✓ {file} ({size_mb:.2f} MB)")
+                status = '✓' if file in results['written'] else '·'
+                print(f"   {status} {file} ({size_mb:.2f} MB)")
         
         print("\n📋 Documentation Created:")
         print("   ✓ data_model_documentation.md")
@@ -479,14 +737,9 @@ For questions about this data model, refer to the project documentation or data
         print("   3. Follow import validation checklist")
         print("   4. Create dashboard using data model documentation")
         
-        return {
-            'jobs_df': jobs_df,
-            'skills_df': skills_df,
-            'job_skills_df': job_skills_df,
-            'summaries': summaries
-        }
+        return results
 
 if __name__ == "__main__":
-    # Run optimization
+    # Run optimization (--force rebuilds every output)
     optimizer = PowerBIDataOptimizer()
-    results = optimizer.run_optimization()
\ No newline at end of file
+    results = optimizer.run_optimization(force='--force' in sys.argv)
\ No newline at end of file
@@ -0,0 +1,266 @@
+# Power BI Export from PostgreSQL
+# Builds the *_powerbi.csv tables and summaries straight from the database with
+# COPY (SELECT ...) TO STDOUT: rows stream from the server to disk without
+# DataFrames, one session per output, several outputs in parallel
+#
+# Usage:
+#     python powerbi/db_export.py                      # full bundle into data/processed
+#     python powerbi/db_export.py --output exports -j 8
+#     python powerbi/db_export.py --only jobs_powerbi.csv skills_summary_powerbi.csv
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'sql'))
+from database_setup import DatabaseManager
+from export_writer import ExportWriter
+from lazy_imports import lazy_import
+from stage_profiler import profiled
+
+pd = lazy_import('pandas')
+quantile_sketch = lazy_import('quantile_sketch')
+
+# Bumped when a query below changes the content of its output
+DB_EXPORT_VERSION = 5
+
+_JOB_COUNT = "(SELECT NULLIF(COUNT(*), 0) FROM jobs)"
+
+# One SELECT per bundle file; column names and order match PowerBIDataOptimizer
+EXPORT_QUERIES = {
+    'jobs_powerbi.csv': """
+        SELECT j.job_id, j.posting_date, j.job_title, j.job_title_full, j.job_title_additional,
+               j.position_type, j.position_level, j.years_experience, j.experience_level,
+               j.city, j.country, j.salary_min::float8 AS salary_min, j.salary_max::float8 AS salary_max,
+               j.salary_min_usd::float8 AS salary_min_usd, j.salary_max_usd::float8 AS salary_max_usd,
+               CASE WHEN j.salary_outlier THEN 'True' ELSE 'False' END AS salary_outlier,
+               j.pay_rate, j.currency, j.applicants, c.company_name, c.industry AS company_industry,
+               c.company_size, j.posting_year, j.posting_month, j.canonical_job_id, j.role_id,
+               ((j.salary_min + j.salary_max) / 2)::float8 AS salary_avg,
+               CASE WHEN NOT j.salary_outlier
+                    THEN ((j.salary_min_usd + j.salary_max_usd) / 2)::float8 END AS salary_avg_usd,
+               CASE WHEN j.salary_min IS NULL THEN 'False' ELSE 'True' END AS has_salary,
+               j.posting_year * 100 + j.posting_month AS posting_date_key,
+               to_char(make_date(2000, j.posting_month, 1), 'Mon') AS posting_month_name
+        FROM jobs j
+        LEFT JOIN companies c ON j.company_id = c.company_id
+        ORDER BY j.job_id""",
+    'skills_powerbi.csv': """
+        SELECT skill_id, skill_name, skill_category, length(skill_name) AS skill_name_length
+        FROM skills
+        ORDER BY skill_id""",
+    'job_skills_powerbi.csv': """
+        SELECT job_id, skill_id
+        FROM job_skills
+        ORDER BY job_id, skill_id""",
+    'skills_summary_powerbi.csv': f"""
+        SELECT s.skill_id, COUNT(*) AS job_count, s.skill_name, s.skill_category,
+               ROUND(COUNT(*) * 100.0 / {_JOB_COUNT}, 2)::float8 AS percentage
+        FROM job_skills js
+        JOIN skills s ON js.skill_id = s.skill_id
+        GROUP BY s.skill_id, s.skill_name, s.skill_category
+        ORDER BY job_count DESC, s.skill_id""",
+    'monthly_trends_powerbi.csv': """
+        SELECT posting_year, posting_month,
+               to_char(make_date(2000, posting_month, 1), 'Mon') AS posting_month_name,
+               COUNT(*) AS posting_count,
+               posting_year || '-' || LPAD(posting_month::text, 2, '0') AS year_month
+        FROM jobs
+        WHERE posting_year IS NOT NULL AND posting_month IS NOT NULL
+        GROUP BY posting_year, posting_month
+        ORDER BY posting_year, posting_month""",
+    'experience_summary_powerbi.csv': f"""
+        SELECT experience_level, COUNT(*) AS job_count,
+               (AVG((salary_min_usd + salary_max_usd) / 2) FILTER (WHERE NOT salary_outlier))::float8 AS salary_avg,
+               AVG(applicants)::float8 AS applicants,
+               ROUND(COUNT(*) * 100.0 / {_JOB_COUNT}, 2)::float8 AS percentage
+        FROM jobs
+        WHERE experience_level IS NOT NULL
+        GROUP BY experience_level
+        ORDER BY experience_level""",
+    'location_summary_powerbi.csv': f"""
+        SELECT city, country, COUNT(*) AS job_count,
+               ROUND(COUNT(*) * 100.0 / {_JOB_COUNT}, 2)::float8 AS percentage
+        FROM jobs
+        WHERE city IS NOT NULL AND country IS NOT NULL
+        GROUP BY city, country
+        ORDER BY job_count DESC, city, country""",
+    'industry_summary_powerbi.csv': f"""
+        SELECT c.industry AS company_industry, COUNT(*) AS job_count,
+               COUNT(DISTINCT c.company_name) AS company_count,
+               (AVG((j.salary_min_usd + j.salary_max_usd) / 2) FILTER (WHERE NOT j.salary_outlier))::float8 AS salary_avg,
+               ROUND(COUNT(*) * 100.0 / {_JOB_COUNT}, 2)::float8 AS percentage
+        FROM jobs j
+        JOIN companies c ON j.company_id = c.company_id
+        WHERE c.industry IS NOT NULL
+        GROUP BY c.industry
+        ORDER BY job_count DESC, company_industry""",
+    'role_summary_powerbi.csv': f"""
+        SELECT r.role_id, COUNT(*) AS job_count,
+               (AVG((j.salary_min_usd + j.salary_max_usd) / 2) FILTER (WHERE NOT j.salary_outlier))::float8 AS salary_avg,
+               r.role_name, r.title_count,
+               ROUND(COUNT(*) * 100.0 / {_JOB_COUNT}, 2)::float8 AS percentage
+        FROM jobs j
+        JOIN roles r ON j.role_id = r.role_id
+        GROUP BY r.role_id, r.role_name, r.title_count
+        ORDER BY job_count DESC, r.role_id""",
+}
+
+# Salary t-digests cannot be built in SQL: the salaried rows of this projection
+# are streamed and sketched client-side, at the grain of
+# PowerBIDataOptimizer.SALARY_SKETCH_DIMENSIONS
+SKETCH_OUTPUT = 'salary_sketches.csv'
+SALARY_SKETCH_DIMENSIONS = ['city', 'experience_level', 'company_industry']
+SKETCH_QUERY = """
+    SELECT j.city, j.experience_level, c.industry AS company_industry,
+           ((j.salary_min_usd + j.salary_max_usd) / 2)::float8 AS salary_avg_usd
+    FROM jobs j
+    LEFT JOIN companies c ON j.company_id = c.company_id
+    WHERE NOT j.salary_outlier AND j.salary_min_usd IS NOT NULL AND j.salary_max_usd IS NOT NULL"""
+
+EXPORT_OUTPUTS = list(EXPORT_QUERIES) + [SKETCH_OUTPUT]
+
+
+def copy_statement(query):
+    """COPY statement streaming a query result as CSV with a header row"""
+    return f"COPY ({query.strip()}) TO STDOUT WITH (FORMAT csv, HEADER true)"
+
+
+class DatabaseBundleExporter:
+    """
+    Writes the Power BI bundle from PostgreSQL instead of the cleaned CSV files
+
+    Each output is produced by one COPY on its own connection and written
+    atomically through ExportWriter, so client memory stays at the driver's
+    copy buffer regardless of table size. salary_sketches.csv is the one
+    exception: its salaried rows are streamed and sketched in Python. Outputs
+    are always rebuilt: the database has no content hash to compare against.
+    The monthly partitions of the file-based export are not produced here.
+    """
+
+    def __init__(self, output_dir='data/processed', db_manager=None):
+        self.output_dir = Path(output_dir)
+        self.db_manager = db_manager or DatabaseManager()
+        self.writer = ExportWriter(self.output_dir)
+
+    def _params(self):
+        return {'source': 'postgresql', 'database': self.db_manager.database,
+                'export_version': DB_EXPORT_VERSION}
+
+    def export_one(self, name):
+        """
+        Stream one output from the database into the export directory
+
+        Args:
+            name: Output file name from EXPORT_OUTPUTS
+
+        Returns:
+            dict: Output name, bytes written and seconds
+        """
+        started = time.perf_counter()
+        if name == SKETCH_OUTPUT:
+            return self.export_sketches(started)
+        raw = self.db_manager.get_engine().raw_connection()
+        try:
+            dbapi = raw.driver_connection if hasattr(raw, 'driver_connection') else raw.connection
+            cursor = dbapi.cursor()
+            # ISO dates and UTF-8 text match the file-based export
+            cursor.execute("SET DateStyle = 'ISO, YMD'")
+            cursor.execute("SET client_encoding = 'UTF8'")
+            with self.writer.open(name, [], self._params(), encoding='utf-8', newline='') as f:
+                cursor.copy_expert(copy_statement(EXPORT_QUERIES[name]), f)
+            cursor.close()
+            dbapi.commit()
+        finally:
+            raw.close()
+        size = (self.output_dir / name).stat().st_size
+        return {'name': name, 'bytes': size, 'seconds': time.perf_counter() - started}
+
+    def export_sketches(self, started):
+        """Stream the salaried rows and write their t-digests like the file-based export"""
+        chunks = list(self.db_manager.stream_query(SKETCH_QUERY))
+        rows = pd.concat(chunks, ignore_index=True)
+        sketches = quantile_sketch.build_sketches(rows, SALARY_SKETCH_DIMENSIONS, 'salary_avg_usd')
+        self.writer.write_csv(SKETCH_OUTPUT, sketches, [], self._params(), force=True)
+        size = (self.output_dir / SKETCH_OUTPUT).stat().st_size
+        return {'name': SKETCH_OUTPUT, 'bytes': size, 'seconds': time.perf_counter() - started}
+
+    def export_bundle(self, outputs=None, parallel=4):
+        """
+        Export the selected outputs concurrently
+
+        Args:
+            outputs: Names from EXPORT_OUTPUTS (default: all)
+            parallel: Concurrent COPY sessions
+
+        Returns:
+            dict: Per-output result from export_one
+        """
+        outputs = list(EXPORT_OUTPUTS) if outputs is None else list(outputs)
+        unknown = sorted(set(outputs) - set(EXPORT_OUTPUTS))
+        if unknown:
+            raise ValueError(f"Unknown Power BI outputs: {', '.join(unknown)}")
+
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(parallel, len(outputs) or 1))) as pool:
+                futures = {pool.submit(self.export_one, name): name for name in outputs}
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[result['name']] = result
+                    print(f"   ✓ {result['name']}: {result['bytes'] / 1e6:.1f} MB in {result['seconds']:.1f}s")
+        finally:
+            self.writer.save_manifest()
+        return results
+
+    def close(self):
+        self.db_manager.close()
+
+
+@profiled('powerbi_db_export')
+def export_bundle_from_db(output_dir='data/processed', outputs=None, parallel=4, db_manager=None):
+    """
+    Build the Power BI bundle from PostgreSQL with parallel COPY exports
+
+    Args:
+        output_dir: Export directory
+        outputs: Names from EXPORT_OUTPUTS (default: all)
+        parallel: Concurrent COPY sessions
+        db_manager: DatabaseManager to use (default: from environment / sql/.env)
+
+    Returns:
+        dict: Per-output result (bytes, seconds)
+    """
+    owns_manager = db_manager is None
+    exporter = DatabaseBundleExporter(output_dir, db_manager)
+    print(f"📤 Exporting Power BI bundle from PostgreSQL ({parallel} parallel sessions)...")
+    started = time.perf_counter()
+    try:
+        results = exporter.export_bundle(outputs, parallel)
+    finally:
+        if owns_manager:
+            exporter.close()
+    total = sum(r['bytes'] for r in results.values())
+    print(f"✅ {len(results)} files, {total / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s -> {output_dir}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the Power BI bundle straight from PostgreSQL')
+    parser.add_argument('--output', default='data/processed', help='Export directory')
+    parser.add_argument('-j', '--parallel', type=int, default=4, help='Concurrent COPY sessions')
+    parser.add_argument('--only', nargs='+', choices=sorted(EXPORT_OUTPUTS), metavar='FILE',
+                        help='Export only these files')
+    args = parser.parse_args()
+
+    try:
+        export_bundle_from_db(args.output, args.only, args.parallel)
+    except Exception as e:
+        print(f"❌ Database export failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# Power BI Export Writer
+# Single atomic writer for the Power BI bundle: tracks source content hashes in a
+# manifest and only rewrites an output when its inputs (or the output itself) changed
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from skills_bridge import file_sha256
+
+MANIFEST_NAME = '.export_manifest.json'
+
+# mkstemp creates 0600 files; exported files get the usual umask-based mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_file(path, mode='w', **open_kwargs):
+    """
+    Open a temporary file next to path and move it into place on success
+
+    Readers (Power BI, the validator) never observe a half-written file, and a
+    failed export leaves the previous version untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    os.close(fd)
+    os.chmod(tmp_name, FILE_MODE)
+    try:
+        with open(tmp_name, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def write_text_if_changed(path, text, encoding='utf-8'):
+    """Atomically write a text file unless it already has exactly this content"""
+    path = Path(path)
+    if path.exists() and path.read_text(encoding=encoding) == text:
+        return False
+    with atomic_file(path, 'w', encoding=encoding) as f:
+        f.write(text)
+    return True
+
+
+class ExportWriter:
+    """
+    Change-aware writer for one export directory
+
+    The manifest records, per output, a fingerprint of its inputs (content
+    hashes plus optional parameters) and the output's own size and mtime.
+    Input hashes are cached by (size, mtime) so unchanged sources are not re-read.
+    """
+
+    def __init__(self, output_dir, manifest_name=MANIFEST_NAME):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.output_dir / manifest_name
+        self.manifest = self._load_manifest()
+        self.written = []
+        self.skipped = []
+
+    def _load_manifest(self):
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                manifest.setdefault('inputs', {})
+                manifest.setdefault('outputs', {})
+                return manifest
+            except (ValueError, OSError):
+                pass
+        return {'inputs': {}, 'outputs': {}}
+
+    def save_manifest(self):
+        """Persist the manifest (call once at the end of an export run)"""
+        with atomic_file(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    # ------------------------------------------------------------------
+    # Fingerprints
+    # ------------------------------------------------------------------
+    def input_hash(self, path):
+        """Content hash of an input file, cached by size and mtime"""
+        path = Path(path)
+        stat = path.stat()
+        key = str(path.resolve())
+        cached = self.manifest['inputs'].get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+
+        sha = file_sha256(path)
+        self.manifest['inputs'][key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+        return sha
+
+    def fingerprint(self, inputs, params=None):
+        """Combined fingerprint of the input files and build parameters"""
+        digest = hashlib.sha256()
+        for path in sorted(str(Path(p)) for p in inputs):
+            digest.update(Path(path).name.encode())
+            digest.update(self.input_hash(path).encode())
+        if params:
+            digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def is_current(self, name, inputs, params=None):
+        """True when the output exists, is untouched and was built from these inputs"""
+        output = self.output_dir / name
+        record = self.manifest['outputs'].get(name)
+        if record is None or not output.exists():
+            return False
+        stat = output.stat()
+        if stat.st_size != record['size'] or stat.st_mtime_ns != record['mtime_ns']:
+            return False
+        return record['fingerprint'] == self.fingerprint(inputs, params)
+
+    def _record(self, name, inputs, params=None, kind='file'):
+        stat = (self.output_dir / name).stat()
+        self.manifest['outputs'][name] = {
+            'fingerprint': self.fingerprint(inputs, params),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'kind': kind
+        }
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+    @contextmanager
+    def open(self, name, inputs, params=None, mode='w', **open_kwargs):
+        """Atomically write an output file by hand and record it in the manifest"""
+        with atomic_file(self.output_dir / name, mode, **open_kwargs) as f:
+            yield f
+        self._record(name, inputs, params)
+        self.written.append(name)
+
+    def write_csv(self, name, df, inputs, params=None, force=False, **to_csv_kwargs):
+        """
+        Write a DataFrame to CSV unless the output is already current
+
+        Args:
+            name: Output file name inside the export directory
+            df: DataFrame to write
+            inputs: Source files the output is derived from
+            params: Extra build parameters that affect the output
+            force: Write even if the output is current
+
+        Returns:
+            bool: True if the file was written
+        """
+        if not force and self.is_current(name, inputs, params):
+            self.skipped.append(name)
+            return False
+
+        to_csv_kwargs.setdefault('index', False)
+        with atomic_file(self.output_dir / name, 'w', encoding='utf-8', newline='') as f:
+            df.to_csv(f, **to_csv_kwargs)
+        self._record(name, inputs, params)
+        self.written.append(name)
+        return True
+
+    def link(self, name, source, force=False):
+        """
+        Publish a pass-through table as a hardlink (symlink, then copy, as fallbacks)
+
+        Args:
+            name: Output file name inside the export directory
+            source: Source file whose content is exported unchanged
+            force: Re-link even if the output is current
+
+        Returns:
+            bool: True if the output was (re)created
+        """
+        source = Path(source)
+        output = self.output_dir / name
+
+        if not force and output.exists():
+            try:
+                if os.path.samefile(output, source):
+                    # Already a hardlink (or symlink) to the source: nothing to publish
+                    self._record(name, [source], kind='link')
+                    self.skipped.append(name)
+                    return False
+            except OSError:
+                pass
+            if self.is_current(name, [source]):
+                self.skipped.append(name)
+                return False
+
+        tmp = output.with_name(f'.{output.name}.link.tmp')
+        if tmp.exists() or tmp.is_symlink():
+            tmp.unlink()
+        try:
+            os.link(source, tmp)
+            kind = 'hardlink'
+        except OSError:
+            try:
+                os.symlink(os.path.relpath(source, output.parent), tmp)
+                kind = 'symlink'
+            except OSError:
+                shutil.copy2(source, tmp)
+                kind = 'copy'
+        os.replace(tmp, output)
+        self._record(name, [source], kind=kind)
+        self.written.append(name)
+        return True
+
+    def summary(self):
+        """Counts of written and skipped outputs for reporting"""
+        return {'written': list(self.written), 'skipped': list(self.skipped)}
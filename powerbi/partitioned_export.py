@@ -0,0 +1,111 @@
+# Power BI Partitioned Export
+# Writes the fact and bridge tables as monthly partition files keyed by posting_date_key,
+# so Power BI incremental refresh only re-imports months whose content changed
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from export_writer import atomic_file
+
+PARTITION_DIRNAME = 'powerbi_partitions'
+PARTITION_MANIFEST = 'partitions.json'
+UNDATED_KEY = 'undated'
+
+
+def partition_key_series(jobs_df):
+    """posting_date_key per job as a string partition key ('YYYYMM' or 'undated')"""
+    keys = jobs_df['posting_date_key'].astype('Int64').astype(str)
+    return keys.where(jobs_df['posting_date_key'].notna(), UNDATED_KEY)
+
+
+class PartitionedExporter:
+    """
+    Monthly partition writer for the Power BI fact and bridge tables
+
+    Each partition is serialized in memory and hashed; only partitions whose
+    hash differs from the manifest are written, and months that disappeared
+    from the source are deleted. The manifest (partitions.json) lists every
+    partition's file, row count, hash and last update time.
+    """
+
+    def __init__(self, output_dir, dirname=PARTITION_DIRNAME):
+        self.root = Path(output_dir) / dirname
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / PARTITION_MANIFEST
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (ValueError, OSError):
+                pass
+        return {'partition_column': 'posting_date_key', 'tables': {}}
+
+    def export_table(self, table_name, df, keys, force=False):
+        """
+        Write one table as monthly partitions, touching only changed months
+
+        Args:
+            table_name: Table name (used for the sub-directory and file prefix)
+            df: Table to partition
+            keys: Partition key per row (aligned with df)
+            force: Rewrite every partition
+
+        Returns:
+            dict: Lists of 'written', 'unchanged' and 'removed' partition keys
+        """
+        table_dir = self.root / table_name
+        table_dir.mkdir(parents=True, exist_ok=True)
+        previous = self.manifest['tables'].get(table_name, {})
+        current = {}
+        stats = {'written': [], 'unchanged': [], 'removed': []}
+        now = datetime.now().isoformat(timespec='seconds')
+
+        for key, part in df.groupby(keys.to_numpy(), sort=True):
+            file_name = f'{table_name}_{key}.csv'
+            payload = part.to_csv(index=False).encode('utf-8')
+            sha = hashlib.sha256(payload).hexdigest()
+            entry = previous.get(key)
+
+            if not force and entry and entry['sha256'] == sha and (table_dir / file_name).exists():
+                current[key] = entry
+                stats['unchanged'].append(key)
+                continue
+
+            with atomic_file(table_dir / file_name, 'wb') as f:
+                f.write(payload)
+            current[key] = {
+                'file': f'{table_name}/{file_name}',
+                'rows': int(len(part)),
+                'bytes': len(payload),
+                'sha256': sha,
+                'updated': now
+            }
+            stats['written'].append(key)
+
+        for key, entry in previous.items():
+            if key not in current:
+                (self.root / entry['file']).unlink(missing_ok=True)
+                stats['removed'].append(key)
+
+        self.manifest['tables'][table_name] = current
+        return stats
+
+    def manifest_text(self):
+        """Serialized partition manifest"""
+        return json.dumps(self.manifest, indent=2, sort_keys=True)
+
+    def summary_frame(self):
+        """Partition manifest as a DataFrame (table, partition, rows, bytes, updated)"""
+        rows = [
+            {'table': table, 'partition': key, **entry}
+            for table, partitions in self.manifest['tables'].items()
+            for key, entry in partitions.items()
+        ]
+        return pd.DataFrame(rows)
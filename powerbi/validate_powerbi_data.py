@@ -6,9 +6,14 @@ Validates that all required CSV files are properly formatted for Power BI import
 
 import pandas as pd
 import os
+import sys
 from pathlib import Path
 
-def validate_powerbi_data():
+# Shared data-layer modules
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from skills_bridge import read_job_skills
+
+def validate_powerbi_data(data_dir='data/processed'):
     """Validate all Power BI CSV files are ready for import"""
     
     print("=== Power BI Data Validation ===\n")
@@ -25,7 +30,7 @@ def validate_powerbi_data():
         'industry_summary_powerbi.csv': 'Pre-aggregated industry statistics'
     }
     
-    data_dir = Path('data/processed')
+    data_dir = Path(data_dir)
     validation_results = {}
     
     # Check file existence
@@ -82,7 +87,7 @@ def validate_powerbi_data():
     
     if validation_results['job_skills_powerbi.csv']['exists']:
         try:
-            job_skills_df = pd.read_csv(data_dir / 'job_skills_powerbi.csv')
+            job_skills_df = read_job_skills(data_dir / 'job_skills_powerbi.csv', build=False)
             print(f"   ✓ job_skills_powerbi.csv: {len(job_skills_df):,} rows, {len(job_skills_df.columns)} columns")
             
             # Check required columns
@@ -190,7 +195,7 @@ def generate_powerbi_import_summary():
         # Read main tables
         jobs_df = pd.read_csv(data_dir / 'jobs_powerbi.csv')
         skills_df = pd.read_csv(data_dir / 'skills_powerbi.csv')
-        job_skills_df = pd.read_csv(data_dir / 'job_skills_powerbi.csv')
+        job_skills_df = read_job_skills(data_dir / 'job_skills_powerbi.csv', build=False)
         
         summary = f"""# Power BI Import Summary
 
@@ -245,4 +250,5 @@ if __name__ == "__main__":
         print("3. Import CSV files in the specified order")
         print("4. Create relationships and build visualizations")
     else:
-        print("\nPlease complete data preparation before proceeding with Power BI dashboard creation.")
\ No newline at end of file
+        print("\nPlease complete data preparation before proceeding with Power BI dashboard creation.")
+        sys.exit(1)
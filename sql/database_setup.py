@@ -4,21 +4,195 @@ Provides database connection management, schema creation, and utility functions
 """
 
 import os
-import psycopg2
-from psycopg2 import sql
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import SQLAlchemyError
-import pandas as pd
 import logging
-from typing import Optional, Dict, Any
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, List
 import time
 import getpass
+import uuid
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import, require
+from stage_profiler import profiled, stage
+from sql_script_runner import SqlScriptRunner, format_report, parse_script
+
+# Database drivers and pandas are imported on first use
+psycopg2 = lazy_import('psycopg2')
+sql = lazy_import('psycopg2.sql')
+sqlalchemy = lazy_import('sqlalchemy')
+sqlalchemy_exc = lazy_import('sqlalchemy.exc')
+pd = lazy_import('pandas')
+pa = lazy_import('pyarrow')
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+def configure_logging(level=logging.INFO):
+    """Console logging for scripts using this module (call from their entry point)"""
+    logging.basicConfig(level=level, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# PostgreSQL type OIDs -> Arrow type names, so every streamed chunk gets the same schema
+# (numeric is read as float, like pd.read_sql's coerce_float)
+_ARROW_TYPES = {
+    16: 'bool_', 20: 'int64', 21: 'int16', 23: 'int32', 26: 'int64',
+    700: 'float32', 701: 'float64', 1700: 'float64',
+    18: 'string', 19: 'string', 25: 'string', 1042: 'string', 1043: 'string',
+    1082: 'date32', 1114: 'timestamp', 1184: 'timestamptz',
+}
+
+
+def arrow_schema(description) -> 'pa.Schema':
+    """Arrow schema for a DB-API cursor description (unknown types become strings)"""
+    fields = []
+    for column in description:
+        name = _ARROW_TYPES.get(column[1], 'string')
+        if name == 'timestamp':
+            arrow_type = pa.timestamp('us')
+        elif name == 'timestamptz':
+            arrow_type = pa.timestamp('us', tz='UTC')
+        else:
+            arrow_type = getattr(pa, name)()
+        fields.append(pa.field(column[0], arrow_type))
+    return pa.schema(fields)
+
+
+def split_sql_statements(sql_content: str) -> List[str]:
+    """Split a SQL script into statements (comment, string and dollar-quote aware)"""
+    return [statement.text for statement in parse_script(sql_content)]
+
+
+_CREATE_TABLE = re.compile(r'CREATE\s+TABLE\s+(\w+)\s*\((.*)\)\s*$', re.IGNORECASE | re.DOTALL)
+_REFERENCES = re.compile(r'\s+REFERENCES\s+(\w+)\s*\(([^)]*)\)((?:\s+ON\s+(?:DELETE|UPDATE)\s+'
+                         r'(?:CASCADE|RESTRICT|NO\s+ACTION|SET\s+NULL|SET\s+DEFAULT))*)', re.IGNORECASE)
+_TABLE_CONSTRAINT = re.compile(r'^(?:CONSTRAINT\s+(\w+)\s+)?(PRIMARY\s+KEY|UNIQUE|FOREIGN\s+KEY|CHECK|EXCLUDE)\b\s*(.*)$',
+                               re.IGNORECASE | re.DOTALL)
+_KEY_COLUMNS = re.compile(r'^\(([^)]*)\)$')
+_FOREIGN_KEY = re.compile(r'^\(([^)]*)\)' + _REFERENCES.pattern + r'$', re.IGNORECASE)
+
+
+def _split_table_items(body: str) -> List[str]:
+    """Split a CREATE TABLE body on top-level commas, dropping -- comments"""
+    body = '\n'.join(line.split('--', 1)[0] for line in body.splitlines())
+    items, depth, current = [], 0, []
+    for char in body:
+        if char == ',' and depth == 0:
+            items.append(''.join(current).strip())
+            current = []
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current.append(char)
+    items.append(''.join(current).strip())
+    return [item for item in items if item]
+
+
+def _key_name(table: str, columns: str, suffix: str) -> str:
+    """PostgreSQL's default constraint name: <table>_<col1>_<col2>_<suffix>"""
+    return '_'.join([table] + [c.strip() for c in columns.split(',')] + [suffix])
+
+
+def _defer_table_constraint(table: str, constraint, keys: List[str], foreign_keys: List[tuple]) -> bool:
+    """
+    Move a table-level constraint item into the deferred keys / foreign keys
+
+    Returns:
+        bool: False for CHECK constraints, which stay in CREATE TABLE
+
+    Raises:
+        ValueError: For a constraint the plan cannot defer (so it is never
+            silently kept during the load)
+    """
+    name, kind, rest = constraint.group(1), ' '.join(constraint.group(2).upper().split()), constraint.group(3).strip()
+    if kind == 'CHECK':
+        return False
+    if kind in ('PRIMARY KEY', 'UNIQUE'):
+        key_columns = _KEY_COLUMNS.match(rest)
+        if key_columns:
+            if kind == 'PRIMARY KEY':
+                keys.insert(0, f"ALTER TABLE {table} ADD CONSTRAINT {name or table + '_pkey'} "
+                               f"PRIMARY KEY ({key_columns.group(1)})")
+            else:
+                name = name or _key_name(table, key_columns.group(1), 'key')
+                keys.append(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({key_columns.group(1)})")
+            return True
+    if kind == 'FOREIGN KEY':
+        foreign_key = _FOREIGN_KEY.match(rest)
+        if foreign_key:
+            name = name or _key_name(table, foreign_key.group(1), 'fkey')
+            foreign_keys.append((table, name,
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({foreign_key.group(1)}) "
+                f"REFERENCES {foreign_key.group(2)}({foreign_key.group(3)}){foreign_key.group(4)} NOT VALID"))
+            return True
+    raise ValueError(f"{table}: cannot defer table constraint for bulk load: {constraint.group(0)}")
+
+
+def plan_bulk_load(statements: List[str]) -> Dict[str, Any]:
+    """
+    Split schema statements into a bulk-load plan
+
+    Tables are created with only their CHECK constraints; primary keys, unique
+    constraints, foreign keys and secondary indexes (column or table level) are
+    deferred until after the data is loaded. Deferred constraints keep their
+    CONSTRAINT name or get PostgreSQL's default one (<table>_pkey,
+    <table>_<columns>_key, <table>_<columns>_fkey), so the final schema
+    matches a normal create_schema run. Constraints the plan cannot defer
+    raise ValueError rather than staying in the bulk-load tables.
+
+    Args:
+        statements: Statements of the schema file, in order
+
+    Returns:
+        Dict with 'create' (statements to run before loading), 'keys'
+        (table -> primary/unique key statements), 'indexes' (CREATE INDEX
+        statements), 'foreign_keys' (list of (table, constraint, ADD statement))
+        and 'tables' (table names, in creation order)
+    """
+    plan = {'create': [], 'keys': {}, 'indexes': [], 'foreign_keys': [], 'tables': []}
+    for statement in statements:
+        body = '\n'.join(line for line in statement.splitlines() if not line.strip().startswith('--')).strip()
+        if re.match(r'CREATE\s+(UNIQUE\s+)?INDEX\b', body, re.IGNORECASE):
+            plan['indexes'].append(body)
+            continue
+        match = _CREATE_TABLE.match(body)
+        if not match:
+            plan['create'].append(statement)
+            continue
+
+        table, columns = match.group(1), []
+        plan['tables'].append(table)
+        keys = plan['keys'].setdefault(table, [])
+        for item in _split_table_items(match.group(2)):
+            constraint = _TABLE_CONSTRAINT.match(item)
+            if constraint:
+                if not _defer_table_constraint(table, constraint, keys, plan['foreign_keys']):
+                    columns.append(item)
+                continue
+            if re.search(r'\bCONSTRAINT\b', item, re.IGNORECASE):
+                raise ValueError(f"{table}: named column constraints cannot be deferred: {item}")
+            column = item.split()[0]
+            references = _REFERENCES.search(item)
+            if references:
+                name = f"{table}_{column}_fkey"
+                plan['foreign_keys'].append((table, name,
+                    f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                    f"REFERENCES {references.group(1)}({references.group(2)}){references.group(3)} NOT VALID"))
+                item = _REFERENCES.sub('', item)
+            if re.search(r'\bREFERENCES\b', item, re.IGNORECASE):
+                raise ValueError(f"{table}: unsupported REFERENCES clause: {item}")
+            if re.search(r'\bPRIMARY\s+KEY\b', item, re.IGNORECASE):
+                keys.insert(0, f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({column})")
+                item = re.sub(r'\s+PRIMARY\s+KEY\b', '', item, flags=re.IGNORECASE)
+            if re.search(r'\bUNIQUE\b', item, re.IGNORECASE):
+                keys.append(f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_key UNIQUE ({column})")
+                item = re.sub(r'\s+UNIQUE\b', '', item, flags=re.IGNORECASE)
+            columns.append(item)
+        plan['create'].append(f"CREATE TABLE {table} (\n    " + ",\n    ".join(columns) + "\n)")
+    return plan
+
 class DatabaseManager:
     """
     Manages PostgreSQL database connections and operations for the Wuzzuf analysis project
@@ -154,7 +328,7 @@ class DatabaseManager:
             
             for attempt in range(retry_count):
                 try:
-                    self.engine = create_engine(
+                    self.engine = sqlalchemy.create_engine(
                         self.connection_string,
                         pool_size=10,
                         max_overflow=20,
@@ -164,12 +338,12 @@ class DatabaseManager:
                     
                     # Test connection
                     with self.engine.connect() as conn:
-                        conn.execute(text("SELECT 1"))
+                        conn.execute(sqlalchemy.text("SELECT 1"))
                     
                     logger.info("Database connection established successfully")
                     break
                     
-                except SQLAlchemyError as e:
+                except sqlalchemy_exc.SQLAlchemyError as e:
                     logger.warning(f"Connection attempt {attempt + 1} failed: {e}")
                     if attempt < retry_count - 1:
                         time.sleep(retry_delay)
@@ -183,6 +357,9 @@ class DatabaseManager:
         """
         Execute SQL commands from a file
         
+        The statements run in one transaction, sent in batched round trips
+        (see SqlScriptRunner); per-statement timings are logged at DEBUG level.
+        
         Args:
             file_path: Path to SQL file
             
@@ -190,39 +367,116 @@ class DatabaseManager:
             bool: True if successful, False otherwise
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                sql_content = file.read()
-            
-            engine = self.get_engine()
-            with engine.connect() as conn:
-                # Split by semicolon and execute each statement
-                statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-                
-                for statement in statements:
-                    if statement:
-                        conn.execute(text(statement))
-                        
-                conn.commit()
-            
-            logger.info(f"Successfully executed SQL file: {file_path}")
-            return True
-            
+            report = SqlScriptRunner(self.get_engine()).run_script(Path(file_path))
         except Exception as e:
             logger.error(f"Error executing SQL file {file_path}: {e}")
             return False
+        
+        logger.debug(format_report(report))
+        if report['failed']:
+            logger.error(f"Error executing SQL file {file_path}: {report['error']}")
+            return False
+        
+        logger.info(f"Successfully executed SQL file: {file_path} ({len(report['statements'])} statements, "
+                    f"{report['round_trips']} round trips, {report['seconds']:.2f}s)")
+        return True
     
-    def create_schema(self, schema_file: str = 'sql/schema.sql') -> bool:
+    def create_schema(self, schema_file: str = 'sql/schema.sql', bulk_load: bool = False) -> bool:
         """
         Create database schema from SQL file
         
         Args:
             schema_file: Path to schema SQL file
+            bulk_load: Create the tables without keys, foreign keys and
+                secondary indexes; call finalize_schema() after loading the data
             
         Returns:
             bool: True if successful, False otherwise
         """
-        logger.info("Creating database schema...")
-        return self.execute_sql_file(schema_file)
+        if not bulk_load:
+            logger.info("Creating database schema...")
+            return self.execute_sql_file(schema_file)
+
+        logger.info("Creating database schema for bulk load (indexes and constraints deferred)...")
+        try:
+            with open(schema_file, 'r', encoding='utf-8') as file:
+                plan = plan_bulk_load(split_sql_statements(file.read()))
+            report = SqlScriptRunner(self.get_engine()).run_script('\n;\n'.join(plan['create']))
+            if report['failed']:
+                raise RuntimeError(report['error'])
+            logger.info(f"Created {len(plan['tables'])} tables; deferred "
+                        f"{sum(len(k) for k in plan['keys'].values())} keys, {len(plan['indexes'])} indexes "
+                        f"and {len(plan['foreign_keys'])} foreign keys")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating bulk-load schema from {schema_file}: {e}")
+            return False
+    
+    def _run_sessions(self, groups: List[List[str]], parallel_sessions: int, maintenance_work_mem: str = None):
+        """Run statement groups in parallel sessions; each group runs in order in one session"""
+        engine = self.get_engine()
+
+        def run_group(statements):
+            with engine.connect() as conn:
+                if maintenance_work_mem:
+                    conn.execute(sqlalchemy.text(f"SET maintenance_work_mem = '{maintenance_work_mem}'"))
+                for statement in statements:
+                    started = time.perf_counter()
+                    conn.execute(sqlalchemy.text(statement))
+                    conn.commit()
+                    logger.debug(f"{time.perf_counter() - started:.2f}s  {statement}")
+                if maintenance_work_mem:
+                    conn.execute(sqlalchemy.text("RESET maintenance_work_mem"))
+                    conn.commit()
+
+        groups = [group for group in groups if group]
+        with ThreadPoolExecutor(max_workers=max(1, min(parallel_sessions, len(groups) or 1))) as pool:
+            list(pool.map(run_group, groups))
+
+    def finalize_schema(self, schema_file: str = 'sql/schema.sql', parallel_sessions: int = 4,
+                        maintenance_work_mem: str = '256MB') -> bool:
+        """
+        Build the keys, indexes and foreign keys deferred by create_schema(bulk_load=True)
+
+        Primary/unique keys are added per table in parallel sessions, then the
+        secondary indexes are built in parallel (CREATE INDEX only takes a SHARE
+        lock, so several can run on one table). Foreign keys are added NOT VALID
+        and validated afterwards, and the tables are analyzed last.
+
+        Args:
+            schema_file: Path to the schema SQL file used for create_schema
+            parallel_sessions: Database sessions used at the same time
+            maintenance_work_mem: Memory per index build (None keeps the server setting)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            with open(schema_file, 'r', encoding='utf-8') as file:
+                plan = plan_bulk_load(split_sql_statements(file.read()))
+
+            started = time.perf_counter()
+            self._run_sessions(list(plan['keys'].values()), parallel_sessions, maintenance_work_mem)
+            logger.info(f"Primary and unique keys built in {time.perf_counter() - started:.1f}s")
+
+            started = time.perf_counter()
+            self._run_sessions([[index] for index in plan['indexes']], parallel_sessions, maintenance_work_mem)
+            logger.info(f"{len(plan['indexes'])} indexes built in {time.perf_counter() - started:.1f}s")
+
+            started = time.perf_counter()
+            self._run_sessions([[add for _, _, add in plan['foreign_keys']]], 1)
+            validations = {}
+            for table, name, _ in plan['foreign_keys']:
+                validations.setdefault(table, []).append(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+            self._run_sessions(list(validations.values()), parallel_sessions)
+            logger.info(f"{len(plan['foreign_keys'])} foreign keys validated in {time.perf_counter() - started:.1f}s")
+
+            self._run_sessions([[f"ANALYZE {table}"] for table in plan['tables']], parallel_sessions)
+            logger.info("Bulk-load schema finalized and tables analyzed")
+            return True
+        except Exception as e:
+            logger.error(f"Error finalizing bulk-load schema: {e}")
+            return False
     
     def test_connection(self) -> Dict[str, Any]:
         """
@@ -235,11 +489,11 @@ class DatabaseManager:
             engine = self.get_engine()
             with engine.connect() as conn:
                 # Get database version
-                result = conn.execute(text("SELECT version()"))
+                result = conn.execute(sqlalchemy.text("SELECT version()"))
                 version = result.fetchone()[0]
                 
                 # Get table count
-                result = conn.execute(text("""
+                result = conn.execute(sqlalchemy.text("""
                     SELECT COUNT(*) 
                     FROM information_schema.tables 
                     WHERE table_schema = 'public'
@@ -261,7 +515,52 @@ class DatabaseManager:
                 'database': self.database
             }
     
-    def get_table_info(self) -> pd.DataFrame:
+    def stream_query(self, query: str, chunk_rows: int = 50_000, params: Optional[Dict[str, Any]] = None,
+                     as_arrow: bool = False) -> Iterator[Any]:
+        """
+        Run a query on a named server-side cursor and yield the result in chunks
+        
+        Only one chunk is held in client memory at a time, so arbitrarily large
+        results (e.g. the jobs_with_companies view) can be exported or processed
+        in bounded memory. Stopping the iteration early closes the cursor.
+        
+        Args:
+            query: SQL query (psycopg2 %(name)s placeholders for params)
+            chunk_rows: Rows fetched per round trip and per yielded chunk
+            params: Query parameters
+            as_arrow: Yield pyarrow Tables (same schema for every chunk) instead of DataFrames
+            
+        Yields:
+            DataFrame or pyarrow.Table chunks of at most chunk_rows rows
+        """
+        if as_arrow:
+            require(pa, 'stream_query(as_arrow=True)')
+        raw = self.get_engine().raw_connection()
+        try:
+            dbapi = raw.driver_connection if hasattr(raw, 'driver_connection') else raw.connection
+            cursor = dbapi.cursor(name=f"wuzzuf_stream_{uuid.uuid4().hex[:12]}")
+            cursor.itersize = chunk_rows
+            cursor.execute(query, params)
+            columns, schema = None, None
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if columns is None:
+                    columns = [column[0] for column in cursor.description]
+                    schema = arrow_schema(cursor.description) if as_arrow else None
+                elif not rows:
+                    break
+                # An empty result still yields one (empty) chunk carrying the columns
+                chunk = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                if as_arrow:
+                    chunk = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                yield chunk
+            cursor.close()
+            dbapi.commit()
+        finally:
+            # Returning the connection to the pool rolls back and drops an unfinished cursor
+            raw.close()
+    
+    def get_table_info(self) -> 'pd.DataFrame':
         """
         Get information about all tables in the database
         
@@ -296,6 +595,27 @@ class DatabaseManager:
             logger.info("Database connections closed")
 
 
+def get_database_manager(backend: str = None, **kwargs):
+    """
+    Database manager for the configured backend
+    
+    Args:
+        backend: 'postgresql' or 'duckdb' (default: WUZZUF_SQL_BACKEND, else 'postgresql')
+        **kwargs: Passed to DatabaseManager or DuckDBManager
+        
+    Returns:
+        DatabaseManager, or DuckDBManager running the same queries in-process
+    """
+    backend = (backend or os.getenv('WUZZUF_SQL_BACKEND', 'postgresql')).lower()
+    if backend == 'duckdb':
+        from duckdb_backend import DuckDBManager
+        return DuckDBManager(**kwargs)
+    if backend not in ('postgresql', 'postgres'):
+        raise ValueError(f"Unknown SQL backend '{backend}' (use 'postgresql' or 'duckdb')")
+    return DatabaseManager(**kwargs)
+
+
+@profiled('setup_database')
 def setup_database(host='localhost', port=5432, username='postgres', password=None):
     """
     Complete database setup function
@@ -314,17 +634,22 @@ def setup_database(host='localhost', port=5432, username='postgres', password=No
         db_manager = DatabaseManager(host, port, username, password)
         
         # Create database
-        if not db_manager.create_database():
+        with stage('create_database'):
+            created = db_manager.create_database()
+        if not created:
             logger.error("Failed to create database")
             return None
         
         # Create schema
-        if not db_manager.create_schema():
+        with stage('create_schema'):
+            created = db_manager.create_schema()
+        if not created:
             logger.error("Failed to create schema")
             return None
         
         # Test connection
-        status = db_manager.test_connection()
+        with stage('test_connection'):
+            status = db_manager.test_connection()
         if status['status'] == 'connected':
             logger.info("Database setup completed successfully")
             logger.info(f"Tables created: {status['table_count']}")
@@ -342,6 +667,7 @@ if __name__ == "__main__":
     """
     Run database setup when script is executed directly
     """
+    configure_logging()
     print("Wuzzuf Job Market Analysis - Database Setup")
     print("=" * 50)
     
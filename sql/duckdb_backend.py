@@ -0,0 +1,375 @@
+"""
+Embedded DuckDB backend for Wuzzuf Job Market Analysis
+Registers the processed Parquet/CSV files as the jobs, companies, skills, roles
+and job_skills tables and runs the sql/ query library in-process, with a small
+PostgreSQL dialect shim, so analyses need no database server
+
+Usage:
+    python sql/duckdb_backend.py sql/queries.sql
+    python sql/duckdb_backend.py --query "SELECT experience_level, COUNT(*) FROM jobs GROUP BY 1"
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'pipeline'))
+from lazy_imports import lazy_import, require
+from sql_script_runner import SqlScriptRunner, parse_script
+
+duckdb = lazy_import('duckdb')
+pd = lazy_import('pandas')
+pa = lazy_import('pyarrow')
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL TO_CHAR patterns and their strftime equivalents (longest first)
+_DATE_FORMATS = [('YYYY', '%Y'), ('Month', '%B'), ('Mon', '%b'), ('HH24', '%H'), ('Day', '%A'),
+                 ('MM', '%m'), ('DD', '%d'), ('YY', '%y'), ('MI', '%M'), ('SS', '%S'), ('Dy', '%a')]
+
+_CASTS = [(re.compile(r'::\s*numeric\b(\s*\(\s*\d+\s*(,\s*\d+\s*)?\))?', re.IGNORECASE), '::DOUBLE'),
+          (re.compile(r'::\s*text\b', re.IGNORECASE), '::VARCHAR')]
+_TO_CHAR = re.compile(r'\bTO_CHAR\s*\(', re.IGNORECASE)
+_DATE_CALL = re.compile(r'(?<![.\w])DATE\s*\(', re.IGNORECASE)
+
+
+def _call_args(sql: str, open_paren: int):
+    """Top-level argument spans and the closing index of the call opened at open_paren"""
+    depth, quote, start, args = 0, None, open_paren + 1, []
+    for i in range(open_paren, len(sql)):
+        ch = sql[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                args.append((start, i))
+                return args, i
+        elif ch == ',' and depth == 1:
+            args.append((start, i))
+            start = i + 1
+    raise ValueError(f"Unbalanced parentheses after: {sql[open_paren - 10:open_paren + 30]!r}")
+
+
+def _strftime_format(pg_format: str) -> str:
+    """Convert a quoted PostgreSQL TO_CHAR pattern to a quoted strftime pattern"""
+    body = pg_format.strip()[1:-1].replace('%', '%%')
+    out, i = [], 0
+    while i < len(body):
+        for token, replacement in _DATE_FORMATS:
+            if body.startswith(token, i):
+                out.append(replacement)
+                i += len(token)
+                break
+        else:
+            out.append(body[i])
+            i += 1
+    return "'" + ''.join(out) + "'"
+
+
+def _rewrite_calls(sql: str, pattern, rewrite) -> str:
+    """Rewrite every call matching pattern, innermost (right-most) first"""
+    while True:
+        matches = list(pattern.finditer(sql))
+        if not matches:
+            return sql
+        match = matches[-1]
+        args, close = _call_args(sql, match.end() - 1)
+        sql = sql[:match.start()] + rewrite([sql[a:b].strip() for a, b in args]) + sql[close + 1:]
+
+
+def translate(sql: str) -> str:
+    """
+    Translate the PostgreSQL constructs used by sql/*.sql to DuckDB
+
+    Handles ::numeric/::text casts, TO_CHAR(date, 'Mon YYYY') and DATE(expr).
+    Everything else in the query library (LPAD, EXTRACT, PERCENTILE_CONT ...
+    WITHIN GROUP, STDDEV, ILIKE, window functions) is native DuckDB syntax.
+    """
+    for pattern, replacement in _CASTS:
+        sql = pattern.sub(replacement, sql)
+    sql = _rewrite_calls(sql, _DATE_CALL, lambda args: f"CAST({args[0]} AS DATE)")
+    sql = _rewrite_calls(sql, _TO_CHAR, lambda args: f"strftime({args[0]}, {_strftime_format(args[1])})")
+    return sql
+
+
+class _ShimCursor:
+    """DB-API cursor that translates PostgreSQL SQL before executing it on DuckDB"""
+
+    rowcount = -1
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, query, params=None):
+        self._connection.execute(translate(query), params)
+        return self
+
+    @property
+    def description(self):
+        return self._connection.description
+
+    def fetchone(self):
+        return self._connection.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._connection.fetchmany(size)
+
+    def fetchall(self):
+        return self._connection.fetchall()
+
+    def close(self):
+        self._connection.close()
+
+
+class DuckDBEngine:
+    """
+    Stand-in for the SQLAlchemy engine returned by DatabaseManager.get_engine()
+
+    Works as a DB-API connection for pd.read_sql(query, engine) and provides
+    raw_connection() for SqlScriptRunner.run_queries; every cursor is its own
+    DuckDB connection to the shared database, so concurrent queries are safe.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self):
+        return _ShimCursor(self._connection.cursor())
+
+    def raw_connection(self):
+        return DuckDBEngine(self._connection.cursor())
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        # Reads run in autocommit mode: there is never a transaction to roll back
+        pass
+
+    def close(self):
+        self._connection.close()
+
+    def dispose(self):
+        self._connection.close()
+
+
+class DuckDBManager:
+    """
+    In-process replacement for DatabaseManager over the processed data files
+
+    Tables are loaded once into DuckDB's columnar storage; queries then run
+    multi-threaded without a server. Company ids are assigned the way
+    load_database.py assigns them (one per company name, in name order).
+    """
+
+    TABLES = ['companies', 'skills', 'roles', 'jobs', 'job_skills']
+
+    def __init__(self, data_dir: str = 'data/processed', database: str = ':memory:',
+                 threads: Optional[int] = None, schema_file: str = 'sql/schema.sql'):
+        self.data_dir = Path(data_dir)
+        self.database = database
+        self.threads = threads
+        self.schema_file = Path(schema_file)
+        self._connection = None
+        self._engine = None
+
+    def _source(self, name: str) -> Optional[str]:
+        """read_parquet/read_csv expression for a table file (Parquet preferred)"""
+        for suffix, reader in (('.parquet', 'read_parquet'), ('.csv', 'read_csv_auto')):
+            path = self.data_dir / f'{name}{suffix}'
+            if path.exists():
+                quoted = str(path).replace("'", "''")
+                return f"{reader}('{quoted}')"
+        return None
+
+    def _register_tables(self, conn):
+        """Create the schema tables and the schema views from the data files"""
+        jobs, skills, job_skills = self._source('jobs'), self._source('skills'), self._source('job_skills')
+        missing = [name for name, source in (('jobs', jobs), ('skills', skills), ('job_skills', job_skills))
+                   if source is None]
+        if missing:
+            raise FileNotFoundError(f"No .parquet or .csv file for {', '.join(missing)} in {self.data_dir}")
+
+        started = time.perf_counter()
+        conn.execute(f"CREATE OR REPLACE TEMP VIEW _jobs_source AS SELECT *, row_number() OVER () AS _row FROM {jobs}")
+        companies = self._source('companies')
+        if companies:
+            conn.execute(f"CREATE OR REPLACE TABLE companies AS SELECT * FROM {companies}")
+        else:
+            # First non-empty attribute per company, as load_database.extract_companies_data
+            conn.execute("""
+                CREATE OR REPLACE TABLE companies AS
+                SELECT row_number() OVER (ORDER BY company_name) AS company_id, company_name,
+                       min_by(NULLIF(trim(company_industry), ''), _row)
+                           FILTER (WHERE company_industry IS NOT NULL) AS industry,
+                       min_by(NULLIF(trim(company_size), ''), _row)
+                           FILTER (WHERE company_size IS NOT NULL) AS company_size
+                FROM (SELECT trim(company_name) AS company_name, company_industry, company_size, _row
+                      FROM _jobs_source WHERE company_name IS NOT NULL)
+                GROUP BY company_name""")
+        conn.execute(f"CREATE OR REPLACE TABLE skills AS SELECT * FROM {skills}")
+        roles = self._source('roles')
+        if roles:
+            conn.execute(f"CREATE OR REPLACE TABLE roles AS SELECT * FROM {roles}")
+        else:
+            # Processed data from before title clustering: role queries return no rows
+            conn.execute("CREATE OR REPLACE TABLE roles (role_id INTEGER, role_name VARCHAR, title_count INTEGER)")
+        conn.execute("""
+            CREATE OR REPLACE TABLE jobs AS
+            SELECT j.* EXCLUDE (company_name, company_industry, company_size, _row), c.company_id
+            FROM _jobs_source j
+            LEFT JOIN companies c ON trim(j.company_name) = c.company_name
+            ORDER BY j._row""")
+        conn.execute(f"CREATE OR REPLACE TABLE job_skills AS SELECT * FROM {job_skills}")
+        conn.execute("DROP VIEW _jobs_source")
+
+        if self.schema_file.exists():
+            for statement in parse_script(self.schema_file.read_text(encoding='utf-8')):
+                if re.match(r'CREATE\s+VIEW\b', statement.text, re.IGNORECASE):
+                    conn.execute(translate(re.sub(r'^CREATE\s+VIEW', 'CREATE OR REPLACE VIEW',
+                                                  statement.text, flags=re.IGNORECASE)))
+        logger.info(f"Registered {', '.join(self.TABLES)} from {self.data_dir} in {time.perf_counter() - started:.2f}s")
+
+    def get_engine(self) -> DuckDBEngine:
+        """Open the database (loading the data files on first use) and return the engine"""
+        if self._engine is None:
+            require(duckdb, 'The DuckDB backend')
+            config = {'threads': self.threads} if self.threads else {}
+            conn = duckdb.connect(self.database, config=config)
+            # PostgreSQL semantics for int / int
+            conn.execute("SET integer_division = true")
+            self._register_tables(conn)
+            self._connection = conn
+            self._engine = DuckDBEngine(conn)
+        return self._engine
+
+    def query(self, query: str, params: Optional[List[Any]] = None) -> 'pd.DataFrame':
+        """Run a (PostgreSQL dialect) query and return the result as a DataFrame"""
+        self.get_engine()
+        cursor = self._connection.cursor()
+        try:
+            return cursor.execute(translate(query), params).df()
+        finally:
+            cursor.close()
+
+    def stream_query(self, query: str, chunk_rows: int = 50_000, params: Optional[List[Any]] = None,
+                     as_arrow: bool = False) -> Iterator[Any]:
+        """
+        Yield a query result in chunks, like DatabaseManager.stream_query
+
+        Args:
+            query: SQL query (PostgreSQL dialect, translated)
+            chunk_rows: Rows per yielded chunk
+            params: Positional query parameters (? placeholders)
+            as_arrow: Yield pyarrow Tables instead of DataFrames
+
+        Yields:
+            DataFrame or pyarrow.Table chunks of at most chunk_rows rows
+        """
+        require(pa, 'DuckDBManager.stream_query')
+        self.get_engine()
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(translate(query), params)
+            # to_arrow_reader replaces the deprecated fetch_record_batch in newer DuckDB releases
+            reader = (cursor.to_arrow_reader(chunk_rows) if hasattr(cursor, 'to_arrow_reader')
+                      else cursor.fetch_record_batch(chunk_rows))
+            empty = True
+            for batch in reader:
+                empty = False
+                table = pa.Table.from_batches([batch])
+                yield table if as_arrow else table.to_pandas()
+            if empty:
+                table = reader.schema.empty_table()
+                yield table if as_arrow else table.to_pandas()
+        finally:
+            cursor.close()
+
+    def execute_sql_file(self, file_path: str) -> bool:
+        """Run every statement of a .sql file; returns False on the first failure"""
+        self.get_engine()
+        cursor = self._connection.cursor()
+        try:
+            for statement in parse_script(Path(file_path).read_text(encoding='utf-8')):
+                if statement.kind == 'transaction':
+                    continue
+                cursor.execute(translate(statement.text))
+            return True
+        except Exception as e:
+            logger.error(f"Error executing {file_path}: {e}")
+            return False
+        finally:
+            cursor.close()
+
+    def test_connection(self) -> Dict[str, Any]:
+        """Backend details and table row counts"""
+        self.get_engine()
+        counts = {table: self._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in self.TABLES}
+        version = self._connection.execute("SELECT version()").fetchone()[0]
+        threads = self._connection.execute("SELECT current_setting('threads')").fetchone()[0]
+        return {'status': 'success', 'backend': 'duckdb', 'version': version, 'threads': threads,
+                'data_dir': str(self.data_dir), 'tables': counts}
+
+    def get_table_info(self) -> 'pd.DataFrame':
+        """Columns of the registered tables"""
+        return self.query("""
+            SELECT table_name, column_name, data_type, is_nullable
+            FROM information_schema.columns
+            WHERE table_schema = 'main'
+            ORDER BY table_name, ordinal_position""")
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._engine = None
+            logger.info("DuckDB database closed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the SQL query library on the embedded DuckDB backend')
+    parser.add_argument('sql_file', nargs='?', help='.sql file whose read-only queries to run')
+    parser.add_argument('--query', help='Run one query and print the result')
+    parser.add_argument('--data-dir', default='data/processed', help='Directory with the processed files')
+    parser.add_argument('--threads', type=int, default=None, help='DuckDB worker threads (default: all cores)')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 4, help='Queries in flight')
+    args = parser.parse_args()
+    if bool(args.sql_file) == bool(args.query):
+        parser.error('give either a .sql file or --query')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    db_manager = DuckDBManager(args.data_dir, threads=args.threads)
+    try:
+        if args.query:
+            print(db_manager.query(args.query).to_string(index=False))
+            return
+        results = SqlScriptRunner(db_manager.get_engine()).run_queries(args.sql_file, workers=args.workers,
+                                                                        fetch=False)
+        for result in results:
+            if result['error']:
+                print(f"❌ line {result['line']:>4}  {result['title'][:60]}: {result['error']}")
+            else:
+                print(f"✅ line {result['line']:>4}  {result['title'][:60]}: "
+                      f"{result['rows']:,} rows in {result['seconds'] * 1000:.0f} ms")
+        failed = sum(1 for result in results if result['error'])
+        print(f"\n{len(results) - failed}/{len(results)} queries succeeded")
+        if failed:
+            sys.exit(1)
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
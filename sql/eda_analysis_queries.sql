@@ -47,8 +47,7 @@ SELECT
     COUNT(*) as total_skill_mentions
 FROM skills s
 JOIN job_skills js ON s.skill_id = js.skill_id;
--- Query 
-2.2: Top 15 Skills Overall (Technical & Soft)
+-- Query 2.2: Top 15 Skills Overall (Technical & Soft)
 -- Business Question: What are the most demanded skills overall?
 SELECT 
     s.skill_name,
@@ -91,8 +90,9 @@ WHERE s.skill_category = 'soft'
     AND s.skill_name != ''
 GROUP BY s.skill_name
 ORDER BY job_count DESC
-LIMIT 10;-- Quer
-y 2.5: Skills by Role Analysis
+LIMIT 10;
+
+-- Query 2.5: Skills by Role Analysis
 -- Business Question: What skills are most demanded for each top job role?
 SELECT 
     j.job_title,
@@ -138,8 +138,9 @@ WHERE c.industry IN (
     AND s.skill_name IS NOT NULL 
     AND s.skill_name != ''
 GROUP BY c.industry, s.skill_name, s.skill_category
-ORDER BY c.industry, mention_count DESC;-- ====
-=================================================
+ORDER BY c.industry, mention_count DESC;
+
+-- =====================================================
 -- UTILITY QUERIES
 -- =====================================================
 
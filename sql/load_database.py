@@ -0,0 +1,665 @@
+"""
+Database loading pipeline for Wuzzuf Job Market Analysis
+Functions from notebooks/02_database_insertion.ipynb as an importable module, plus
+load_database() which (re)creates the schema and loads the processed CSV files
+"""
+
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from database_setup import DatabaseManager, configure_logging
+from lazy_imports import lazy_import
+from stage_profiler import profiled, stage
+
+pd = lazy_import('pandas')
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / 'data' / 'processed'
+DEFAULT_SCHEMA_FILE = Path(__file__).resolve().parent / 'schema.sql'
+
+
+def validate_and_clean_data(jobs_df, skills_df, job_skills_df):
+    """
+    Validate and clean data before insertion
+    """
+    validation_report = {
+        'jobs_original': len(jobs_df),
+        'skills_original': len(skills_df),
+        'job_skills_original': len(job_skills_df),
+        'issues': []
+    }
+    
+    # Validate jobs data
+    print("Validating jobs data...")
+    
+    # Check for required columns
+    required_job_cols = ['job_id', 'posting_date', 'job_title', 'company_name']
+    missing_cols = [col for col in required_job_cols if col not in jobs_df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing required columns in jobs data: {missing_cols}")
+    
+    # Remove duplicates based on job_id
+    initial_count = len(jobs_df)
+    jobs_df = jobs_df.drop_duplicates(subset=['job_id'])
+    if len(jobs_df) < initial_count:
+        duplicates_removed = initial_count - len(jobs_df)
+        validation_report['issues'].append(f"Removed {duplicates_removed} duplicate job records")
+        print(f"⚠️  Removed {duplicates_removed} duplicate job records")
+    
+    # Validate job_id is not null
+    null_job_ids = jobs_df['job_id'].isnull().sum()
+    if null_job_ids > 0:
+        jobs_df = jobs_df.dropna(subset=['job_id'])
+        validation_report['issues'].append(f"Removed {null_job_ids} records with null job_id")
+        print(f"⚠️  Removed {null_job_ids} records with null job_id")
+    
+    # Convert posting_date to datetime
+    try:
+        jobs_df['posting_date'] = pd.to_datetime(jobs_df['posting_date'])
+    except Exception as e:
+        validation_report['issues'].append(f"Date conversion issues: {str(e)}")
+        print(f"⚠️  Date conversion issues: {str(e)}")
+    
+    # Validate skills data
+    print("Validating skills data...")
+    
+    # Remove duplicate skills
+    initial_skills = len(skills_df)
+    skills_df = skills_df.drop_duplicates(subset=['skill_name'])
+    if len(skills_df) < initial_skills:
+        duplicates_removed = initial_skills - len(skills_df)
+        validation_report['issues'].append(f"Removed {duplicates_removed} duplicate skills")
+        print(f"⚠️  Removed {duplicates_removed} duplicate skills")
+    
+    # Validate job_skills relationships
+    print("Validating job-skills relationships...")
+    
+    # Remove relationships with invalid job_ids or skill_ids
+    valid_job_ids = set(jobs_df['job_id'])
+    valid_skill_ids = set(skills_df['skill_id'])
+    
+    initial_relationships = len(job_skills_df)
+    job_skills_df = job_skills_df[
+        job_skills_df['job_id'].isin(valid_job_ids) & 
+        job_skills_df['skill_id'].isin(valid_skill_ids)
+    ]
+    
+    if len(job_skills_df) < initial_relationships:
+        invalid_removed = initial_relationships - len(job_skills_df)
+        validation_report['issues'].append(f"Removed {invalid_removed} invalid job-skill relationships")
+        print(f"⚠️  Removed {invalid_removed} invalid job-skill relationships")
+    
+    # Remove duplicate relationships
+    initial_relationships = len(job_skills_df)
+    job_skills_df = job_skills_df.drop_duplicates(subset=['job_id', 'skill_id'])
+    if len(job_skills_df) < initial_relationships:
+        duplicates_removed = initial_relationships - len(job_skills_df)
+        validation_report['issues'].append(f"Removed {duplicates_removed} duplicate job-skill relationships")
+        print(f"⚠️  Removed {duplicates_removed} duplicate job-skill relationships")
+    
+    # Update final counts
+    validation_report.update({
+        'jobs_final': len(jobs_df),
+        'skills_final': len(skills_df),
+        'job_skills_final': len(job_skills_df)
+    })
+    
+    print("\n✅ Data validation completed")
+    print(f"Final counts: Jobs={len(jobs_df):,}, Skills={len(skills_df):,}, Relationships={len(job_skills_df):,}")
+    
+    return jobs_df, skills_df, job_skills_df, validation_report
+
+
+def extract_companies(jobs_df):
+    """
+    Extract unique companies from jobs data
+    """
+    print("Extracting unique companies...")
+    
+    # Get unique companies with their attributes
+    company_columns = ['company_name', 'company_industry', 'company_size']
+    
+    # Handle missing company names
+    jobs_with_companies = jobs_df[jobs_df['company_name'].notna()].copy()
+    
+    # Group by company name and take first occurrence of industry and size
+    companies_df = jobs_with_companies.groupby('company_name').agg({
+        'company_industry': 'first',
+        'company_size': 'first'
+    }).reset_index()
+    
+    # Rename columns to match database schema
+    companies_df = companies_df.rename(columns={
+        'company_industry': 'industry',
+        'company_size': 'company_size'
+    })
+    
+    # Clean company data
+    companies_df['company_name'] = companies_df['company_name'].str.strip()
+    companies_df['industry'] = companies_df['industry'].str.strip()
+    companies_df['company_size'] = companies_df['company_size'].str.strip()
+    
+    # Replace empty strings with None
+    companies_df = companies_df.replace('', None)
+    
+    print(f"✓ Extracted {len(companies_df):,} unique companies")
+    
+    return companies_df
+
+
+def insert_companies(companies_df, engine):
+    """
+    Insert companies data into database
+    """
+    print("Inserting companies data...")
+    
+    try:
+        # Insert companies and get the inserted data with IDs
+        companies_df.to_sql('companies', engine, if_exists='append', index=False, method='multi')
+        
+        # Get the inserted companies with their generated IDs
+        companies_with_ids = pd.read_sql(
+            "SELECT company_id, company_name FROM companies ORDER BY company_id", 
+            engine
+        )
+        
+        print(f"✅ Successfully inserted {len(companies_df):,} companies")
+        return companies_with_ids
+        
+    except Exception as e:
+        logger.error(f"Error inserting companies: {e}")
+        raise
+
+
+def insert_skills(skills_df, engine):
+    """
+    Insert skills data into database
+    """
+    print("Inserting skills data...")
+    
+    try:
+        # Prepare skills data for insertion
+        skills_insert = skills_df[['skill_name', 'skill_category']].copy()
+        
+        # Clean skills data
+        skills_insert['skill_name'] = skills_insert['skill_name'].str.strip().str.lower()
+        skills_insert['skill_category'] = skills_insert['skill_category'].str.strip().str.lower()
+        
+        # Insert skills
+        skills_insert.to_sql('skills', engine, if_exists='append', index=False, method='multi')
+        
+        # Get inserted skills with their IDs
+        skills_with_ids = pd.read_sql(
+            "SELECT skill_id, skill_name FROM skills ORDER BY skill_id", 
+            engine
+        )
+        
+        print(f"✅ Successfully inserted {len(skills_df):,} skills")
+        return skills_with_ids
+        
+    except Exception as e:
+        logger.error(f"Error inserting skills: {e}")
+        raise
+
+
+def insert_roles(roles_df, engine):
+    """
+    Insert the roles dimension (role ids are kept from roles.csv)
+    """
+    print("Inserting roles data...")
+    
+    try:
+        roles_insert = roles_df[['role_id', 'role_name', 'title_count']].copy()
+        roles_insert.to_sql('roles', engine, if_exists='append', index=False, method='multi')
+        
+        print(f"✅ Successfully inserted {len(roles_insert):,} roles")
+        return roles_insert
+        
+    except Exception as e:
+        logger.error(f"Error inserting roles: {e}")
+        raise
+
+
+def prepare_jobs_for_insertion(jobs_df, companies_with_ids):
+    """
+    Prepare jobs data for insertion by mapping company names to IDs
+    """
+    print("Preparing jobs data for insertion...")
+    
+    # Create company name to ID mapping
+    company_mapping = dict(zip(companies_with_ids['company_name'], companies_with_ids['company_id']))
+    
+    # Prepare jobs data
+    jobs_insert = jobs_df.copy()
+    
+    # Map company names to IDs
+    jobs_insert['company_id'] = jobs_insert['company_name'].map(company_mapping)
+    
+    # Select columns that match database schema
+    db_columns = [
+        'job_id', 'posting_date', 'job_title', 'job_title_full', 'job_title_additional',
+        'position_type', 'position_level', 'years_experience', 'experience_level',
+        'city', 'country', 'salary_min', 'salary_max', 'salary_min_usd', 'salary_max_usd',
+        'salary_outlier', 'pay_rate', 'currency', 'applicants', 'company_id', 'posting_year', 'posting_month',
+        'canonical_job_id', 'role_id'
+    ]
+    
+    # Keep only columns that exist in the dataframe
+    available_columns = [col for col in db_columns if col in jobs_insert.columns]
+    jobs_insert = jobs_insert[available_columns]
+    
+    # Handle data types
+    if 'salary_min' in jobs_insert.columns:
+        jobs_insert['salary_min'] = pd.to_numeric(jobs_insert['salary_min'], errors='coerce')
+    if 'salary_max' in jobs_insert.columns:
+        jobs_insert['salary_max'] = pd.to_numeric(jobs_insert['salary_max'], errors='coerce')
+    if 'years_experience' in jobs_insert.columns:
+        jobs_insert['years_experience'] = pd.to_numeric(jobs_insert['years_experience'], errors='coerce').fillna(0).astype(int)
+    if 'applicants' in jobs_insert.columns:
+        jobs_insert['applicants'] = pd.to_numeric(jobs_insert['applicants'], errors='coerce')
+    if 'role_id' in jobs_insert.columns:
+        jobs_insert['role_id'] = pd.to_numeric(jobs_insert['role_id'], errors='coerce').astype('Int64')
+    
+    # Replace empty strings with None
+    jobs_insert = jobs_insert.replace('', None)
+    
+    # Report on company mapping
+    mapped_companies = jobs_insert['company_id'].notna().sum()
+    total_jobs = len(jobs_insert)
+    
+    print(f"✓ Prepared {total_jobs:,} jobs for insertion")
+    print(f"✓ {mapped_companies:,} jobs mapped to companies ({mapped_companies/total_jobs*100:.1f}%)")
+    
+    return jobs_insert
+
+
+def insert_jobs(jobs_insert, engine):
+    """
+    Insert jobs data into database
+    """
+    print("Inserting jobs data...")
+    
+    try:
+        # Insert jobs in batches for better performance
+        batch_size = 1000
+        total_batches = (len(jobs_insert) + batch_size - 1) // batch_size
+        
+        for i in range(0, len(jobs_insert), batch_size):
+            batch = jobs_insert.iloc[i:i+batch_size]
+            batch.to_sql('jobs', engine, if_exists='append', index=False, method='multi')
+            
+            batch_num = (i // batch_size) + 1
+            if batch_num % 5 == 0 or batch_num == total_batches:
+                print(f"  Inserted batch {batch_num}/{total_batches} ({len(batch)} records)")
+        
+        print(f"✅ Successfully inserted {len(jobs_insert):,} jobs")
+        
+    except Exception as e:
+        logger.error(f"Error inserting jobs: {e}")
+        raise
+
+
+def insert_job_skills(job_skills_df, engine):
+    """
+    Insert job-skills relationships into database
+    """
+    print("Inserting job-skills relationships...")
+    
+    try:
+        # Prepare job_skills data
+        job_skills_insert = job_skills_df[['job_id', 'skill_id']].copy()
+        
+        # Convert to appropriate data types
+        job_skills_insert['job_id'] = job_skills_insert['job_id'].astype('int64')
+        job_skills_insert['skill_id'] = job_skills_insert['skill_id'].astype('int32')
+        
+        # Insert in batches
+        batch_size = 5000
+        total_batches = (len(job_skills_insert) + batch_size - 1) // batch_size
+        
+        for i in range(0, len(job_skills_insert), batch_size):
+            batch = job_skills_insert.iloc[i:i+batch_size]
+            batch.to_sql('job_skills', engine, if_exists='append', index=False, method='multi')
+            
+            batch_num = (i // batch_size) + 1
+            if batch_num % 10 == 0 or batch_num == total_batches:
+                print(f"  Inserted batch {batch_num}/{total_batches} ({len(batch)} relationships)")
+        
+        print(f"✅ Successfully inserted {len(job_skills_insert):,} job-skill relationships")
+        
+    except Exception as e:
+        logger.error(f"Error inserting job-skills relationships: {e}")
+        raise
+
+
+def validate_database_integrity(engine):
+    """
+    Perform comprehensive database integrity checks
+    """
+    print("Performing database integrity checks...")
+    
+    integrity_report = {
+        'timestamp': datetime.now(),
+        'checks': [],
+        'issues': [],
+        'summary': {}
+    }
+    
+    # 1. Table row counts
+    print("\n1. Checking table row counts...")
+    tables = ['companies', 'skills', 'roles', 'jobs', 'job_skills']
+    
+    for table in tables:
+        count = pd.read_sql(f"SELECT COUNT(*) as count FROM {table}", engine).iloc[0]['count']
+        integrity_report['summary'][f'{table}_count'] = count
+        print(f"   {table}: {count:,} records")
+    
+    # 2. Foreign key integrity
+    print("\n2. Checking foreign key integrity...")
+    
+    # Jobs -> Companies
+    orphaned_jobs = pd.read_sql("""
+        SELECT COUNT(*) as count 
+        FROM jobs j 
+        WHERE j.company_id IS NOT NULL 
+        AND j.company_id NOT IN (SELECT company_id FROM companies)
+    """, engine).iloc[0]['count']
+    
+    if orphaned_jobs > 0:
+        integrity_report['issues'].append(f"Found {orphaned_jobs} jobs with invalid company_id")
+        print(f"   ⚠️  {orphaned_jobs} jobs with invalid company_id")
+    else:
+        print(f"   ✓ All job company references are valid")
+    
+    # Job_skills -> Jobs
+    orphaned_job_skills_jobs = pd.read_sql("""
+        SELECT COUNT(*) as count 
+        FROM job_skills js 
+        WHERE js.job_id NOT IN (SELECT job_id FROM jobs)
+    """, engine).iloc[0]['count']
+    
+    if orphaned_job_skills_jobs > 0:
+        integrity_report['issues'].append(f"Found {orphaned_job_skills_jobs} job_skills with invalid job_id")
+        print(f"   ⚠️  {orphaned_job_skills_jobs} job_skills with invalid job_id")
+    else:
+        print(f"   ✓ All job_skills job references are valid")
+    
+    # Job_skills -> Skills
+    orphaned_job_skills_skills = pd.read_sql("""
+        SELECT COUNT(*) as count 
+        FROM job_skills js 
+        WHERE js.skill_id NOT IN (SELECT skill_id FROM skills)
+    """, engine).iloc[0]['count']
+    
+    if orphaned_job_skills_skills > 0:
+        integrity_report['issues'].append(f"Found {orphaned_job_skills_skills} job_skills with invalid skill_id")
+        print(f"   ⚠️  {orphaned_job_skills_skills} job_skills with invalid skill_id")
+    else:
+        print(f"   ✓ All job_skills skill references are valid")
+    
+    # 3. Data quality checks
+    print("\n3. Checking data quality...")
+    
+    # Null job titles
+    null_titles = pd.read_sql("SELECT COUNT(*) as count FROM jobs WHERE job_title IS NULL", engine).iloc[0]['count']
+    if null_titles > 0:
+        integrity_report['issues'].append(f"Found {null_titles} jobs with null titles")
+        print(f"   ⚠️  {null_titles} jobs with null titles")
+    else:
+        print(f"   ✓ All jobs have titles")
+    
+    # Invalid dates
+    invalid_dates = pd.read_sql("""
+        SELECT COUNT(*) as count FROM jobs 
+        WHERE posting_date IS NULL OR posting_date < '2000-01-01' OR posting_date > CURRENT_DATE
+    """, engine).iloc[0]['count']
+    
+    if invalid_dates > 0:
+        integrity_report['issues'].append(f"Found {invalid_dates} jobs with invalid dates")
+        print(f"   ⚠️  {invalid_dates} jobs with invalid dates")
+    else:
+        print(f"   ✓ All job dates are valid")
+    
+    # 4. Business logic checks
+    print("\n4. Checking business logic...")
+    
+    # Salary range validation
+    invalid_salary_ranges = pd.read_sql("""
+        SELECT COUNT(*) as count FROM jobs 
+        WHERE salary_min IS NOT NULL AND salary_max IS NOT NULL 
+        AND salary_max < salary_min
+    """, engine).iloc[0]['count']
+    
+    if invalid_salary_ranges > 0:
+        integrity_report['issues'].append(f"Found {invalid_salary_ranges} jobs with invalid salary ranges")
+        print(f"   ⚠️  {invalid_salary_ranges} jobs with invalid salary ranges")
+    else:
+        print(f"   ✓ All salary ranges are valid")
+    
+    # 5. Summary statistics
+    print("\n5. Summary statistics...")
+    
+    # Jobs with companies
+    jobs_with_companies = pd.read_sql(
+        "SELECT COUNT(*) as count FROM jobs WHERE company_id IS NOT NULL", 
+        engine
+    ).iloc[0]['count']
+    
+    total_jobs = integrity_report['summary']['jobs_count']
+    company_coverage = (jobs_with_companies / total_jobs * 100) if total_jobs > 0 else 0
+    
+    print(f"   Jobs with company info: {jobs_with_companies:,} ({company_coverage:.1f}%)")
+    integrity_report['summary']['jobs_with_companies'] = jobs_with_companies
+    integrity_report['summary']['company_coverage_pct'] = company_coverage
+    
+    # Jobs with skills
+    jobs_with_skills = pd.read_sql("""
+        SELECT COUNT(DISTINCT job_id) as count FROM job_skills
+    """, engine).iloc[0]['count']
+    
+    skills_coverage = (jobs_with_skills / total_jobs * 100) if total_jobs > 0 else 0
+    print(f"   Jobs with skills: {jobs_with_skills:,} ({skills_coverage:.1f}%)")
+    integrity_report['summary']['jobs_with_skills'] = jobs_with_skills
+    integrity_report['summary']['skills_coverage_pct'] = skills_coverage
+    
+    # Average skills per job
+    avg_skills = pd.read_sql("""
+        SELECT AVG(skill_count) as avg_skills
+        FROM (
+            SELECT job_id, COUNT(*) as skill_count
+            FROM job_skills
+            GROUP BY job_id
+        ) skill_counts
+    """, engine).iloc[0]['avg_skills']
+    
+    if avg_skills:
+        print(f"   Average skills per job: {avg_skills:.1f}")
+        integrity_report['summary']['avg_skills_per_job'] = float(avg_skills)
+    
+    # Jobs with salary data
+    jobs_with_salary = pd.read_sql("""
+        SELECT COUNT(*) as count FROM jobs 
+        WHERE salary_min IS NOT NULL OR salary_max IS NOT NULL
+    """, engine).iloc[0]['count']
+    
+    salary_coverage = (jobs_with_salary / total_jobs * 100) if total_jobs > 0 else 0
+    print(f"   Jobs with salary data: {jobs_with_salary:,} ({salary_coverage:.1f}%)")
+    integrity_report['summary']['jobs_with_salary'] = jobs_with_salary
+    integrity_report['summary']['salary_coverage_pct'] = salary_coverage
+    
+    # Overall status
+    if len(integrity_report['issues']) == 0:
+        print("\n✅ All integrity checks passed!")
+        integrity_report['status'] = 'PASSED'
+    else:
+        print(f"\n⚠️  Found {len(integrity_report['issues'])} integrity issues")
+        integrity_report['status'] = 'ISSUES_FOUND'
+    
+    return integrity_report
+
+
+def generate_loading_report(validation_report, integrity_report):
+    """
+    Generate comprehensive data loading report
+    """
+    print("\n" + "=" * 60)
+    print("DATABASE DATA LOADING REPORT")
+    print("=" * 60)
+    
+    print(f"\nTimestamp: {integrity_report['timestamp']}")
+    print(f"Database: wuzzuf")
+    print(f"Status: {integrity_report['status']}")
+    
+    print("\n📊 DATA PROCESSING SUMMARY")
+    print("-" * 30)
+    print(f"Original CSV Records:")
+    print(f"  - Jobs: {validation_report['jobs_original']:,}")
+    print(f"  - Skills: {validation_report['skills_original']:,}")
+    print(f"  - Job-Skills: {validation_report['job_skills_original']:,}")
+    
+    print(f"\nProcessed Records:")
+    print(f"  - Jobs: {validation_report['jobs_final']:,}")
+    print(f"  - Skills: {validation_report['skills_final']:,}")
+    print(f"  - Job-Skills: {validation_report['job_skills_final']:,}")
+    
+    if validation_report['issues']:
+        print(f"\nData Cleaning Issues:")
+        for issue in validation_report['issues']:
+            print(f"  - {issue}")
+    
+    print("\n🗄️  DATABASE INSERTION SUMMARY")
+    print("-" * 35)
+    summary = integrity_report['summary']
+    print(f"Companies: {summary['companies_count']:,}")
+    print(f"Skills: {summary['skills_count']:,}")
+    print(f"Jobs: {summary['jobs_count']:,}")
+    print(f"Job-Skills Relationships: {summary['job_skills_count']:,}")
+    
+    print("\n📈 DATA COVERAGE ANALYSIS")
+    print("-" * 30)
+    print(f"Jobs with company info: {summary['jobs_with_companies']:,} ({summary['company_coverage_pct']:.1f}%)")
+    print(f"Jobs with skills: {summary['jobs_with_skills']:,} ({summary['skills_coverage_pct']:.1f}%)")
+    print(f"Jobs with salary data: {summary['jobs_with_salary']:,} ({summary['salary_coverage_pct']:.1f}%)")
+    print(f"Average skills per job: {summary.get('avg_skills_per_job', 0):.1f}")
+    
+    if integrity_report['issues']:
+        print("\n⚠️  INTEGRITY ISSUES")
+        print("-" * 20)
+        for issue in integrity_report['issues']:
+            print(f"  - {issue}")
+    
+    print("\n✅ DELIVERABLES COMPLETED")
+    print("-" * 30)
+    print("✓ Data insertion functions with error handling")
+    print("✓ Company extraction and deduplication logic")
+    print("✓ Transaction management and rollback capabilities")
+    print("✓ Data loading validation report with row counts")
+    print("✓ Populated PostgreSQL database 'wuzzuf' with all tables")
+    
+    print("\n🎯 NEXT STEPS")
+    print("-" * 15)
+    print("1. Database is ready for analysis queries")
+    print("2. Proceed to business intelligence analysis (Task 4)")
+    print("3. All foreign key relationships are properly established")
+    print("4. Data integrity checks completed successfully")
+    
+    return {
+        'validation_report': validation_report,
+        'integrity_report': integrity_report,
+        'status': 'COMPLETED' if integrity_report['status'] == 'PASSED' else 'COMPLETED_WITH_ISSUES'
+    }
+
+
+@profiled('load_database')
+def load_database(data_dir=DEFAULT_DATA_DIR, db_manager=None, recreate_schema=True, bulk_load=True,
+                  parallel_sessions=4):
+    """
+    Load jobs.csv, skills.csv, job_skills.csv and roles.csv into PostgreSQL
+
+    Same steps as notebooks/02_database_insertion.ipynb. With recreate_schema
+    the tables are dropped and recreated first, so the load can be repeated.
+    In bulk-load mode the recreated tables have no keys or indexes while rows
+    are inserted; they are built afterwards, before the integrity checks.
+
+    Args:
+        data_dir: Directory with the processed CSV files
+        db_manager: DatabaseManager to use (default: from environment / sql/.env)
+        recreate_schema: Drop and recreate the tables before loading
+        bulk_load: Defer keys, foreign keys and indexes until after the load
+            (only applies with recreate_schema)
+        parallel_sessions: Database sessions used to build the deferred indexes
+
+    Returns:
+        dict: Final loading report (validation and integrity reports, status)
+    """
+    data_dir = Path(data_dir)
+    owns_manager = db_manager is None
+    db_manager = db_manager or DatabaseManager()
+    bulk_load = bulk_load and recreate_schema
+
+    try:
+        if recreate_schema:
+            with stage('create_schema'):
+                if (not db_manager.create_database()
+                        or not db_manager.create_schema(str(DEFAULT_SCHEMA_FILE), bulk_load=bulk_load)):
+                    raise RuntimeError("Database schema creation failed")
+        engine = db_manager.get_engine()
+
+        with stage('read_csv') as st:
+            for name in ('jobs.csv', 'skills.csv', 'job_skills.csv'):
+                if not (data_dir / name).exists():
+                    raise FileNotFoundError(f"Required file not found: {data_dir / name}")
+            jobs_df = pd.read_csv(data_dir / 'jobs.csv')
+            skills_df = pd.read_csv(data_dir / 'skills.csv')
+            job_skills_df = pd.read_csv(data_dir / 'job_skills.csv')
+            # roles.csv is optional: processed data from before title clustering has no role_id
+            roles_df = pd.read_csv(data_dir / 'roles.csv') if (data_dir / 'roles.csv').exists() else None
+            st.set_rows(rows_out=len(jobs_df) + len(skills_df) + len(job_skills_df))
+
+        jobs_df, skills_df, job_skills_df, validation_report = validate_and_clean_data(jobs_df, skills_df, job_skills_df)
+
+        with stage('companies') as st:
+            companies_with_ids = insert_companies(extract_companies(jobs_df), engine)
+            st.set_rows(rows_out=len(companies_with_ids))
+        with stage('skills') as st:
+            insert_skills(skills_df, engine)
+            st.set_rows(rows_out=len(skills_df))
+        if roles_df is not None:
+            with stage('roles') as st:
+                insert_roles(roles_df, engine)
+                st.set_rows(rows_out=len(roles_df))
+        with stage('jobs') as st:
+            insert_jobs(prepare_jobs_for_insertion(jobs_df, companies_with_ids), engine)
+            st.set_rows(rows_out=len(jobs_df))
+        with stage('job_skills') as st:
+            insert_job_skills(job_skills_df, engine)
+            st.set_rows(rows_out=len(job_skills_df))
+
+        if bulk_load:
+            with stage('finalize_schema'):
+                print("Building indexes and validating constraints...")
+                if not db_manager.finalize_schema(str(DEFAULT_SCHEMA_FILE), parallel_sessions):
+                    raise RuntimeError("Building deferred indexes and constraints failed")
+
+        with stage('integrity_checks'):
+            integrity_report = validate_database_integrity(engine)
+        return generate_loading_report(validation_report, integrity_report)
+    finally:
+        if owns_manager:
+            db_manager.close()
+
+
+if __name__ == "__main__":
+    configure_logging()
+    print("Database Data Insertion Pipeline")
+    print("=" * 40)
+    print(f"Started at: {datetime.now()}")
+    try:
+        load_database(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_DIR)
+    except Exception as e:
+        print(f"❌ Database loading failed: {e}")
+        sys.exit(1)
+    print(f"\n🏁 Data insertion pipeline completed at: {datetime.now()}")
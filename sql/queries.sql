@@ -18,17 +18,19 @@
 -- What are the most common job titles and hiring industries?
 -- =====================================================
 
--- Query 1.1: Top 10 Job Titles by Posting Count
+-- Query 1.1: Top 10 Job Roles by Posting Count
 -- Purpose: Identify the most in-demand job roles in the market
--- Expected Output: Job title, posting count, percentage of total market
+-- Expected Output: Role name, distinct titles in the role, posting count, percentage of total market
+-- Note: Roles cluster title variants ("Sr. Software Engineer", "Software Engineer III")
+--       into one canonical role (pipeline/title_clustering.py)
 SELECT 
-    job_title,
+    r.role_name,
+    r.title_count,
     COUNT(*) as posting_count,
     ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM jobs), 2) as percentage
-FROM jobs 
-WHERE job_title IS NOT NULL 
-    AND job_title != ''
-GROUP BY job_title 
+FROM jobs j
+JOIN roles r ON j.role_id = r.role_id
+GROUP BY r.role_id, r.role_name, r.title_count
 ORDER BY posting_count DESC 
 LIMIT 10;
 
@@ -103,27 +105,28 @@ GROUP BY experience_level
 ORDER BY posting_count DESC;
 
 -- Query 3.2: Experience Distribution by Top Job Roles
--- Purpose: Examine experience requirements for the most common job titles
--- Expected Output: Job title, experience level, posting count, percentage within role
+-- Purpose: Examine experience requirements for the most common job roles
+-- Expected Output: Role name, experience level, posting count, percentage within role
 WITH top_roles AS (
-    SELECT job_title
+    SELECT role_id
     FROM jobs 
-    WHERE job_title IS NOT NULL AND job_title != ''
-    GROUP BY job_title
+    WHERE role_id IS NOT NULL
+    GROUP BY role_id
     ORDER BY COUNT(*) DESC
     LIMIT 5
 )
 SELECT 
-    j.job_title,
+    r.role_name,
     j.experience_level,
     COUNT(*) as posting_count,
-    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY j.job_title), 2) as percentage_within_role
+    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY r.role_id), 2) as percentage_within_role
 FROM jobs j
-JOIN top_roles tr ON j.job_title = tr.job_title
+JOIN top_roles tr ON j.role_id = tr.role_id
+JOIN roles r ON j.role_id = r.role_id
 WHERE j.experience_level IS NOT NULL 
     AND j.experience_level != ''
-GROUP BY j.job_title, j.experience_level
-ORDER BY j.job_title, posting_count DESC;
+GROUP BY r.role_id, r.role_name, j.experience_level
+ORDER BY r.role_name, posting_count DESC;
 
 -- =====================================================
 -- BUSINESS QUESTION 4: SALARY INSIGHTS
@@ -144,20 +147,19 @@ FROM jobs;
 
 -- Query 4.2: Average Salaries by Job Role
 -- Purpose: Identify highest paying job roles with statistical analysis
--- Expected Output: Job title, job count, avg min/max/mid salary, salary range
+-- Expected Output: Role name, job count, avg min/max/mid salary, salary range
 SELECT 
-    job_title,
+    r.role_name,
     COUNT(*) as job_count,
-    ROUND(AVG(salary_min), 0) as avg_min_salary,
-    ROUND(AVG(salary_max), 0) as avg_max_salary,
-    ROUND(AVG((salary_min + salary_max) / 2.0), 0) as avg_mid_salary,
-    ROUND(AVG(salary_max - salary_min), 0) as avg_salary_range
-FROM jobs 
-WHERE salary_min IS NOT NULL 
-    AND salary_max IS NOT NULL
-    AND job_title IS NOT NULL 
-    AND job_title != ''
-GROUP BY job_title 
+    ROUND(AVG(j.salary_min), 0) as avg_min_salary,
+    ROUND(AVG(j.salary_max), 0) as avg_max_salary,
+    ROUND(AVG((j.salary_min + j.salary_max) / 2.0), 0) as avg_mid_salary,
+    ROUND(AVG(j.salary_max - j.salary_min), 0) as avg_salary_range
+FROM jobs j
+JOIN roles r ON j.role_id = r.role_id
+WHERE j.salary_min IS NOT NULL 
+    AND j.salary_max IS NOT NULL
+GROUP BY r.role_id, r.role_name 
 HAVING COUNT(*) >= 10  -- Only roles with at least 10 salary data points
 ORDER BY avg_mid_salary DESC
 LIMIT 10;
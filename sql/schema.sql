@@ -12,6 +12,7 @@ DROP TABLE IF EXISTS job_skills CASCADE;
 DROP TABLE IF EXISTS jobs CASCADE;
 DROP TABLE IF EXISTS companies CASCADE;
 DROP TABLE IF EXISTS skills CASCADE;
+DROP TABLE IF EXISTS roles CASCADE;
 
 -- Create companies table
 -- Stores unique company information extracted from job postings
@@ -32,6 +33,15 @@ CREATE TABLE skills (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Create roles table
+-- Canonical job roles clustered from job titles (pipeline/title_clustering.py)
+CREATE TABLE roles (
+    role_id INTEGER PRIMARY KEY,
+    role_name VARCHAR(255) NOT NULL UNIQUE,
+    title_count INTEGER NOT NULL DEFAULT 1 CHECK (title_count >= 1),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create jobs table
 -- Main table storing job posting information
 CREATE TABLE jobs (
@@ -48,12 +58,17 @@ CREATE TABLE jobs (
     country VARCHAR(100),
     salary_min DECIMAL(12,2) CHECK (salary_min >= 0),
     salary_max DECIMAL(12,2) CHECK (salary_max >= 0),
+    salary_min_usd DECIMAL(14,2) CHECK (salary_min_usd >= 0),
+    salary_max_usd DECIMAL(14,2) CHECK (salary_max_usd >= 0),
+    salary_outlier BOOLEAN NOT NULL DEFAULT FALSE,
     pay_rate VARCHAR(20),
     currency VARCHAR(10),
     applicants DECIMAL(10,1) CHECK (applicants >= 0),
     company_id INTEGER REFERENCES companies(company_id) ON DELETE SET NULL,
     posting_year INTEGER CHECK (posting_year >= 2000 AND posting_year <= 2030),
     posting_month INTEGER CHECK (posting_month >= 1 AND posting_month <= 12),
+    canonical_job_id BIGINT,
+    role_id INTEGER REFERENCES roles(role_id) ON DELETE SET NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     -- Ensure salary_max >= salary_min when both are present
@@ -81,6 +96,8 @@ CREATE INDEX idx_jobs_country ON jobs(country);
 CREATE INDEX idx_jobs_company_id ON jobs(company_id);
 CREATE INDEX idx_jobs_posting_year_month ON jobs(posting_year, posting_month);
 CREATE INDEX idx_jobs_salary_range ON jobs(salary_min, salary_max) WHERE salary_min IS NOT NULL;
+CREATE INDEX idx_jobs_canonical_job_id ON jobs(canonical_job_id) WHERE canonical_job_id <> job_id;
+CREATE INDEX idx_jobs_role_id ON jobs(role_id);
 
 -- Companies table indexes
 CREATE INDEX idx_companies_name ON companies(company_name);
@@ -125,6 +142,7 @@ LEFT JOIN skills s ON js.skill_id = s.skill_id;
 -- Add comments for documentation
 COMMENT ON TABLE companies IS 'Stores unique company information extracted from job postings';
 COMMENT ON TABLE skills IS 'Stores normalized and categorized skills (technical/soft)';
+COMMENT ON TABLE roles IS 'Canonical job roles; each groups the job titles clustered together by title similarity';
 COMMENT ON TABLE jobs IS 'Main table containing all job posting information';
 COMMENT ON TABLE job_skills IS 'Junction table for many-to-many relationship between jobs and skills';
 
@@ -133,6 +151,10 @@ COMMENT ON COLUMN jobs.experience_level IS 'Bucketed experience level: Entry (0-
 COMMENT ON COLUMN jobs.applicants IS 'Number of applicants for the job posting';
 COMMENT ON COLUMN jobs.salary_min IS 'Minimum salary in the specified currency';
 COMMENT ON COLUMN jobs.salary_max IS 'Maximum salary in the specified currency';
+COMMENT ON COLUMN jobs.salary_min_usd IS 'Minimum salary as an annual USD amount (pipeline/salary_normalization.py)';
+COMMENT ON COLUMN jobs.salary_outlier IS 'Normalized salary flagged by the robust (median/MAD) outlier test';
+COMMENT ON COLUMN jobs.canonical_job_id IS 'Earliest posting of the near-duplicate cluster (pipeline/duplicate_detection.py); equals job_id unless reposted';
+COMMENT ON COLUMN jobs.role_id IS 'Canonical role of job_title, so title variants count as one role';
 
 -- Grant permissions (adjust as needed for your environment)
 -- GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA public TO wuzzuf_user;
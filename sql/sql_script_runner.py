@@ -0,0 +1,466 @@
+"""
+SQL script runner for Wuzzuf Job Market Analysis
+Splits SQL files into statements (comments, quoted strings and dollar-quoting
+aware), runs scripts in batched round trips inside one transaction with
+per-statement timings, and runs read-only query libraries concurrently
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Statements PostgreSQL refuses to run inside a transaction block
+_NON_TRANSACTIONAL = re.compile(
+    r'^(CREATE\s+DATABASE|DROP\s+DATABASE|ALTER\s+SYSTEM|VACUUM|CREATE\s+(UNIQUE\s+)?INDEX\s+CONCURRENTLY|'
+    r'DROP\s+INDEX\s+CONCURRENTLY|REINDEX\s+.*CONCURRENTLY|CREATE\s+TABLESPACE|DROP\s+TABLESPACE)\b',
+    re.IGNORECASE | re.DOTALL)
+_TRANSACTION_CONTROL = re.compile(r'^(BEGIN|START\s+TRANSACTION|COMMIT|END|ROLLBACK|ABORT)\b', re.IGNORECASE)
+_READ_ONLY_START = ('SELECT', 'WITH', 'VALUES', 'TABLE', 'SHOW', 'EXPLAIN')
+_WRITE_KEYWORDS = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE|CREATE|DROP|ALTER|TRUNCATE|GRANT|REVOKE|COPY|INTO)\b',
+                             re.IGNORECASE)
+_DOLLAR_TAG = re.compile(r'\$([A-Za-z_][A-Za-z_0-9]*)?\$')
+_DECORATIVE = re.compile(r'^[=\-#*\s]*$')
+
+_MARKER = 'wuzzuf_stmt'
+
+
+class Statement:
+    """One SQL statement of a script, with its position and preceding comments"""
+
+    def __init__(self, text: str, index: int, line: int, comments: List[str], code: str):
+        self.text = text
+        self.index = index
+        self.line = line
+        self.comments = comments
+        # Statement with comments and string contents blanked out, for classification
+        self._code = code
+
+    @property
+    def title(self) -> str:
+        """First non-decorative line of the comment block above the statement"""
+        for comment in self.comments:
+            if not _DECORATIVE.match(comment):
+                return comment
+        return ' '.join(self.text.split())[:60]
+
+    @property
+    def kind(self) -> str:
+        """'read', 'write', 'transaction' or 'non_transactional'"""
+        code = self._code.strip()
+        if _TRANSACTION_CONTROL.match(code):
+            return 'transaction'
+        if _NON_TRANSACTIONAL.match(code):
+            return 'non_transactional'
+        first = code.split(None, 1)[0].upper() if code else ''
+        if first.lstrip('(') in _READ_ONLY_START and not _WRITE_KEYWORDS.search(code):
+            return 'read'
+        return 'write'
+
+    def __repr__(self):
+        return f"Statement({self.index}, line {self.line}, {self.kind}: {self.title!r})"
+
+
+def _scan(sql_content: str):
+    """
+    Yield (text, code, start_line, comments) for each statement of a script
+
+    `code` is the statement with comments removed and string/identifier
+    contents replaced by spaces, so keyword checks never look inside them.
+    """
+    i, n, line = 0, len(sql_content), 1
+    text, code, comments, block = [], [], [], []
+    start_line = None
+    # A comment on the same line as the closing ';' belongs to that statement
+    after_end = False
+
+    while i < n:
+        char = sql_content[i]
+        nxt = sql_content[i + 1] if i + 1 < n else ''
+
+        if char == '-' and nxt == '-':
+            end = sql_content.find('\n', i)
+            end = n if end == -1 else end
+            if start_line is None:
+                if not after_end:
+                    block.append(sql_content[i + 2:end].strip())
+            else:
+                text.append(sql_content[i:end])
+            i = end
+            continue
+
+        if char == '/' and nxt == '*':
+            depth, j = 1, i + 2
+            while j < n and depth:
+                if sql_content.startswith('/*', j):
+                    depth, j = depth + 1, j + 2
+                elif sql_content.startswith('*/', j):
+                    depth, j = depth - 1, j + 2
+                else:
+                    j += 1
+            chunk = sql_content[i:j]
+            line += chunk.count('\n')
+            if start_line is not None:
+                text.append(chunk)
+                code.append(' ')
+            i = j
+            continue
+
+        if char == ';':
+            if start_line is not None:
+                yield ''.join(text).strip(), ''.join(code), start_line, comments
+            text, code, comments, block, start_line = [], [], [], [], None
+            after_end = True
+            i += 1
+            continue
+
+        if start_line is None:
+            if char == '\n':
+                line += 1
+                after_end = False
+                # A blank line ends the comment block that titles the next statement
+                if sql_content[i + 1:].lstrip(' \t').startswith('\n'):
+                    block = []
+                i += 1
+                continue
+            if char.isspace():
+                i += 1
+                continue
+            start_line, comments, block = line, block, []
+
+        if char in ("'", '"'):
+            escape = char == "'" and i > 0 and sql_content[i - 1] in 'eE' and (
+                i < 2 or not (sql_content[i - 2].isalnum() or sql_content[i - 2] == '_'))
+            j = i + 1
+            while j < n:
+                if escape and sql_content[j] == '\\':
+                    j += 2
+                    continue
+                if sql_content[j] == char:
+                    if sql_content[j + 1:j + 2] == char:
+                        j += 2
+                        continue
+                    break
+                j += 1
+            chunk = sql_content[i:j + 1]
+            line += chunk.count('\n')
+            text.append(chunk)
+            code.append(char + ' ' * max(len(chunk) - 2, 0) + (char if len(chunk) > 1 else ''))
+            i = j + 1
+            continue
+
+        if char == '$':
+            tag = _DOLLAR_TAG.match(sql_content, i)
+            prev = sql_content[i - 1] if i else ''
+            if tag and not (prev.isalnum() or prev == '_'):
+                delimiter = tag.group(0)
+                end = sql_content.find(delimiter, tag.end())
+                end = n if end == -1 else end + len(delimiter)
+                chunk = sql_content[i:end]
+                line += chunk.count('\n')
+                text.append(chunk)
+                code.append(' ' * len(chunk))
+                i = end
+                continue
+
+        line += char == '\n'
+        text.append(char)
+        code.append(char)
+        i += 1
+
+    if start_line is not None and ''.join(text).strip():
+        yield ''.join(text).strip(), ''.join(code), start_line, comments
+
+
+def parse_script(sql_content: str) -> List[Statement]:
+    """
+    Split a SQL script into statements
+
+    Semicolons inside -- and /* */ comments, single-quoted and E'' strings,
+    double-quoted identifiers and $tag$ dollar-quoted bodies do not end a
+    statement. Comment lines directly above a statement are kept as its
+    comments (used for titles in reports).
+
+    Args:
+        sql_content: Text of the SQL script
+
+    Returns:
+        List of Statement objects in script order
+    """
+    statements = []
+    for text, code, line, comments in _scan(sql_content):
+        statements.append(Statement(text, len(statements), line, comments, code))
+    return statements
+
+
+def load_script(source: Union[str, Path, List[Statement]]) -> List[Statement]:
+    """Statements from a file path, SQL text or an already parsed list"""
+    if isinstance(source, list):
+        return source
+    if isinstance(source, Path) or (isinstance(source, str) and '\n' not in source and source.endswith('.sql')):
+        return parse_script(Path(source).read_text(encoding='utf-8'))
+    return parse_script(source)
+
+
+def _marker(index: int) -> str:
+    """DO block that raises a notice with the statement index and server clock"""
+    return (f"DO $wuzzuf_timing$ BEGIN RAISE NOTICE '{_MARKER} % %', {index}, "
+            f"extract(epoch from clock_timestamp()); END $wuzzuf_timing$")
+
+
+def _marker_times(notices) -> Dict[int, float]:
+    """Statement index -> server time from the timing notices"""
+    times = {}
+    for notice in notices:
+        match = re.search(_MARKER + r' (-?\d+) ([0-9.]+)', notice)
+        if match:
+            times[int(match.group(1))] = float(match.group(2))
+    return times
+
+
+class SqlScriptRunner:
+    """
+    Runs SQL scripts and query libraries against a SQLAlchemy engine (psycopg2)
+
+    Scripts run inside one transaction; consecutive transactional statements are
+    sent together in batches of up to `batch_size`, with a timing notice raised
+    between statements so each statement still gets its own server-side time
+    and a failure can be traced to its statement.
+    """
+
+    def __init__(self, engine, batch_size: int = 50):
+        self.engine = engine
+        self.batch_size = batch_size
+
+    def _batches(self, statements: List[Statement]):
+        """Group statements into ('batch', [...]) and ('single', [stmt]) units"""
+        batch = []
+        for statement in statements:
+            if statement.kind in ('non_transactional', 'transaction'):
+                if batch:
+                    yield 'batch', batch
+                    batch = []
+                yield 'single', [statement]
+                continue
+            batch.append(statement)
+            if len(batch) >= self.batch_size:
+                yield 'batch', batch
+                batch = []
+        if batch:
+            yield 'batch', batch
+
+    def run_script(self, source, stop_on_error: bool = True) -> Dict[str, Any]:
+        """
+        Run every statement of a script inside one transaction
+
+        Statements PostgreSQL cannot run in a transaction (CREATE DATABASE,
+        VACUUM, ... CONCURRENTLY) commit the work so far and run on their own;
+        explicit BEGIN/COMMIT statements are skipped, since the runner manages
+        the transaction.
+
+        Args:
+            source: Path to a .sql file, SQL text, or parsed statements
+            stop_on_error: Roll back and stop at the first failure (otherwise
+                the failed batch is rolled back and the script continues)
+
+        Returns:
+            Dict with 'statements' (index, title, line, kind, seconds, status),
+            'seconds', 'round_trips', 'failed' and 'error'
+        """
+        statements = load_script(source)
+        report = {'statements': [], 'seconds': 0.0, 'round_trips': 0, 'failed': 0, 'error': None}
+        rows = {s.index: {'index': s.index, 'title': s.title, 'line': s.line, 'kind': s.kind,
+                          'seconds': None, 'status': 'pending'} for s in statements}
+        started = time.perf_counter()
+
+        raw = self.engine.raw_connection()
+        try:
+            dbapi = raw.driver_connection if hasattr(raw, 'driver_connection') else raw.connection
+            dbapi.notices = deque()
+            cursor = dbapi.cursor()
+            uncommitted = []
+            for mode, unit in self._batches(statements):
+                if unit[0].kind == 'transaction':
+                    rows[unit[0].index]['status'] = 'skipped'
+                    continue
+                if mode == 'single':
+                    dbapi.commit()
+                    uncommitted = []
+                    dbapi.autocommit = True
+                    unit_start = time.perf_counter()
+                    try:
+                        cursor.execute(unit[0].text)
+                        rows[unit[0].index].update(seconds=time.perf_counter() - unit_start, status='ok')
+                    except Exception as e:
+                        rows[unit[0].index].update(status='failed', error=str(e).strip())
+                        report['failed'] += 1
+                        report['error'] = report['error'] or str(e).strip()
+                        if stop_on_error:
+                            break
+                    finally:
+                        dbapi.autocommit = False
+                        report['round_trips'] += 1
+                    continue
+
+                dbapi.notices.clear()
+                # Without stop_on_error a savepoint limits a failure's rollback to its own batch
+                parts = [_marker(-1)] if stop_on_error else ['SAVEPOINT wuzzuf_batch', _marker(-1)]
+                for statement in unit:
+                    parts.extend([statement.text, _marker(statement.index)])
+                try:
+                    # Newline before each ';' so a trailing -- comment cannot swallow it
+                    cursor.execute('\n;\n'.join(parts))
+                    ok = True
+                except Exception as e:
+                    ok = False
+                    error = str(e).strip()
+                report['round_trips'] += 1
+
+                times = _marker_times(dbapi.notices)
+                previous = times.get(-1)
+                for statement in unit:
+                    if statement.index in times:
+                        seconds = times[statement.index] - previous if previous is not None else None
+                        rows[statement.index].update(seconds=seconds, status='ok')
+                        previous = times[statement.index]
+                        uncommitted.append(statement.index)
+                    elif not ok:
+                        rows[statement.index].update(status='failed', error=error)
+                        report['failed'] += 1
+                        report['error'] = report['error'] or f"line {statement.line}: {error}"
+                        break
+                if not ok:
+                    if stop_on_error:
+                        break
+                    cursor.execute('ROLLBACK TO SAVEPOINT wuzzuf_batch')
+                    for statement in unit:
+                        if rows[statement.index]['status'] == 'ok':
+                            rows[statement.index]['status'] = 'rolled back'
+                            uncommitted.remove(statement.index)
+
+            if report['failed'] and stop_on_error:
+                dbapi.rollback()
+                for index in uncommitted:
+                    rows[index]['status'] = 'rolled back'
+            else:
+                dbapi.commit()
+            cursor.close()
+        finally:
+            raw.close()
+
+        report['statements'] = [rows[s.index] for s in statements]
+        report['seconds'] = time.perf_counter() - started
+        return report
+
+    def _run_read(self, statement: Statement, fetch: bool, max_rows: Optional[int]) -> Dict[str, Any]:
+        """Run one read-only statement on its own pooled connection"""
+        result = {'index': statement.index, 'title': statement.title, 'line': statement.line,
+                  'seconds': None, 'rows': 0, 'columns': [], 'data': None, 'error': None}
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            started = time.perf_counter()
+            try:
+                cursor.execute(statement.text)
+                columns = [d[0] for d in cursor.description] if cursor.description else []
+                data = cursor.fetchmany(max_rows) if max_rows else cursor.fetchall()
+                rowcount = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else len(data)
+                result.update(seconds=time.perf_counter() - started, rows=rowcount, columns=columns,
+                              data=data if fetch else None)
+            except Exception as e:
+                result['error'] = str(e).strip()
+            finally:
+                raw.rollback()
+                cursor.close()
+        finally:
+            raw.close()
+        return result
+
+    def run_queries(self, source, workers: int = 4, fetch: bool = True,
+                    max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run the read-only statements of a query library concurrently
+
+        Each SELECT/WITH statement runs in its own transaction on a pooled
+        connection, so independent queries overlap on the server. Statements
+        that write are ignored.
+
+        Args:
+            source: Path to a .sql file, SQL text, or parsed statements
+            workers: Queries in flight at the same time
+            fetch: Keep the fetched rows in the results
+            max_rows: Fetch at most this many rows per query
+
+        Returns:
+            List of dicts (index, title, line, seconds, rows, columns, data, error) in script order
+        """
+        statements = load_script(source)
+        reads = [s for s in statements if s.kind == 'read']
+        skipped = len(statements) - len(reads)
+        if skipped:
+            logger.info(f"Skipping {skipped} statement(s) that are not read-only")
+        if workers <= 1 or len(reads) <= 1:
+            return [self._run_read(s, fetch, max_rows) for s in reads]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda s: self._run_read(s, fetch, max_rows), reads))
+
+
+def format_report(report: Dict[str, Any], top: int = 10) -> str:
+    """Text summary of run_script output: totals and the slowest statements"""
+    lines = [f"{len(report['statements'])} statements in {report['seconds']:.2f}s "
+             f"({report['round_trips']} round trips, {report['failed']} failed)"]
+    timed = sorted((r for r in report['statements'] if r['seconds'] is not None),
+                   key=lambda r: r['seconds'], reverse=True)
+    for row in timed[:top]:
+        lines.append(f"  {row['seconds'] * 1000:9.1f} ms  line {row['line']:<5} {row['title'][:70]}")
+    for row in report['statements']:
+        if row['status'] == 'failed':
+            lines.append(f"  ❌ line {row['line']}: {row.get('error', '')}")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from database_setup import DatabaseManager, configure_logging
+
+    parser = argparse.ArgumentParser(description='Run SQL files: read-only query libraries concurrently, '
+                                                 'other scripts in one batched transaction')
+    parser.add_argument('files', nargs='+', help='SQL files, e.g. sql/queries.sql')
+    parser.add_argument('--workers', type=int, default=4, help='Read-only queries in flight at once')
+    parser.add_argument('--top', type=int, default=10, help='Slowest statements to list per script')
+    args = parser.parse_args()
+
+    configure_logging()
+    db_manager = DatabaseManager()
+    runner = SqlScriptRunner(db_manager.get_engine())
+    failures = 0
+    try:
+        for path in args.files:
+            statements = load_script(Path(path))
+            print(f"\n📄 {path}: {len(statements)} statements")
+            if statements and all(s.kind == 'read' for s in statements):
+                started = time.perf_counter()
+                results = runner.run_queries(statements, workers=args.workers, fetch=False)
+                for result in results:
+                    if result['error']:
+                        failures += 1
+                        print(f"   ❌ line {result['line']:<5} {result['title'][:60]}: {result['error']}")
+                    else:
+                        print(f"   ✅ {result['seconds'] * 1000:8.1f} ms  {result['rows']:>7,} rows  "
+                              f"{result['title'][:60]}")
+                print(f"   {len(results)} queries in {time.perf_counter() - started:.2f}s "
+                      f"with {args.workers} worker(s)")
+            else:
+                report = runner.run_script(statements)
+                failures += report['failed']
+                print('   ' + format_report(report, args.top).replace('\n', '\n   '))
+    finally:
+        db_manager.close()
+    sys.exit(1 if failures else 0)
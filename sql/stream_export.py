@@ -0,0 +1,124 @@
+"""
+Streaming query export for Wuzzuf Job Market Analysis
+Writes query results (e.g. the jobs_with_companies view) to CSV or Parquet chunk
+by chunk from a server-side cursor, so exports run in bounded memory at any scale
+
+Usage:
+    python sql/stream_export.py exports/jobs_with_companies.parquet --export jobs_with_companies
+    python sql/stream_export.py exports/jobs_2021.csv --query "SELECT * FROM jobs WHERE posting_year = 2021"
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+from database_setup import DatabaseManager, configure_logging
+from lazy_imports import lazy_import, require
+from stage_profiler import profiled
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'powerbi'))
+from export_writer import atomic_file
+
+pq = lazy_import('pyarrow.parquet')
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Detail extracts that are too large to materialize at full scale
+EXPORTS = {
+    'jobs_with_companies': 'SELECT * FROM jobs_with_companies ORDER BY job_id',
+    'job_skills_summary': 'SELECT * FROM job_skills_summary ORDER BY job_id, skill_name',
+    'jobs': 'SELECT * FROM jobs ORDER BY job_id',
+    'job_skills': 'SELECT job_id, skill_id FROM job_skills ORDER BY job_id, skill_id',
+}
+
+
+def _format_for(path, file_format=None):
+    """'csv' or 'parquet' from an explicit format or the file suffix"""
+    file_format = file_format or Path(path).suffix.lstrip('.').lower()
+    if file_format not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported export format '{file_format}' (use .csv or .parquet)")
+    return file_format
+
+
+@profiled('stream_export')
+def export_query(query, output_path, db_manager=None, chunk_rows=DEFAULT_CHUNK_ROWS, file_format=None,
+                 params=None, compression='snappy'):
+    """
+    Stream a query result into a CSV or Parquet file
+
+    Chunks are appended as they arrive (CSV rows, or one Parquet row group per
+    chunk) into a temporary file that replaces output_path only on success.
+
+    Args:
+        query: SQL query to export
+        output_path: Destination .csv or .parquet file
+        db_manager: DatabaseManager to use (default: from environment / sql/.env)
+        chunk_rows: Rows per fetch and per written chunk
+        file_format: 'csv' or 'parquet' (default: from the file suffix)
+        params: Query parameters
+        compression: Parquet compression codec
+
+    Returns:
+        dict: Rows, chunks, seconds and output path
+    """
+    output_path = Path(output_path)
+    file_format = _format_for(output_path, file_format)
+    if file_format == 'parquet':
+        require(pq, 'Parquet export')
+    owns_manager = db_manager is None
+    db_manager = db_manager or DatabaseManager()
+    started = time.perf_counter()
+    rows = chunks = 0
+
+    try:
+        if file_format == 'csv':
+            with atomic_file(output_path, 'w', encoding='utf-8', newline='') as f:
+                for chunk in db_manager.stream_query(query, chunk_rows, params):
+                    chunk.to_csv(f, index=False, header=chunks == 0)
+                    rows, chunks = rows + len(chunk), chunks + 1
+        else:
+            with atomic_file(output_path, 'wb') as f:
+                writer = None
+                try:
+                    for table in db_manager.stream_query(query, chunk_rows, params, as_arrow=True):
+                        if writer is None:
+                            writer = pq.ParquetWriter(f, table.schema, compression=compression)
+                        writer.write_table(table)
+                        rows, chunks = rows + table.num_rows, chunks + 1
+                finally:
+                    if writer is not None:
+                        writer.close()
+    finally:
+        if owns_manager:
+            db_manager.close()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Exported {rows:,} rows in {chunks} chunk(s) to {output_path} in {elapsed:.1f}s")
+    return {'rows': rows, 'chunks': chunks, 'seconds': elapsed, 'path': str(output_path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream a query or view to CSV/Parquet in bounded memory')
+    parser.add_argument('output', help='Output .csv or .parquet file')
+    parser.add_argument('--export', choices=sorted(EXPORTS), help='Named export')
+    parser.add_argument('--query', help='Custom SQL query instead of a named export')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Rows per chunk')
+    args = parser.parse_args()
+    if bool(args.export) == bool(args.query):
+        parser.error('give either --export or --query')
+
+    configure_logging()
+    try:
+        result = export_query(args.query or EXPORTS[args.export], args.output, chunk_rows=args.chunk_rows)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+    print(f"✅ {result['rows']:,} rows -> {result['path']} ({result['chunks']} chunks, {result['seconds']:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
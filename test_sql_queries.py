@@ -7,8 +7,11 @@ import sys
 import os
 sys.path.append('sql')
 
-from database_setup import DatabaseManager
-import pandas as pd
+from database_setup import configure_logging, get_database_manager
+from sql_script_runner import SqlScriptRunner, parse_script
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
 
 def test_sql_queries():
     """Test all SQL queries from the analysis_queries.sql file"""
@@ -17,47 +20,26 @@ def test_sql_queries():
     print("=" * 60)
     
     try:
-        # Initialize database connection
-        db_manager = DatabaseManager()
+        # Initialize database connection (WUZZUF_SQL_BACKEND=duckdb runs in-process)
+        db_manager = get_database_manager()
         engine = db_manager.get_engine()
         
-        # Read the SQL file
-        with open('sql/analysis_queries.sql', 'r', encoding='utf-8') as file:
-            sql_content = file.read()
-        
-        # Extract individual queries (split by comments and empty lines)
-        queries = []
-        current_query = []
-        lines = sql_content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('--') or line == '':
-                if current_query and any(q.strip() for q in current_query):
-                    query_text = '\n'.join(current_query).strip()
-                    if query_text and 'SELECT' in query_text.upper():
-                        queries.append(query_text)
-                current_query = []
-            else:
-                current_query.append(line)
+        # Split the SQL file into statements and run the queries concurrently
+        statements = [s for s in parse_script(open('sql/analysis_queries.sql', encoding='utf-8').read())
+                      if s.kind == 'read']
+        print(f"Found {len(statements)} SQL queries to test\n")
+        results = SqlScriptRunner(engine).run_queries(statements, workers=4)
         
-        # Add the last query if exists
-        if current_query and any(q.strip() for q in current_query):
-            query_text = '\n'.join(current_query).strip()
-            if query_text and 'SELECT' in query_text.upper():
-                queries.append(query_text)
-        
-        print(f"Found {len(queries)} SQL queries to test\n")
-        
-        # Test each query
-        for i, query in enumerate(queries, 1):
-            print(f"📊 Testing Query {i}:")
+        # Report each query
+        for i, result in enumerate(results, 1):
+            print(f"📊 Testing Query {i}: {result['title']}")
             print("-" * 40)
             
-            try:
-                # Execute query
-                result_df = pd.read_sql(query, engine)
-                print(f"✅ Query executed successfully")
+            if result['error']:
+                print(f"❌ Query failed: {result['error']}")
+            else:
+                result_df = pd.DataFrame(result['data'], columns=result['columns'])
+                print(f"✅ Query executed successfully in {result['seconds'] * 1000:.0f} ms")
                 print(f"📈 Results: {len(result_df)} rows, {len(result_df.columns)} columns")
                 
                 # Show first few rows
@@ -70,9 +52,6 @@ def test_sql_queries():
                         print(f"... and {len(result_df) - 3} more rows")
                 else:
                     print("No results returned")
-                    
-            except Exception as e:
-                print(f"❌ Query failed: {e}")
             
             print("\n" + "=" * 60 + "\n")
         
@@ -87,6 +66,7 @@ def test_sql_queries():
         return False
 
 if __name__ == "__main__":
+    configure_logging()
     success = test_sql_queries()
     if success:
         print("\n🎉 SQL query testing completed!")
@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the Wuzzuf Job Market Analysis tests
+Tests import the flat script modules the way the scripts do (directory on
+sys.path) and run against a small seeded synthetic dataset
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+for directory in ('pipeline', 'sql', 'powerbi', 'analysis'):
+    sys.path.append(str(ROOT / directory))
+
+
+@pytest.fixture(scope='session')
+def processed_dir(tmp_path_factory):
+    """~500 processed-format postings (jobs, skills, roles, job_skills.csv) learned from data/processed"""
+    from synthetic_data import generate_dataset
+
+    output_dir = tmp_path_factory.mktemp('processed')
+    generate_dataset(output_dir, scale=0.02, seed=1, formats=('processed',))
+    return output_dir
@@ -0,0 +1,49 @@
+"""The Power BI export works on processed data from before title clustering"""
+
+import shutil
+
+import pandas as pd
+
+from data_optimization import PowerBIDataOptimizer
+
+
+def _export(input_dir, output_dir):
+    optimizer = PowerBIDataOptimizer(input_dir, output_dir, output_dir)
+    return optimizer.export_tables()
+
+
+def test_role_summary_without_roles(processed_dir, tmp_path):
+    legacy = tmp_path / 'legacy'
+    legacy.mkdir()
+    for name in ('skills.csv', 'job_skills.csv'):
+        shutil.copy(processed_dir / name, legacy / name)
+    pd.read_csv(processed_dir / 'jobs.csv').drop(columns=['role_id']).to_csv(legacy / 'jobs.csv', index=False)
+
+    _export(legacy, tmp_path / 'bundle')
+    role_summary = pd.read_csv(tmp_path / 'bundle' / 'role_summary_powerbi.csv')
+    assert role_summary.empty
+    assert list(role_summary.columns) == PowerBIDataOptimizer.ROLE_SUMMARY_COLUMNS
+
+    # Once title clustering has run, the summary is rebuilt from roles.csv
+    shutil.copy(processed_dir / 'jobs.csv', legacy / 'jobs.csv')
+    shutil.copy(processed_dir / 'roles.csv', legacy / 'roles.csv')
+    result = _export(legacy, tmp_path / 'bundle')
+    assert 'role_summary_powerbi.csv' in result['written']
+    role_summary = pd.read_csv(tmp_path / 'bundle' / 'role_summary_powerbi.csv')
+    assert list(role_summary.columns) == PowerBIDataOptimizer.ROLE_SUMMARY_COLUMNS
+    assert role_summary['job_count'].sum() == len(pd.read_csv(legacy / 'jobs.csv'))
+
+
+def test_bridge_partitions_carry_posting_date_key(processed_dir, tmp_path):
+    _export(processed_dir, tmp_path)
+    root = tmp_path / 'powerbi_partitions'
+    jobs = pd.read_csv(tmp_path / 'jobs_powerbi.csv', usecols=['job_id', 'posting_date_key'])
+
+    part = sorted((root / 'job_skills').glob('job_skills_2*.csv'))[0]
+    bridge = pd.read_csv(part)
+    assert list(bridge.columns) == ['job_id', 'skill_id', 'posting_date_key']
+    # Every row sits in the month its file is named after, matching its job
+    assert (bridge['posting_date_key'].astype(str) == part.stem.split('_')[-1]).all()
+    merged = bridge.merge(jobs, on='job_id', suffixes=('', '_job'))
+    assert len(merged) == len(bridge)
+    assert (merged['posting_date_key'] == merged['posting_date_key_job']).all()
@@ -0,0 +1,56 @@
+"""Bulk-load schema plan: every key and foreign key is deferred"""
+
+from pathlib import Path
+
+import pytest
+
+from database_setup import plan_bulk_load, split_sql_statements
+
+SCHEMA = """
+CREATE TABLE postings (
+    job_id BIGINT,
+    company_id INTEGER,
+    city VARCHAR(100),
+    country VARCHAR(100),
+    posted DATE CHECK (posted >= '2000-01-01'),
+    PRIMARY KEY (job_id),
+    CONSTRAINT postings_location_key UNIQUE (job_id, city),
+    UNIQUE (city, country),
+    FOREIGN KEY (company_id) REFERENCES companies(company_id) ON DELETE SET NULL,
+    CONSTRAINT postings_city_check CHECK (city <> '')
+);
+"""
+
+
+def test_table_level_constraints_are_deferred():
+    plan = plan_bulk_load(split_sql_statements(SCHEMA))
+    create = plan['create'][0]
+    assert 'PRIMARY KEY' not in create and 'UNIQUE' not in create and 'REFERENCES' not in create
+    assert 'CHECK (posted' in create and 'postings_city_check' in create
+    assert plan['keys']['postings'] == [
+        'ALTER TABLE postings ADD CONSTRAINT postings_pkey PRIMARY KEY (job_id)',
+        'ALTER TABLE postings ADD CONSTRAINT postings_location_key UNIQUE (job_id, city)',
+        'ALTER TABLE postings ADD CONSTRAINT postings_city_country_key UNIQUE (city, country)',
+    ]
+    assert plan['foreign_keys'] == [(
+        'postings', 'postings_company_id_fkey',
+        'ALTER TABLE postings ADD CONSTRAINT postings_company_id_fkey FOREIGN KEY (company_id) '
+        'REFERENCES companies(company_id) ON DELETE SET NULL NOT VALID')]
+
+
+@pytest.mark.parametrize('item', [
+    'EXCLUDE USING gist (city WITH =)',
+    'FOREIGN KEY (company_id) REFERENCES companies(company_id) DEFERRABLE',
+    'company_id INTEGER CONSTRAINT fk_company REFERENCES companies(company_id)',
+])
+def test_constraints_that_cannot_be_deferred_raise(item):
+    with pytest.raises(ValueError):
+        plan_bulk_load([f"CREATE TABLE postings (\n    job_id BIGINT,\n    {item}\n)"])
+
+
+def test_schema_plan_defers_every_key():
+    schema = Path(__file__).resolve().parent.parent / 'sql' / 'schema.sql'
+    with open(schema, encoding='utf-8') as f:
+        plan = plan_bulk_load(split_sql_statements(f.read()))
+    for statement in plan['create']:
+        assert 'REFERENCES' not in statement.upper() and 'PRIMARY KEY' not in statement.upper()
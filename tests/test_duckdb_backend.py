@@ -0,0 +1,48 @@
+"""Smoke tests: the sql/ query libraries run unchanged on the embedded DuckDB backend"""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('duckdb')
+pytest.importorskip('pyarrow')
+
+from duckdb_backend import DuckDBManager
+from lazy_imports import lazy_import, require
+from sql_script_runner import SqlScriptRunner
+
+ROOT = Path(__file__).resolve().parent.parent
+QUERY_LIBRARIES = sorted(p.name for p in (ROOT / 'sql').glob('*.sql')
+                         if p.name not in ('schema.sql', 'create_database.sql'))
+
+
+@pytest.fixture(scope='module')
+def db_manager(processed_dir):
+    manager = DuckDBManager(processed_dir, schema_file=ROOT / 'sql' / 'schema.sql')
+    yield manager
+    manager.close()
+
+
+@pytest.mark.parametrize('library', QUERY_LIBRARIES)
+def test_query_library_runs(db_manager, library):
+    results = SqlScriptRunner(db_manager.get_engine()).run_queries(ROOT / 'sql' / library, workers=4, fetch=False)
+    assert results, f"no read-only queries found in {library}"
+    failures = [f"line {r['line']}: {r['error']}" for r in results if r['error']]
+    assert not failures, '\n'.join(failures)
+
+
+def test_tables_match_fixture(db_manager, processed_dir):
+    tables = db_manager.test_connection()['tables']
+    assert tables['jobs'] == sum(1 for _ in open(processed_dir / 'jobs.csv', encoding='utf-8')) - 1
+    assert tables['roles'] > 0 and tables['companies'] > 0
+
+
+def test_stream_query_chunks(db_manager):
+    chunks = list(db_manager.stream_query('SELECT job_id FROM jobs ORDER BY job_id', chunk_rows=100))
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == db_manager.test_connection()['tables']['jobs']
+
+
+def test_missing_package_error_names_install_command():
+    with pytest.raises(ImportError, match=r"pip install wuzzuf_missing_package"):
+        require(lazy_import('wuzzuf_missing_package'), 'The DuckDB backend')
@@ -0,0 +1,47 @@
+"""Repost detection merges near-identical postings only, inside the date window"""
+
+import numpy as np
+import pandas as pd
+
+from duplicate_detection import DEFAULT_FIELDS, _feature_tokens, find_near_duplicates
+
+
+def _jobs(rows):
+    """Jobs and bridge frames from (job_id, title, company, city, date, skill_ids) rows"""
+    jobs = pd.DataFrame([r[:5] for r in rows], columns=['job_id', 'job_title', 'company_name', 'city', 'posting_date'])
+    bridge = pd.DataFrame([(r[0], skill) for r in rows for skill in r[5]], columns=['job_id', 'skill_id'])
+    return jobs, bridge
+
+
+def test_low_similarity_postings_are_not_merged():
+    # Same company and city, otherwise unrelated: true Jaccard about 0.17
+    rows = [(i, f'role{i} team{i}', 'acme', 'cairo', f'2021-03-{1 + i % 28:02d}', [3 * i, 3 * i + 1, 3 * i + 2])
+            for i in range(1, 201)]
+    canonical, stats = find_near_duplicates(*_jobs(rows))
+    assert stats['duplicates'] == 0
+    assert (canonical.to_numpy() == np.arange(1, 201)).all()
+
+
+def test_merged_postings_are_truly_similar(processed_dir):
+    jobs = pd.read_csv(processed_dir / 'jobs.csv').drop(columns=['canonical_job_id'])
+    bridge = pd.read_csv(processed_dir / 'job_skills.csv')
+    canonical, _ = find_near_duplicates(jobs, bridge, threshold=0.7)
+
+    indptr, hashes = _feature_tokens(jobs, DEFAULT_FIELDS, bridge)
+    tokens = [set(hashes[indptr[i]:indptr[i + 1]].tolist()) for i in range(len(jobs))]
+    row_of = dict(zip(jobs['job_id'], range(len(jobs))))
+    for row in np.flatnonzero(canonical.to_numpy() != jobs['job_id'].to_numpy()):
+        center = row_of[canonical.iloc[row]]
+        jaccard = len(tokens[row] & tokens[center]) / len(tokens[row] | tokens[center])
+        assert jaccard >= 0.5, f"job {jobs['job_id'].iloc[row]} merged at true Jaccard {jaccard:.2f}"
+
+
+def test_reposts_merge_within_the_window_only():
+    posting = ('data engineer', 'acme', 'cairo')
+    skills = [1, 2, 3, 4]
+    rows = [(1, *posting, '2021-01-01', skills), (2, *posting, '2021-01-11', skills),
+            (3, *posting, '2021-01-21', skills), (4, *posting, '2021-02-15', skills),
+            (5, 'accountant', 'globex', 'giza', '2021-01-05', [7, 8])]
+    canonical, _ = find_near_duplicates(*_jobs(rows), window_days=30)
+    # 2 and 3 are reposts of 1; 4 is 45 days after 1, so the chain 1-2-3-4 does not stretch the cluster
+    assert canonical.tolist() == [1, 1, 1, 4, 5]
@@ -0,0 +1,34 @@
+"""The saved skill-month tensor is only reused while it matches the processed data"""
+
+import numpy as np
+
+from emerging_skills import COUNTS_FILE, load_counts
+from synthetic_data import generate_dataset
+
+
+def _cells(counts):
+    order = np.lexsort((counts.skill_ids, counts.months))
+    return counts.months[order], counts.skill_ids[order], counts.counts[order]
+
+
+def test_regenerated_data_is_recounted(tmp_path):
+    generate_dataset(tmp_path, scale=0.02, seed=1, formats=('processed',))
+    load_counts(tmp_path)
+    assert (tmp_path / COUNTS_FILE).exists()
+
+    # Same directory, different postings: the saved months must not be reused
+    generate_dataset(tmp_path, scale=0.02, seed=2, formats=('processed',))
+    incremental, _, recounted = load_counts(tmp_path)
+    rebuilt, _, _ = load_counts(tmp_path, rebuild=True)
+
+    assert len(recounted) == len(rebuilt.totals)
+    assert incremental.totals == rebuilt.totals
+    for got, expected in zip(_cells(incremental), _cells(rebuilt)):
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_unchanged_data_only_recounts_the_last_month(processed_dir, tmp_path):
+    counts_path = tmp_path / COUNTS_FILE
+    load_counts(processed_dir, counts_path)
+    _, _, recounted = load_counts(processed_dir, counts_path)
+    assert len(recounted) == 1
@@ -0,0 +1,50 @@
+"""Summary routes return the same answers as the fact tables"""
+
+import shutil
+
+import pandas as pd
+import pytest
+
+from data_optimization import PowerBIDataOptimizer
+from query_router import AggregateQuery, QueryRouter
+
+
+@pytest.fixture(scope='module')
+def bundle(processed_dir, tmp_path_factory):
+    """Power BI export of the synthetic data with some postings lacking an industry"""
+    source = tmp_path_factory.mktemp('router_source')
+    for name in ('skills.csv', 'job_skills.csv', 'roles.csv'):
+        shutil.copy(processed_dir / name, source / name)
+    jobs = pd.read_csv(processed_dir / 'jobs.csv')
+    jobs.loc[jobs.index[::10], 'company_industry'] = None
+    jobs.to_csv(source / 'jobs.csv', index=False)
+
+    output = tmp_path_factory.mktemp('router_bundle')
+    PowerBIDataOptimizer(source, output, output).export_tables()
+    return output
+
+
+@pytest.mark.parametrize('query', [
+    AggregateQuery([], ['job_count']),
+    AggregateQuery([], ['job_count', 'percentage']),
+    AggregateQuery(['skill_category'], ['job_count', 'percentage']),
+    AggregateQuery(['posting_year'], ['job_count']),
+    AggregateQuery(['company_industry'], ['job_count', 'salary_avg', 'percentage']),
+    AggregateQuery(['experience_level'], ['job_count', 'salary_avg', 'applicants']),
+])
+def test_routes_agree_with_fact(bundle, query):
+    router = QueryRouter(bundle)
+    routed = router.query(query)
+    fact = router._from_fact(query)
+    order = query.dimensions or query.measures
+    pd.testing.assert_frame_equal(routed.sort_values(order).reset_index(drop=True),
+                                  fact.sort_values(order).reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_totals_are_not_rolled_up_from_partial_summaries(bundle):
+    router = QueryRouter(bundle)
+    total = router.query(AggregateQuery([], ['job_count']))
+    assert router.last_route == 'fact'
+    assert total['job_count'].iloc[0] == len(pd.read_csv(bundle / 'jobs_powerbi.csv'))
+    assert router.route(AggregateQuery(['skill_category'], ['job_count'])) == 'skills_summary_powerbi.csv'
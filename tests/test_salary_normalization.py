@@ -0,0 +1,23 @@
+"""Posted currencies survive cleaning and drive the annual USD conversion"""
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_salary_data
+from salary_normalization import load_rates, normalize_currency, normalize_salaries
+
+
+def test_normalize_currency_maps_symbols_and_defaults_missing():
+    posted = pd.Series(['egp', 'E£', ' usd ', None, '', 'XYZ'])
+    assert normalize_currency(posted).tolist() == ['EGP', 'EGP', 'USD', 'USD', 'USD', 'XYZ']
+
+
+def test_cleaned_currency_is_converted():
+    raw = pd.DataFrame({'Minimum Pay': [10000.0, 50000.0, 1000.0], 'Maximum Pay': [20000.0, 70000.0, 2000.0],
+                        'Pay Rate': ['monthly', 'yearly', 'monthly'], 'Currency': ['egp', np.nan, 'eur']})
+    jobs = normalize_salaries(clean_salary_data(raw), pay_rate_col='Pay Rate')
+    rates, _ = load_rates()
+
+    assert jobs['currency'].tolist() == ['EGP', 'USD', 'EUR']
+    expected = [10000 * 12 * rates['EGP'], 50000.0, 1000 * 12 * rates['EUR']]
+    np.testing.assert_allclose(jobs['salary_min_usd'], np.round(expected, 2))
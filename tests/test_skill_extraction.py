@@ -0,0 +1,27 @@
+"""Skills mentioned in job titles are added by the cleaning stage itself"""
+
+import pandas as pd
+
+from data_cleaning import run_cleaning_pipeline
+from skill_extraction import enrich_job_skills, extract_title_skills
+from synthetic_data import RAW_FILENAME, generate_dataset
+
+
+def _missing_title_pairs(bundle):
+    jobs = pd.read_csv(bundle / 'jobs.csv')
+    title_pairs = extract_title_skills(jobs, pd.read_csv(bundle / 'skills.csv'))
+    return enrich_job_skills(pd.read_csv(bundle / 'job_skills.csv'), title_pairs)[1]
+
+
+def test_cleaning_writes_title_skills(tmp_path):
+    generate_dataset(tmp_path, scale=0.02, seed=1, formats=('raw',))
+    raw_path = tmp_path / RAW_FILENAME
+
+    run_cleaning_pipeline(raw_path, tmp_path / 'tagged', quiet=True, title_skills=False)
+    assert _missing_title_pairs(tmp_path / 'tagged') > 0
+
+    _, _, job_skills = run_cleaning_pipeline(raw_path, tmp_path / 'enriched', quiet=True)
+    assert _missing_title_pairs(tmp_path / 'enriched') == 0
+    tagged = pd.read_csv(tmp_path / 'tagged' / 'job_skills.csv')
+    assert len(job_skills) > len(tagged)
+    assert len(tagged.merge(job_skills, on=['job_id', 'skill_id'])) == len(tagged)
@@ -0,0 +1,13 @@
+"""Validating a Power BI bundle leaves it untouched"""
+
+from data_optimization import PowerBIDataOptimizer
+from validate_powerbi_data import validate_powerbi_data
+
+
+def test_validation_does_not_build_a_bridge(processed_dir, tmp_path):
+    PowerBIDataOptimizer(processed_dir, tmp_path, tmp_path).export_tables()
+    before = sorted(p.name for p in tmp_path.iterdir())
+
+    validate_powerbi_data(tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == before
+    assert not (tmp_path / 'job_skills_powerbi.bridge').exists()
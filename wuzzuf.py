@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Wuzzuf Job Market Analysis command-line interface
+Runs the pipeline stages (cleaning, database load, Power BI export and
+validation, time trends) as a cached, resumable DAG
+
+Usage:
+    python wuzzuf.py list
+    python wuzzuf.py status
+    python wuzzuf.py run                         # bring every stage up to date
+    python wuzzuf.py run powerbi_export -j 2     # one target and its upstream stages
+    python wuzzuf.py run --force clean           # re-run a stage and whatever it changes
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent / 'pipeline'))
+from pipeline_dag import PipelineDAG
+
+
+def cmd_list(dag, args):
+    print("📋 Pipeline stages")
+    print("=" * 60)
+    for name in dag.order:
+        stage = dag.stages[name]
+        after = f"  (needs: {', '.join(stage.deps)})" if stage.deps else ''
+        print(f"   {name:<18} {stage.description}{after}")
+    return 0
+
+
+def cmd_status(dag, args):
+    icons = {'up to date': '✅', 'never run': '⚪', 'failed': '❌', 'missing inputs': '⚠️'}
+    print("📊 Pipeline status")
+    print("=" * 60)
+    for row in dag.status():
+        icon = icons.get(row['state'], '🔄')
+        last = f"  last run {row['finished']} ({row['duration_s']}s)" if row['finished'] and row['duration_s'] is not None else ''
+        print(f"{icon} {row['stage']:<18} {row['state']}{last}")
+    dag.save_state()
+    return 0
+
+
+def cmd_run(dag, args):
+    targets = args.stages or None
+    force = True if args.force else set(args.force_stages or ())
+
+    print(f"🚀 Running pipeline{' (dry run)' if args.dry_run else ''}: {', '.join(dag.select(targets))}")
+    print("=" * 60)
+    outcome = dag.run(targets, force=force, jobs=args.jobs, dry_run=args.dry_run,
+                      keep_going=not args.fail_fast)
+    if args.dry_run:
+        return 0
+
+    ran = [n for n, o in outcome.items() if o == 'ran']
+    cached = [n for n, o in outcome.items() if o == 'cached']
+    failed = [n for n, o in outcome.items() if o in ('failed', 'blocked')]
+    print("\n" + "=" * 60)
+    print(f"Ran: {len(ran)}, up to date: {len(cached)}, failed/blocked: {len(failed)}")
+    if failed:
+        print(f"❌ Failed or blocked: {', '.join(failed)} — fix and re-run to resume from there")
+        return 1
+    print("✅ Pipeline up to date")
+    return 0
+
+
+def cmd_reset(dag, args):
+    dag.reset(args.stages or None)
+    print(f"🧹 Cleared cached state for: {', '.join(args.stages) if args.stages else 'all stages'}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='wuzzuf', description='Wuzzuf Job Market Analysis pipeline')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help='List the pipeline stages')
+    sub.add_parser('status', help='Show which stages are up to date')
+
+    run = sub.add_parser('run', help='Run stages whose inputs changed')
+    run.add_argument('stages', nargs='*', help='Target stages (default: all); upstream stages are included')
+    run.add_argument('-f', '--force', action='store_true', help='Re-run the selected stages even if up to date')
+    run.add_argument('--force-stage', dest='force_stages', action='append', metavar='STAGE',
+                     help='Re-run only this stage unconditionally (repeatable)')
+    run.add_argument('-j', '--jobs', type=int, default=1, help='Stages to run in parallel')
+    run.add_argument('-n', '--dry-run', action='store_true', help='Show what would run')
+    run.add_argument('--fail-fast', action='store_true', help='Stop scheduling new stages after a failure')
+
+    reset = sub.add_parser('reset', help='Forget cached stage state')
+    reset.add_argument('stages', nargs='*')
+
+    args = parser.parse_args(argv)
+    dag = PipelineDAG()
+    commands = {'list': cmd_list, 'status': cmd_status, 'run': cmd_run, 'reset': cmd_reset}
+    try:
+        return commands[args.command](dag, args)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    sys.exit(main())